@@ -39,7 +39,7 @@ forbidden_exception = HTTPException(
 
 
 async def _touch_business_activity_from_payload(payload: Dict[str, Any]) -> None:
-    """C05 — touch throttled desde claim `sid` (fail-soft)."""
+    """C05 — touch throttled desde claim `sid` (fail-soft; write-behind sin I/O en el request)."""
     if payload.get("is_impersonation"):
         return
 
@@ -55,6 +55,9 @@ async def _touch_business_activity_from_payload(payload: Dict[str, Any]) -> None
             BusinessActivityService,
         )
 
+        if settings.BUSINESS_ACTIVITY_WRITE_BEHIND_ENABLED:
+            BusinessActivityService.record_touch(UUID(str(sid_raw)), UUID(str(cliente_raw)))
+            return
         await BusinessActivityService.touch(
             UUID(str(sid_raw)),
             UUID(str(cliente_raw)),
@@ -88,12 +91,11 @@ async def get_current_user_data(
         )
 
     try:
+        from app.core.security.jwt_cache import decode_access_token
+
         token = normalize_bearer_jwt_token(token)
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        # Payload verificado cacheado por digest del token (hasta su exp)
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             logger.warning("Token JWT inválido: falta 'sub'.")
@@ -103,8 +105,9 @@ async def get_current_user_data(
         jti = payload.get("jti")
         if jti:
             try:
-                from app.infrastructure.redis.client import RedisService
-                is_blacklisted = await RedisService.is_token_blacklisted(jti)
+                # Negativos seguros desde el filtro local; Redis solo ante posibles positivos
+                from app.infrastructure.redis.revocation_filter import is_token_revoked
+                is_blacklisted = await is_token_revoked(jti)
                 
                 if is_blacklisted:
                     logger.warning(
@@ -138,6 +141,10 @@ async def get_current_user_data(
                 payload, phase="get_current_user_data_ok"
             )
 
+        # Cuota por tenant + usuario + clase de ruta (token ya verificado)
+        from app.core.security.tenant_rate_limiter import enforce_rate_limit
+        await enforce_rate_limit(request, payload)
+
         await _touch_business_activity_from_payload(payload)
 
         return payload
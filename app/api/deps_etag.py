@@ -0,0 +1,95 @@
+"""
+GET condicional (ETag / If-None-Match) para menús, catálogos y permisos.
+
+El ETag se calcula sin BD: HMAC(SECRET_KEY) de la ruta y query, la identidad
+del token (claims, sin consultar el usuario), los contadores de versión
+(app/infrastructure/cache/versions.py) y una ventana de tiempo
+(CONDITIONAL_GET_MAX_STALENESS_SECONDS) que acota cualquier invalidación perdida.
+
+Uso: como PRIMERA dependencia de la ruta (o del router), antes de las que
+consultan la BD:
+
+    @router.get("/getmenu/", dependencies=[Depends(conditional_get()), Depends(require_permission(...))])
+
+Si el If-None-Match coincide se responde 304 sin ejecutar el resto de
+dependencias ni el endpoint; el token ya fue validado (firma, expiración y
+blacklist) por get_current_user_data. En otro caso la respuesta lleva el ETag.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.api.deps import get_current_user_data
+from app.core.config import settings
+from app.infrastructure.cache.versions import get_versions, record_etag_result, version_keys
+
+# Claims que distinguen lo que el usuario ve (misma combinación → misma respuesta)
+_IDENTITY_CLAIMS = (
+    "sub",
+    "cliente_id",
+    "empresa_id",
+    "access_level",
+    "is_super_admin",
+    "user_type",
+    "is_impersonation",
+    "impersonated_by",
+    "empresa_selection_pending",
+)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil (RFC 9110): ignora W/ (la compresión debilita el ETag)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == target for candidate in if_none_match.split(","))
+
+
+async def compute_etag(request: Request, payload: Dict[str, Any], tenant_scoped: bool = True) -> str:
+    versions = await get_versions(version_keys(payload.get("cliente_id") if tenant_scoped else None))
+    # Desfase por usuario: las ventanas no vencen todas a la vez (sin picos de re-fetch)
+    period = max(1, settings.CONDITIONAL_GET_MAX_STALENESS_SECONDS)
+    window = int((time.time() + zlib.crc32(str(payload.get("sub")).encode()) % period) // period)
+    parts = (
+        request.url.path,
+        request.url.query,
+        window,
+        *(payload.get(claim) for claim in _IDENTITY_CLAIMS),
+        *versions,
+    )
+    digest = hmac.new(settings.SECRET_KEY.encode(), "|".join(map(str, parts)).encode(), hashlib.sha256)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def conditional_get(tenant_scoped: bool = True) -> Callable:
+    """
+    Dependencia de GET condicional.
+
+    Args:
+        tenant_scoped: La respuesta depende de datos del tenant (roles, permisos,
+            módulos contratados). False para catálogos solo globales.
+    """
+    async def _conditional_get(
+        request: Request,
+        response: Response,
+        payload: Dict[str, Any] = Depends(get_current_user_data),
+    ) -> None:
+        if not settings.CONDITIONAL_GET_ENABLED or request.method != "GET":
+            return
+        etag = await compute_etag(request, payload, tenant_scoped)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            record_etag_result(not_modified=True)
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        record_etag_result(not_modified=False)
+        response.headers.update(headers)
+
+    return _conditional_get
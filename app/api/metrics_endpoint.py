@@ -8,6 +8,22 @@ Endpoint para exponer métricas básicas.
 from fastapi import APIRouter, Depends
 from typing import Dict, Any
 from app.core.metrics.basic_metrics import get_metrics_summary, get_slow_queries
+from app.core.metrics.query_budget import get_query_budget_violations
+from app.core.metrics.loop_watchdog import get_loop_block_report
+from app.core.metrics.pool_metrics import get_pool_metrics_report
+from app.core.metrics.load_shedding import get_load_shedding_report
+from app.core.metrics.request_deadline import get_deadline_report
+from app.core.compression import get_compression_report
+from app.infrastructure.cache.versions import get_etag_report
+from app.core.authorization.menu_cache import get_menu_cache_report
+from app.infrastructure.redis.revocation_filter import get_revocation_filter_report
+from app.modules.auth.application.services.business_activity_service import get_business_activity_report
+from app.modules.superadmin.application.services.audit_pipeline import get_audit_pipeline_report
+from app.core.security.tenant_rate_limiter import get_rate_limit_report
+from app.core.security.jwt_cache import get_jwt_cache_report
+from app.modules.auth.application.services.refresh_token_cleanup_job import get_cleanup_progress
+from app.api.v1.module_routers import get_module_router_profile
+from app.infrastructure.database.tenant_admission import get_tenant_admission_report
 from app.core.authorization.rbac import require_super_admin
 
 router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
@@ -45,3 +61,246 @@ async def get_slow_queries_endpoint(
     return slow_queries
 
 
+@router.get("/query-budget", response_model=list)
+async def get_query_budget_endpoint(
+    limit: int = 20,
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene los endpoints que excedieron el presupuesto de queries (posibles N+1).
+
+    Args:
+        limit: Número máximo de resultados (default: 20)
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_query_budget_violations(limit=limit)
+
+
+@router.get("/loop-blocks", response_model=Dict[str, Any])
+async def get_loop_blocks_endpoint(
+    limit: int = 20,
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene los bloqueos del event loop agregados por sitio de llamada.
+
+    Cada entrada incluye el stack capturado mientras el loop estaba bloqueado
+    (llamadas síncronas dentro de código async).
+
+    Args:
+        limit: Número máximo de sitios (default: 20)
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_loop_block_report(limit=limit)
+
+
+@router.get("/pools", response_model=Dict[str, Any])
+async def get_pool_metrics_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene la telemetría de los pools de conexión por engine.
+
+    Por engine: conexiones en uso/ociosas/overflow, histograma y percentiles de
+    espera del checkout, timeouts, fallos de pre-ping y alertas de p95.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_pool_metrics_report()
+
+
+@router.get("/tenant-admission", response_model=Dict[str, Any])
+async def get_tenant_admission_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene el estado del control de admisión a BD por tenant.
+
+    Por tenant: slots en uso y límite (según plan), profundidad de cola,
+    rechazos por cola llena y timeouts de espera.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_tenant_admission_report()
+
+
+@router.get("/load-shedding", response_model=Dict[str, Any])
+async def get_load_shedding_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene el estado del load shedding.
+
+    Nivel de presión actual, señales (requests en curso, lag del loop, espera
+    de pool; relativas a su umbral) y requests rechazados por prioridad.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_load_shedding_report()
+
+
+@router.get("/deadlines", response_model=Dict[str, Any])
+async def get_deadlines_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las sentencias cortadas por deadline de request.
+
+    Cortes por ruta (timeout del driver, cancelación o deadline ya vencido) y
+    timeouts por defecto según prioridad.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_deadline_report()
+
+
+@router.get("/startup", response_model=Dict[str, Any])
+async def get_startup_profile_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene el perfil de arranque de los routers ERP.
+
+    Módulos registrados según ENABLED_MODULES (tiempo de import y módulos Python
+    cargados por cada uno) y módulos omitidos.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_module_router_profile()
+
+
+@router.get("/compression", response_model=Dict[str, Any])
+async def get_compression_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas de compresión de respuestas.
+
+    Respuestas comprimidas por codificación, bytes antes/después y aciertos del
+    cache de cuerpos comprimidos.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_compression_report()
+
+
+@router.get("/etags", response_model=Dict[str, Any])
+async def get_etags_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas de GET condicional (ETag).
+
+    Respuestas 304 vs. 200 con ETag, incrementos de versión y backend de los
+    contadores (Redis o memoria local).
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_etag_report()
+
+
+@router.get("/menu-cache", response_model=Dict[str, Any])
+async def get_menu_cache_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas del cache de menús compilados.
+
+    Aciertos por conjunto de roles, aciertos del cache de roles por usuario,
+    entradas y bytes retenidos.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_menu_cache_report()
+
+
+@router.get("/revocation-filter", response_model=Dict[str, Any])
+async def get_revocation_filter_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas del filtro local de revocación de JWT.
+
+    Checks resueltos en el worker (negativos del Bloom, revocaciones recientes)
+    vs. consultas a Redis, falsos positivos y estado de la sincronización.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_revocation_filter_report()
+
+
+@router.get("/business-activity", response_model=Dict[str, Any])
+async def get_business_activity_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas del touch de actividad de sesión (write-behind).
+
+    Touches encolados y throttled, pendientes de volcar, volcados y filas
+    actualizadas por los UPDATE por tenant.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_business_activity_report()
+
+
+@router.get("/audit-pipeline", response_model=Dict[str, Any])
+async def get_audit_pipeline_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas del pipeline asíncrono de auditoría.
+
+    Tamaño de la cola, eventos insertados en lote, sentencias, eventos
+    volcados a disco y recuperados.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_audit_pipeline_report()
+
+
+@router.get("/rate-limits", response_model=Dict[str, Any])
+async def get_rate_limits_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas del rate limiting por tenant + usuario + clase de ruta.
+
+    Requests permitidos y rechazados (429), cuántos se resolvieron con la
+    reserva local del worker y cuántos requirieron una llamada a Redis.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_rate_limit_report()
+
+
+@router.get("/jwt-cache", response_model=Dict[str, Any])
+async def get_jwt_cache_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene las métricas del cache de access tokens verificados.
+
+    Aciertos (requests sin jwt.decode), tokens expirados, purgados por
+    revocación y desalojos del LRU.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_jwt_cache_report()
+
+
+@router.get("/token-cleanup", response_model=Dict[str, Any])
+async def get_token_cleanup_endpoint(
+    current_user: dict = Depends(require_super_admin)
+):
+    """
+    Obtiene el avance de la limpieza de tokens en todos los tenants.
+
+    Tenants procesados y fallidos sobre el total, tokens eliminados, lotes
+    DELETE ejecutados y tenants en curso.
+
+    Requiere permisos de SuperAdmin.
+    """
+    return get_cleanup_progress()
@@ -0,0 +1,184 @@
+"""
+Registro diferido de los routers de módulos ERP.
+
+Cada paquete `app.modules.<mod>.presentation.endpoints` arrastra sus schemas
+Pydantic, servicios y tablas; importarlos todos domina el arranque del worker y
+su memoria aunque el despliegue solo use unos pocos módulos. Aquí se declara el
+catálogo de routers ERP (código de `modulo` → paquete) y solo se importan los
+habilitados según ENABLED_MODULES:
+
+- "all" (default): todos, igual que antes.
+- "INV,PUR,SLS": lista explícita de códigos del catálogo `modulo`.
+- "catalog": los módulos activos en `cliente_modulo` para algún cliente activo.
+  Requiere BD, así que se resuelve en el lifespan (antes del sync RBAC); si la
+  consulta falla se registran todos.
+
+El tiempo de import y los módulos Python cargados por cada router quedan en
+get_module_router_profile() (endpoint /metrics/startup).
+"""
+
+import importlib
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENABLED_MODULES_ALL = "all"
+ENABLED_MODULES_CATALOG = "catalog"
+
+
+@dataclass(frozen=True)
+class ModuleRouter:
+    """Router ERP registrable: código del catálogo `modulo`, paquete, prefijo y tags."""
+
+    codigo: str
+    module_path: str
+    prefix: str
+    tags: Tuple[str, ...]
+
+
+MODULE_ROUTERS: Tuple[ModuleRouter, ...] = (
+    ModuleRouter("ORG", "app.modules.org.presentation.endpoints", "/org", ("ORG - Organización",)),
+    ModuleRouter("INV", "app.modules.inv.presentation.endpoints", "/inv", ("INV - Inventarios",)),
+    ModuleRouter("PUR", "app.modules.pur.presentation.endpoints", "/pur", ("PUR - Compras",)),
+    ModuleRouter("SLS", "app.modules.sls.presentation.endpoints", "/sls", ("SLS - Ventas",)),
+    ModuleRouter("INV_BILL", "app.modules.invbill.presentation.endpoints", "/inv-bill", ("INV_BILL - Facturación Electrónica",)),
+    ModuleRouter("PRC", "app.modules.prc.presentation.endpoints", "/prc", ("PRC - Precios y Promociones",)),
+    ModuleRouter("LOG", "app.modules.log.presentation.endpoints", "/log", ("LOG - Logística y Distribución",)),
+    ModuleRouter("FIN", "app.modules.fin.presentation.endpoints", "/fin", ("FIN - Finanzas y Contabilidad",)),
+    ModuleRouter("WMS", "app.modules.wms.presentation.endpoints", "/wms", ("WMS - Gestión de Almacenes",)),
+    ModuleRouter("QMS", "app.modules.qms.presentation.endpoints", "/qms", ("QMS - Control de Calidad",)),
+    ModuleRouter("CRM", "app.modules.crm.presentation.endpoints", "/crm", ("CRM - Gestión de Clientes",)),
+    ModuleRouter("POS", "app.modules.pos.presentation.endpoints", "/pos", ("POS - Punto de Venta",)),
+    ModuleRouter("HCM", "app.modules.hcm.presentation.endpoints", "/hcm", ("HCM - Planillas y RRHH",)),
+    ModuleRouter("MFG", "app.modules.mfg.presentation.endpoints", "/mfg", ("MFG - Manufactura y Producción",)),
+    ModuleRouter("MRP", "app.modules.mrp.presentation.endpoints", "/mrp", ("MRP - Planeamiento de Materiales",)),
+    ModuleRouter("MPS", "app.modules.mps.presentation.endpoints", "/mps", ("MPS - Plan Maestro de Producción",)),
+    ModuleRouter("MNT", "app.modules.mnt.presentation.endpoints", "/mnt", ("MNT - Mantenimiento",)),
+    ModuleRouter("CST", "app.modules.cst.presentation.endpoints", "/cst", ("CST - Costeo de Productos",)),
+    ModuleRouter("TAX", "app.modules.tax.presentation.endpoints", "/tax", ("TAX - Libros Electrónicos",)),
+    ModuleRouter("BDG", "app.modules.bdg.presentation.endpoints", "/bdg", ("BDG - Presupuestos",)),
+    ModuleRouter("PM", "app.modules.pm.presentation.endpoints", "/pm", ("PM - Proyectos",)),
+    ModuleRouter("SVC", "app.modules.svc.presentation.endpoints", "/svc", ("SVC - Ordenes de Servicio",)),
+    ModuleRouter("TKT", "app.modules.tkt.presentation.endpoints", "/tkt", ("TKT - Mesa de Ayuda",)),
+    ModuleRouter("DMS", "app.modules.dms.presentation.endpoints", "/dms", ("DMS - Documentos",)),
+    ModuleRouter("WFL", "app.modules.wfl.presentation.endpoints", "/wfl", ("WFL - Flujos de Trabajo",)),
+    ModuleRouter("BI", "app.modules.bi.presentation.endpoints", "/bi", ("BI - Reportes y Analytics",)),
+    ModuleRouter("AUD", "app.modules.aud.presentation.endpoints", "/aud", ("AUD - Auditoría",)),
+)
+
+# codigo → {"import_ms", "modules_loaded", "routes"} de cada router registrado
+_profile: Dict[str, Dict[str, Any]] = {}
+# Atributo del destino con los códigos ya registrados (un lifespan repetido no duplica rutas)
+_REGISTERED_ATTR = "_module_router_codes"
+
+
+def resolve_enabled_modules(raw: str) -> Optional[FrozenSet[str]]:
+    """
+    Códigos habilitados según ENABLED_MODULES (None = todos).
+
+    "catalog" no se resuelve aquí (requiere BD): usar load_catalog_modules().
+    """
+    value = (raw or "").strip()
+    if not value or value.lower() == ENABLED_MODULES_ALL:
+        return None
+    codigos = frozenset(c.strip().upper() for c in value.split(",") if c.strip())
+    unknown = codigos - {m.codigo for m in MODULE_ROUTERS}
+    if unknown:
+        logger.warning(f"[MODULE_ROUTERS] Códigos de módulo desconocidos en ENABLED_MODULES: {sorted(unknown)}")
+    return codigos
+
+
+def is_catalog_mode() -> bool:
+    return (settings.ENABLED_MODULES or "").strip().lower() == ENABLED_MODULES_CATALOG
+
+
+def include_module_routers(
+    target: Any,
+    codigos: Optional[FrozenSet[str]] = None,
+    prefix: str = "",
+) -> List[str]:
+    """
+    Importa y registra en `target` (APIRouter o FastAPI) los routers ERP de `codigos`
+    (todos si es None). Los ya registrados se omiten.
+
+    Returns:
+        Códigos registrados en esta llamada.
+    """
+    registered = []
+    already = getattr(target, _REGISTERED_ATTR, None)
+    if already is None:
+        already = set()
+        setattr(target, _REGISTERED_ATTR, already)
+    for module in MODULE_ROUTERS:
+        if (codigos is not None and module.codigo not in codigos) or module.codigo in already:
+            continue
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        endpoints = importlib.import_module(module.module_path)
+        import_ms = (time.perf_counter() - start) * 1000
+        target.include_router(endpoints.router, prefix=f"{prefix}{module.prefix}", tags=list(module.tags))
+        _profile.setdefault(module.codigo, {
+            "import_ms": round(import_ms, 1),
+            "modules_loaded": len(sys.modules) - modules_before,
+            "routes": len(endpoints.router.routes),
+        })
+        already.add(module.codigo)
+        registered.append(module.codigo)
+    return registered
+
+
+async def load_catalog_modules() -> FrozenSet[str]:
+    """Códigos de módulo activos en cliente_modulo para al menos un cliente activo."""
+    from app.infrastructure.database.connection_async import DatabaseConnection, get_db_connection
+    from app.infrastructure.database.tables import ClienteTable
+    from app.infrastructure.database.tables_modulos import ClienteModuloTable, ModuloTable
+
+    query = select(ModuloTable.c.codigo).distinct().select_from(
+        ClienteModuloTable
+        .join(ModuloTable, ClienteModuloTable.c.modulo_id == ModuloTable.c.modulo_id)
+        .join(ClienteTable, ClienteModuloTable.c.cliente_id == ClienteTable.c.cliente_id)
+    ).where(
+        ClienteModuloTable.c.esta_activo == True,
+        ModuloTable.c.es_activo == True,
+        ClienteTable.c.es_activo == True,
+    )
+    # Consulta cross-tenant sobre el catálogo: sesión ADMIN directa
+    async with get_db_connection(DatabaseConnection.ADMIN) as session:
+        result = await session.execute(query)
+        return frozenset(str(row[0]).upper() for row in result.fetchall())
+
+
+async def register_catalog_module_routers(app: FastAPI) -> List[str]:
+    """
+    Modo "catalog": registra en la app los routers de los módulos contratados.
+    Si el catálogo no se puede leer, registra todos (nunca deja rutas fuera por error).
+    """
+    try:
+        codigos: Optional[FrozenSet[str]] = await load_catalog_modules()
+    except Exception as e:
+        logger.warning(f"[MODULE_ROUTERS] No se pudo leer cliente_modulo, se registran todos los módulos: {e}")
+        codigos = None
+    registered = include_module_routers(app, codigos, prefix=settings.API_V1_STR)
+    app.openapi_schema = None  # Regenerar OpenAPI con las rutas nuevas
+    logger.info(f"[MODULE_ROUTERS] Módulos registrados desde catálogo: {registered}")
+    return registered
+
+
+def get_module_router_profile() -> Dict[str, Any]:
+    """Módulos ERP registrados/omitidos y costo de import de cada router."""
+    registered = sorted(_profile.items(), key=lambda kv: kv[1]["import_ms"], reverse=True)
+    return {
+        "enabled_modules": settings.ENABLED_MODULES,
+        "registered": [{"codigo": codigo, **entry} for codigo, entry in registered],
+        "skipped": [m.codigo for m in MODULE_ROUTERS if m.codigo not in _profile],
+        "total_import_ms": round(sum(entry["import_ms"] for entry in _profile.values()), 1),
+    }
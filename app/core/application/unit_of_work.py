@@ -25,7 +25,8 @@ from app.infrastructure.database.connection_async import (
     get_db_connection, DatabaseConnection
 )
 from app.core.tenant.context import get_current_client_id
-from app.core.exceptions import DatabaseError
+from app.infrastructure.database.statement_timeout import execute_with_deadline
+from app.core.exceptions import DatabaseError, RequestTimeoutError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -74,6 +75,7 @@ class UnitOfWork:
         self.client_id = client_id or self._get_client_id()
         self.connection_type = connection_type
         self.session: Optional[AsyncSession] = None
+        self._connection_cm = None
         self._committed = False
         self._rolled_back = False
         self._operations_count = 0
@@ -90,10 +92,13 @@ class UnitOfWork:
     
     async def __aenter__(self):
         """Inicia la transacción."""
-        self.session = await get_db_connection(
+        # Conservar el context manager: si se descarta, el GC finaliza el generador
+        # de get_db_connection en otra task y cierra la sesión mientras se usa
+        self._connection_cm = get_db_connection(
             connection_type=self.connection_type,
             client_id=self.client_id
-        ).__aenter__()
+        )
+        self.session = await self._connection_cm.__aenter__()
         logger.debug(
             f"[UOW] Transacción iniciada para cliente {self.client_id} "
             f"(connection_type={self.connection_type.value})"
@@ -121,9 +126,10 @@ class UnitOfWork:
                     f"({self._operations_count} operaciones)"
                 )
         
-        # Cerrar sesión
-        if self.session:
-            await self.session.__aexit__(exc_type, exc_val, exc_tb)
+        # Cerrar sesión (commit/rollback ya resueltos arriba)
+        if self._connection_cm is not None:
+            connection_cm, self._connection_cm = self._connection_cm, None
+            await connection_cm.__aexit__(None, None, None)
     
     async def execute(
         self,
@@ -163,7 +169,7 @@ class UnitOfWork:
         
         try:
             self._operations_count += 1
-            result = await self.session.execute(query)
+            result = await execute_with_deadline(self.session, query)
             
             # Si es SELECT, retornar resultados
             if isinstance(query, (Select, TextClause)) or isinstance(query, str):
@@ -176,6 +182,8 @@ class UnitOfWork:
             # Para UPDATE/DELETE/INSERT, retornar rowcount
             return {"rows_affected": result.rowcount}
             
+        except RequestTimeoutError:
+            raise
         except Exception as e:
             logger.error(
                 f"[UOW] Error ejecutando query (operación #{self._operations_count}): {e}",
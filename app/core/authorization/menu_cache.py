@@ -0,0 +1,164 @@
+# app/core/authorization/menu_cache.py
+"""
+Cache de menús compilados por conjunto de roles.
+
+Usuarios del mismo tenant y empresa con el mismo conjunto de roles reciben el
+mismo árbol de menú, así que el árbol se guarda una sola vez, serializado
+(JSON), bajo la clave:
+
+    (tipo de menú, cliente_id, empresa_id, roles ordenados, versiones)
+
+Las versiones son los contadores de app/infrastructure/cache/versions.py
+(global + tenant), que ya incrementan las escrituras de menús, roles, permisos,
+asignación de roles y módulos contratados: tras una escritura la clave cambia y
+la entrada vieja queda inalcanzable hasta que el LRU la expulsa. El TTL acota lo
+que depende del reloj (vencimiento de módulos y de roles asignados).
+
+El conjunto de roles del usuario también se cachea, con las mismas versiones,
+así un acierto completo no ejecuta SQL: solo se reconstruye el modelo desde el
+JSON (validación en pydantic-core, sin transformar filas).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.infrastructure.cache.versions import get_versions, version_keys
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class _TTLCache:
+    """LRU con TTL por entrada (un solo proceso; el event loop serializa el acceso)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._store: "OrderedDict[Tuple[Any, ...], Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() > expires_at:
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple[Any, ...], value: Any) -> None:
+        self._store[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def size_bytes(self) -> int:
+        return sum(len(value) for value, _ in self._store.values() if isinstance(value, bytes))
+
+
+_menus = _TTLCache(settings.MENU_CACHE_MAX_ENTRIES, settings.MENU_CACHE_TTL_SECONDS)
+_role_sets = _TTLCache(settings.MENU_CACHE_MAX_ENTRIES * 4, settings.MENU_CACHE_TTL_SECONDS)
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "role_hits": 0, "role_misses": 0, "bypass": 0}
+
+
+async def _get_role_set(
+    cliente_id: Any,
+    usuario_id: Any,
+    empresa_id: Any,
+    versions: Tuple[Any, ...],
+    load_role_ids: Callable[[], Awaitable[Iterable[Any]]],
+) -> str:
+    key = (str(cliente_id), str(usuario_id), str(empresa_id), versions)
+    role_set = _role_sets.get(key)
+    if role_set is not None:
+        _stats["role_hits"] += 1
+        return role_set
+    _stats["role_misses"] += 1
+    role_set = ",".join(sorted({str(rol_id).lower() for rol_id in await load_role_ids() if rol_id}))
+    _role_sets.put(key, role_set)
+    return role_set
+
+
+async def get_or_build_menu(
+    kind: str,
+    *,
+    cliente_id: Any,
+    usuario_id: Any,
+    empresa_id: Any,
+    response_model: Type[M],
+    build: Callable[[], Awaitable[M]],
+    load_role_ids: Optional[Callable[[], Awaitable[Iterable[Any]]]] = None,
+    scope: Optional[str] = None,
+) -> M:
+    """
+    Devuelve el menú desde el cache o lo construye con `build` y lo guarda.
+
+    Args:
+        kind: Tipo de menú (el mismo conjunto de roles produce árboles distintos
+            en el menú legacy y en el de módulos).
+        load_role_ids: Consulta los roles vigentes del usuario (solo en fallo
+            del cache de roles).
+        scope: Sustituye al conjunto de roles cuando el menú no depende de ellos
+            (super admin, impersonación con rol fijo).
+    """
+    if not settings.MENU_CACHE_ENABLED or cliente_id is None or (scope is None and load_role_ids is None):
+        _stats["bypass"] += 1
+        return await build()
+
+    versions = await get_versions(version_keys(cliente_id))
+    if scope is None:
+        try:
+            scope = "roles:" + await _get_role_set(cliente_id, usuario_id, empresa_id, versions, load_role_ids)
+        except Exception as e:
+            logger.warning("[MENU_CACHE] No se pudieron obtener los roles de %s, sin cache: %s", usuario_id, e)
+            _stats["bypass"] += 1
+            return await build()
+
+    key = (kind, str(cliente_id), str(empresa_id), scope, versions)
+    raw = _menus.get(key)
+    if raw is not None:
+        _stats["hits"] += 1
+        return response_model.model_validate_json(raw)
+
+    _stats["misses"] += 1
+    menu = await build()
+    # Se serializa antes de devolverlo: el llamador puede mutar el modelo
+    _menus.put(key, menu.model_dump_json().encode())
+    return menu
+
+
+def get_menu_cache_report() -> Dict[str, Any]:
+    """Aciertos del cache de menús y de conjuntos de roles, entradas y bytes."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": settings.MENU_CACHE_ENABLED,
+        "ttl_seconds": _menus.ttl_seconds,
+        "entries": len(_menus),
+        "max_entries": _menus.max_entries,
+        "size_bytes": _menus.size_bytes(),
+        "role_set_entries": len(_role_sets),
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else None,
+    }
+
+
+def reset_menu_cache() -> None:
+    """Vacía el cache y las métricas (tests)."""
+    _menus.clear()
+    _role_sets.clear()
+    _stats.update(hits=0, misses=0, role_hits=0, role_misses=0, bypass=0)
@@ -14,3 +14,5 @@ class PermissionMetadata(TypedDict, total=False):
     recurso: str
     accion: str
     modulo_codigo: Optional[str]
+    # Clase de prioridad de la ruta para load shedding (ver route_priority.py)
+    prioridad: Optional[str]
@@ -19,6 +19,7 @@ from uuid import UUID
 from app.core.config import settings
 from app.core.authorization.effective_permissions import EffectivePermissions, SourceType
 from app.core.authorization.permission_cache import get_permission_cache
+from app.infrastructure.cache.versions import bump_versions_soon
 
 logger = logging.getLogger(__name__)
 
@@ -172,6 +173,7 @@ class PermissionResolverService:
 
     def invalidate_for_user(self, usuario_id: UUID, cliente_id: UUID) -> None:
         """Invalida cache para ese usuario en ese tenant (tras cambios en usuario_rol)."""
+        bump_versions_soon(cliente_id)  # ETags de menú/permisos del tenant
         if not getattr(settings, "PERMISSION_RESOLVER_CACHE_ENABLED", False):
             return
         cache = get_permission_cache()
@@ -179,6 +181,7 @@ class PermissionResolverService:
 
     def invalidate_for_tenant(self, cliente_id: UUID) -> None:
         """Invalida todas las entradas de cache del tenant (tras cambios en rol_permiso o cliente_modulo)."""
+        bump_versions_soon(cliente_id)
         if not getattr(settings, "PERMISSION_RESOLVER_CACHE_ENABLED", False):
             return
         cache = get_permission_cache()
@@ -4,6 +4,7 @@ Rutinas de startup para RBAC code-first:
 - Rellena PermissionRegistry desde dependencias require_permission(perm) que no usan RequirePermission(metadata).
 - Ejecuta PermissionSyncService.sync().
 - Advierte por endpoints sin permiso declarado.
+- Cache en disco por huella de rutas para arranques sin cambios (permission_startup_cache.py).
 """
 from __future__ import annotations
 
@@ -15,6 +16,13 @@ from app.core.authorization.permission_registry import (
     get_all as get_all_permissions,
 )
 from app.core.authorization.permission_sync_service import sync as sync_permissions
+from app.core.authorization.permission_startup_cache import (
+    compute_routes_fingerprint,
+    load_startup_cache,
+    save_startup_cache,
+)
+from app.core.config import settings
+from app.infrastructure.cache.versions import bump_versions
 from app.infrastructure.database.queries_async import execute_query
 from app.infrastructure.database.connection_async import DatabaseConnection
 from sqlalchemy import text
@@ -337,7 +345,7 @@ def warn_routes_without_permission(app: Any) -> None:
         )
 
 
-def audit_routes_permissions(app: Any) -> None:
+def audit_routes_permissions(app: Any) -> dict[str, Any]:
     """
     Auditoría de endpoints protegidos vs no protegidos.
 
@@ -346,6 +354,7 @@ def audit_routes_permissions(app: Any) -> None:
       [RBAC] Routes with permission metadata: Y
       [RBAC] Routes missing permission metadata: Z
     y lista las rutas que faltan (respetando SKIP_PATHS / SKIP_PREFIXES).
+    Retorna el mismo resumen (se guarda en el cache de startup).
     """
     total = 0
     with_perm = 0
@@ -374,12 +383,37 @@ def audit_routes_permissions(app: Any) -> None:
     for methods, path in missing:
         logger.warning("%s Route missing permission metadata: %s %s", RBAC_LOG_PREFIX, methods, path)
 
-
-def apply_rbac_enforcement(app: Any) -> None:
+    return {
+        "total": total,
+        "with_permission": with_perm,
+        "without_permission": without_perm,
+        "missing": missing,
+    }
+
+
+def _inject_permission(route: APIRoute, path: str, codigo: str) -> None:
+    """Agrega require_permission(codigo) como dependencia de la ruta."""
+    dependency_callable = require_permission(codigo)
+    # Para FastAPI internals (Dependant)
+    sub_dep = get_parameterless_sub_dependant(
+        dependency=dependency_callable,
+        path=path,
+    )
+    dependant = getattr(route, "dependant", None)
+    if dependant is not None:
+        dependant.dependencies.append(sub_dep)
+    # Para introspección en route.dependencies
+    route.dependencies.append(Depends(dependency_callable))
+
+
+def apply_rbac_enforcement(app: Any) -> list[dict[str, Any]]:
     """
     Inyecta dinámicamente require_permission(codigo) en rutas que no declaran permisos,
     usando la misma lógica de inferencia de ensure_registry_from_routes.
+
+    Retorna la tabla de enforcement aplicada: [{"path", "methods", "codigo"}].
     """
+    applied: list[dict[str, Any]] = []
     for route, path, methods in _iter_api_routes(app):
         # Excluir rutas públicas
         if path in SKIP_PATHS:
@@ -398,16 +432,8 @@ def apply_rbac_enforcement(app: Any) -> None:
         codigo = f"{modulo_codigo.lower()}.{recurso}.{accion}"
 
         # Añadir dependencia de autorización a nivel de ruta
-        dependency_callable = require_permission(codigo)
-        # Para FastAPI internals (Dependant)
-        sub_dep = get_parameterless_sub_dependant(
-            dependency=dependency_callable,
-            path=path,
-        )
-        if dependant is not None:
-            dependant.dependencies.append(sub_dep)
-        # Para introspección en route.dependencies
-        route.dependencies.append(Depends(dependency_callable))
+        _inject_permission(route, path, codigo)
+        applied.append({"path": path, "methods": sorted(methods), "codigo": codigo})
 
         logger.info(
             "%s Enforcement applied: %s %s -> %s",
@@ -416,12 +442,50 @@ def apply_rbac_enforcement(app: Any) -> None:
             path,
             codigo,
         )
+    return applied
+
+
+def apply_enforcement_table(app: Any, enforcement: list[dict[str, Any]]) -> int:
+    """
+    Aplica una tabla de enforcement ya calculada (cache de startup) sin repetir la
+    inferencia. Retorna cuántas rutas recibieron la dependencia.
+    """
+    by_route = {(e["path"], tuple(e["methods"])): e["codigo"] for e in enforcement}
+    applied = 0
+    for route, path, methods in _iter_api_routes(app):
+        codigo = by_route.get((path, tuple(sorted(methods))))
+        if codigo is None or _has_permission_dependency(getattr(route, "dependant", None)):
+            continue
+        _inject_permission(route, path, codigo)
+        applied += 1
+    return applied
+
+
+def _restore_from_cache(app: Any, cached: dict[str, Any]) -> None:
+    """Startup rápido: registry y enforcement desde el cache; sin sync ni auditoría."""
+    for meta in cached.get("registry") or []:
+        register_permission(meta)
+    applied = apply_enforcement_table(app, cached.get("enforcement") or [])
+    audit = cached.get("audit") or {}
+    logger.info(
+        "%s Startup desde cache (huella %s): %s permisos, %s rutas con enforcement, "
+        "%s rutas sin permiso declarado. Sync con BD omitido (sin cambios de rutas).",
+        RBAC_LOG_PREFIX,
+        str(cached.get("fingerprint"))[:12],
+        len(cached.get("registry") or []),
+        applied,
+        audit.get("without_permission", "?"),
+    )
 
 
 async def run_rbac_startup(app: Any) -> None:
     """
     Ejecutar al startup: rellena registry desde rutas, sync con BD y advierte rutas sin permiso.
     Orden: ensure_registry -> enforcement -> sync -> warn.
+
+    Con RBAC_STARTUP_CACHE_ENABLED, si la huella de rutas coincide con el cache en
+    disco se restaura registry + enforcement desde ahí y se omite el resto
+    (permission_startup_cache.py).
     """
     try:
         # DEBUG: verificar cantidad de rutas registradas al momento del startup RBAC
@@ -433,12 +497,27 @@ async def run_rbac_startup(app: Any) -> None:
         from app.core.authorization.core_permissions import register_core_permissions
 
         register_core_permissions()
+
+        fingerprint = None
+        if settings.RBAC_STARTUP_CACHE_ENABLED:
+            try:
+                fingerprint = compute_routes_fingerprint(app)
+                cached = load_startup_cache(fingerprint)
+            except Exception as cache_err:
+                logger.warning("%s Cache de startup no disponible: %s", RBAC_LOG_PREFIX, cache_err)
+                fingerprint, cached = None, None
+            if cached is not None:
+                _restore_from_cache(app, cached)
+                return
+
         ensure_registry_from_routes(app)
-        apply_rbac_enforcement(app)
-        await sync_permissions()
+        enforcement = apply_rbac_enforcement(app)
+        synced = await sync_permissions()
+        # Rutas/permisos nuevos (release): el catálogo de permisos pudo cambiar → ETags globales
+        await bump_versions()
 
         # Auditoría de rutas declaradas con permiso vs sin permiso
-        audit_routes_permissions(app)
+        audit = audit_routes_permissions(app)
 
         # Verificación de conteo en tabla permiso vs permisos declarados
         try:
@@ -471,5 +550,10 @@ async def run_rbac_startup(app: Any) -> None:
             logger.warning("%s No se pudo verificar conteo de tabla permiso: %s", RBAC_LOG_PREFIX, count_err)
 
         warn_routes_without_permission(app)
+
+        # Solo tras un sync completo: si falló o se omitió por configuración, el próximo
+        # arranque lo ejecuta (la huella de rutas no cambia al reactivar el sync)
+        if fingerprint is not None and synced is True:
+            save_startup_cache(fingerprint, get_all_permissions(), enforcement, audit)
     except Exception as e:
         logger.warning("%s Error en startup RBAC (no bloqueante): %s", RBAC_LOG_PREFIX, e)
@@ -0,0 +1,148 @@
+# app/core/authorization/permission_startup_cache.py
+"""
+Cache en disco del startup RBAC, indexado por huella de la tabla de rutas.
+
+run_rbac_startup recorre todas las rutas varias veces (registry, enforcement,
+auditoría, advertencias) y sincroniza cientos de permisos contra la tabla
+permiso en cada arranque de cada worker. Con las mismas rutas el resultado es
+siempre el mismo, así que se guarda:
+
+- registry: permisos derivados (PermissionRegistry completo).
+- enforcement: (path, métodos, codigo) de las rutas a las que se inyecta
+  require_permission por inferencia.
+- audit: resumen de rutas con/sin permiso.
+
+La huella (sha256) cubre path, métodos y metadata de permisos de cada ruta, los
+permisos core, el código de permission_startup (un cambio de reglas de
+inferencia invalida el cache) y la BD destino del sync (servidor/puerto/base
+ADMIN y principal): otro entorno en el mismo host no reutiliza el archivo. Mismo despliegue → se carga el archivo y no se
+repite el sync con BD; el camino costoso corre una vez por release.
+
+El archivo se escribe solo si el sync con BD terminó bien (escritura atómica:
+temporal + os.replace, seguro con varios workers).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from fastapi.routing import APIRoute
+from starlette.routing import Mount, Router
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RBAC_LOG_PREFIX = "[RBAC]"
+CACHE_FORMAT_VERSION = 1
+
+
+_DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[3] / "logs" / "rbac_startup_cache.json"
+
+
+def get_cache_path() -> Path:
+    """Ruta del archivo de cache (RBAC_STARTUP_CACHE_PATH o logs/ del proyecto)."""
+    configured = (settings.RBAC_STARTUP_CACHE_PATH or "").strip()
+    if configured:
+        return Path(configured)
+    return _DEFAULT_CACHE_PATH
+
+
+def _database_identity() -> list:
+    """BD contra la que se sincronizan los permisos (ADMIN) y la principal."""
+    return [
+        settings.DB_ADMIN_SERVER, settings.DB_ADMIN_PORT, settings.DB_ADMIN_DATABASE,
+        settings.DB_SERVER, settings.DB_PORT, settings.DB_DATABASE,
+    ]
+
+
+def _permission_signature(call: Any) -> Optional[list]:
+    codigo = getattr(call, "__permission_codigo__", None)
+    metadata = getattr(call, "__permission_metadata__", None)
+    if codigo is None and metadata is None:
+        return None
+    return [codigo, metadata]
+
+
+def _iter_route_signatures(routes: Any) -> Iterator[list]:
+    """[path, métodos, permisos] de cada APIRoute (incluye Mount y routers anidados)."""
+    for route in routes:
+        if isinstance(route, APIRoute):
+            dependencies = getattr(getattr(route, "dependant", None), "dependencies", None) or []
+            permissions = [
+                signature
+                for signature in (_permission_signature(dep.call) for dep in dependencies)
+                if signature is not None
+            ]
+            yield [route.path or "/", sorted(route.methods or ()), permissions]
+        elif isinstance(route, (Mount, Router)):
+            yield from _iter_route_signatures(getattr(route, "routes", None) or [])
+
+
+def compute_routes_fingerprint(app: Any) -> str:
+    """
+    Huella de las rutas y su metadata de permisos. Debe calcularse antes de
+    apply_rbac_enforcement (que agrega dependencias a las rutas).
+    """
+    from app.core.authorization import permission_startup
+    from app.core.authorization.core_permissions import CORE_STATIC_PERMISSIONS
+
+    routes = list(_iter_route_signatures(getattr(app, "routes", [])))
+    routes.sort(key=lambda r: (r[0], r[1]))
+
+    digest = hashlib.sha256()
+    digest.update(str(CACHE_FORMAT_VERSION).encode())
+    digest.update(Path(permission_startup.__file__).read_bytes())
+    payload = {"routes": routes, "core": CORE_STATIC_PERMISSIONS, "database": _database_identity()}
+    digest.update(json.dumps(payload, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def load_startup_cache(fingerprint: str) -> Optional[dict[str, Any]]:
+    """Contenido del cache si existe y corresponde a la huella; None si no."""
+    path = get_cache_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("%s Cache de startup ilegible (%s), se reconstruye: %s", RBAC_LOG_PREFIX, path, e)
+        return None
+    if data.get("fingerprint") != fingerprint or data.get("version") != CACHE_FORMAT_VERSION:
+        return None
+    return data
+
+
+def save_startup_cache(
+    fingerprint: str,
+    registry: list[dict[str, Any]],
+    enforcement: list[dict[str, Any]],
+    audit: dict[str, Any],
+) -> None:
+    """Escribe el cache de forma atómica. Un fallo solo se loggea."""
+    path = get_cache_path()
+    data = {
+        "version": CACHE_FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "registry": registry,
+        "enforcement": enforcement,
+        "audit": audit,
+    }
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".rbac_startup_", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        logger.info("%s Cache de startup guardado en %s", RBAC_LOG_PREFIX, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("%s No se pudo guardar el cache de startup (%s): %s", RBAC_LOG_PREFIX, path, e)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
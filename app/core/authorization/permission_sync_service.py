@@ -46,23 +46,28 @@ async def _get_modulo_id_by_codigo(modulo_codigo: str | None) -> str | None:
     return None
 
 
-async def sync() -> None:
+async def sync() -> bool | None:
     """
     Sincroniza permisos del registry con la tabla permiso.
     Idempotente.
+
+    Returns:
+        True si terminó sin errores (o no había nada que hacer); False si la tabla
+        no se pudo leer o falló algún INSERT/UPDATE; None si el sync está
+        deshabilitado (RBAC_PERMISSION_SYNC_ENABLED=false) y no se ejecutó.
     """
     try:
         from app.core.config import settings
         if getattr(settings, "RBAC_PERMISSION_SYNC_ENABLED", True) is False:
             logger.info("%s Permission sync deshabilitado por configuración.", RBAC_LOG_PREFIX)
-            return
+            return None
     except Exception:
         pass
 
     declared = get_all()
     if not declared:
         logger.info("%s No hay permisos declarados en código para sincronizar.", RBAC_LOG_PREFIX)
-        return
+        return True
 
     codigos_declared = {p["codigo"] for p in declared}
 
@@ -85,9 +90,10 @@ async def sync() -> None:
         )
     except Exception as e:
         logger.warning("%s No se pudo leer tabla permiso (sync omitido): %s", RBAC_LOG_PREFIX, e)
-        return
+        return False
 
     existing_by_codigo = {r["codigo"]: r for r in (existing_rows or [])}
+    errors = 0
 
     # 3) INSERT o UPDATE por cada declarado
     for p in declared:
@@ -122,6 +128,7 @@ async def sync() -> None:
                 logger.info("%s Permission synced: %s", RBAC_LOG_PREFIX, codigo)
             except Exception as e:
                 logger.warning("%s Error insertando permiso %s: %s", RBAC_LOG_PREFIX, codigo, e)
+                errors += 1
         else:
             try:
                 upd = text("""
@@ -145,6 +152,7 @@ async def sync() -> None:
                 logger.info("%s Permission synced: %s", RBAC_LOG_PREFIX, codigo)
             except Exception as e:
                 logger.warning("%s Error actualizando permiso %s: %s", RBAC_LOG_PREFIX, codigo, e)
+                errors += 1
 
     # 4) Desactivar permisos que están en BD pero no en código (excepto grant-only protegidos)
     for codigo, row in existing_by_codigo.items():
@@ -170,3 +178,6 @@ async def sync() -> None:
                 logger.info("%s Permission disabled: %s", RBAC_LOG_PREFIX, codigo)
             except Exception as e:
                 logger.warning("%s Error desactivando permiso %s: %s", RBAC_LOG_PREFIX, codigo, e)
+                errors += 1
+
+    return errors == 0
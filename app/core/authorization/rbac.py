@@ -362,7 +362,7 @@ def require_tenant_admin() -> Callable:
     
     return dependency
 
-def require_permission(permission: str) -> Callable:
+def require_permission(permission: str, prioridad: Optional[str] = None) -> Callable:
     """
     Dependency que requiere un permiso específico.
     
@@ -373,6 +373,8 @@ def require_permission(permission: str) -> Callable:
     
     Args:
         permission: Permiso requerido (formato: 'modulo.accion')
+        prioridad: Clase de prioridad de la ruta para load shedding
+            ("critica", "alta", "normal", "baja"); None = inferida (route_priority.py)
         
     Returns:
         Callable: Dependencia de FastAPI que valida el permiso
@@ -408,6 +410,7 @@ def require_permission(permission: str) -> Callable:
         return current_user
     
     dependency.__permission_codigo__ = permission
+    dependency.__route_priority__ = prioridad
     return dependency
 
 
@@ -424,6 +427,7 @@ def RequirePermission(metadata: PermissionMetadata) -> Callable:
             "recurso": "orden_servicio",
             "accion": "crear",
             "modulo_codigo": "LOG",
+            "prioridad": "alta",  # opcional, para load shedding
         }))])
     """
     codigo = (metadata.get("codigo") or "").strip()
@@ -445,6 +449,7 @@ def RequirePermission(metadata: PermissionMetadata) -> Callable:
         return current_user
     
     dependency.__permission_metadata__ = metadata
+    dependency.__route_priority__ = metadata.get("prioridad")
     return dependency
 
 
@@ -0,0 +1,135 @@
+# app/core/authorization/route_priority.py
+"""
+Clases de prioridad de rutas para load shedding.
+
+- critica: auth/refresh, health. Nunca se rechaza.
+- alta: escrituras transaccionales (POST/PUT/PATCH/DELETE). Nunca se rechaza.
+- normal: lecturas puntuales (GET /recurso/{id}). Se rechaza con presión crítica.
+- baja: exportes, reportes y listados. Primera en rechazarse.
+
+Declaración explícita, junto a la metadata de permisos:
+    Depends(require_permission("inv.reporte.leer", prioridad="baja"))
+    Depends(RequirePermission({..., "prioridad": "baja"}))
+
+Rutas sin permiso (login, refresh, /me):
+    @router.post("/login/", dependencies=[Depends(declare_priority(PRIORITY_CRITICA))])
+
+Sin declaración se infiere de la ruta: prefijo de auth, palabras de
+exporte/reporte en el path o en el código del permiso, método HTTP y si el GET
+termina en parámetro de path (detalle) o no (listado).
+"""
+
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Optional, Pattern, Tuple
+
+from fastapi.routing import APIRoute
+
+PRIORITY_CRITICA = "critica"
+PRIORITY_ALTA = "alta"
+PRIORITY_NORMAL = "normal"
+PRIORITY_BAJA = "baja"
+PRIORITIES = (PRIORITY_CRITICA, PRIORITY_ALTA, PRIORITY_NORMAL, PRIORITY_BAJA)
+
+CRITICAL_PATH_PREFIXES = ("/api/v1/auth", "/health")
+_LOW_PRIORITY_WORDS = re.compile(r"export|report|descarga|download|excel|pdf|csv|kardex", re.IGNORECASE)
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_PRIORITY_CACHE_SIZE = 4096
+
+
+def declare_priority(prioridad: str) -> Callable[[], None]:
+    """Dependency sin efecto que solo declara la prioridad de la ruta (rutas sin require_permission)."""
+    if prioridad not in PRIORITIES:
+        raise ValueError(f"declare_priority: prioridad inválida '{prioridad}' (válidas: {', '.join(PRIORITIES)})")
+
+    def dependency() -> None:
+        return None
+
+    dependency.__route_priority__ = prioridad
+    return dependency
+
+
+def _iter_dependency_calls(dependant: Any) -> Iterable[Any]:
+    for dependency in getattr(dependant, "dependencies", None) or []:
+        if dependency.call is not None:
+            yield dependency.call
+        yield from _iter_dependency_calls(dependency)
+
+
+def declared_priority(dependant: Any) -> Optional[str]:
+    """Prioridad declarada en require_permission/RequirePermission de la ruta (la más alta)."""
+    declared = [
+        getattr(call, "__route_priority__", None)
+        for call in _iter_dependency_calls(dependant)
+    ]
+    declared = [p for p in declared if p in PRIORITIES]
+    if not declared:
+        return None
+    return min(declared, key=PRIORITIES.index)
+
+
+def _permission_codes(dependant: Any) -> Iterable[str]:
+    for call in _iter_dependency_calls(dependant):
+        codigo = getattr(call, "__permission_codigo__", None)
+        if codigo is None:
+            codigo = (getattr(call, "__permission_metadata__", None) or {}).get("codigo")
+        if codigo:
+            yield codigo
+
+
+def infer_priority(path: str, method: str, dependant: Any = None) -> str:
+    """Prioridad de una ruta: declarada si existe, si no inferida de path/método/permiso."""
+    declared = declared_priority(dependant) if dependant is not None else None
+    if declared:
+        return declared
+    if path.startswith(CRITICAL_PATH_PREFIXES):
+        return PRIORITY_CRITICA
+    if _LOW_PRIORITY_WORDS.search(path) or any(
+        _LOW_PRIORITY_WORDS.search(codigo) for codigo in _permission_codes(dependant)
+    ):
+        return PRIORITY_BAJA
+    if method.upper() in _WRITE_METHODS:
+        return PRIORITY_ALTA
+    if path.rstrip("/").endswith("}"):
+        return PRIORITY_NORMAL
+    return PRIORITY_BAJA
+
+
+class RoutePriorityIndex:
+    """Resuelve (método, path) → prioridad usando las rutas de la app; cache LRU."""
+
+    def __init__(self, routes: List[Any]):
+        self._routes: List[Tuple[Pattern, Optional[set], str, Any]] = []
+        for route in routes:
+            if isinstance(route, APIRoute):
+                self._routes.append((route.path_regex, route.methods, route.path, route.dependant))
+        self._cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def priority(self, method: str, path: str) -> str:
+        key = (method, path)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        resolved = None
+        for path_regex, methods, template, dependant in self._routes:
+            if path_regex.match(path) and (not methods or method in methods):
+                resolved = infer_priority(template, method, dependant)
+                break
+        if resolved is None:
+            resolved = infer_priority(path, method)
+
+        self._cache[key] = resolved
+        if len(self._cache) > _PRIORITY_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return resolved
+
+
+def get_route_priority_index(app: Any) -> RoutePriorityIndex:
+    """Índice de prioridades de la app (uno por app, compartido por los middlewares)."""
+    index = getattr(app.state, "route_priority_index", None)
+    if index is None:
+        index = RoutePriorityIndex(getattr(app, "routes", []))
+        app.state.route_priority_index = index
+    return index
@@ -0,0 +1,343 @@
+# app/core/compression.py
+"""
+Compresión de respuestas (brotli/gzip) negociada por Accept-Encoding.
+
+Menús, catálogos de permisos y listados ERP son JSON grandes y repetitivos
+(ratio típico 8-12×). El middleware comprime:
+
+- Respuestas de un solo bloque (JSONResponse, la gran mayoría) de al menos
+  COMPRESSION_MIN_SIZE bytes, con tipo comprimible (JSON, texto, XML, JS).
+- Streams (StreamingResponse) de tipo comprimible, chunk a chunk con flush.
+  Binarios ya comprimidos (xlsx, pdf, zip, imágenes) y text/event-stream pasan tal cual.
+- Nunca respuestas que ya traen Content-Encoding (p. ej. OpenAPI precalculado).
+
+Cache de cuerpos comprimidos: el mismo cuerpo (mismo menú para todos los
+usuarios de un rol, mismo catálogo) se comprime una sola vez. LRU por
+blake2b(cuerpo) + codificación, acotado en bytes (COMPRESSION_CACHE_MAX_BYTES).
+get_precompressed() lo expone a otros caches de respuesta.
+
+Es middleware ASGI puro (no BaseHTTPMiddleware): necesita distinguir una
+respuesta de un bloque de un stream y no bufferizar exportes.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # Opcional: sin brotli solo gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ENCODING_BROTLI = "br"
+ENCODING_GZIP = "gzip"
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+_NEVER_COMPRESS_TYPES = ("text/event-stream",)
+_THREAD_THRESHOLD_BYTES = 512 * 1024  # Cuerpos mayores se comprimen fuera del event loop
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Codificaciones soportadas en orden de preferencia."""
+    return (ENCODING_BROTLI, ENCODING_GZIP) if brotli is not None else (ENCODING_GZIP,)
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding → {codificación: q}. Las de q=0 se excluyen."""
+    accepted: Dict[str, float] = {}
+    for part in (header or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted[name] = q
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str], supported: Optional[Tuple[str, ...]] = None) -> Optional[str]:
+    """Mejor codificación aceptada por el cliente (mayor q; a igual q, el orden de preferencia)."""
+    accepted = parse_accept_encoding(header)
+    candidates = [
+        (accepted.get(encoding, accepted.get("*", 0.0)), -index, encoding)
+        for index, encoding in enumerate(supported or available_encodings())
+    ]
+    q, _, encoding = max(candidates, default=(0.0, 0, None))
+    return encoding if q > 0 else None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    content_type = (content_type or "").lower()
+    if not content_type or content_type.startswith(_NEVER_COMPRESS_TYPES):
+        return False
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == ENCODING_BROTLI:
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+# ============================================================================
+# CACHE DE CUERPOS COMPRIMIDOS
+# ============================================================================
+
+class CompressedBodyCache:
+    """LRU (digest, codificación) → cuerpo comprimido, acotado por bytes totales."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[bytes, str]) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Tuple[bytes, str], value: bytes) -> None:
+        if len(value) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = value
+        self.size_bytes += len(value)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+_stats: Dict[str, Any] = {
+    "compressed": {},       # codificación → respuestas
+    "streamed": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "skipped_small": 0,
+    "skipped_type": 0,
+}
+
+
+async def get_precompressed(body: bytes, encoding: str) -> bytes:
+    """
+    Cuerpo comprimido con `encoding`, desde el cache si ya se comprimió antes.
+
+    El digest (blake2b) cuesta una fracción de la compresión, así que los cuerpos
+    repetidos se sirven sin recomprimir.
+    """
+    use_cache = _cache.max_bytes > 0
+    if use_cache:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+    if len(body) >= _THREAD_THRESHOLD_BYTES:
+        compressed = await asyncio.to_thread(compress_body, body, encoding)
+    else:
+        compressed = compress_body(body, encoding)
+    if use_cache:
+        _cache.put(key, compressed)
+    return compressed
+
+
+class _StreamCompressor:
+    """Compresión incremental con flush por chunk (el cliente recibe cada bloque al llegar)."""
+
+    def __init__(self, encoding: str):
+        if encoding == ENCODING_BROTLI:
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+class CompressionMiddleware:
+    """Comprime respuestas HTTP según Accept-Encoding, tamaño y tipo de contenido."""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None  # type: ignore[assignment]
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status = message["status"]
+            if "content-encoding" in headers or status < 200 or status in (204, 304):
+                self.passthrough = True
+            elif not is_compressible(headers.get("content-type")):
+                self.passthrough = True
+                _stats["skipped_type"] += 1
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start_message = message  # Se envía con el primer bloque del cuerpo
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None and self.stream is None:
+            start, self.start_message = self.start_message, None
+            if not more_body:
+                await self._send_single(start, body)
+                return
+            # Stream: compresión incremental
+            self.stream = _StreamCompressor(self.encoding)
+            headers = MutableHeaders(raw=start["headers"])
+            self._set_encoding_headers(headers)
+            del headers["content-length"]
+            _stats["streamed"] += 1
+            await self.send(start)
+
+        data = self.stream.chunk(body) if body else b""
+        if not more_body:
+            data += self.stream.finish()
+        _stats["bytes_in"] += len(body)
+        _stats["bytes_out"] += len(data)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_single(self, start: Message, body: bytes) -> None:
+        if len(body) < self.minimum_size:
+            _stats["skipped_small"] += 1
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        compressed = await get_precompressed(body, self.encoding)
+        headers = MutableHeaders(raw=start["headers"])
+        self._set_encoding_headers(headers)
+        headers["Content-Length"] = str(len(compressed))
+        counts = _stats["compressed"]
+        counts[self.encoding] = counts.get(self.encoding, 0) + 1
+        _stats["bytes_in"] += len(body)
+        _stats["bytes_out"] += len(compressed)
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # El cuerpo codificado no es byte a byte el original: ETag fuerte → débil
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+
+# ============================================================================
+# REPORTE
+# ============================================================================
+
+def get_compression_report() -> Dict[str, Any]:
+    """Respuestas comprimidas, ahorro de bytes y estado del cache de cuerpos."""
+    bytes_in, bytes_out = _stats["bytes_in"], _stats["bytes_out"]
+    lookups = _cache.hits + _cache.misses
+    return {
+        "enabled": settings.COMPRESSION_ENABLED,
+        "encodings": list(available_encodings()),
+        "minimum_size": settings.COMPRESSION_MIN_SIZE,
+        "compressed": dict(_stats["compressed"]),
+        "streamed": _stats["streamed"],
+        "skipped_small": _stats["skipped_small"],
+        "skipped_type": _stats["skipped_type"],
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "ratio": round(bytes_in / bytes_out, 2) if bytes_out else None,
+        "cache": {
+            "entries": len(_cache),
+            "size_bytes": _cache.size_bytes,
+            "max_bytes": _cache.max_bytes,
+            "hits": _cache.hits,
+            "misses": _cache.misses,
+            "hit_rate": round(_cache.hits / lookups, 3) if lookups else None,
+        },
+    }
+
+
+def reset_compression_metrics() -> None:
+    """Limpia contadores y cache (tests)."""
+    _cache.clear()
+    _stats.update(compressed={}, streamed=0, bytes_in=0, bytes_out=0, skipped_small=0, skipped_type=0)
@@ -17,6 +17,13 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     DESCRIPTION: str = "API FastAPI para Service"
 
+    # Routers ERP a registrar: "all", lista de códigos del catálogo modulo ("INV,PUR,SLS")
+    # o "catalog" (módulos activos en cliente_modulo, resuelto en el lifespan)
+    ENABLED_MODULES: str = os.getenv("ENABLED_MODULES", "all")
+    # OpenAPI precalculado (scripts/build_openapi.py); sin build se genera en runtime
+    OPENAPI_STATIC_ENABLED: bool = os.getenv("OPENAPI_STATIC_ENABLED", "true").lower() == "true"
+    OPENAPI_STATIC_DIR: str = os.getenv("OPENAPI_STATIC_DIR", "static/openapi")
+
     # Database Principal (Base de datos centralizada Multi-Tenant)
     DB_SERVER: str = os.getenv("DB_SERVER", "")
     DB_USER: str = os.getenv("DB_USER", "")
@@ -145,6 +152,20 @@ class Settings(BaseSettings):
     # Límites generosos para no afectar uso normal, pero proteger contra ataques
     RATE_LIMIT_LOGIN: str = os.getenv("RATE_LIMIT_LOGIN", "10/minute")  # 10 intentos de login por minuto (generoso)
     RATE_LIMIT_API: str = os.getenv("RATE_LIMIT_API", "200/minute")  # 200 requests API por minuto (generoso)
+    # Storage de slowapi (login por IP); vacío → memoria del worker. Con p.ej. redis://host:6379/0 los
+    # contadores se comparten entre workers y, si Redis cae, se cuenta en memoria (sin 500)
+    RATE_LIMIT_STORAGE_URI: str = os.getenv("RATE_LIMIT_STORAGE_URI", "")
+
+    # Rate limiting por tenant + usuario + clase de ruta (GCRA en Redis, reservas locales por lote).
+    # Cuota = RATE_LIMIT_CLASS_QUOTAS[clase] (requests por ventana, plan de peso 1) × peso del plan.
+    TENANT_RATE_LIMIT_ENABLED: bool = os.getenv("TENANT_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_WINDOW_SECONDS: float = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+    RATE_LIMIT_CLASS_QUOTAS: str = os.getenv("RATE_LIMIT_CLASS_QUOTAS", "critica:120,alta:300,normal:600,baja:60")
+    RATE_LIMIT_PLAN_WEIGHTS: str = os.getenv(
+        "RATE_LIMIT_PLAN_WEIGHTS", "trial:0.5,basico:1,profesional:2,enterprise:5"
+    )
+    RATE_LIMIT_LOCAL_BATCH: int = int(os.getenv("RATE_LIMIT_LOCAL_BATCH", "20"))  # Tokens reservados por llamada a Redis
+    RATE_LIMIT_LOCAL_LEASE_SECONDS: float = float(os.getenv("RATE_LIMIT_LOCAL_LEASE_SECONDS", "1"))
 
     # ============================================
     # FEATURE FLAGS - FASE 2: PERFORMANCE (ACTIVADO POR DEFECTO)
@@ -153,7 +174,22 @@ class Settings(BaseSettings):
     # Para desactivar, establecer variable de entorno a "false"
     ENABLE_CONNECTION_POOLING: bool = os.getenv("ENABLE_CONNECTION_POOLING", "true").lower() == "true"
     ENABLE_REDIS_CACHE: bool = os.getenv("ENABLE_REDIS_CACHE", "true").lower() == "true"
-    
+
+    # Presupuesto de queries por request (detector N+1). Server-Timing solo fuera de producción.
+    QUERY_BUDGET_ENABLED: bool = os.getenv("QUERY_BUDGET_ENABLED", "true").lower() == "true"
+    QUERY_BUDGET_MAX_STATEMENTS: int = int(os.getenv("QUERY_BUDGET_MAX_STATEMENTS", "30"))  # Log si un request ejecuta más
+    QUERY_BUDGET_DUPLICATE_THRESHOLD: int = int(os.getenv("QUERY_BUDGET_DUPLICATE_THRESHOLD", "5"))  # Misma huella N veces = N+1
+
+    # Cache de forma de sentencias Core para filtro/auditoría de tenant (0 = desactivado)
+    STATEMENT_SHAPE_CACHE_SIZE: int = int(os.getenv("STATEMENT_SHAPE_CACHE_SIZE", "2048"))
+    # Cache de SQL textual parseado (TextClause/strings: tabla, filtro de tenant, '?' → :paramN)
+    SQL_TEXT_CACHE_SIZE: int = int(os.getenv("SQL_TEXT_CACHE_SIZE", "1024"))
+
+    # Watchdog del event loop: captura el stack cuando el loop se bloquea más del umbral
+    LOOP_WATCHDOG_ENABLED: bool = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() == "true"
+    LOOP_WATCHDOG_THRESHOLD_MS: float = float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100"))
+    LOOP_WATCHDOG_INTERVAL_MS: float = float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "50"))
+
     # ✅ FASE 1: Unit of Work Pattern (ACTIVADO POR DEFECTO)
     # Para desactivar temporalmente, establecer ENABLE_UNIT_OF_WORK=false
     ENABLE_UNIT_OF_WORK: bool = os.getenv("ENABLE_UNIT_OF_WORK", "true").lower() == "true"
@@ -168,6 +204,9 @@ class Settings(BaseSettings):
     
     # Code-first RBAC: sincronizar permisos declarados en código con tabla permiso al startup.
     RBAC_PERMISSION_SYNC_ENABLED: bool = os.getenv("RBAC_PERMISSION_SYNC_ENABLED", "true").lower() == "true"
+    # Cache del startup RBAC (registry + enforcement) por huella de rutas y BD; vacío = logs/ del proyecto
+    RBAC_STARTUP_CACHE_ENABLED: bool = os.getenv("RBAC_STARTUP_CACHE_ENABLED", "true").lower() == "true"
+    RBAC_STARTUP_CACHE_PATH: str = os.getenv("RBAC_STARTUP_CACHE_PATH", "")
 
     # INV-P0-002: escritura directa POST/PUT /inv/stock (tabla derivada). Default false = bloqueado.
     INV_ALLOW_STOCK_DIRECT_WRITE: bool = os.getenv("INV_ALLOW_STOCK_DIRECT_WRITE", "false").lower() == "true"
@@ -195,7 +234,126 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))  # Conexiones adicionales permitidas
     DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # Reciclar conexiones cada hora (segundos)
     DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Timeout para obtener conexión (segundos)
-    
+
+    # Réplicas de lectura (DatabaseConnection.READ). Por tenant: filas de cliente_conexion con
+    # es_solo_lectura=1. DB_READ_REPLICA_SERVER: réplica de la BD compartida (mismas credenciales).
+    ENABLE_READ_REPLICAS: bool = os.getenv("ENABLE_READ_REPLICAS", "true").lower() == "true"
+    DB_READ_REPLICA_SERVER: str = os.getenv("DB_READ_REPLICA_SERVER", "")
+    DB_READ_REPLICA_PORT: int = int(os.getenv("DB_READ_REPLICA_PORT", "1433"))
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "5"))
+    DB_READ_MAX_OVERFLOW: int = int(os.getenv("DB_READ_MAX_OVERFLOW", "5"))
+    DB_READ_REPLICA_RETRY_SECONDS: int = int(os.getenv("DB_READ_REPLICA_RETRY_SECONDS", "30"))  # Réplica caída → primaria durante N s
+
+    # Telemetría de pools: espera de checkout, timeouts, pre-ping (GET /api/v1/metrics/pools)
+    POOL_METRICS_ENABLED: bool = os.getenv("POOL_METRICS_ENABLED", "true").lower() == "true"
+    POOL_METRICS_SAMPLE_SIZE: int = int(os.getenv("POOL_METRICS_SAMPLE_SIZE", "1024"))  # Muestras para percentiles
+    POOL_WAIT_P95_ALERT_MS: float = float(os.getenv("POOL_WAIT_P95_ALERT_MS", "100"))
+    POOL_ALERT_INTERVAL_SECONDS: float = float(os.getenv("POOL_ALERT_INTERVAL_SECONDS", "60"))
+
+    # Pre-calentamiento al arrancar: engines, conexiones y caches de los tenants más activos
+    TENANT_WARMUP_ENABLED: bool = os.getenv("TENANT_WARMUP_ENABLED", "true").lower() == "true"
+    TENANT_WARMUP_TOP_N: int = int(os.getenv("TENANT_WARMUP_TOP_N", "20"))
+    TENANT_WARMUP_LOOKBACK_HOURS: int = int(os.getenv("TENANT_WARMUP_LOOKBACK_HOURS", "24"))  # Actividad de sesiones considerada
+    TENANT_WARMUP_MIN_IDLE: int = int(os.getenv("TENANT_WARMUP_MIN_IDLE", "2"))  # Conexiones abiertas por engine (≤ DB_POOL_SIZE)
+    TENANT_WARMUP_CONCURRENCY: int = int(os.getenv("TENANT_WARMUP_CONCURRENCY", "4"))
+    TENANT_WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("TENANT_WARMUP_TIMEOUT_SECONDS", "60"))
+    SUBDOMAIN_CACHE_TTL_SECONDS: int = int(os.getenv("SUBDOMAIN_CACHE_TTL_SECONDS", "60"))
+
+    # Control de admisión por tenant a la BD (get_db_connection): evita que un tenant acapare
+    # las conexiones. Límite del tenant = TENANT_DB_MAX_CONCURRENCY × peso de su plan.
+    TENANT_ADMISSION_ENABLED: bool = os.getenv("TENANT_ADMISSION_ENABLED", "true").lower() == "true"
+    TENANT_DB_MAX_CONCURRENCY: int = int(os.getenv("TENANT_DB_MAX_CONCURRENCY", "8"))  # Sesiones simultáneas (peso 1)
+    TENANT_DB_GLOBAL_MAX_CONCURRENCY: int = int(os.getenv("TENANT_DB_GLOBAL_MAX_CONCURRENCY", "64"))  # Todas las sesiones tenant
+    TENANT_DB_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("TENANT_DB_QUEUE_TIMEOUT_SECONDS", "5"))
+    TENANT_DB_MAX_QUEUE: int = int(os.getenv("TENANT_DB_MAX_QUEUE", "100"))  # En espera por tenant; más → 503 inmediato
+    TENANT_PLAN_CONCURRENCY_WEIGHTS: str = os.getenv(
+        "TENANT_PLAN_CONCURRENCY_WEIGHTS", "trial:0.5,basico:1,profesional:2,enterprise:4"
+    )
+
+    # Load shedding: bajo presión (requests en curso, lag del loop, espera de pool) se rechazan
+    # con 503 + Retry-After primero las rutas de prioridad baja (exportes, reportes, listados).
+    # Señal de lag: requiere LOOP_WATCHDOG_ENABLED. Presión ≥1× umbral → baja; ≥2× → también normal.
+    LOAD_SHEDDING_ENABLED: bool = os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() == "true"
+    SHED_MAX_IN_FLIGHT: int = int(os.getenv("SHED_MAX_IN_FLIGHT", "200"))
+    SHED_LOOP_LAG_MS: float = float(os.getenv("SHED_LOOP_LAG_MS", "200"))
+    SHED_POOL_WAIT_MS: float = float(os.getenv("SHED_POOL_WAIT_MS", "500"))
+    SHED_RETRY_AFTER_SECONDS: int = int(os.getenv("SHED_RETRY_AFTER_SECONDS", "5"))
+
+    # Deadline por request: header REQUEST_TIMEOUT_HEADER (segundos, tope REQUEST_MAX_TIMEOUT_SECONDS)
+    # o default por prioridad de ruta. Se aplica a execute_query/UnitOfWork como timeout del driver
+    # (+ cancelación asyncio tras REQUEST_DEADLINE_GRACE_SECONDS).
+    REQUEST_DEADLINE_ENABLED: bool = os.getenv("REQUEST_DEADLINE_ENABLED", "true").lower() == "true"
+    REQUEST_TIMEOUT_HEADER: str = os.getenv("REQUEST_TIMEOUT_HEADER", "X-Request-Timeout")
+    REQUEST_MAX_TIMEOUT_SECONDS: float = float(os.getenv("REQUEST_MAX_TIMEOUT_SECONDS", "120"))
+    REQUEST_TIMEOUT_BY_PRIORITY: str = os.getenv(
+        "REQUEST_TIMEOUT_BY_PRIORITY", "critica:10,alta:30,normal:20,baja:60"
+    )
+    REQUEST_DEADLINE_GRACE_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_GRACE_SECONDS", "1"))
+
+    # Compresión de respuestas (brotli si está instalado, gzip): cuerpos ≥ COMPRESSION_MIN_SIZE bytes
+    # de tipo JSON/texto. Los cuerpos repetidos se comprimen una vez (LRU de COMPRESSION_CACHE_MAX_BYTES; 0 = sin cache).
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_CACHE_MAX_BYTES: int = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+    # GET condicional (ETag/If-None-Match) en menús, catálogos y permisos: ETag de contadores de versión
+    # (Redis o memoria) incrementados por las escrituras; la ventana acota la staleness sin Redis.
+    CONDITIONAL_GET_ENABLED: bool = os.getenv("CONDITIONAL_GET_ENABLED", "true").lower() == "true"
+    CONDITIONAL_GET_MAX_STALENESS_SECONDS: int = int(os.getenv("CONDITIONAL_GET_MAX_STALENESS_SECONDS", "300"))
+
+    # Cache de menús compilados por (tenant, empresa, conjunto de roles, versiones). Las escrituras
+    # invalidan vía los contadores de versión; el TTL acota vencimientos de módulos y roles.
+    MENU_CACHE_ENABLED: bool = os.getenv("MENU_CACHE_ENABLED", "true").lower() == "true"
+    MENU_CACHE_MAX_ENTRIES: int = int(os.getenv("MENU_CACHE_MAX_ENTRIES", "2000"))
+    MENU_CACHE_TTL_SECONDS: int = int(os.getenv("MENU_CACHE_TTL_SECONDS", "300"))
+
+    # Touch de actividad de sesión (C05) write-behind: buffer en memoria volcado cada N segundos con
+    # un UPDATE por tenant; MAX_PENDING fuerza un volcado anticipado.
+    BUSINESS_ACTIVITY_WRITE_BEHIND_ENABLED: bool = os.getenv("BUSINESS_ACTIVITY_WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    BUSINESS_ACTIVITY_FLUSH_SECONDS: float = float(os.getenv("BUSINESS_ACTIVITY_FLUSH_SECONDS", "5"))
+    BUSINESS_ACTIVITY_MAX_PENDING: int = int(os.getenv("BUSINESS_ACTIVITY_MAX_PENDING", "5000"))
+
+    # Pipeline asíncrono de auditoría (auth_audit_log): cola acotada + INSERT multi-fila por BD destino,
+    # spill a disco si la BD falla. AUDIT_SYNC_EVENTS se escriben en línea (durabilidad inmediata).
+    AUDIT_PIPELINE_ENABLED: bool = os.getenv("AUDIT_PIPELINE_ENABLED", "true").lower() == "true"
+    AUDIT_SYNC_EVENTS: str = os.getenv(
+        "AUDIT_SYNC_EVENTS",
+        "impersonation_started,impersonation_ended,admin_password_reset,"
+        "token_reuse_detected,replay_detected,family_compromised",
+    )
+    AUDIT_QUEUE_MAX_SIZE: int = int(os.getenv("AUDIT_QUEUE_MAX_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_SECONDS: float = float(os.getenv("AUDIT_FLUSH_SECONDS", "1"))
+    AUDIT_SPILL_DIR: str = os.getenv("AUDIT_SPILL_DIR", "logs/audit_spill")
+    AUDIT_SPILL_REPLAY_SECONDS: float = float(os.getenv("AUDIT_SPILL_REPLAY_SECONDS", "30"))
+    AUDIT_SHUTDOWN_TIMEOUT_SECONDS: float = float(os.getenv("AUDIT_SHUTDOWN_TIMEOUT_SECONDS", "10"))
+
+    # Login: usuario + roles + empresas en una query al tenant y superadmin + expiración de tokens
+    # en una a ADMIN (login_context.py); false → una query por paso como antes
+    LOGIN_CONTEXT_SINGLE_QUERY: bool = os.getenv("LOGIN_CONTEXT_SINGLE_QUERY", "true").lower() == "true"
+
+    # Limpieza de tokens/sesiones en todos los tenants: N tenants en paralelo, DELETE en lotes TOP N
+    # con pausa entre lotes (evita escalar a lock de tabla) y checkpoint para reanudar una corrida cortada
+    TOKEN_CLEANUP_CONCURRENCY: int = int(os.getenv("TOKEN_CLEANUP_CONCURRENCY", "4"))
+    TOKEN_CLEANUP_BATCH_SIZE: int = int(os.getenv("TOKEN_CLEANUP_BATCH_SIZE", "1000"))  # < 5000 locks (umbral de escalamiento)
+    TOKEN_CLEANUP_BATCH_PAUSE_SECONDS: float = float(os.getenv("TOKEN_CLEANUP_BATCH_PAUSE_SECONDS", "0.2"))
+    TOKEN_CLEANUP_CHECKPOINT_PATH: str = os.getenv("TOKEN_CLEANUP_CHECKPOINT_PATH", "logs/token_cleanup_checkpoint.json")
+    TOKEN_CLEANUP_CHECKPOINT_MAX_AGE_HOURS: float = float(os.getenv("TOKEN_CLEANUP_CHECKPOINT_MAX_AGE_HOURS", "24"))
+
+    # Cache de access tokens verificados (SHA-256 del token → payload, vence en su exp; LRU por worker)
+    JWT_DECODE_CACHE_ENABLED: bool = os.getenv("JWT_DECODE_CACHE_ENABLED", "true").lower() == "true"
+    JWT_DECODE_CACHE_SIZE: int = int(os.getenv("JWT_DECODE_CACHE_SIZE", "4096"))
+
+    # Filtro local de revocación de JWT (Bloom + revocaciones recientes vía Redis pub/sub): los tokens
+    # seguro no revocados se validan sin ir a Redis. Error rate = falsos positivos (que sí consultan Redis).
+    REVOCATION_FILTER_ENABLED: bool = os.getenv("REVOCATION_FILTER_ENABLED", "true").lower() == "true"
+    REVOCATION_FILTER_CAPACITY: int = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+    REVOCATION_FILTER_ERROR_RATE: float = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001"))
+    REVOCATION_FILTER_RECENT_MAX: int = int(os.getenv("REVOCATION_FILTER_RECENT_MAX", "10000"))
+    REVOCATION_FILTER_REBUILD_SECONDS: int = int(os.getenv("REVOCATION_FILTER_REBUILD_SECONDS", "900"))
+
     # Configuración de Redis Cache (opcional)
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
@@ -70,6 +70,16 @@ class ServiceError(CustomException):
     def __init__(self, status_code: int, detail: str, internal_code: str = "SERVICE_ERROR"):
         super().__init__(status_code=status_code, detail=detail, internal_code=internal_code)
 
+class RequestTimeoutError(ServiceError):
+    """
+    Deadline del request agotado antes o durante una consulta.
+    
+    USO: La lanza la capa de BD (execute_query/UnitOfWork) al cortar una sentencia
+    por el deadline del request. Es ServiceError para atravesar handle_service_errors.
+    """
+    def __init__(self, detail: str, internal_code: str = "REQUEST_DEADLINE_EXCEEDED"):
+        super().__init__(status_code=504, detail=detail, internal_code=internal_code)
+
 class AuthenticationError(CustomException):
     """
     Errores de autenticación y autorización.
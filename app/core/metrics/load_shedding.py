@@ -0,0 +1,139 @@
+# app/core/metrics/load_shedding.py
+"""
+Load shedding adaptativo por presión de pool, event loop y requests en curso.
+
+Sin esto, bajo sobrecarga los requests se encolan hasta DB_POOL_TIMEOUT (30 s) y
+todos los usuarios ven fallos de 30 segundos. El middleware calcula un nivel de
+presión con tres señales (cada una relativa a su umbral):
+
+- Requests en curso / SHED_MAX_IN_FLIGHT
+- Lag del event loop (loop_watchdog) / SHED_LOOP_LAG_MS
+- Espera reciente de checkout del pool más saturado (pool_metrics) / SHED_POOL_WAIT_MS
+
+Nivel 0 (<1×): pasa todo. Nivel 1 (≥1×): se rechazan rutas "baja". Nivel 2 (≥2×):
+también "normal". "alta" (escrituras) y "critica" (auth/refresh) siempre pasan.
+El rechazo es inmediato: 503 + Retry-After (SHED_RETRY_AFTER_SECONDS × nivel).
+
+La prioridad de cada ruta (route_priority.py) solo se resuelve cuando hay
+presión; en operación normal el costo es un contador y una comparación.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from app.core.authorization.route_priority import (
+    PRIORITIES,
+    PRIORITY_BAJA,
+    PRIORITY_NORMAL,
+    get_route_priority_index,
+)
+from app.core.config import settings
+from app.core.metrics.loop_watchdog import get_current_loop_lag_ms
+from app.core.metrics.pool_metrics import get_max_recent_pool_wait_ms
+
+logger = logging.getLogger(__name__)
+
+_PRESSURE_TTL_SECONDS = 0.1  # Las señales se recalculan como máximo cada 100ms
+_SHED_BY_LEVEL = {1: frozenset({PRIORITY_BAJA}), 2: frozenset({PRIORITY_BAJA, PRIORITY_NORMAL})}
+
+
+class LoadShedder:
+    """Nivel de presión actual y contadores de rechazos."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.level = 0
+        self.signals: Dict[str, float] = {}
+        self._computed_at = 0.0
+        self.shed_by_priority: Dict[str, int] = {p: 0 for p in PRIORITIES}
+        self.last_shed_at: Optional[float] = None
+
+    def pressure_level(self) -> int:
+        now = time.monotonic()
+        if now - self._computed_at < _PRESSURE_TTL_SECONDS:
+            return self.level
+        self._computed_at = now
+        self.signals = {
+            "in_flight": self.in_flight / max(1, settings.SHED_MAX_IN_FLIGHT),
+            "loop_lag": get_current_loop_lag_ms() / settings.SHED_LOOP_LAG_MS,
+            "pool_wait": get_max_recent_pool_wait_ms() / settings.SHED_POOL_WAIT_MS,
+        }
+        pressure = max(self.signals.values())
+        level = 2 if pressure >= 2 else 1 if pressure >= 1 else 0
+        if level != self.level:
+            log = logger.warning if level > self.level else logger.info
+            log(f"[LOAD_SHEDDING] Nivel de presión {self.level} → {level} (señales: {self._signals_text()})")
+        self.level = level
+        return level
+
+    def _signals_text(self) -> str:
+        return ", ".join(f"{name}={ratio:.2f}×" for name, ratio in self.signals.items())
+
+    def should_shed(self, priority: str, level: int) -> bool:
+        return priority in _SHED_BY_LEVEL.get(level, ())
+
+    def record_shed(self, priority: str) -> None:
+        self.shed_by_priority[priority] = self.shed_by_priority.get(priority, 0) + 1
+        self.last_shed_at = time.time()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.LOAD_SHEDDING_ENABLED,
+            "level": self.level,
+            "in_flight": self.in_flight,
+            "signals": {name: round(ratio, 3) for name, ratio in self.signals.items()},
+            "shed_by_priority": dict(self.shed_by_priority),
+            "last_shed_at": self.last_shed_at,
+        }
+
+
+_shedder = LoadShedder()
+
+
+class LoadSheddingMiddleware(BaseHTTPMiddleware):
+    """
+    Rechaza temprano (503 + Retry-After) el tráfico de baja prioridad bajo presión.
+
+    Va por fuera de TenantMiddleware: un request rechazado no llega a resolver
+    tenant ni a pedir conexión.
+    """
+
+    def __init__(self, app, shedder: Optional[LoadShedder] = None):
+        super().__init__(app)
+        self.shedder = shedder or _shedder
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        shedder = self.shedder
+        level = shedder.pressure_level()
+        if level and request.method != "OPTIONS":
+            priority = get_route_priority_index(request.app).priority(request.method, request.url.path)
+            if shedder.should_shed(priority, level):
+                shedder.record_shed(priority)
+                logger.info(
+                    f"[LOAD_SHEDDING] 503 {request.method} {request.url.path} "
+                    f"(prioridad={priority}, nivel={level})"
+                )
+                return JSONResponse(
+                    status_code=503,
+                    content={
+                        "detail": "Servicio con alta carga. Reintente en unos segundos.",
+                        "error_code": "LOAD_SHED",
+                    },
+                    headers={"Retry-After": str(settings.SHED_RETRY_AFTER_SECONDS * level)},
+                )
+
+        shedder.in_flight += 1
+        try:
+            return await call_next(request)
+        finally:
+            shedder.in_flight -= 1
+
+
+def get_load_shedding_report() -> Dict[str, Any]:
+    """Nivel de presión, señales y rechazos por prioridad."""
+    return _shedder.report()
@@ -0,0 +1,234 @@
+# app/core/metrics/loop_watchdog.py
+"""
+Detector de bloqueos del event loop.
+
+Las llamadas síncronas dentro de código async (redis.Redis síncrono, bcrypt,
+pyodbc, get_connection_metadata síncrono, etc.) congelan el loop para TODOS
+los tenants sin dejar rastro en logs. Este módulo:
+
+- Mide el lag del loop con un latido (heartbeat) asyncio cada
+  LOOP_WATCHDOG_INTERVAL_MS.
+- Un hilo vigilante revisa el latido; si el loop lleva más de
+  LOOP_WATCHDOG_THRESHOLD_MS sin latir, captura el stack del hilo del loop
+  (sys._current_frames) mientras sigue bloqueado → muestra el frame culpable.
+- Agrega los bloqueos por sitio de llamada (archivo:línea:función del frame
+  más interno dentro de app/) para el reporte de superadmin.
+
+USO (lifespan):
+    watchdog = start_loop_watchdog()
+    ...
+    await stop_loop_watchdog()
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_SITES_TRACKED = 200
+_STACK_DEPTH = 12
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _call_site(frames: List[traceback.FrameSummary]) -> str:
+    """
+    Sitio de llamada representativo: el frame más interno que pertenece a app/
+    (el código nuestro que invocó la llamada bloqueante); si no hay ninguno,
+    el frame más interno del stack.
+    """
+    for frame in reversed(frames):
+        if frame.filename.startswith(_APP_ROOT) and not frame.filename.endswith("loop_watchdog.py"):
+            return f"{os.path.relpath(frame.filename, os.path.dirname(_APP_ROOT))}:{frame.lineno}:{frame.name}"
+    if frames:
+        last = frames[-1]
+        return f"{last.filename}:{last.lineno}:{last.name}"
+    return "desconocido"
+
+
+class LoopWatchdog:
+    """Vigila el event loop y acumula los bloqueos por sitio de llamada."""
+
+    def __init__(self, threshold_ms: float, interval_ms: float):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._lock = threading.Lock()
+        self._sites: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_seen": None, "stack": []}
+        )
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Bloqueo en curso (capturado por el hilo vigilante, cerrado por el latido)
+        self._pending_site: Optional[str] = None
+        self._pending_stack: List[str] = []
+        self.max_lag_ms = 0.0
+        self.last_lag_ms = 0.0  # Lag del último latido (señal para load shedding)
+        self.blocks_detected = 0
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = loop.create_task(self._heartbeat())
+        self._monitor_thread = threading.Thread(
+            target=self._monitor, name="loop-watchdog", daemon=True
+        )
+        self._monitor_thread.start()
+        logger.info(
+            "[LOOP_WATCHDOG] Iniciado (umbral=%.0fms, intervalo=%.0fms)",
+            self.threshold * 1000,
+            self.interval * 1000,
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._monitor_thread is not None:
+            self._monitor_thread.join(timeout=1)
+            self._monitor_thread = None
+        logger.info("[LOOP_WATCHDOG] Detenido")
+
+    # ------------------------------------------------------------------
+    # Latido (corre en el loop)
+    # ------------------------------------------------------------------
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self.last_lag_ms = lag * 1000
+            if lag >= self.threshold:
+                self._close_block(lag)
+            elif self._pending_site is not None:
+                with self._lock:
+                    self._pending_site = None
+                    self._pending_stack = []
+
+    def _close_block(self, lag: float) -> None:
+        lag_ms = lag * 1000
+        with self._lock:
+            site = self._pending_site or "desconocido (no capturado)"
+            stack = self._pending_stack
+            self._pending_site = None
+            self._pending_stack = []
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            self.blocks_detected += 1
+            if site not in self._sites and len(self._sites) >= _MAX_SITES_TRACKED:
+                return
+            entry = self._sites[site]
+            entry["count"] += 1
+            entry["total_ms"] += lag_ms
+            entry["max_ms"] = max(entry["max_ms"], lag_ms)
+            entry["last_seen"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            if stack:
+                entry["stack"] = stack
+        logger.warning("[LOOP_WATCHDOG] Event loop bloqueado %.1fms en %s", lag_ms, site)
+
+    # ------------------------------------------------------------------
+    # Hilo vigilante
+    # ------------------------------------------------------------------
+
+    def _monitor(self) -> None:
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            stalled = time.monotonic() - self._last_beat - self.interval
+            if stalled < self.threshold or self._pending_site is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)[-_STACK_DEPTH:]
+            with self._lock:
+                self._pending_site = _call_site(frames)
+                self._pending_stack = [
+                    f"{f.filename}:{f.lineno} in {f.name}" for f in frames
+                ]
+
+    # ------------------------------------------------------------------
+    # Reporte
+    # ------------------------------------------------------------------
+
+    def report(self, limit: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            sites = []
+            for site, data in self._sites.items():
+                item = {"call_site": site, **data}
+                item["total_ms"] = round(data["total_ms"], 2)
+                item["max_ms"] = round(data["max_ms"], 2)
+                sites.append(item)
+        sites.sort(key=lambda s: s["total_ms"], reverse=True)
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "blocks_detected": self.blocks_detected,
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "offenders": sites[:limit],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sites.clear()
+            self.max_lag_ms = 0.0
+            self.blocks_detected = 0
+
+
+_watchdog: Optional[LoopWatchdog] = None
+
+
+def start_loop_watchdog(
+    threshold_ms: Optional[float] = None,
+    interval_ms: Optional[float] = None,
+) -> LoopWatchdog:
+    """Inicia el watchdog global sobre el loop actual (idempotente)."""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = LoopWatchdog(
+            threshold_ms=threshold_ms or settings.LOOP_WATCHDOG_THRESHOLD_MS,
+            interval_ms=interval_ms or settings.LOOP_WATCHDOG_INTERVAL_MS,
+        )
+        _watchdog.start()
+    return _watchdog
+
+
+async def stop_loop_watchdog() -> None:
+    """Detiene el watchdog global si está activo."""
+    global _watchdog
+    if _watchdog is not None:
+        await _watchdog.stop()
+        _watchdog = None
+
+
+def get_current_loop_lag_ms() -> float:
+    """Lag del event loop medido en el último latido (0 si el watchdog no corre)."""
+    return _watchdog.last_lag_ms if _watchdog is not None else 0.0
+
+
+def get_loop_block_report(limit: int = 20) -> Dict[str, Any]:
+    """Reporte de bloqueos agregados por sitio de llamada."""
+    if _watchdog is None:
+        return {"enabled": False, "blocks_detected": 0, "max_lag_ms": 0.0, "offenders": []}
+    return {"enabled": True, **_watchdog.report(limit=limit)}
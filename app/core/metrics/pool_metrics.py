@@ -0,0 +1,282 @@
+# app/core/metrics/pool_metrics.py
+"""
+Telemetría de saturación de pools de conexión (AsyncEngine y pools pyodbc).
+
+Cuando los requests se vuelven lentos hay que distinguir tiempo de SQL de tiempo
+esperando una conexión. Por cada engine registrado se mide:
+
+- Conexiones en uso (checked-out), ociosas (checked-in) y overflow, leídas del
+  pool al momento del reporte.
+- Tiempo de espera del checkout: histograma por buckets + percentiles sobre las
+  últimas POOL_METRICS_SAMPLE_SIZE muestras. Incluye abrir una conexión nueva
+  cuando el pool todavía tiene margen (es tiempo que el request pasa esperando).
+- Timeouts del pool (sqlalchemy.exc.TimeoutError: pool agotado).
+- Fallos de pre-ping (conexión muerta detectada al hacer checkout) e
+  invalidaciones.
+
+Alerta: si el p95 de espera supera POOL_WAIT_P95_ALERT_MS se loggea un warning
+(como máximo una vez cada POOL_ALERT_INTERVAL_SECONDS por engine) y se guarda en
+el reporte.
+
+USO:
+    engine = create_async_engine(...)
+    instrument_engine("async:tenant_x", engine)
+    ...
+    get_pool_metrics_report()
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, exc
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Límites superiores (ms) de los buckets del histograma de espera; el último es +Inf
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+_MAX_ALERTS_KEPT = 20
+# Espera "reciente": media móvil exponencial que además decae con el tiempo sin
+# checkouts (vida media en segundos), para que un pico viejo no cuente como presión.
+_EWMA_ALPHA = 0.2
+_RECENT_HALF_LIFE_SECONDS = 5.0
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class PoolMetrics:
+    """Contadores e histograma de espera de un pool."""
+
+    def __init__(self, name: str, pool: Any):
+        self.name = name
+        self.pool = pool
+        self.checkouts = 0
+        self.timeouts = 0
+        self.pre_ping_failures = 0
+        self.invalidations = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.alerts: deque = deque(maxlen=_MAX_ALERTS_KEPT)
+        self._recent: deque = deque(maxlen=settings.POOL_METRICS_SAMPLE_SIZE)
+        self._last_alert_check = 0.0
+        self._wait_ewma_ms = 0.0
+        self._ewma_updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            if wait_ms > self.wait_max_ms:
+                self.wait_max_ms = wait_ms
+            self._recent.append(wait_ms)
+            self._update_ewma(wait_ms)
+            for i, upper in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= upper:
+                    self.bucket_counts[i] += 1
+                    break
+            else:
+                self.bucket_counts[-1] += 1
+        self._maybe_alert()
+
+    def record_timeout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self._recent.append(wait_ms)
+            self._update_ewma(wait_ms)
+        logger.warning(
+            f"[POOL_METRICS] Timeout esperando conexión en {self.name} "
+            f"tras {wait_ms:.0f}ms ({self._occupancy_text()})"
+        )
+
+    def _update_ewma(self, wait_ms: float) -> None:
+        self._wait_ewma_ms = self.recent_wait_ms() * (1 - _EWMA_ALPHA) + wait_ms * _EWMA_ALPHA
+        self._ewma_updated = time.monotonic()
+
+    def _maybe_alert(self) -> None:
+        now = time.monotonic()
+        if now - self._last_alert_check < settings.POOL_ALERT_INTERVAL_SECONDS:
+            return
+        self._last_alert_check = now
+        p95 = self.wait_percentile(95)
+        if p95 <= settings.POOL_WAIT_P95_ALERT_MS:
+            return
+        alert = {
+            "timestamp": datetime.now().isoformat(),
+            "wait_p95_ms": round(p95, 2),
+            "threshold_ms": settings.POOL_WAIT_P95_ALERT_MS,
+            **self.occupancy(),
+        }
+        self.alerts.append(alert)
+        logger.warning(
+            f"[POOL_METRICS] Pool {self.name} saturado: p95 de espera {p95:.1f}ms "
+            f"> {settings.POOL_WAIT_P95_ALERT_MS}ms ({self._occupancy_text()})"
+        )
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def recent_wait_ms(self) -> float:
+        """Espera de checkout reciente (EWMA con decaimiento temporal); barato de leer."""
+        elapsed = time.monotonic() - self._ewma_updated
+        return self._wait_ewma_ms * 0.5 ** (elapsed / _RECENT_HALF_LIFE_SECONDS)
+
+    def wait_percentile(self, pct: float) -> float:
+        with self._lock:
+            values = sorted(self._recent)
+        return _percentile(values, pct)
+
+    def occupancy(self) -> Dict[str, Any]:
+        """Estado actual del pool (solo QueuePool expone todos los valores)."""
+        data: Dict[str, Any] = {}
+        for key, method in (
+            ("size", "size"),
+            ("checked_out", "checkedout"),
+            ("idle", "checkedin"),
+            ("overflow", "overflow"),
+        ):
+            fn = getattr(self.pool, method, None)
+            try:
+                data[key] = fn() if fn is not None else None
+            except Exception:
+                data[key] = None
+        return data
+
+    def _occupancy_text(self) -> str:
+        o = self.occupancy()
+        return f"en uso={o['checked_out']}, ociosas={o['idle']}, overflow={o['overflow']}, size={o['size']}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = sorted(self._recent)
+            histogram = {
+                **{f"le_{upper}ms": count for upper, count in zip(WAIT_BUCKETS_MS, self.bucket_counts)},
+                "le_inf": self.bucket_counts[-1],
+            }
+            checkouts = self.checkouts
+            data = {
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "pre_ping_failures": self.pre_ping_failures,
+                "invalidations": self.invalidations,
+                "wait_avg_ms": round(self.wait_total_ms / checkouts, 3) if checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "alerts": list(self.alerts),
+            }
+        return {
+            "engine": self.name,
+            **self.occupancy(),
+            **data,
+            "wait_p50_ms": round(_percentile(values, 50), 3),
+            "wait_p95_ms": round(_percentile(values, 95), 3),
+            "wait_p99_ms": round(_percentile(values, 99), 3),
+            "wait_recent_ms": round(self.recent_wait_ms(), 3),
+            "wait_histogram": histogram,
+        }
+
+
+_registry: Dict[str, PoolMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def _wrap_checkout(pool: Any, metrics: PoolMetrics) -> None:
+    """Envuelve Pool._do_get para medir la espera del checkout (no re-envuelve)."""
+    original_do_get = pool._do_get
+    if getattr(original_do_get, "__pool_metrics__", None) is metrics:
+        return
+
+    def _timed_do_get():
+        start = time.perf_counter()
+        try:
+            connection = original_do_get()
+        except exc.TimeoutError:
+            metrics.record_timeout((time.perf_counter() - start) * 1000)
+            raise
+        metrics.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+    _timed_do_get.__pool_metrics__ = metrics
+    pool._do_get = _timed_do_get
+    metrics.pool = pool
+
+
+def instrument_engine(name: str, engine: Any) -> Optional[PoolMetrics]:
+    """
+    Registra un Engine/AsyncEngine para telemetría (idempotente por nombre).
+
+    - Espera del checkout: envuelve Pool._do_get (el punto donde se bloquea hasta
+      obtener una conexión o agotar pool_timeout). engine.dispose() recrea el pool:
+      el evento "engine_disposed" vuelve a envolver el pool nuevo.
+    - Pre-ping e invalidaciones: evento "invalidate" del pool; un pre-ping fallido
+      invalida la conexión con InvalidatePoolError. Pool.recreate() conserva los
+      listeners, no hace falta registrarlo otra vez.
+    """
+    if not settings.POOL_METRICS_ENABLED:
+        return None
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    metrics = PoolMetrics(name, pool)
+    _wrap_checkout(pool, metrics)
+
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        if isinstance(exception, exc.InvalidatePoolError):
+            metrics.pre_ping_failures += 1
+        metrics.invalidations += 1
+
+    def _on_engine_disposed(disposed_engine):
+        _wrap_checkout(disposed_engine.pool, metrics)
+
+    event.listen(pool, "invalidate", _on_invalidate)
+    event.listen(sync_engine, "engine_disposed", _on_engine_disposed)
+
+    with _registry_lock:
+        _registry[name] = metrics
+    return metrics
+
+
+def forget_engine(name: str) -> None:
+    """Quita un engine del registro (al cerrarlo/evictarlo)."""
+    with _registry_lock:
+        _registry.pop(name, None)
+
+
+def get_pool_metrics(name: str) -> Optional[PoolMetrics]:
+    return _registry.get(name)
+
+
+def get_max_recent_pool_wait_ms() -> float:
+    """Mayor espera reciente de checkout entre todos los engines (señal de presión)."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return max((m.recent_wait_ms() for m in metrics), default=0.0)
+
+
+def get_pool_metrics_report() -> Dict[str, Any]:
+    """Snapshot de todos los engines registrados, ordenado por p95 de espera."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    engines = [m.snapshot() for m in metrics]
+    engines.sort(key=lambda e: e["wait_p95_ms"], reverse=True)
+    return {
+        "enabled": settings.POOL_METRICS_ENABLED,
+        "wait_p95_alert_ms": settings.POOL_WAIT_P95_ALERT_MS,
+        "engines": engines,
+    }
@@ -0,0 +1,296 @@
+# app/core/metrics/query_budget.py
+"""
+Detector de N+1 y presupuesto de queries por request.
+
+Cuenta cada sentencia que llega al driver (eventos de Engine de SQLAlchemy,
+incluye AsyncEngine vía su sync_engine) dentro de un contexto por request
+(ContextVar) y registra:
+- Número de sentencias ejecutadas
+- Huellas (fingerprints) duplicadas: misma forma de SQL repetida → señal de N+1
+- Tiempo total en BD
+
+Salidas:
+- Header Server-Timing (solo fuera de producción)
+- Log de endpoints que exceden QUERY_BUDGET_MAX_STATEMENTS o repiten una misma
+  huella QUERY_BUDGET_DUPLICATE_THRESHOLD veces o más
+- Fixture pytest `query_budget` (tests/conftest.py) que falla el test si se
+  excede el presupuesto declarado
+
+USO:
+    with track_queries() as stats:
+        await servicio()
+    assert_query_budget(stats, max_statements=3)
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_FINGERPRINT_MAX_LENGTH = 300
+_MAX_VIOLATIONS_TRACKED = 200
+
+_STRING_LITERAL_RE = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_NAMED_PARAM_RE = re.compile(r"[:@]\w+")
+_IN_LIST_RE = re.compile(r"\bin\s*\((?:\s*\?\s*,?)+\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """Estadísticas de queries acumuladas en un contexto (request o test)."""
+
+    statement_count: int = 0
+    total_db_time: float = 0.0  # segundos
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statement_count += 1
+        self.total_db_time += duration
+        self.fingerprints[fingerprint_sql(statement)] += 1
+
+    def duplicates(self) -> Dict[str, int]:
+        """Huellas ejecutadas más de una vez (fingerprint → veces)."""
+        return {fp: n for fp, n in self.fingerprints.items() if n > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        """Sentencias redundantes (ejecuciones extra de una misma huella)."""
+        return sum(n - 1 for n in self.fingerprints.values() if n > 1)
+
+    @property
+    def max_repetitions(self) -> int:
+        return max(self.fingerprints.values(), default=0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "statement_count": self.statement_count,
+            "total_db_time_ms": round(self.total_db_time * 1000, 2),
+            "duplicate_count": self.duplicate_count,
+            "duplicates": self.duplicates(),
+        }
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Se excedió el presupuesto de queries declarado (usado por tests)."""
+
+
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+_listeners_installed = False
+_install_lock = threading.Lock()
+
+# Endpoints que excedieron el presupuesto: "METHOD path" → contadores
+_violations: Dict[str, Dict[str, Any]] = defaultdict(
+    lambda: {"count": 0, "max_statements": 0, "max_repetitions": 0, "last_seen": None}
+)
+
+
+def fingerprint_sql(statement: str) -> str:
+    """
+    Normaliza una sentencia SQL a su "forma" (sin literales ni parámetros).
+
+    Dos ejecuciones con distintos valores producen la misma huella, lo que
+    permite detectar el patrón N+1 (misma query repetida por cada fila).
+    """
+    sql = statement.lower()
+    sql = _STRING_LITERAL_RE.sub("?", sql)
+    sql = _NAMED_PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _WHITESPACE_RE.sub(" ", sql).strip()
+    sql = _IN_LIST_RE.sub("in (?)", sql)
+    return sql[:_FINGERPRINT_MAX_LENGTH]
+
+
+def get_current_query_stats() -> Optional[QueryStats]:
+    """Retorna las estadísticas del contexto actual (None si no se está midiendo)."""
+    return _current_query_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Abre un contexto de medición. Las sentencias ejecutadas dentro (incluidas
+    tareas hijas que copien el contexto) se acumulan en el QueryStats devuelto.
+    """
+    install_query_counter()
+    stats = QueryStats()
+    token = _current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+def assert_query_budget(
+    stats: QueryStats,
+    max_statements: int,
+    max_duplicates: Optional[int] = None,
+) -> None:
+    """
+    Verifica que `stats` respete el presupuesto.
+
+    Raises:
+        QueryBudgetExceeded: Si se excede max_statements o max_duplicates.
+    """
+    problems: List[str] = []
+    if stats.statement_count > max_statements:
+        problems.append(
+            f"{stats.statement_count} queries ejecutadas (presupuesto: {max_statements})"
+        )
+    if max_duplicates is not None and stats.duplicate_count > max_duplicates:
+        problems.append(
+            f"{stats.duplicate_count} queries duplicadas (máximo: {max_duplicates})"
+        )
+    if problems:
+        detail = "; ".join(problems)
+        repeated = sorted(stats.duplicates().items(), key=lambda kv: kv[1], reverse=True)[:5]
+        if repeated:
+            detail += "\nHuellas repetidas:\n" + "\n".join(
+                f"  {n}x {fp}" for fp, n in repeated
+            )
+        raise QueryBudgetExceeded(detail)
+
+
+# ============================================================================
+# EVENTOS DE SQLALCHEMY
+# ============================================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_query_stats.get() is None or context is None:
+        return
+    # El inicio se guarda en el ExecutionContext (uno por sentencia): conn.info
+    # lanza ResourceClosedError si la conexión se invalida durante la ejecución
+    context._query_budget_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_query_stats.get()
+    if stats is None:
+        return
+    start = getattr(context, "_query_budget_start", None)
+    duration = time.perf_counter() - start if start is not None else 0.0
+    stats.record(statement, duration)
+
+
+def _handle_error(exception_context):
+    # La sentencia falló: descartar el inicio pendiente pero contarla igual
+    stats = _current_query_stats.get()
+    if stats is None:
+        return
+    start = getattr(exception_context.execution_context, "_query_budget_start", None)
+    duration = time.perf_counter() - start if start is not None else 0.0
+    if exception_context.statement:
+        stats.record(exception_context.statement, duration)
+
+
+def install_query_counter() -> None:
+    """
+    Registra los listeners a nivel de clase Engine (aplica a todos los engines,
+    incluidos los creados después). Idempotente.
+    """
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    with _install_lock:
+        if _listeners_installed:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _listeners_installed = True
+        logger.info("[QUERY_BUDGET] Contador de queries por request instalado")
+
+
+# ============================================================================
+# REPORTE POR ENDPOINT
+# ============================================================================
+
+def _record_violation(endpoint: str, stats: QueryStats) -> None:
+    if endpoint not in _violations and len(_violations) >= _MAX_VIOLATIONS_TRACKED:
+        return
+    entry = _violations[endpoint]
+    entry["count"] += 1
+    entry["max_statements"] = max(entry["max_statements"], stats.statement_count)
+    entry["max_repetitions"] = max(entry["max_repetitions"], stats.max_repetitions)
+    entry["last_seen"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def get_query_budget_violations(limit: int = 20) -> List[Dict[str, Any]]:
+    """Endpoints que excedieron el presupuesto, ordenados por peor caso."""
+    items = [{"endpoint": k, **v} for k, v in _violations.items()]
+    items.sort(key=lambda v: (v["max_statements"], v["count"]), reverse=True)
+    return items[:limit]
+
+
+def reset_query_budget_violations() -> None:
+    """Limpia el reporte de violaciones (útil para tests)."""
+    _violations.clear()
+
+
+def build_server_timing(stats: QueryStats) -> str:
+    """Valor del header Server-Timing para las estadísticas dadas."""
+    return (
+        f'db;dur={stats.total_db_time * 1000:.2f};'
+        f'desc="queries={stats.statement_count} duplicadas={stats.duplicate_count}"'
+    )
+
+
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    """
+    Mide las queries de cada request.
+
+    - Fuera de producción agrega Server-Timing con tiempo de BD y conteos.
+    - Loggea (y acumula en el reporte) los endpoints que exceden el presupuesto
+      o repiten una misma huella (probable N+1).
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        if settings.ENVIRONMENT != "production":
+            existing = response.headers.get("Server-Timing")
+            timing = build_server_timing(stats)
+            response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        over_budget = stats.statement_count > settings.QUERY_BUDGET_MAX_STATEMENTS
+        n_plus_one = stats.max_repetitions >= settings.QUERY_BUDGET_DUPLICATE_THRESHOLD
+        if over_budget or n_plus_one:
+            route = request.scope.get("route")
+            path = getattr(route, "path", None) or request.url.path
+            endpoint = f"{request.method} {path}"
+            _record_violation(endpoint, stats)
+            worst = max(stats.fingerprints.items(), key=lambda kv: kv[1], default=(None, 0))
+            logger.warning(
+                "[QUERY_BUDGET] %s ejecutó %d queries en %.1fms (presupuesto=%d, duplicadas=%d). "
+                "Huella más repetida (%dx): %s",
+                endpoint,
+                stats.statement_count,
+                stats.total_db_time * 1000,
+                settings.QUERY_BUDGET_MAX_STATEMENTS,
+                stats.duplicate_count,
+                worst[1],
+                worst[0],
+            )
+
+        return response
@@ -0,0 +1,194 @@
+# app/core/metrics/request_deadline.py
+"""
+Deadline por request propagado a la capa de BD.
+
+Sin deadline, un request que el cliente ya abandonó (o que excede lo razonable)
+sigue ocupando conexión y CPU de SQL Server hasta que la sentencia termina. El
+middleware fija al inicio del request un instante límite (ContextVar):
+
+- Header REQUEST_TIMEOUT_HEADER (segundos, ej. "X-Request-Timeout: 8"), acotado
+  a REQUEST_MAX_TIMEOUT_SECONDS.
+- Si no viene, default por prioridad de ruta (route_priority.py) según
+  REQUEST_TIMEOUT_BY_PRIORITY ("critica:10,alta:30,normal:20,baja:60").
+
+execute_query/UnitOfWork consultan el tiempo restante y lo aplican como timeout
+de la sentencia (statement_timeout.py). Un corte por deadline → 504
+(RequestTimeoutError, REQUEST_DEADLINE_EXCEEDED) y queda contado aquí por ruta.
+
+USO:
+    with request_deadline(5.0, label="job nocturno"):
+        await execute_query(query)
+"""
+
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_ROUTES_TRACKED = 200
+
+
+@dataclass(frozen=True)
+class RequestDeadline:
+    """Instante límite (reloj monotónico) y presupuesto original del request."""
+
+    expires_at: float
+    budget_seconds: float
+    label: str = ""
+    # Scope ASGI del request: el router deja ahí la ruta resuelta después de abrir el deadline
+    scope: Optional[Dict[str, Any]] = field(default=None, compare=False, repr=False)
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def route_label(self) -> str:
+        """"METHOD /plantilla/{id}" si la ruta ya se resolvió; si no, la etiqueta fija."""
+        route = self.scope.get("route") if self.scope is not None else None
+        path = getattr(route, "path", None)
+        if path:
+            return f"{self.scope.get('method', '')} {path}"
+        return self.label
+
+
+_current_deadline: ContextVar[Optional[RequestDeadline]] = ContextVar(
+    "current_request_deadline", default=None
+)
+
+# "METHOD /plantilla/{id}" → contadores de cortes por deadline
+_timeouts: Dict[str, Dict[str, Any]] = defaultdict(
+    lambda: {"count": 0, "driver": 0, "cancelled": 0, "expired_before": 0, "last_seen": None}
+)
+
+
+@lru_cache(maxsize=8)
+def parse_priority_timeouts(raw: str) -> Dict[str, float]:
+    """'critica:10,baja:60' → {'critica': 10.0, 'baja': 60.0}; entradas inválidas se ignoran."""
+    timeouts: Dict[str, float] = {}
+    for item in raw.split(","):
+        priority, _, seconds = item.partition(":")
+        try:
+            timeouts[priority.strip().lower()] = float(seconds)
+        except ValueError:
+            if item.strip():
+                logger.warning(f"[DEADLINE] Timeout por prioridad inválido ignorado: '{item}'")
+    return timeouts
+
+
+def parse_timeout_header(value: Optional[str]) -> Optional[float]:
+    """Segundos pedidos por el cliente, acotados a REQUEST_MAX_TIMEOUT_SECONDS (None si inválido)."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if seconds <= 0 or seconds != seconds:  # NaN
+        return None
+    return min(seconds, settings.REQUEST_MAX_TIMEOUT_SECONDS)
+
+
+def get_current_deadline() -> Optional[RequestDeadline]:
+    """Deadline del request actual (None fuera de un request o si está desactivado)."""
+    return _current_deadline.get()
+
+
+def remaining_seconds() -> Optional[float]:
+    """Segundos que le quedan al request actual (None si no hay deadline; puede ser ≤ 0)."""
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+@contextmanager
+def request_deadline(
+    seconds: float, label: str = "", scope: Optional[Dict[str, Any]] = None
+) -> Iterator[RequestDeadline]:
+    """
+    Abre un deadline de `seconds` segundos. Si ya hay uno más cercano en el
+    contexto, se conserva el más cercano (un bloque anidado no lo alarga).
+
+    Con `scope` (middleware), los cortes se etiquetan con la plantilla de la ruta
+    resuelta en lugar del path crudo: un path con IDs no abre una etiqueta por ID.
+    """
+    outer = _current_deadline.get()
+    deadline = RequestDeadline(time.monotonic() + seconds, seconds, label, scope)
+    if outer is not None and outer.expires_at <= deadline.expires_at:
+        deadline = outer
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def record_deadline_timeout(kind: str) -> None:
+    """
+    Cuenta un corte por deadline para la ruta actual.
+
+    kind: "driver" (timeout del driver), "cancelled" (cancelación asyncio) o
+    "expired_before" (el deadline ya había vencido antes de ejecutar).
+    """
+    deadline = _current_deadline.get()
+    label = (deadline.route_label() if deadline is not None else "") or "sin_request"
+    if label not in _timeouts and len(_timeouts) >= _MAX_ROUTES_TRACKED:
+        label = "otros"
+    entry = _timeouts[label]
+    entry["count"] += 1
+    entry[kind] = entry.get(kind, 0) + 1
+    entry["last_seen"] = time.time()
+    logger.warning(
+        f"[DEADLINE] Sentencia cortada por deadline ({kind}) en {label}"
+        + (f" (presupuesto {deadline.budget_seconds:g}s)" if deadline is not None else "")
+    )
+
+
+class RequestDeadlineMiddleware(BaseHTTPMiddleware):
+    """
+    Fija el deadline del request (header o default por prioridad de ruta).
+
+    Va por dentro del LoadSheddingMiddleware y por fuera de TenantMiddleware:
+    la resolución de tenant también consume del presupuesto.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        seconds = parse_timeout_header(request.headers.get(settings.REQUEST_TIMEOUT_HEADER))
+        if seconds is None:
+            # Import diferido: app.core.authorization importa la capa de queries (ciclo)
+            from app.core.authorization.route_priority import get_route_priority_index
+
+            priority = get_route_priority_index(request.app).priority(request.method, request.url.path)
+            seconds = parse_priority_timeouts(settings.REQUEST_TIMEOUT_BY_PRIORITY).get(priority)
+
+        if not seconds or seconds <= 0:
+            return await call_next(request)
+
+        with request_deadline(seconds, label=f"{request.method} {request.url.path}", scope=request.scope):
+            return await call_next(request)
+
+
+def get_deadline_report() -> Dict[str, Any]:
+    """Cortes por deadline por ruta (los más frecuentes primero)."""
+    routes = sorted(_timeouts.items(), key=lambda kv: kv[1]["count"], reverse=True)
+    return {
+        "enabled": settings.REQUEST_DEADLINE_ENABLED,
+        "header": settings.REQUEST_TIMEOUT_HEADER,
+        "timeouts_by_priority": parse_priority_timeouts(settings.REQUEST_TIMEOUT_BY_PRIORITY),
+        "total_timeouts": sum(entry["count"] for _, entry in routes),
+        "routes": [{"route": label, **entry} for label, entry in routes],
+    }
+
+
+def reset_deadline_metrics() -> None:
+    """Limpia los contadores (tests)."""
+    _timeouts.clear()
@@ -0,0 +1,376 @@
+# app/core/openapi_static.py
+"""
+Documento OpenAPI precalculado y servido estático.
+
+Generar /openapi.json con cientos de endpoints y schemas grandes cuesta segundos
+de CPU y bastante memoria en el primer hit de cada worker. El documento se
+genera en el build (scripts/build_openapi.py) y se guarda en OPENAPI_STATIC_DIR:
+
+- openapi.json (+ .gz y .br si brotli está instalado)
+- openapi.<modulo>.json(.gz/.br): documento parcial por prefijo de ruta
+  (/api/v1/inv → "inv") con solo los schemas que referencia
+- manifest.json: ETag de cada documento y huella de rutas y schemas del build
+
+En runtime install_static_openapi(app) reemplaza la ruta /openapi.json por una
+que sirve los bytes ya comprimidos según Accept-Encoding, con ETag y 304 en
+If-None-Match, y agrega /openapi/{modulo}.json. Si no hay build o la huella no
+coincide (build desactualizado), se mantiene la generación dinámica. La huella
+cubre rutas, textos de cada operación y los campos de los modelos Pydantic que
+usan (recorridos sin generar el schema), así un cambio de schema o descripción
+invalida el build.
+"""
+
+import enum
+import gzip
+import hashlib
+import json
+import logging
+import typing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from fastapi import FastAPI
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from app.core.compression import negotiate_encoding
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # Opcional: sin brotli se sirve gzip/identidad
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+_FULL_DOCUMENT = ""
+_ENCODINGS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def _stable(value: Any) -> Any:
+    """Representación serializable y estable entre procesos (sin direcciones de memoria)."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, enum.Enum):
+        return _stable(value.value)
+    if isinstance(value, dict):
+        return {str(k): _stable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_stable(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    text = repr(value)
+    return type(value).__qualname__ if " at 0x" in text else text
+
+
+def _iter_types(annotation: Any) -> Iterator[type]:
+    """Clases dentro de una anotación (List[Item], Optional[Enum], Annotated[...])."""
+    if isinstance(annotation, type):
+        yield annotation
+    for arg in typing.get_args(annotation):
+        yield from _iter_types(arg)
+
+
+def _field_signature(name: str, field: Any, models: Dict[str, Any]) -> List[Any]:
+    """Nombre, tipo, alias, descripción, default y restricciones de un campo/parámetro."""
+    for cls in _iter_types(field.annotation):
+        _collect_model(cls, models)
+    return [
+        name,
+        _stable(field.annotation),
+        field.alias,
+        field.title,
+        field.description,
+        field.is_required(),
+        _stable(field.default),
+        _stable(field.examples),
+        _stable(field.json_schema_extra),
+        _stable(field.metadata),
+        field.deprecated,
+    ]
+
+
+def _collect_model(cls: type, models: Dict[str, Any]) -> None:
+    """Firma de un modelo Pydantic (y sus modelos/enums anidados) o de un Enum."""
+    key = f"{cls.__module__}.{cls.__qualname__}"
+    if key in models:
+        return
+    if isinstance(cls, type) and issubclass(cls, enum.Enum):
+        models[key] = [_stable(member.value) for member in cls]
+    elif isinstance(cls, type) and issubclass(cls, BaseModel):
+        models[key] = None  # marca antes de recorrer (modelos recursivos)
+        models[key] = {
+            "doc": cls.__doc__,
+            "config": _stable({k: v for k, v in cls.model_config.items() if k in ("title", "json_schema_extra")}),
+            "fields": [_field_signature(name, field, models) for name, field in cls.model_fields.items()],
+        }
+
+
+def _route_signature(route: APIRoute, models: Dict[str, Any]) -> List[Any]:
+    params = []
+    flat = get_flat_dependant(route.dependant, skip_repeats=True)
+    for kind in ("path_params", "query_params", "header_params", "cookie_params", "body_params"):
+        for param in getattr(flat, kind):
+            params.append([kind, *_field_signature(param.name, param.field_info, models)])
+    for cls in _iter_types(route.response_model):
+        _collect_model(cls, models)
+    for response in (route.responses or {}).values():
+        for cls in _iter_types(response.get("model") if isinstance(response, dict) else None):
+            _collect_model(cls, models)
+    return [
+        route.path,
+        ",".join(sorted(route.methods or ())),
+        route.summary,
+        route.description,
+        route.response_description,
+        route.operation_id,
+        route.deprecated,
+        route.status_code,
+        _stable(route.tags),
+        _stable(route.response_model),
+        _stable(route.responses),
+        params,
+    ]
+
+
+def compute_openapi_fingerprint(app: FastAPI) -> str:
+    """
+    Huella de la versión de la app, las rutas (path, métodos, textos, parámetros)
+    y los campos de los modelos Pydantic que referencian.
+    """
+    models: Dict[str, Any] = {}
+    routes = sorted(
+        (
+            _route_signature(route, models)
+            for route in app.routes
+            if isinstance(route, APIRoute) and route.include_in_schema
+        ),
+        key=lambda r: (r[0], r[1]),
+    )
+    payload = json.dumps(
+        {"version": app.version, "routes": routes, "models": models},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _iter_refs(node: Any) -> Iterator[str]:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            yield ref
+        for value in node.values():
+            yield from _iter_refs(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_refs(value)
+
+
+def _module_of(path: str) -> Optional[str]:
+    prefix = settings.API_V1_STR.rstrip("/") + "/"
+    if not path.startswith(prefix):
+        return None
+    return path[len(prefix):].split("/", 1)[0] or None
+
+
+def split_openapi_by_module(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Documentos parciales por primer segmento bajo API_V1_STR, con el cierre de $ref de sus schemas."""
+    schemas = (document.get("components") or {}).get("schemas") or {}
+    paths_by_module: Dict[str, Dict[str, Any]] = {}
+    for path, item in (document.get("paths") or {}).items():
+        module = _module_of(path)
+        if module:
+            paths_by_module.setdefault(module, {})[path] = item
+
+    documents = {}
+    for module, paths in paths_by_module.items():
+        needed: Set[str] = set()
+        pending = list(_iter_refs(paths))
+        while pending:
+            name = pending.pop().rsplit("/", 1)[-1]
+            if name in needed or name not in schemas:
+                continue
+            needed.add(name)
+            pending.extend(_iter_refs(schemas[name]))
+        components = {k: v for k, v in (document.get("components") or {}).items() if k != "schemas"}
+        components["schemas"] = {name: schemas[name] for name in sorted(needed)}
+        documents[module] = {**document, "paths": paths, "components": components}
+    return documents
+
+
+def _write_variants(out_dir: Path, name: str, body: bytes) -> Dict[str, Any]:
+    (out_dir / name).write_bytes(body)
+    (out_dir / f"{name}.gz").write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+    encodings = ["gzip"]
+    if brotli is not None:
+        (out_dir / f"{name}.br").write_bytes(brotli.compress(body, quality=11))
+        encodings.insert(0, "br")
+    return {
+        "file": name,
+        "etag": hashlib.sha256(body).hexdigest()[:32],
+        "size": len(body),
+        "encodings": encodings,
+    }
+
+
+def build_openapi_documents(app: FastAPI, out_dir: Path, split_modules: bool = True) -> Dict[str, Any]:
+    """
+    Genera el documento completo (y parciales por módulo) con sus variantes
+    comprimidas y el manifest.
+
+    Returns:
+        Manifest escrito.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    document = app.openapi()
+    documents = {_FULL_DOCUMENT: document}
+    if split_modules:
+        documents.update(split_openapi_by_module(document))
+
+    manifest: Dict[str, Any] = {
+        "fingerprint": compute_openapi_fingerprint(app),
+        "version": app.version,
+        "documents": {},
+    }
+    for module, doc in documents.items():
+        name = f"openapi.{module}.json" if module else "openapi.json"
+        body = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        manifest["documents"][module] = _write_variants(out_dir, name, body)
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+# ============================================================================
+# RUNTIME
+# ============================================================================
+
+class StaticOpenAPI:
+    """Documentos precalculados en memoria (bytes por codificación) y su ETag."""
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]):
+        self.directory = directory
+        self.manifest = manifest
+        self._bodies: Dict[Tuple[str, str], bytes] = {}
+
+    def has(self, module: str) -> bool:
+        return module in self.manifest["documents"]
+
+    def modules(self) -> List[str]:
+        return sorted(m for m in self.manifest["documents"] if m)
+
+    def _body(self, module: str, encoding: str) -> bytes:
+        key = (module, encoding)
+        body = self._bodies.get(key)
+        if body is None:
+            name = self.manifest["documents"][module]["file"]
+            suffix = dict(_ENCODINGS).get(encoding, "")
+            body = self._bodies[key] = (self.directory / f"{name}{suffix}").read_bytes()
+        return body
+
+    def response(self, request: Request, module: str = _FULL_DOCUMENT) -> Response:
+        entry = self.manifest["documents"][module]
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), tuple(entry["encodings"])) or "identity"
+        etag = f'"{entry["etag"]}"' if encoding == "identity" else f'"{entry["etag"]}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(self._body(module, encoding), media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match coincide con cualquier variante (identidad/br/gzip) del documento."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        value = candidate.strip().removeprefix("W/").strip('"')
+        if value.split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def load_static_openapi(directory: Path) -> Optional[StaticOpenAPI]:
+    """Manifest del build (None si no existe o es ilegible)."""
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"[OPENAPI] Manifest ilegible en {directory}: {e}")
+        return None
+    if _FULL_DOCUMENT not in manifest.get("documents", {}):
+        return None
+    return StaticOpenAPI(directory, manifest)
+
+
+def install_static_openapi(app: FastAPI, directory: Optional[Path] = None) -> bool:
+    """
+    Sirve /openapi.json desde el build si existe (y agrega /openapi/{modulo}.json).
+
+    La huella de rutas se valida en el primer request (en modo ENABLED_MODULES=catalog
+    las rutas se registran en el lifespan): si no coincide se usa la generación dinámica.
+
+    Returns:
+        True si había un build para instalar.
+    """
+    if not app.openapi_url:
+        return False
+    static = load_static_openapi(Path(directory or settings.OPENAPI_STATIC_DIR))
+    if static is None:
+        logger.info("[OPENAPI] Sin documento precalculado; /openapi.json se genera en runtime")
+        return False
+
+    openapi_url = app.openapi_url
+    dynamic_routes = [r for r in app.router.routes if getattr(r, "path", None) == openapi_url]
+    dynamic_endpoint = dynamic_routes[0].endpoint if dynamic_routes else None
+    for route in dynamic_routes:
+        app.router.routes.remove(route)
+
+    state: Dict[str, Optional[bool]] = {"fresh": None}
+
+    def _is_fresh() -> bool:
+        if state["fresh"] is None:
+            state["fresh"] = static.manifest.get("fingerprint") == compute_openapi_fingerprint(app)
+            if not state["fresh"]:
+                logger.warning(
+                    "[OPENAPI] Documento precalculado desactualizado (rutas o schemas distintos al build); "
+                    "se genera en runtime. Ejecutar scripts/build_openapi.py en el build."
+                )
+        return state["fresh"]
+
+    async def openapi_static(request: Request) -> Response:
+        if not _is_fresh() and dynamic_endpoint is not None:
+            return await dynamic_endpoint(request)
+        return static.response(request)
+
+    async def openapi_module(request: Request, modulo: str) -> Response:
+        if not _is_fresh() or not static.has(modulo):
+            return JSONResponse(
+                status_code=404,
+                content={"detail": f"Documento OpenAPI no disponible para '{modulo}'", "error_code": "OPENAPI_NOT_FOUND"},
+            )
+        return static.response(request, modulo)
+
+    app.add_route(openapi_url, openapi_static, include_in_schema=False)
+    app.add_api_route("/openapi/{modulo}.json", openapi_module, methods=["GET"], include_in_schema=False)
+    app.state.static_openapi = static
+    logger.info(
+        f"[OPENAPI] Documento precalculado instalado ({len(static.modules())} módulos, "
+        f"codificaciones: {static.manifest['documents'][_FULL_DOCUMENT]['encodings']})"
+    )
+    return True
@@ -0,0 +1,129 @@
+# app/core/security/jwt_cache.py
+"""
+Cache de access tokens ya verificados (digest del token → payload).
+
+Una SPA envía el mismo access token decenas de veces por minuto y cada request
+repetía jwt.decode (base64 + JSON + HMAC + validación de claims). El cache guarda
+el payload verificado bajo el SHA-256 del token completo (firma incluida):
+
+- Un token alterado tiene otro digest → miss → jwt.decode lo rechaza como antes.
+- La entrada vence en el `exp` del token; un token sin `exp` no se cachea.
+- LRU acotado a JWT_DECODE_CACHE_SIZE entradas por worker.
+- Revocación: RevocationFilter.add purga el jti (revocación local o recibida por
+  el canal pub/sub). get_current_user_data igual verifica la blacklist en cada
+  request, también con el payload cacheado.
+
+Se devuelve una copia superficial del payload: el llamador puede modificarla.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from jose import jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class VerifiedTokenCache:
+    """LRU digest → (payload, exp) con índice por jti para purgar revocaciones."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._by_jti: Dict[str, bytes] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "purged": 0}
+
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        payload, exp = entry
+        if exp <= time.time():
+            self._remove(digest)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.stats["hits"] += 1
+        return payload
+
+    def put(self, digest: bytes, payload: Dict[str, Any]) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_size <= 0:
+            return
+        self._entries[digest] = (payload, float(exp))
+        self._entries.move_to_end(digest)
+        jti = payload.get("jti")
+        if jti:
+            self._by_jti[str(jti)] = digest
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def purge_jti(self, jti: str) -> bool:
+        digest = self._by_jti.get(jti)
+        if digest is None:
+            return False
+        self._remove(digest)
+        self.stats["purged"] += 1
+        return True
+
+    def _remove(self, digest: bytes) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            jti = entry[0].get("jti")
+            if jti and self._by_jti.get(str(jti)) == digest:
+                del self._by_jti[str(jti)]
+
+    def report(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": settings.JWT_DECODE_CACHE_ENABLED,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+        }
+
+
+_cache = VerifiedTokenCache(settings.JWT_DECODE_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    jwt.decode del access token (SECRET_KEY) con cache del payload verificado.
+
+    Raises:
+        JWTError: Token inválido, alterado o expirado (igual que jwt.decode).
+    """
+    if not settings.JWT_DECODE_CACHE_ENABLED:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _cache.get(digest)
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        _cache.put(digest, payload)
+    return dict(payload)
+
+
+def purge_revoked_jti(jti: str) -> None:
+    """Descarta del cache el token con ese jti (llamado al registrar una revocación)."""
+    _cache.purge_jti(jti)
+
+
+def get_jwt_cache_report() -> Dict[str, Any]:
+    """Aciertos, expirados, purgados por revocación y tamaño del cache."""
+    return _cache.report()
+
+
+def reset_jwt_cache() -> None:
+    """Vacía el cache y las métricas (tests)."""
+    global _cache
+    _cache = VerifiedTokenCache(settings.JWT_DECODE_CACHE_SIZE)
@@ -16,6 +16,7 @@ from sqlalchemy.sql import ClauseElement
 from app.core.config import settings
 from app.core.tenant.context import try_get_current_client_id
 from app.core.exceptions import SecurityError
+from app.core.security.statement_shape import get_statement_shape, statement_preview
 
 logger = logging.getLogger(__name__)
 
@@ -155,16 +156,20 @@ class QueryAuditor:
         Verifica que el WHERE clause incluya filtro de cliente_id.
         """
         try:
+            # Análisis estructural cacheado por forma de sentencia (tabla y WHERE
+            # renderizado); las comprobaciones de abajo se evalúan en cada llamada
+            shape = get_statement_shape(query)
+
             # Obtener tabla principal
             if table_name is None:
-                table_name = QueryAuditor._extract_table_name_from_query(query)
+                table_name = shape.from_name
             
             if table_name and table_name.lower() in QueryAuditor.GLOBAL_TABLES:
                 return True
 
             # Verificar WHERE clause
-            if hasattr(query, 'whereclause') and query.whereclause is not None:
-                where_str = str(query.whereclause)
+            if shape.where_sql is not None:
+                where_str = shape.where_sql
                 table_lower = (table_name or "").lower()
                 # Consulta por PK permitida (ej. rol por rol_id); autorización en capa de aplicación
                 if table_lower in QueryAuditor.PK_LOOKUP_TABLES:
@@ -193,7 +198,7 @@ class QueryAuditor:
                     # ⚠️ ADVERTENCIA: Query sin filtro de tenant
                     logger.warning(
                         f"[QUERY_AUDITOR] Query SQLAlchemy Core sin filtro explícito de cliente_id. "
-                        f"Tabla: {table_name}, Query: {str(query)[:200]}..."
+                        f"Tabla: {table_name}, Query: {statement_preview(query, shape)}..."
                     )
                     
                     # En producción, bloquear si está habilitado
@@ -345,26 +350,9 @@ class QueryAuditor:
         Extrae el nombre de la tabla principal de una query SQLAlchemy Core.
         """
         try:
-            if isinstance(query, Select):
-                # SELECT: obtener de FROM clause
-                if query.froms:
-                    from_clause = query.froms[0]
-                    if hasattr(from_clause, 'name'):
-                        return from_clause.name
-                    elif hasattr(from_clause, '__table__'):
-                        return from_clause.__table__.name
-            elif isinstance(query, (Update, Delete)):
-                # UPDATE/DELETE: obtener de table
-                if hasattr(query, 'table'):
-                    table = query.table
-                    if hasattr(table, 'name'):
-                        return table.name
-            elif isinstance(query, Insert):
-                # INSERT: obtener de table
-                if hasattr(query, 'table'):
-                    table = query.table
-                    if hasattr(table, 'name'):
-                        return table.name
+            if isinstance(query, (Select, Update, Delete, Insert)):
+                # SELECT: FROM principal; UPDATE/DELETE/INSERT: tabla destino
+                return get_statement_shape(query).from_name
         except Exception as e:
             logger.debug(f"[QUERY_AUDITOR] Error extrayendo nombre de tabla: {e}")
         
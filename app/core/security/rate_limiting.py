@@ -32,6 +32,11 @@ logger = logging.getLogger(__name__)
 _limiter = None
 _limiter_enabled = False
 
+def _storage_uri() -> str:
+    """Storage de slowapi: RATE_LIMIT_STORAGE_URI explícito o memoria del worker."""
+    return settings.RATE_LIMIT_STORAGE_URI or "memory://"
+
+
 def _initialize_limiter():
     """Inicializa slowapi solo si el rate limiting está habilitado."""
     global _limiter, _limiter_enabled
@@ -46,17 +51,24 @@ def _initialize_limiter():
         from slowapi.util import get_remote_address
         from slowapi.errors import RateLimitExceeded
         
+        storage_uri = _storage_uri()
+        shared_storage = storage_uri != "memory://"
+        # El storage remoto (p.ej. Redis) conecta en el primer hit: si cae, se sigue
+        # contando en memoria del worker en vez de responder 500
         _limiter = Limiter(
             key_func=get_remote_address,
             default_limits=[],  # Sin límites por defecto (se definen por endpoint)
-            storage_uri="memory://",  # Almacenamiento en memoria (simple)
-            headers_enabled=True  # Incluir headers de rate limit en respuesta
+            storage_uri=storage_uri,
+            headers_enabled=True,  # Incluir headers de rate limit en respuesta
+            in_memory_fallback_enabled=shared_storage,
+            swallow_errors=shared_storage,
         )
         
         _limiter_enabled = True
         logger.info(
             f"[RATE_LIMITING] Activado. "
-            f"Límites: Login={settings.RATE_LIMIT_LOGIN}, API={settings.RATE_LIMIT_API}"
+            f"Límites: Login={settings.RATE_LIMIT_LOGIN}, API={settings.RATE_LIMIT_API}, "
+            f"storage={storage_uri.split('@')[-1]}"
         )
         
         return _limiter
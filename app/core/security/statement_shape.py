@@ -0,0 +1,138 @@
+# app/core/security/statement_shape.py
+"""
+Cache de la "forma" de sentencias SQLAlchemy Core para filtro y auditoría de tenant.
+
+execute_query analiza cada sentencia Core tres veces (get_table_name_from_query,
+QueryAuditor.validate_tenant_filter y apply_tenant_filter): Select.froms compila la
+sentencia completa en cada acceso y la auditoría renderiza el WHERE. Las mismas
+formas (select(InvStockTable).where(...)) se ejecutan miles de veces con distintos
+valores, así que el análisis se guarda por cache key de SQLAlchemy, que identifica
+la estructura (tablas, columnas, operadores) sin los valores de los parámetros.
+
+Solo se cachean datos estructurales (tabla principal y WHERE renderizado, con los
+parámetros como :nombre). Las decisiones que dependen de client_id, tablas globales
+o settings se siguen evaluando en cada llamada: las garantías de seguridad no cambian.
+
+Sentencias sin cache key (construcciones no cacheables) se analizan siempre.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Delete, Insert, Select, Table, Update
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StatementShape:
+    """Datos estructurales de una sentencia Core (independientes de los valores)."""
+
+    # Nombre de la tabla principal (o str() del FROM si no tiene nombre, p.ej. JOIN)
+    table_name: Optional[str]
+    # Atributo .name del FROM principal (None para JOIN u otros FROM sin nombre)
+    from_name: Optional[str]
+    # FROM principal cuando es una Table: misma cache key ⇒ mismo objeto Table
+    table: Optional[Table]
+    # str(whereclause) o None si la sentencia no tiene WHERE
+    where_sql: Optional[str]
+    # Primeros 200 caracteres del SQL (para logs); se calcula al primer uso
+    sql_preview: Optional[str] = None
+
+
+def _primary_from(query: Any) -> Any:
+    if isinstance(query, Select):
+        froms = query.get_final_froms()
+        return froms[0] if froms else None
+    if isinstance(query, (Update, Delete, Insert)):
+        return getattr(query, "table", None)
+    return None
+
+
+def analyze_statement(query: Any) -> StatementShape:
+    """Analiza la sentencia sin cache (recorre el árbol)."""
+    from_clause = _primary_from(query)
+    from_name = getattr(from_clause, "name", None) if from_clause is not None else None
+    table_name = (from_name or str(from_clause)) if from_clause is not None else None
+    whereclause = getattr(query, "whereclause", None)
+    return StatementShape(
+        table_name=table_name,
+        from_name=from_name,
+        table=from_clause if isinstance(from_clause, Table) else None,
+        where_sql=str(whereclause) if whereclause is not None else None,
+    )
+
+
+class StatementShapeCache:
+    """LRU acotado cache key → StatementShape (thread-safe)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, StatementShape]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def get(self, query: Any) -> StatementShape:
+        if self.max_size <= 0:
+            return analyze_statement(query)
+
+        cache_key = query._generate_cache_key()
+        if cache_key is None:
+            self.uncacheable += 1
+            return analyze_statement(query)
+
+        key = cache_key.key
+        with self._lock:
+            shape = self._entries.get(key)
+            if shape is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return shape
+
+        shape = analyze_statement(query)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = shape
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return shape
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.uncacheable = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+        }
+
+
+_shape_cache = StatementShapeCache(settings.STATEMENT_SHAPE_CACHE_SIZE)
+
+
+def get_statement_shape(query: Any) -> StatementShape:
+    """Forma de la sentencia Core, cacheada por su cache key."""
+    return _shape_cache.get(query)
+
+
+def statement_preview(query: Any, shape: StatementShape) -> str:
+    """SQL truncado para logs; se renderiza una vez por forma."""
+    if shape.sql_preview is None:
+        shape.sql_preview = str(query)[:200]
+    return shape.sql_preview
+
+
+def get_statement_shape_cache() -> StatementShapeCache:
+    return _shape_cache
@@ -0,0 +1,266 @@
+# app/core/security/tenant_rate_limiter.py
+"""
+Rate limiting compartido por tenant + usuario + clase de ruta (GCRA sobre Redis).
+
+slowapi (rate_limiting.py) limita por IP y en memoria de cada worker: con N
+workers el límite real es N×, y no distingue tenants ni usuarios. Este limitador
+se aplica en get_current_user_data, con el token ya verificado (un claim
+falsificado no puede agotar la cuota de otro usuario):
+
+- Clave: ratelimit:<cliente_id>:<usuario>:<clase>; la clase es la prioridad de
+  la ruta (route_priority: critica/alta/normal/baja).
+- Cuota: RATE_LIMIT_CLASS_QUOTAS (requests por RATE_LIMIT_WINDOW_SECONDS con plan
+  de peso 1) × peso del plan del tenant (RATE_LIMIT_PLAN_WEIGHTS).
+- GCRA en Redis: script Lua atómico, un único valor por clave (el TAT). Ráfaga
+  máxima = la cuota de la ventana; luego un request cada ventana/cuota.
+- Camino rápido local: cada worker reserva hasta RATE_LIMIT_LOCAL_BATCH tokens por
+  llamada a Redis y los consume en memoria durante RATE_LIMIT_LOCAL_LEASE_SECONDS.
+  Los no usados se devuelven al TAT en la siguiente reserva de la clave (misma
+  llamada al script): con muchos workers y poco tráfico cada uno, las reservas
+  ociosas no agotan la cuota compartida. Un rechazo también se recuerda
+  localmente hasta su Retry-After.
+- Sin Redis (desactivado o caído) se aplica el mismo GCRA en memoria del worker.
+
+Excedido → 429 con Retry-After.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "ratelimit:"
+_MAX_LOCAL_KEYS = 10000
+_REDIS_RETRY_SECONDS = 5.0
+
+# KEYS[1]=clave; ARGV: ahora (ms), intervalo por token (ms), ráfaga (ms), tokens pedidos,
+# tokens devueltos (reserva local anterior sin usar).
+# Devuelve {concedidos, ms hasta el próximo token si no se concedió ninguno}.
+_GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local want = tonumber(ARGV[4])
+local refund = tonumber(ARGV[5] or 0)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now) - refund * interval
+if tat < now then tat = now end
+local room = math.floor((now + burst - tat) / interval)
+if room <= 0 then
+  if refund > 0 then
+    tat = math.ceil(tat)
+    redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+  end
+  return {0, math.ceil(tat + interval - burst - now)}
+end
+local granted = math.min(want, room)
+tat = math.ceil(tat + granted * interval)
+redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+return {granted, 0}
+"""
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    retry_after: float = 0.0
+
+
+class _Lease:
+    """Tokens reservados localmente para una clave (o rechazo recordado)."""
+
+    __slots__ = ("tokens", "expires_at", "blocked_until")
+
+    def __init__(self):
+        self.tokens = 0
+        self.expires_at = 0.0
+        self.blocked_until = 0.0
+
+
+def _gcra_reserve(
+    tat: float, now: float, interval: float, burst: float, want: int, refund: int = 0
+) -> Tuple[int, float, float]:
+    """Mismo algoritmo que _GCRA_LUA: (concedidos, nuevo TAT, espera si 0 concedidos)."""
+    tat = max(tat - refund * interval, now)
+    room = math.floor((now + burst - tat) / interval)
+    if room <= 0:
+        return 0, tat, tat + interval - burst - now
+    granted = min(want, room)
+    return granted, tat + granted * interval, 0.0
+
+
+def _parse_quotas(raw: str) -> Dict[str, float]:
+    from app.infrastructure.database.tenant_admission import parse_plan_weights
+
+    return parse_plan_weights(raw)
+
+
+def quota_for(route_class: str, plan_suscripcion: Optional[str] = None) -> int:
+    """Requests por ventana para una clase de ruta según el plan (peso 1 si es desconocido)."""
+    quotas = _parse_quotas(settings.RATE_LIMIT_CLASS_QUOTAS)
+    weights = _parse_quotas(settings.RATE_LIMIT_PLAN_WEIGHTS)
+    base = quotas.get(route_class, quotas.get("normal", 600.0))
+    weight = weights.get((plan_suscripcion or "").strip().lower(), 1.0)
+    return max(1, round(base * weight))
+
+
+class TenantRateLimiter:
+    """GCRA compartido en Redis con reservas locales por lote."""
+
+    def __init__(self):
+        self._leases: Dict[str, _Lease] = {}
+        self._local_tat: Dict[str, float] = {}
+        self._script = None
+        self._script_client = None
+        self._redis_down_until = 0.0
+        self.stats: Dict[str, int] = {
+            "allowed": 0,
+            "rejected": 0,
+            "local_hits": 0,
+            "refunded": 0,
+            "redis_calls": 0,
+            "redis_errors": 0,
+            "local_fallback": 0,
+        }
+
+    async def check(self, key: str, limit: int) -> RateLimitDecision:
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None:
+            if lease.blocked_until > now:
+                self.stats["rejected"] += 1
+                return RateLimitDecision(False, limit, lease.blocked_until - now)
+            if lease.tokens > 0 and lease.expires_at > now:
+                lease.tokens -= 1
+                self.stats["local_hits"] += 1
+                self.stats["allowed"] += 1
+                return RateLimitDecision(True, limit)
+
+        # Reserva vencida con tokens sin usar: se devuelven en la misma llamada
+        refund = lease.tokens if lease is not None else 0
+        if refund:
+            lease.tokens = 0
+            self.stats["refunded"] += refund
+        window = settings.RATE_LIMIT_WINDOW_SECONDS
+        want = max(1, min(settings.RATE_LIMIT_LOCAL_BATCH, limit // 20))
+        granted, wait = await self._reserve(key, window / limit, window, want, refund)
+
+        if lease is None:
+            if len(self._leases) >= _MAX_LOCAL_KEYS:
+                self._prune(now)
+            lease = self._leases[key] = _Lease()
+        if granted <= 0:
+            lease.tokens = 0
+            lease.blocked_until = now + wait
+            self.stats["rejected"] += 1
+            return RateLimitDecision(False, limit, wait)
+        lease.tokens = granted - 1
+        lease.expires_at = now + settings.RATE_LIMIT_LOCAL_LEASE_SECONDS
+        lease.blocked_until = 0.0
+        self.stats["allowed"] += 1
+        return RateLimitDecision(True, limit)
+
+    async def _reserve(
+        self, key: str, interval: float, burst: float, want: int, refund: int = 0
+    ) -> Tuple[int, float]:
+        """Devuelve `refund` tokens y reserva hasta `want`: en Redis si está disponible, si no en memoria."""
+        if settings.ENABLE_REDIS_CACHE and time.monotonic() >= self._redis_down_until:
+            try:
+                script = await self._get_script()
+                if script is not None:
+                    self.stats["redis_calls"] += 1
+                    granted, wait_ms = await script(
+                        keys=[f"{_KEY_PREFIX}{key}"],
+                        args=[int(time.time() * 1000), interval * 1000, burst * 1000, want, refund],
+                    )
+                    return int(granted), int(wait_ms) / 1000
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                self._redis_down_until = time.monotonic() + _REDIS_RETRY_SECONDS
+                logger.warning(f"[RATE_LIMIT] Redis no disponible, límite local por worker: {e}")
+
+        self.stats["local_fallback"] += 1
+        now = time.monotonic()
+        granted, tat, wait = _gcra_reserve(self._local_tat.get(key, now), now, interval, burst, want, refund)
+        self._local_tat[key] = tat
+        return granted, wait
+
+    async def _get_script(self):
+        from app.infrastructure.redis.client import _get_redis_client
+
+        client = await _get_redis_client()
+        if client is None:
+            return None
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(_GCRA_LUA)
+            self._script_client = client
+        return self._script
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, lease in self._leases.items()
+                    if lease.expires_at <= now and lease.blocked_until <= now]:
+            del self._leases[key]
+        for key in [k for k, tat in self._local_tat.items() if tat <= now]:
+            del self._local_tat[key]
+
+    def report(self) -> Dict[str, Any]:
+        checks = self.stats["allowed"] + self.stats["rejected"]
+        return {
+            "enabled": settings.TENANT_RATE_LIMIT_ENABLED,
+            "window_seconds": settings.RATE_LIMIT_WINDOW_SECONDS,
+            "local_keys": len(self._leases),
+            **self.stats,
+            "local_rate": round(self.stats["local_hits"] / checks, 3) if checks else None,
+        }
+
+
+_limiter = TenantRateLimiter()
+
+
+async def enforce_rate_limit(request: Request, payload: Dict[str, Any]) -> None:
+    """
+    Aplica la cuota del usuario autenticado para la clase de la ruta actual.
+
+    Raises:
+        HTTPException 429 con Retry-After si la cuota está agotada.
+    """
+    if not settings.TENANT_RATE_LIMIT_ENABLED:
+        return
+    from app.core.authorization.route_priority import get_route_priority_index
+    from app.core.tenant.context import try_get_tenant_context
+
+    tenant = try_get_tenant_context()
+    cliente_id = payload.get("cliente_id") or (tenant.client_id if tenant else None)
+    route_class = get_route_priority_index(request.app).priority(request.method, request.url.path)
+    limit = quota_for(route_class, tenant.plan_suscripcion if tenant else None)
+
+    decision = await _limiter.check(f"{cliente_id}:{payload.get('sub')}:{route_class}", limit)
+    if not decision.allowed:
+        retry_after = max(1, math.ceil(decision.retry_after))
+        logger.info(
+            f"[RATE_LIMIT] 429 {request.method} {request.url.path} "
+            f"(cliente={cliente_id}, usuario={payload.get('sub')}, clase={route_class}, límite={limit})"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiadas solicitudes. Por favor, intente más tarde.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def get_rate_limit_report() -> Dict[str, Any]:
+    """Requests permitidos/rechazados y cuántos se resolvieron sin ir a Redis."""
+    return _limiter.report()
+
+
+def reset_rate_limiter() -> None:
+    """Descarta reservas, estado local y métricas (tests)."""
+    global _limiter
+    _limiter = TenantRateLimiter()
@@ -31,6 +31,8 @@ import threading
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 class ConnectionMetadataCache:
@@ -235,6 +237,11 @@ connection_cache = ConnectionMetadataCache(ttl_seconds=300)
 # Para testing o configuración custom, puedes crear instancias adicionales:
 # custom_cache = ConnectionMetadataCache(ttl_seconds=600)  # 10 minutos
 
+# Cache subdominio -> {"cliente_id", "codigo_cliente"} del TenantMiddleware.
+# Clave: subdominio en minúsculas. TTL corto: cada worker tiene su propia copia y
+# solo se invalida explícitamente en el worker que modificó el cliente.
+subdomain_cache = ConnectionMetadataCache(ttl_seconds=settings.SUBDOMAIN_CACHE_TTL_SECONDS)
+
 
 # ============================================
 # FUNCIONES HELPER PARA MONITOREO
@@ -276,6 +283,19 @@ def invalidate_client_cache(client_id: int) -> bool:
     return connection_cache.invalidate(client_id)
 
 
+def invalidate_subdomain_cache() -> int:
+    """
+    Limpia el cache de subdominios.
+
+    Se llama al cambiar subdominio o estado de un cliente; se limpia completo
+    porque el subdominio anterior no siempre se conoce.
+
+    Returns:
+        Cantidad de entradas eliminadas
+    """
+    return subdomain_cache.clear()
+
+
 def clear_all_cache() -> int:
     """
     Limpia todo el cache.
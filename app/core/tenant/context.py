@@ -73,6 +73,7 @@ class TenantContext:
         servidor: Servidor de BD (para Multi-DB)
         puerto: Puerto de BD (para Multi-DB)
         tipo_instalacion: "cloud", "onpremise", "hybrid"
+        plan_suscripcion: Plan del cliente (peso en el control de admisión a BD)
     """
     
     # CAMPOS BÁSICOS (OBLIGATORIOS)
@@ -89,7 +90,12 @@ class TenantContext:
     servidor: Optional[str] = None  # Para Multi-DB
     puerto: Optional[int] = None  # Para Multi-DB
     tipo_instalacion: Optional[str] = "cloud"  # "cloud", "onpremise", "hybrid"
-    
+    plan_suscripcion: Optional[str] = None  # Peso en el control de admisión a BD
+
+    # Read-your-writes: True tras el primer commit en la primaria durante el request
+    # (las lecturas DatabaseConnection.READ posteriores ya no van a réplicas)
+    wrote_primary: bool = False
+
     def __post_init__(self):
         """
         Validaciones y ajustes post-inicialización.
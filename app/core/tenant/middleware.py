@@ -37,6 +37,7 @@ from app.core.exceptions import ClientNotFoundException
 
 # ✅ FASE 2: Importar función async para obtener metadata
 from app.core.tenant.routing import get_connection_metadata_async
+from app.core.tenant.cache import subdomain_cache
 from app.infrastructure.database.queries_async import execute_query
 from app.infrastructure.database.tables import ClienteTable
 from sqlalchemy import select
@@ -456,7 +457,8 @@ class TenantMiddleware(BaseHTTPMiddleware):
             connection_metadata=connection_metadata,
             servidor=servidor,
             puerto=puerto,
-            tipo_instalacion=tipo_instalacion
+            tipo_instalacion=tipo_instalacion,
+            plan_suscripcion=client_data.get('plan_suscripcion')
         )
         
         # Establecer contexto
@@ -555,11 +557,18 @@ class TenantMiddleware(BaseHTTPMiddleware):
         ✅ FASE 2: Versión async que reemplaza la función síncrona.
         
         IMPORTANTE: Usa conexión ADMIN porque aún no tenemos contexto establecido.
+        Resultado cacheado en subdomain_cache (solo clientes encontrados).
         """
+        cache_key = subdomain.lower()
+        cached = subdomain_cache.get(cache_key)
+        if cached:
+            return cached
+
         # ✅ FASE 2: Usar SQLAlchemy Core con async
         query = select(
             ClienteTable.c.cliente_id,
-            ClienteTable.c.codigo_cliente
+            ClienteTable.c.codigo_cliente,
+            ClienteTable.c.plan_suscripcion
         ).where(
             ClienteTable.c.subdominio == subdomain,
             ClienteTable.c.es_activo == True
@@ -580,9 +589,11 @@ class TenantMiddleware(BaseHTTPMiddleware):
             if results:
                 result = {
                     "cliente_id": results[0]["cliente_id"], 
-                    "codigo_cliente": results[0]["codigo_cliente"]
+                    "codigo_cliente": results[0]["codigo_cliente"],
+                    "plan_suscripcion": results[0]["plan_suscripcion"]
                 }
                 logger.debug(f"[DB] Cliente encontrado: {result}")
+                subdomain_cache.set(cache_key, result)
                 return result
             else:
                 logger.debug(
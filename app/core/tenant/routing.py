@@ -27,7 +27,7 @@ FALLBACK:
 
 import logging
 import json
-from typing import Dict, Any, Optional, AsyncIterator
+from typing import Dict, Any, List, Optional, AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from contextlib import asynccontextmanager
@@ -187,7 +187,8 @@ async def _query_connection_metadata_from_db_async(client_id: UUID) -> Optional[
                 "tipo_bd": row[6] or "sqlserver",
                 "usa_ssl": bool(row[7]),
                 "tipo_instalacion": row[8] or "cloud",
-                "metadata_json": metadata_json
+                "metadata_json": metadata_json,
+                "read_replicas": await _query_read_replicas_async(session, client_id)
             }
             
             logger.debug(
@@ -205,6 +206,58 @@ async def _query_connection_metadata_from_db_async(client_id: UUID) -> Optional[
         return None
 
 
+async def _query_read_replicas_async(session: AsyncSession, client_id: UUID) -> List[Dict[str, Any]]:
+    """
+    Réplicas de lectura del cliente: conexiones activas con es_solo_lectura=1 que no
+    son la principal. Se cachean junto con la metadata (clave "read_replicas").
+    """
+    from app.infrastructure.database.tables import ClienteConexionTable
+    from sqlalchemy import select, or_
+    
+    query = select(
+        ClienteConexionTable.c.servidor,
+        ClienteConexionTable.c.puerto,
+        ClienteConexionTable.c.nombre_bd,
+        ClienteConexionTable.c.usuario_encriptado,
+        ClienteConexionTable.c.password_encriptado,
+    ).where(
+        ClienteConexionTable.c.cliente_id == client_id,
+        ClienteConexionTable.c.es_activo == True,
+        ClienteConexionTable.c.es_solo_lectura == True,
+        or_(
+            ClienteConexionTable.c.es_conexion_principal == False,
+            ClienteConexionTable.c.es_conexion_principal.is_(None)
+        )
+    ).order_by(
+        ClienteConexionTable.c.conexion_id
+    )
+    
+    replicas = []
+    try:
+        result = await session.execute(query)
+        for row in result.fetchall():
+            try:
+                usuario = decrypt_credential(row[3]) if row[3] else ""
+                password = decrypt_credential(row[4]) if row[4] else ""
+            except Exception as decrypt_err:
+                logger.warning(
+                    f"[METADATA] Réplica {row[0]} de cliente {client_id} omitida: "
+                    f"no se pudieron desencriptar credenciales ({decrypt_err})"
+                )
+                continue
+            replicas.append({
+                "servidor": row[0],
+                "puerto": row[1] or 1433,
+                "nombre_bd": row[2],
+                "usuario": usuario,
+                "password": password,
+            })
+    except Exception as e:
+        logger.warning(f"[METADATA] No se pudieron consultar réplicas de cliente {client_id}: {e}")
+    
+    return replicas
+
+
 # ⚠️ DEPRECATED: Mantener para compatibilidad temporal
 def _query_connection_metadata_from_db(client_id: UUID) -> Optional[Dict[str, Any]]:
     """
@@ -795,7 +848,8 @@ def get_database_type(client_id: UUID) -> str:
 
 @asynccontextmanager
 async def get_connection_for_tenant(
-    cliente_id: Optional[UUID] = None
+    cliente_id: Optional[UUID] = None,
+    read_only: bool = False
 ) -> AsyncIterator[AsyncSession]:
     """
     ✅ FASE 5: Función centralizada para obtener conexión por tenant.
@@ -807,6 +861,8 @@ async def get_connection_for_tenant(
     
     Args:
         cliente_id: ID del cliente (opcional, usa contexto si no se proporciona)
+        read_only: Lectura que puede ir a una réplica (DatabaseConnection.READ);
+            sin réplica disponible usa la misma conexión que una escritura
     
     Yields:
         AsyncSession de SQLAlchemy configurada para el tenant apropiado
@@ -855,7 +911,17 @@ async def get_connection_for_tenant(
     # 4. Determinar tipo de conexión
     database_type = metadata.get("database_type", DEFAULT_DATABASE_TYPE)
     
-    if database_type == "multi":
+    if read_only:
+        # Réplica de lectura (por tenant o de la BD compartida); get_db_connection
+        # vuelve a la primaria si no hay una disponible o el request ya escribió
+        logger.debug(f"[ROUTER] Cliente {cliente_id} -> lectura ({database_type})")
+        async with get_db_connection(
+            DatabaseConnection.READ,
+            client_id=cliente_id,
+            connection_metadata=metadata
+        ) as session:
+            yield session
+    elif database_type == "multi":
         # Multi-DB: usar metadata para construir conexión dedicada
         logger.debug(
             f"[ROUTER] Cliente {cliente_id} -> Multi-DB ({metadata.get('nombre_bd')})"
@@ -0,0 +1,240 @@
+# app/core/tenant/warmup.py
+"""
+Pre-calentamiento de tenants al arrancar.
+
+Tras un deploy, el primer request de cada tenant paga: crear su AsyncEngine, abrir
+conexiones, resolver la metadata de conexión (query ADMIN + descifrado Fernet) y
+resolver el subdominio. Esta etapa lo adelanta para los TENANT_WARMUP_TOP_N tenants
+con más sesiones activas en las últimas TENANT_WARMUP_LOOKBACK_HOURS horas (los
+tenants dedicados guardan sus sesiones en su propia BD y se cuentan ahí):
+
+1. Subdominio → subdomain_cache (lo que consulta TenantMiddleware).
+2. Metadata de conexión → connection_cache / Redis (get_connection_metadata_async).
+3. AsyncEngine del tenant con TENANT_WARMUP_MIN_IDLE conexiones ya abiertas en el pool.
+
+Corre en background desde el lifespan: no retrasa el readiness. La concurrencia
+está acotada (TENANT_WARMUP_CONCURRENCY) para no competir con el tráfico real y
+todo el proceso tiene un tope de TENANT_WARMUP_TIMEOUT_SECONDS. Un tenant que
+falla solo se loggea; su primer request lo resolverá como siempre.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.tenant.cache import subdomain_cache
+from app.infrastructure.database import connection_async
+from app.infrastructure.database.connection_async import DatabaseConnection
+from app.infrastructure.database.tables import ClienteTable, UserSessionTable
+
+logger = logging.getLogger(__name__)
+
+_warmup_task: Optional[asyncio.Task] = None
+_DEDICATED = "dedicated"
+
+
+_TENANT_COLUMNS = (
+    ClienteTable.c.cliente_id,
+    ClienteTable.c.codigo_cliente,
+    ClienteTable.c.subdominio,
+    ClienteTable.c.plan_suscripcion,
+)
+
+
+def _recent_session_filters(since: datetime) -> List[Any]:
+    last_activity = func.coalesce(
+        UserSessionTable.c.last_business_activity_at,
+        UserSessionTable.c.last_refresh_at,
+        UserSessionTable.c.created_at,
+    )
+    return [UserSessionTable.c.is_active == True, last_activity >= since]
+
+
+async def _load_shared_ranking(limit: int, since: datetime) -> List[Dict[str, Any]]:
+    """Tenants compartidos con más sesiones recientes (user_session de la BD ADMIN)."""
+    sesiones = func.count(UserSessionTable.c.session_id)
+    query = select(
+        *_TENANT_COLUMNS,
+        sesiones.label("sesiones"),
+    ).select_from(
+        UserSessionTable.join(ClienteTable, UserSessionTable.c.cliente_id == ClienteTable.c.cliente_id)
+    ).where(
+        ClienteTable.c.es_activo == True,
+        ClienteTable.c.tipo_instalacion != _DEDICATED,
+        *_recent_session_filters(since),
+    ).group_by(
+        *_TENANT_COLUMNS
+    ).order_by(
+        sesiones.desc()
+    ).limit(limit)
+
+    # Consulta cross-tenant: sesión ADMIN directa (como routing), sin filtro de tenant
+    async with connection_async.get_db_connection(DatabaseConnection.ADMIN) as session:
+        result = await session.execute(query)
+        return [dict(row._mapping) for row in result.fetchall()]
+
+
+async def _load_dedicated_tenants() -> List[Dict[str, Any]]:
+    """Tenants activos con BD dedicada: sus sesiones no están en la BD ADMIN."""
+    query = select(*_TENANT_COLUMNS).where(
+        ClienteTable.c.es_activo == True,
+        ClienteTable.c.tipo_instalacion == _DEDICATED,
+    )
+    async with connection_async.get_db_connection(DatabaseConnection.ADMIN) as session:
+        result = await session.execute(query)
+        return [dict(row._mapping) for row in result.fetchall()]
+
+
+async def _count_dedicated_sessions(tenant: Dict[str, Any], since: datetime) -> int:
+    """Sesiones recientes de un tenant dedicado, contadas en su propia BD."""
+    query = select(func.count(UserSessionTable.c.session_id)).where(
+        UserSessionTable.c.cliente_id == tenant["cliente_id"],
+        *_recent_session_filters(since),
+    )
+    async with connection_async.get_db_connection(
+        DatabaseConnection.DEFAULT, client_id=tenant["cliente_id"]
+    ) as session:
+        result = await session.execute(query)
+        return int(result.scalar() or 0)
+
+
+async def load_active_tenants(limit: int, lookback_hours: int) -> List[Dict[str, Any]]:
+    """
+    Tenants activos ordenados por cantidad de sesiones con actividad reciente.
+
+    Los compartidos se rankean en la BD ADMIN; los dedicados se cuentan en su BD
+    (acotado por TENANT_WARMUP_CONCURRENCY) y se mezclan en el mismo ranking.
+
+    Returns:
+        Lista de dicts con cliente_id, codigo_cliente, subdominio, plan_suscripcion y sesiones.
+    """
+    since = datetime.now() - timedelta(hours=lookback_hours)
+    ranking = await _load_shared_ranking(limit, since)
+
+    semaphore = asyncio.Semaphore(max(1, settings.TENANT_WARMUP_CONCURRENCY))
+
+    async def _with_sessions(tenant: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {**tenant, "sesiones": await _count_dedicated_sessions(tenant, since)}
+            except Exception as e:
+                logger.warning(f"[WARMUP] No se pudieron contar sesiones del tenant dedicado {tenant.get('cliente_id')}: {e}")
+                return {**tenant, "sesiones": 0}
+
+    dedicated = await asyncio.gather(*(_with_sessions(t) for t in await _load_dedicated_tenants()))
+    ranking.extend(tenant for tenant in dedicated if tenant["sesiones"] > 0)
+    ranking.sort(key=lambda tenant: tenant["sesiones"], reverse=True)
+    return ranking[:limit]
+
+
+async def _open_idle_connections(engine: Any, count: int) -> int:
+    """
+    Abre `count` conexiones a la vez y las devuelve al pool, que las conserva
+    ociosas (hasta pool_size).
+    """
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(await engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+async def warm_up_tenant(tenant: Dict[str, Any]) -> int:
+    """
+    Calienta caches, engine y pool de un tenant.
+
+    Returns:
+        Conexiones abiertas en el pool del tenant.
+    """
+    from app.core.tenant.routing import get_connection_metadata_async
+
+    client_id = tenant["cliente_id"]
+    if tenant.get("subdominio"):
+        subdomain_cache.set(tenant["subdominio"].lower(), {
+            "cliente_id": client_id,
+            "codigo_cliente": tenant["codigo_cliente"],
+            "plan_suscripcion": tenant.get("plan_suscripcion"),
+        })
+
+    metadata = await get_connection_metadata_async(client_id)
+    engine = connection_async._get_async_engine(DatabaseConnection.DEFAULT, client_id, metadata)
+    if engine is None:
+        return 0
+    min_idle = min(settings.TENANT_WARMUP_MIN_IDLE, settings.DB_POOL_SIZE)
+    return await _open_idle_connections(engine, min_idle)
+
+
+async def warm_up_tenants(
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Calienta el engine ADMIN y los tenants más activos con concurrencia acotada.
+
+    Returns:
+        Resumen: tenants calentados, fallidos, conexiones abiertas y duración.
+    """
+    start = time.perf_counter()
+    limit = settings.TENANT_WARMUP_TOP_N if limit is None else limit
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.TENANT_WARMUP_CONCURRENCY))
+    summary: Dict[str, Any] = {"tenants": 0, "failed": 0, "connections": 0}
+
+    # Esta consulta ya deja creado el engine ADMIN (middleware y metadata de todos los tenants)
+    tenants = await load_active_tenants(limit, settings.TENANT_WARMUP_LOOKBACK_HOURS)
+
+    async def _warm(tenant: Dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                opened = await warm_up_tenant(tenant)
+                summary["connections"] += opened
+                summary["tenants"] += 1
+            except Exception as e:
+                summary["failed"] += 1
+                logger.warning(f"[WARMUP] No se pudo calentar el tenant {tenant.get('cliente_id')}: {e}")
+
+    await asyncio.gather(*(_warm(tenant) for tenant in tenants))
+    summary["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    logger.info(
+        f"[WARMUP] {summary['tenants']}/{len(tenants)} tenants calentados "
+        f"({summary['connections']} conexiones, {summary['failed']} fallidos) en {summary['duration_ms']}ms"
+    )
+    return summary
+
+
+async def _run_warmup() -> None:
+    try:
+        await asyncio.wait_for(warm_up_tenants(), timeout=settings.TENANT_WARMUP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"[WARMUP] Pre-calentamiento interrumpido tras {settings.TENANT_WARMUP_TIMEOUT_SECONDS}s"
+        )
+    except Exception as e:
+        logger.warning(f"[WARMUP] Pre-calentamiento fallido (no bloqueante): {e}")
+
+
+def start_tenant_warmup() -> asyncio.Task:
+    """Lanza el pre-calentamiento en background (no bloquea el arranque)."""
+    global _warmup_task
+    if _warmup_task is None or _warmup_task.done():
+        _warmup_task = asyncio.create_task(_run_warmup(), name="tenant-warmup")
+    return _warmup_task
+
+
+async def stop_tenant_warmup() -> None:
+    """Cancela el pre-calentamiento si sigue corriendo al apagar."""
+    global _warmup_task
+    task, _warmup_task = _warmup_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
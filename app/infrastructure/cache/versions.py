@@ -0,0 +1,151 @@
+# app/infrastructure/cache/versions.py
+"""
+Contadores de versión para ETags (GET condicional de menús y catálogos).
+
+Cada escritura que cambia menús, roles, permisos o módulos incrementa un
+contador; los endpoints de lectura derivan su ETag de esos contadores (ver
+app/api/deps_etag.py), así un If-None-Match vigente se responde con 304 sin
+consultar la BD.
+
+Ámbitos:
+- global: catálogo de módulos, menús del sistema, catálogos globales y, por
+  seguridad, cualquier escritura cuyo tenant no se pueda determinar.
+- tenant:{cliente_id}: roles, permisos, asignación de roles y módulos del tenant.
+
+Los contadores viven en Redis (compartidos entre workers) cuando ya está
+conectado; si no, en memoria del proceso con una base aleatoria (fail-soft:
+un worker no ve los incrementos de otro, la staleness queda acotada por la
+ventana de tiempo que también entra en el ETag).
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import secrets
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.tenant.context import try_get_current_client_id
+from app.infrastructure.redis.client import RedisService
+
+logger = logging.getLogger(__name__)
+
+SCOPE_GLOBAL = "global"
+SCOPE_TENANT = "tenant"
+
+_KEY_PREFIX = "etag_version:"
+_local_base = secrets.randbits(32)
+_local: Dict[str, int] = {}
+_pending: Set[asyncio.Task] = set()
+_stats: Dict[str, int] = {"bumps": 0, "not_modified": 0, "etag_served": 0}
+
+
+def version_keys(cliente_id: Optional[Any] = None) -> List[str]:
+    """Claves de versión de un recurso: global y, si se indica, la del tenant."""
+    keys = [f"{_KEY_PREFIX}{SCOPE_GLOBAL}"]
+    if cliente_id:
+        keys.append(f"{_KEY_PREFIX}{SCOPE_TENANT}:{cliente_id}")
+    return keys
+
+
+async def get_versions(keys: List[str]) -> Tuple[Any, ...]:
+    """Versiones actuales de `keys` (Redis si está conectado, si no las locales)."""
+    if RedisService.is_redis_available():
+        remote = await RedisService.mget_ints(keys)
+        if remote is not None:
+            return ("redis", *remote)
+    return ("local", _local_base, *(_local.get(key, 0) for key in keys))
+
+
+def _bump_keys(cliente_id: Optional[Any]) -> List[str]:
+    if cliente_id is None or str(cliente_id) == settings.SUPERADMIN_CLIENTE_ID:
+        return version_keys()
+    return [f"{_KEY_PREFIX}{SCOPE_TENANT}:{cliente_id}"]
+
+
+async def _bump_remote(keys: List[str]) -> None:
+    # Solo con Redis ya conectado: sin él, get_versions también sirve las versiones locales
+    if not RedisService.is_redis_available():
+        return
+    for key in keys:
+        await RedisService.incr(key)
+
+
+async def bump_versions(cliente_id: Optional[Any] = None) -> None:
+    """
+    Invalida los ETags del tenant (o globales si cliente_id es None o el tenant
+    del superadmin, cuyas escrituras afectan a todos).
+    """
+    keys = _bump_keys(cliente_id)
+    for key in keys:
+        _local[key] = _local.get(key, 0) + 1
+    _stats["bumps"] += 1
+    await _bump_remote(keys)
+
+
+def bump_versions_soon(cliente_id: Optional[Any] = None) -> None:
+    """bump_versions desde código síncrono: local inmediato, Redis en una tarea del loop."""
+    keys = _bump_keys(cliente_id)
+    for key in keys:
+        _local[key] = _local.get(key, 0) + 1
+    _stats["bumps"] += 1
+    try:
+        task = asyncio.get_running_loop().create_task(_bump_remote(keys))
+    except RuntimeError:
+        return
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+def _resolve_cliente_id(scope: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> Optional[UUID]:
+    if scope == SCOPE_GLOBAL:
+        return None
+    try:
+        cliente_id = signature.bind_partial(*args, **kwargs).arguments.get("cliente_id")
+    except TypeError:
+        cliente_id = None
+    return cliente_id or try_get_current_client_id()
+
+
+def bumps_versions(scope: str = SCOPE_TENANT) -> Callable:
+    """
+    Decorador para métodos de escritura async: al terminar sin error incrementa
+    la versión del ámbito. SCOPE_TENANT toma el argumento `cliente_id` o el
+    tenant del contexto; sin tenant se invalida lo global.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            await bump_versions(_resolve_cliente_id(scope, signature, args, kwargs))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def record_etag_result(not_modified: bool) -> None:
+    _stats["not_modified" if not_modified else "etag_served"] += 1
+
+
+def get_etag_report() -> Dict[str, Any]:
+    """Respuestas 304/200 con ETag e incrementos de versión."""
+    served = _stats["not_modified"] + _stats["etag_served"]
+    return {
+        "enabled": settings.CONDITIONAL_GET_ENABLED,
+        "backend": "redis" if RedisService.is_redis_available() else "local",
+        "max_staleness_seconds": settings.CONDITIONAL_GET_MAX_STALENESS_SECONDS,
+        **_stats,
+        "not_modified_rate": round(_stats["not_modified"] / served, 3) if served else None,
+    }
+
+
+def reset_versions() -> None:
+    """Limpia contadores locales y métricas (tests)."""
+    _local.clear()
+    _stats.update(bumps=0, not_modified=0, etag_served=0)
@@ -21,7 +21,14 @@ from uuid import UUID
 
 from app.core.config import settings
 from app.core.exceptions import DatabaseError
-from app.core.tenant.context import get_current_client_id
+from app.core.metrics.pool_metrics import forget_engine, instrument_engine
+from app.core.tenant.context import get_current_client_id, try_get_current_client_id
+from app.infrastructure.database.tenant_admission import tenant_db_slot
+from app.infrastructure.database.read_routing import (
+    READ_REPLICA_SESSION_KEY,
+    mark_replica_unavailable,
+    select_read_replica,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +39,7 @@ class DatabaseConnection(Enum):
     """Tipo de conexión a base de datos."""
     DEFAULT = "default"  # Conexión tenant-aware
     ADMIN = "admin"       # Conexión de administración (metadata)
+    READ = "read"         # Lectura tenant-aware: réplica si existe, si no la primaria (ver read_routing)
 
 # Cache de engines async (uno por tenant)
 _async_engines: dict[str, any] = {}
@@ -232,6 +240,7 @@ def _get_async_engine(
         )
         
         _async_engines[engine_key] = engine
+        instrument_engine(f"async:{engine_key}", engine)
         logger.info(f"[ASYNC_CONNECTION] AsyncEngine creado para {engine_key}")
         
         return engine
@@ -240,6 +249,81 @@ def _get_async_engine(
         return None
 
 
+def _build_replica_connection_string(replica: dict) -> str:
+    """Connection string async para una réplica de lectura (ApplicationIntent=ReadOnly)."""
+    return (
+        f"mssql+aioodbc://{quote_plus(str(replica.get('usuario')))}:"
+        f"{quote_plus(str(replica.get('password')))}@"
+        f"{replica.get('servidor')}:{replica.get('puerto') or 1433}/"
+        f"{replica.get('nombre_bd')}?"
+        f"driver={quote_plus(settings.DB_DRIVER)}&"
+        f"TrustServerCertificate=yes&"
+        f"ApplicationIntent=ReadOnly"
+    )
+
+
+def _get_read_engine(engine_key: str, replica: dict) -> Optional[AsyncEngine]:
+    """
+    Obtiene o crea el AsyncEngine de una réplica de lectura.
+
+    Pool propio (DB_READ_POOL_SIZE / DB_READ_MAX_OVERFLOW): los listados pesados no
+    compiten por conexiones con las escrituras de la primaria.
+    """
+    if engine_key in _async_engines:
+        return _async_engines[engine_key]
+
+    if not all([replica.get("servidor"), replica.get("nombre_bd"), replica.get("usuario"), replica.get("password")]):
+        logger.warning(f"[ASYNC_CONNECTION] Réplica {engine_key} sin datos de conexión completos")
+        return None
+
+    try:
+        engine = create_async_engine(
+            _build_replica_connection_string(replica),
+            pool_size=settings.DB_READ_POOL_SIZE,
+            max_overflow=settings.DB_READ_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            echo=False
+        )
+        _async_engines[engine_key] = engine
+        instrument_engine(f"async:{engine_key}", engine)
+        logger.info(f"[ASYNC_CONNECTION] AsyncEngine de réplica creado para {engine_key}")
+        return engine
+    except Exception as e:
+        logger.error(f"[ASYNC_CONNECTION] Error creando AsyncEngine de réplica: {e}", exc_info=True)
+        return None
+
+
+async def _open_replica_session(client_id, connection_metadata: Optional[dict]) -> Optional[AsyncSession]:
+    """
+    Abre una sesión contra una réplica de lectura disponible, o None para usar la primaria.
+
+    La conexión se obtiene antes de entregar la sesión (la primera query la pediría
+    igual): si la réplica no responde se saca de rotación y el llamador sigue con la
+    primaria en lugar de fallar.
+    """
+    selected = select_read_replica(client_id, connection_metadata)
+    if selected is None:
+        return None
+    engine_key, replica = selected
+
+    engine = _get_read_engine(engine_key, replica)
+    if engine is None:
+        mark_replica_unavailable(engine_key, "engine no disponible")
+        return None
+
+    session = AsyncSession(engine, expire_on_commit=False)
+    session.info[READ_REPLICA_SESSION_KEY] = True
+    try:
+        await session.connection()
+    except Exception as e:
+        await session.close()
+        mark_replica_unavailable(engine_key, e)
+        return None
+    return session
+
+
 @asynccontextmanager
 async def get_db_connection(
     connection_type: DatabaseConnection = DatabaseConnection.DEFAULT,
@@ -254,7 +338,7 @@ async def get_db_connection(
     - Usa SQLAlchemy AsyncEngine + aioodbc
     
     Args:
-        connection_type: Tipo de conexión (DEFAULT o ADMIN)
+        connection_type: Tipo de conexión (DEFAULT, ADMIN o READ)
         client_id: ID del cliente (opcional, usa contexto si no se proporciona)
         connection_metadata: Metadata de conexión (opcional, evita consulta adicional)
     
@@ -276,8 +360,8 @@ async def get_db_connection(
             "Instalar: pip install 'sqlalchemy[asyncio]' aioodbc"
         )
     
-    # ✅ FASE 5: Si no se proporciona metadata y es DEFAULT, obtenerla del routing
-    if connection_type == DatabaseConnection.DEFAULT and not connection_metadata:
+    # ✅ FASE 5: Si no se proporciona metadata y es DEFAULT/READ, obtenerla del routing
+    if connection_type in (DatabaseConnection.DEFAULT, DatabaseConnection.READ) and not connection_metadata:
         if client_id is None:
             try:
                 client_id = get_current_client_id()
@@ -306,30 +390,44 @@ async def get_db_connection(
                 logger.debug(f"[ASYNC_CONNECTION] No se pudo obtener metadata del routing: {routing_err}")
                 # Continuar sin metadata (usará Single-DB por defecto)
     
-    engine = _get_async_engine(connection_type, client_id, connection_metadata)
+    # Admisión por tenant (slot durante toda la sesión); ADMIN no consume slots
+    admission_client_id = None
+    if connection_type != DatabaseConnection.ADMIN:
+        admission_client_id = client_id if client_id is not None else try_get_current_client_id()
     
-    if not engine:
-        raise DatabaseError(
-            detail="No se pudo crear AsyncEngine para la conexión",
-            internal_code="ENGINE_CREATION_ERROR"
-        )
-    
-    # Crear session factory
-    async_session = sessionmaker(
-        engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
-    
-    async with async_session() as session:
-        try:
-            yield session
-        except Exception as e:
-            await session.rollback()
-            logger.error(f"[ASYNC_CONNECTION] Error en sesión async: {e}", exc_info=True)
-            raise
-        finally:
-            await session.close()
+    async with tenant_db_slot(admission_client_id):
+        # READ: réplica si hay una disponible; si no, misma conexión que DEFAULT
+        session = None
+        if connection_type == DatabaseConnection.READ:
+            session = await _open_replica_session(client_id, connection_metadata)
+            connection_type = DatabaseConnection.DEFAULT
+        
+        if session is None:
+            engine = _get_async_engine(connection_type, client_id, connection_metadata)
+        
+            if not engine:
+                raise DatabaseError(
+                    detail="No se pudo crear AsyncEngine para la conexión",
+                    internal_code="ENGINE_CREATION_ERROR"
+                )
+        
+            # Crear session factory
+            async_session = sessionmaker(
+                engine,
+                class_=AsyncSession,
+                expire_on_commit=False
+            )
+            session = async_session()
+        
+        async with session:
+            try:
+                yield session
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"[ASYNC_CONNECTION] Error en sesión async: {e}", exc_info=True)
+                raise
+            finally:
+                await session.close()
 
 
 # Alias para compatibilidad (deprecated)
@@ -347,6 +445,7 @@ async def close_all_async_engines():
     for engine_key, engine in _async_engines.items():
         try:
             await engine.dispose()
+            forget_engine(f"async:{engine_key}")
             logger.debug(f"[ASYNC_CONNECTION] AsyncEngine {engine_key} cerrado")
         except Exception as e:
             logger.warning(f"[ASYNC_CONNECTION] Error cerrando engine {engine_key}: {e}")
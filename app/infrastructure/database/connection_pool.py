@@ -31,6 +31,7 @@ from collections import OrderedDict
 
 from app.core.config import settings
 from app.core.exceptions import DatabaseError
+from app.core.metrics.pool_metrics import forget_engine, get_pool_metrics_report, instrument_engine
 from app.infrastructure.database.connection_async import DatabaseConnection
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ logger = logging.getLogger(__name__)
 _pools: Dict[str, Any] = {}
 _pool_access_times: OrderedDict[str, datetime] = OrderedDict()  # LRU tracking
 _pool_enabled = False
+_pools_initialized = False
 
 # ✅ FASE 0: Aumentar límites para soportar 100+ tenants dedicados
 # ✅ CORRECCIÓN: Configuración de límites optimizada para escalabilidad
@@ -113,6 +115,7 @@ def _initialize_pools():
             pool_timeout=settings.DB_POOL_TIMEOUT,
             echo=False
         )
+        instrument_engine("pyodbc:admin", _pools['admin'])
         
         logger.info(
             f"[CONNECTION_POOL] Pool ADMIN inicializado. "
@@ -157,8 +160,29 @@ def _initialize_pools():
         )
         _pool_enabled = False
 
-# Inicializar al importar
-_initialize_pools()
+def init_pools() -> None:
+    """
+    Inicializa los pools una sola vez (idempotente).
+
+    Se llama desde el lifespan de la app, no al importar el módulo: el import no
+    crea engines. Los accesos (get_connection_from_pool, is_pooling_enabled) lo
+    invocan igualmente por si el módulo se usa fuera de la app (scripts).
+    """
+    global _pools_initialized
+    if _pools_initialized:
+        return
+    _pools_initialized = True
+    _initialize_pools()
+
+    if _pool_enabled:
+        logger.info("✅ Módulo de connection pooling cargado y activo")
+        logger.info(
+            f"   Configuración: MaxTenantPools={MAX_TENANT_POOLS}, "
+            f"TenantPoolSize={TENANT_POOL_SIZE}, "
+            f"InactivityTimeout={POOL_INACTIVITY_TIMEOUT}s"
+        )
+    else:
+        logger.info("ℹ️ Módulo de connection pooling cargado pero desactivado")
 
 
 def _cleanup_inactive_pools():
@@ -196,6 +220,7 @@ def _cleanup_inactive_pools():
                 )
             del _pools[pool_key]
             del _pool_access_times[pool_key]
+            forget_engine(f"pyodbc:{pool_key}")
         except Exception as e:
             logger.warning(f"[CONNECTION_POOL] Error cerrando pool inactivo {pool_key}: {e}")
 
@@ -230,6 +255,7 @@ def _evict_oldest_pool():
             )
         del _pools[oldest_pool_key]
         del _pool_access_times[oldest_pool_key]
+        forget_engine(f"pyodbc:{oldest_pool_key}")
     except Exception as e:
         logger.warning(f"[CONNECTION_POOL] Error evictando pool {oldest_pool_key}: {e}")
 
@@ -333,6 +359,7 @@ def _get_pool_for_tenant(client_id: int, connection_string: str) -> Any:
         
         _pools[pool_key] = pool_engine
         _pool_access_times[pool_key] = datetime.now()
+        instrument_engine(f"pyodbc:{pool_key}", pool_engine)
         
         tenant_pools_count = len([k for k in _pools.keys() if k.startswith('tenant_')])
         logger.info(
@@ -374,6 +401,7 @@ def get_connection_from_pool(
     Returns:
         SQLAlchemy connection o None si pooling no está disponible
     """
+    init_pools()
     if not _pool_enabled:
         return None
     
@@ -401,6 +429,7 @@ def get_connection_from_pool(
 
 def is_pooling_enabled() -> bool:
     """Verifica si connection pooling está habilitado."""
+    init_pools()
     return _pool_enabled
 
 
@@ -418,7 +447,9 @@ def get_pool_stats() -> Dict[str, Any]:
         "tenant_pools": len(tenant_pools),
         "max_tenant_pools": MAX_TENANT_POOLS,
         "admin_pool": "admin" in _pools,
-        "pool_keys": list(_pools.keys())
+        "pool_keys": list(_pools.keys()),
+        # Ocupación, espera de checkout, timeouts y pre-ping (pools pyodbc y AsyncEngines)
+        "engines": get_pool_metrics_report()["engines"]
     }
 
 
@@ -459,6 +490,8 @@ def close_all_pools():
                 except Exception as e:
                     logger.warning(f"[CONNECTION_POOL] Error cerrando pool '{pool_key}': {e}")
         
+        for pool_key in _pools:
+            forget_engine(f"pyodbc:{pool_key}")
         _pools.clear()
         _pool_access_times.clear()
         logger.info("[CONNECTION_POOL] Todos los pools cerrados")
@@ -478,17 +511,3 @@ def close_all_pools():
     except Exception as e:
         logger.warning(f"[CONNECTION_POOL] Error cerrando pools: {e}")
 
-
-# ============================================
-# LOGGING DE INICIALIZACIÓN
-# ============================================
-
-if _pool_enabled:
-    logger.info("✅ Módulo de connection pooling cargado y activo")
-    logger.info(
-        f"   Configuración: MaxTenantPools={MAX_TENANT_POOLS}, "
-        f"TenantPoolSize={TENANT_POOL_SIZE}, "
-        f"InactivityTimeout={POOL_INACTIVITY_TIMEOUT}s"
-    )
-else:
-    logger.info("ℹ️ Módulo de connection pooling cargado pero desactivado")
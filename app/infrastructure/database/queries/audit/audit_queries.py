@@ -25,7 +25,8 @@ INSERT INTO auth_audit_log (
     user_agent,
     device_info,
     geolocation,
-    metadata_json
+    metadata_json,
+    fecha_evento
 )
 OUTPUT INSERTED.log_id, INSERTED.fecha_evento
 VALUES (
@@ -40,7 +41,8 @@ VALUES (
     :user_agent,
     :device_info,
     :geolocation,
-    :metadata_json
+    :metadata_json,
+    :fecha_evento
 );
 """
 
@@ -7,6 +7,7 @@ QUERIES INCLUIDAS:
 - GET_USER_MAX_ACCESS_LEVEL
 - IS_USER_SUPER_ADMIN
 - GET_USER_ACCESS_LEVEL_INFO_COMPLETE
+- GET_LOGIN_CONTEXT / GET_LOGIN_CONTEXT_DEDICATED / GET_LOGIN_ADMIN_CONTEXT
 
 Refresh tokens: usar refresh_token_queries_core (SQLAlchemy Core).
 
@@ -55,8 +56,61 @@ WHERE ur.usuario_id = :usuario_id
   AND (ur.empresa_id IS NULL OR ur.empresa_id = :empresa_id)
 """
 
+# ============================================
+# CONTEXTO DE LOGIN (UNA IDA A BD POR BASE)
+# ============================================
+# Una fila por usuario_rol activo (o una sola fila sin roles): usuario + roles +
+# empresa de cada rol. login_context.LoginContext deriva de estas filas niveles,
+# nombres de roles, es_admin_cliente y empresas elegibles con los mismos criterios
+# que las queries individuales. No se filtra r.es_activo/oe.es_activo en el JOIN
+# porque cada derivación aplica su propio criterio.
+
+_LOGIN_CONTEXT_SELECT = """
+SELECT
+    u.usuario_id, u.cliente_id, u.nombre_usuario, u.correo, u.contrasena,
+    u.nombre, u.apellido, u.es_activo, u.requiere_cambio_contrasena,
+    u.proveedor_autenticacion, u.empresa_default_id,
+    ur.usuario_rol_id, ur.cliente_id AS ur_cliente_id, ur.empresa_id AS ur_empresa_id,
+    r.nombre AS rol_nombre, r.codigo_rol, r.nivel_acceso,
+    r.es_admin_cliente, r.es_activo AS rol_es_activo, r.cliente_id AS rol_cliente_id,
+    oe.razon_social, oe.nombre_comercial, oe.es_activo AS empresa_es_activo
+FROM usuario u
+LEFT JOIN usuario_rol ur ON ur.usuario_id = u.usuario_id AND ur.es_activo = 1
+LEFT JOIN rol r ON r.rol_id = ur.rol_id
+LEFT JOIN org_empresa oe ON oe.empresa_id = ur.empresa_id
+"""
+
+GET_LOGIN_CONTEXT = _LOGIN_CONTEXT_SELECT + """
+WHERE u.cliente_id = :cliente_id AND u.nombre_usuario = :nombre_usuario AND u.es_eliminado = 0
+"""
+
+# BD dedicada: todos los usuarios de la BD pertenecen al tenant
+GET_LOGIN_CONTEXT_DEDICATED = _LOGIN_CONTEXT_SELECT + """
+WHERE u.nombre_usuario = :nombre_usuario AND u.es_eliminado = 0
+"""
+
+# BD ADMIN: rol SUPER_ADMIN en el cliente SYSTEM + expiración de tokens del tenant
+GET_LOGIN_ADMIN_CONTEXT = """
+SELECT
+    (SELECT COUNT(*)
+     FROM usuario_rol ur
+     INNER JOIN rol r ON ur.rol_id = r.rol_id
+     WHERE ur.usuario_id = :usuario_id
+       AND ur.cliente_id = :system_cliente_id
+       AND ur.es_activo = 1
+       AND r.es_activo = 1
+       AND r.codigo_rol = 'SUPER_ADMIN'
+       AND r.nivel_acceso = 5) AS super_admin_count,
+    cac.access_token_minutes, cac.refresh_token_days
+FROM (SELECT 1 AS uno) base
+LEFT JOIN cliente_auth_config cac ON cac.cliente_id = :cliente_id
+"""
+
 __all__ = [
     "GET_USER_MAX_ACCESS_LEVEL",
     "IS_USER_SUPER_ADMIN",
     "GET_USER_ACCESS_LEVEL_INFO_COMPLETE",
+    "GET_LOGIN_CONTEXT",
+    "GET_LOGIN_CONTEXT_DEDICATED",
+    "GET_LOGIN_ADMIN_CONTEXT",
 ]
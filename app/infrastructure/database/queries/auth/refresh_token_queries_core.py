@@ -451,7 +451,8 @@ async def get_active_sessions_by_user_oldest_first_core(
 
 
 async def delete_expired_tokens_core(
-    cliente_id: UUID
+    cliente_id: UUID,
+    limit: Optional[int] = None,
 ) -> int:
     """
     Elimina tokens expirados y revocados usando SQLAlchemy Core.
@@ -460,6 +461,7 @@ async def delete_expired_tokens_core(
     
     Args:
         cliente_id: ID del cliente (tenant)
+        limit: Máximo de filas a eliminar (lote TOP N); None = todas
     
     Returns:
         Número de tokens eliminados
@@ -474,13 +476,15 @@ async def delete_expired_tokens_core(
     from app.infrastructure.database.queries_async import execute_query
     from sqlalchemy import delete
     
-    query = delete(RefreshTokensTable).where(
-        and_(
-            RefreshTokensTable.c.expires_at < func.getdate(),
-            RefreshTokensTable.c.is_revoked == True,
-            RefreshTokensTable.c.cliente_id == cliente_id  # ✅ Filtro explícito + automático
-        )
+    condition = and_(
+        RefreshTokensTable.c.expires_at < func.getdate(),
+        RefreshTokensTable.c.is_revoked == True,
+        RefreshTokensTable.c.cliente_id == cliente_id  # ✅ Filtro explícito + automático
     )
+    if limit:
+        batch = select(RefreshTokensTable.c.token_id).where(condition).limit(limit)
+        condition = RefreshTokensTable.c.token_id.in_(batch)
+    query = delete(RefreshTokensTable).where(condition)
     
     result = await execute_query(query, client_id=cliente_id)
     # execute_query para DELETE retorna [{"rows_affected": N}]
@@ -32,6 +32,7 @@ from app.infrastructure.database.queries.auth.session.user_session_queries_core
     is_session_absolute_expired_core,
     is_session_idle_expired_core,
     list_active_sessions_oldest_first_core,
+    touch_business_activity_batch_core,
     touch_business_activity_core,
     update_session_empresa_core,
     update_session_on_refresh_core,
@@ -66,6 +67,7 @@ __all__ = [
     "revoke_all_user_sessions_tx",
     "revoke_session_tx",
     "rotate_refresh_token_tx",
+    "touch_business_activity_batch_core",
     "touch_business_activity_core",
     "update_current_token_id_core",
     "update_session_empresa_core",
@@ -233,10 +233,14 @@ async def purge_expired_tokens_core(
     cliente_id: UUID,
     *,
     retention_days: int = _DEFAULT_RETENTION_DAYS,
+    limit: Optional[int] = None,
 ) -> int:
     """
     DELETE con política de retención forense (D-04: 90 días usados/revocados).
     También elimina tokens expirados nunca consumidos.
+
+    Con limit, borra como máximo ese número de filas (TOP N por PK): el llamador
+    repite hasta que retorne menos de limit, sin escalar a lock de tabla.
     """
     if retention_days <= 0:
         raise ValidationError(
@@ -247,26 +251,28 @@ async def purge_expired_tokens_core(
     from app.infrastructure.database.queries_async import execute_query
 
     cutoff = _retention_cutoff(retention_days)
-    stmt = delete(RefreshTokensTable).where(
-        and_(
-            RefreshTokensTable.c.cliente_id == cliente_id,
-            or_(
-                and_(
-                    RefreshTokensTable.c.is_used == True,  # noqa: E712
-                    RefreshTokensTable.c.used_at < cutoff,
-                ),
-                and_(
-                    RefreshTokensTable.c.is_revoked == True,  # noqa: E712
-                    RefreshTokensTable.c.revoked_at < cutoff,
-                ),
-                and_(
-                    RefreshTokensTable.c.is_used == False,  # noqa: E712
-                    RefreshTokensTable.c.is_revoked == False,  # noqa: E712
-                    RefreshTokensTable.c.expires_at < func.getdate(),
-                ),
+    condition = and_(
+        RefreshTokensTable.c.cliente_id == cliente_id,
+        or_(
+            and_(
+                RefreshTokensTable.c.is_used == True,  # noqa: E712
+                RefreshTokensTable.c.used_at < cutoff,
             ),
-        )
+            and_(
+                RefreshTokensTable.c.is_revoked == True,  # noqa: E712
+                RefreshTokensTable.c.revoked_at < cutoff,
+            ),
+            and_(
+                RefreshTokensTable.c.is_used == False,  # noqa: E712
+                RefreshTokensTable.c.is_revoked == False,  # noqa: E712
+                RefreshTokensTable.c.expires_at < func.getdate(),
+            ),
+        ),
     )
+    if limit:
+        batch = select(RefreshTokensTable.c.token_id).where(condition).limit(limit)
+        condition = RefreshTokensTable.c.token_id.in_(batch)
+    stmt = delete(RefreshTokensTable).where(condition)
     result = await execute_query(stmt, client_id=cliente_id)
     if result and len(result) > 0:
         return int(result[0].get("rows_affected", 0))
@@ -203,6 +203,43 @@ async def touch_business_activity_core(
     return int(result.get("rows_affected", 0))
 
 
+async def touch_business_activity_batch_core(
+    cliente_id: UUID,
+    session_ids: List[UUID],
+    *,
+    throttle_minutes: int,
+) -> int:
+    """
+    Touch set-based de varias sesiones del tenant (write-behind C05): un UPDATE por
+    lote. Solo filas activas cuyo último touch es más viejo que el throttle (otro
+    worker pudo haberlas actualizado ya).
+    """
+    from app.infrastructure.database.queries_async import execute_update
+
+    if not session_ids:
+        return 0
+    stmt = (
+        update(UserSessionTable)
+        .where(
+            and_(
+                UserSessionTable.c.cliente_id == cliente_id,
+                UserSessionTable.c.session_id.in_(session_ids),
+                UserSessionTable.c.is_active == True,  # noqa: E712
+                (
+                    UserSessionTable.c.last_business_activity_at.is_(None)
+                    | (
+                        UserSessionTable.c.last_business_activity_at
+                        < func.dateadd(text("minute"), -throttle_minutes, func.getdate())
+                    )
+                ),
+            )
+        )
+        .values(last_business_activity_at=func.getdate())
+    )
+    result = await execute_update(stmt, client_id=cliente_id)
+    return int(result.get("rows_affected", 0))
+
+
 async def close_session_core(
     session_id: UUID,
     cliente_id: UUID,
@@ -410,6 +447,7 @@ async def purge_closed_sessions_core(
     *,
     retention_days: int = _DEFAULT_SESSION_RETENTION_DAYS,
     compromised_retention_days: int = _DEFAULT_COMPROMISED_RETENTION_DAYS,
+    limit: Optional[int] = None,
 ) -> int:
     """
     DELETE sesiones cerradas fuera de retención forense (D-04).
@@ -417,6 +455,7 @@ async def purge_closed_sessions_core(
   - Sesiones inactivas con revoked_at anterior al cutoff (90d por defecto).
   - Excluye sesiones con familia comprometida aún dentro de retención SIEM
     (365d por defecto); token_family se elimina en cascada al purgar la sesión.
+  - Con limit, como máximo ese número de sesiones por llamada (lotes TOP N).
     """
     if retention_days <= 0:
         raise ValidationError(
@@ -455,16 +494,18 @@ async def purge_closed_sessions_core(
         .correlate(UserSessionTable)
         .exists()
     )
-    stmt = delete(UserSessionTable).where(
-        and_(
-            UserSessionTable.c.cliente_id == cliente_id,
-            UserSessionTable.c.is_active == False,  # noqa: E712
-            UserSessionTable.c.revoked_at.isnot(None),
-            UserSessionTable.c.revoked_at < session_cutoff,
-            not_(UserSessionTable.c.session_id.in_(protected_sessions)),
-            not_(remaining_tokens),
-        )
+    condition = and_(
+        UserSessionTable.c.cliente_id == cliente_id,
+        UserSessionTable.c.is_active == False,  # noqa: E712
+        UserSessionTable.c.revoked_at.isnot(None),
+        UserSessionTable.c.revoked_at < session_cutoff,
+        not_(UserSessionTable.c.session_id.in_(protected_sessions)),
+        not_(remaining_tokens),
     )
+    if limit:
+        batch = select(UserSessionTable.c.session_id).where(condition).limit(limit)
+        condition = UserSessionTable.c.session_id.in_(batch)
+    stmt = delete(UserSessionTable).where(condition)
     result = await execute_query(stmt, client_id=cliente_id)
     if result and len(result) > 0:
         return int(result[0].get("rows_affected", 0))
@@ -3,6 +3,7 @@ from typing import List, Dict, Any, Optional
 from uuid import UUID
 from sqlalchemy import select, insert, update, and_, or_
 from app.infrastructure.database.tables_erp import BiReporteTable
+from app.infrastructure.database.connection_async import DatabaseConnection
 from app.infrastructure.database.queries_async import execute_query, execute_insert, execute_update
 
 _COLUMNS = {c.name for c in BiReporteTable.c}
@@ -37,7 +38,7 @@ async def list_reporte(
             BiReporteTable.c.codigo_reporte.ilike(f"%{buscar}%"),
         ))
     q = q.order_by(BiReporteTable.c.codigo_reporte)
-    return await execute_query(q, client_id=client_id)
+    return await execute_query(q, client_id=client_id, connection_type=DatabaseConnection.READ)
 
 
 async def get_reporte_by_id(
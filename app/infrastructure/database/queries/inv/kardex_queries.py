@@ -8,6 +8,7 @@ from datetime import date
 from sqlalchemy import select, and_, func
 
 from app.infrastructure.database.tables_erp import InvMovimientoTable, InvMovimientoDetalleTable
+from app.infrastructure.database.connection_async import DatabaseConnection
 from app.infrastructure.database.queries_async import execute_query
 from app.shared.pagination.query_helpers import apply_erp_pagination, apply_erp_sort, extract_count
 
@@ -95,7 +96,7 @@ async def count_kardex(
         .select_from(_KARDEX_JOIN)
         .where(and_(*conditions))
     )
-    result = await execute_query(query, client_id=client_id)
+    result = await execute_query(query, client_id=client_id, connection_type=DatabaseConnection.READ)
     return extract_count(result)
 
 
@@ -134,4 +135,4 @@ async def list_kardex(
     )
     if pagination is not None and pagination.is_paginated:
         query = apply_erp_pagination(query, pagination)
-    return await execute_query(query, client_id=client_id)
+    return await execute_query(query, client_id=client_id, connection_type=DatabaseConnection.READ)
@@ -28,7 +28,9 @@ from app.infrastructure.database.query_helpers import (
     get_table_name_from_query,
     apply_tenant_filter_to_text_clause
 )
-from app.core.exceptions import DatabaseError, ValidationError, SecurityError
+from app.infrastructure.database.sql_text_cache import bind_qmark_params, get_parsed_sql
+from app.infrastructure.database.statement_timeout import execute_with_deadline
+from app.core.exceptions import DatabaseError, ValidationError, SecurityError, RequestTimeoutError
 from app.core.config import settings
 from app.core.security.query_auditor import QueryAuditor
 import logging
@@ -46,6 +48,7 @@ def _get_connection_context(
     Retorna el context manager correcto según el tipo de conexión:
     - ADMIN: get_db_connection(ADMIN)
     - DEFAULT: get_connection_for_tenant() (routing centralizado)
+    - READ: get_connection_for_tenant(read_only=True) (réplica si existe)
     """
     if connection_type == DatabaseConnection.ADMIN:
         return get_db_connection(connection_type)
@@ -62,7 +65,10 @@ def _get_connection_context(
                 except (ValueError, OverflowError):
                     cliente_id_uuid = None
         
-        return get_connection_for_tenant(cliente_id=cliente_id_uuid)
+        return get_connection_for_tenant(
+            cliente_id=cliente_id_uuid,
+            read_only=connection_type == DatabaseConnection.READ
+        )
 
 
 async def execute_query(
@@ -188,7 +194,7 @@ async def execute_query(
         # ✅ FASE 5: Usar routing centralizado
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 
                 # Si es SELECT, obtener resultados
                 if isinstance(query, Select):
@@ -200,6 +206,8 @@ async def execute_query(
                     await session.commit()
                     return [{"rows_affected": result.rowcount}]
                     
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_query async: {str(e)}")
@@ -213,19 +221,8 @@ async def execute_query(
         # ✅ FASE 1 SEGURIDAD: Aplicar filtro automático de tenant a TextClause
         # Obtener nombre de tabla para verificar si es global
         try:
-            # Intentar extraer nombre de tabla del SQL string
             query_str = query.text if hasattr(query, 'text') else str(query)
-            query_lower = query_str.lower()
-            table_name = None
-            
-            # Buscar patrones comunes: "FROM tabla", "UPDATE tabla", etc.
-            for keyword in ["from", "update", "delete from", "insert into"]:
-                if keyword in query_lower:
-                    parts = query_lower.split(keyword, 1)
-                    if len(parts) > 1:
-                        table_part = parts[1].strip().split()[0].strip(";").strip("(")
-                        table_name = table_part
-                        break
+            table_name = get_parsed_sql(query_str).table_guess
         except Exception:
             table_name = None
         
@@ -263,10 +260,12 @@ async def execute_query(
         # ✅ FASE 5: Usar routing centralizado
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 rows = result.fetchall()
                 columns = result.keys()
                 return [dict(zip(columns, row)) for row in rows]
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_query async (TextClause): {str(e)}")
@@ -286,16 +285,7 @@ async def execute_query(
         if not skip_tenant_validation and settings.ENABLE_QUERY_TENANT_VALIDATION:
             try:
                 # Intentar extraer nombre de tabla de la query string
-                table_name = None
-                query_lower = query.lower()
-                # Buscar patrones comunes: "FROM tabla", "UPDATE tabla", etc.
-                for keyword in ["from", "update", "delete from", "insert into"]:
-                    if keyword in query_lower:
-                        parts = query_lower.split(keyword, 1)
-                        if len(parts) > 1:
-                            table_part = parts[1].strip().split()[0].strip(";").strip("(")
-                            table_name = table_part
-                            break
+                table_name = get_parsed_sql(query).table_guess
                 
                 QueryAuditor.validate_tenant_filter(
                     query=query,
@@ -321,39 +311,33 @@ async def execute_query(
                 if isinstance(params, (tuple, list)):
                     if len(params) == 0:
                         logger.warning("execute_query recibió params vacío, ejecutando query sin parámetros")
-                        query = text(query)
+                        query = get_parsed_sql(query).template
                     else:
-                        param_names = [f"param{i}" for i in range(len(params))]
-                        query_text = query
-                        for i, name in enumerate(param_names):
-                            query_text = query_text.replace("?", f":{name}", 1)
-                        params_dict = dict(zip(param_names, params))
-                        query = text(query_text).bindparams(**params_dict)
+                        query = bind_qmark_params(query, params)
                 elif isinstance(params, dict):
                     # Si ya es dict, convertir ? a :param_name
                     if len(params) == 0:
                         logger.warning("execute_query recibió params dict vacío, ejecutando query sin parámetros")
-                        query = text(query)
+                        query = get_parsed_sql(query).template
                     else:
-                        query_text = query
-                        for key in params.keys():
-                            query_text = query_text.replace("?", f":{key}", 1)
-                        query = text(query_text).bindparams(**params)
+                        query = bind_qmark_params(query, params)
                 else:
                     logger.warning(f"execute_query recibió params de tipo inesperado: {type(params)}, ejecutando query sin parámetros")
-                    query = text(query)
+                    query = get_parsed_sql(query).template
             else:
-                query = text(query)
+                query = get_parsed_sql(query).template
         else:
-            query = text(query)
+            query = get_parsed_sql(query).template
         
         # ✅ FASE 5: Usar routing centralizado
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 rows = result.fetchall()
                 columns = result.keys()
                 return [dict(zip(columns, row)) for row in rows]
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_query async (string): {str(e)}")
@@ -389,13 +373,15 @@ async def execute_auth_query(
         # ✅ FASE 5: Usar routing centralizado
         async with _get_connection_context(connection_type) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 row = result.fetchone()
                 
                 if row:
                     columns = result.keys()
                     return dict(zip(columns, row))
                 return None
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_auth_query async: {str(e)}")
@@ -414,16 +400,7 @@ async def execute_auth_query(
         # Intentar extraer nombre de tabla
         try:
             query_str = query.text if hasattr(query, 'text') else str(query)
-            query_lower = query_str.lower()
-            table_name = None
-            
-            for keyword in ["from", "update", "delete from", "insert into"]:
-                if keyword in query_lower:
-                    parts = query_lower.split(keyword, 1)
-                    if len(parts) > 1:
-                        table_part = parts[1].strip().split()[0].strip(";").strip("(")
-                        table_name = table_part
-                        break
+            table_name = get_parsed_sql(query_str).table_guess
         except Exception:
             table_name = None
         
@@ -437,13 +414,15 @@ async def execute_auth_query(
         
         async with _get_connection_context(connection_type) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 row = result.fetchone()
                 
                 if row:
                     columns = result.keys()
                     return dict(zip(columns, row))
                 return None
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_auth_query async (TextClause): {str(e)}")
@@ -462,42 +441,36 @@ async def execute_auth_query(
                 if isinstance(params, (tuple, list)):
                     if len(params) == 0:
                         logger.warning("execute_auth_query recibió params vacío, ejecutando query sin parámetros")
-                        query = text(query)
+                        query = get_parsed_sql(query).template
                     else:
-                        param_names = [f"param{i}" for i in range(len(params))]
-                        query_text = query
-                        for i, name in enumerate(param_names):
-                            query_text = query_text.replace("?", f":{name}", 1)
-                        params_dict = dict(zip(param_names, params))
-                        logger.debug(f"execute_auth_query: convirtiendo ? a parámetros nombrados: {params_dict}")
-                        query = text(query_text).bindparams(**params_dict)
+                        logger.debug(f"execute_auth_query: convirtiendo ? a parámetros nombrados: {params}")
+                        query = bind_qmark_params(query, params)
                 elif isinstance(params, dict):
                     # Si ya es dict, convertir ? a :param_name
                     if len(params) == 0:
                         logger.warning("execute_auth_query recibió params dict vacío, ejecutando query sin parámetros")
-                        query = text(query)
+                        query = get_parsed_sql(query).template
                     else:
-                        query_text = query
-                        for key in params.keys():
-                            query_text = query_text.replace("?", f":{key}", 1)
-                        query = text(query_text).bindparams(**params)
+                        query = bind_qmark_params(query, params)
                 else:
                     logger.warning(f"execute_auth_query recibió params de tipo inesperado: {type(params)}, ejecutando query sin parámetros")
-                    query = text(query)
+                    query = get_parsed_sql(query).template
             else:
-                query = text(query)
+                query = get_parsed_sql(query).template
         else:
-            query = text(query)
+            query = get_parsed_sql(query).template
         
         async with _get_connection_context(connection_type) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 row = result.fetchone()
                 
                 if row:
                     columns = result.keys()
                     return dict(zip(columns, row))
                 return None
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_auth_query async (string): {str(e)}")
@@ -534,7 +507,7 @@ async def execute_insert(
     if isinstance(query, Insert):
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 await session.commit()
                 
                 # Obtener datos insertados si hay OUTPUT
@@ -548,6 +521,8 @@ async def execute_insert(
                 
                 return {"rows_affected": result.rowcount}
                 
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_insert async: {str(e)}")
@@ -562,16 +537,7 @@ async def execute_insert(
         # Intentar extraer nombre de tabla
         try:
             query_str = query.text if hasattr(query, 'text') else str(query)
-            query_lower = query_str.lower()
-            table_name = None
-            
-            for keyword in ["from", "update", "delete from", "insert into"]:
-                if keyword in query_lower:
-                    parts = query_lower.split(keyword, 1)
-                    if len(parts) > 1:
-                        table_part = parts[1].strip().split()[0].strip(";").strip("(")
-                        table_name = table_part
-                        break
+            table_name = get_parsed_sql(query_str).table_guess
         except Exception:
             table_name = None
         
@@ -585,7 +551,7 @@ async def execute_insert(
         
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 await session.commit()
                 
                 if result.returns_rows:
@@ -598,6 +564,8 @@ async def execute_insert(
                 
                 return {"rows_affected": result.rowcount}
                 
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_insert async (TextClause): {str(e)}")
@@ -614,28 +582,20 @@ async def execute_insert(
             if question_marks > 0:
                 # Convertir tupla a dict con nombres param0, param1, etc.
                 if isinstance(params, tuple):
-                    param_names = [f"param{i}" for i in range(len(params))]
-                    query_text = query
-                    for i, name in enumerate(param_names):
-                        query_text = query_text.replace("?", f":{name}", 1)
-                    params_dict = dict(zip(param_names, params))
-                    query = text(query_text).bindparams(**params_dict)
+                    query = bind_qmark_params(query, params)
                 elif isinstance(params, dict):
                     # Si ya es dict, convertir ? a :param_name
-                    query_text = query
-                    for key in params.keys():
-                        query_text = query_text.replace("?", f":{key}", 1)
-                    query = text(query_text).bindparams(**params)
+                    query = bind_qmark_params(query, params)
                 else:
-                    query = text(query)
+                    query = get_parsed_sql(query).template
             else:
-                query = text(query)
+                query = get_parsed_sql(query).template
         else:
-            query = text(query)
+            query = get_parsed_sql(query).template
         
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 await session.commit()
                 
                 if result.returns_rows:
@@ -648,6 +608,8 @@ async def execute_insert(
                 
                 return {"rows_affected": result.rowcount}
                 
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_insert async (string): {str(e)}")
@@ -684,7 +646,7 @@ async def execute_update(
     if isinstance(query, Update):
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 await session.commit()
                 
                 if result.returns_rows:
@@ -697,6 +659,8 @@ async def execute_update(
                 
                 return {"rows_affected": result.rowcount}
                 
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_update async: {str(e)}")
@@ -711,16 +675,7 @@ async def execute_update(
         # Intentar extraer nombre de tabla
         try:
             query_str = query.text if hasattr(query, 'text') else str(query)
-            query_lower = query_str.lower()
-            table_name = None
-            
-            for keyword in ["from", "update", "delete from", "insert into"]:
-                if keyword in query_lower:
-                    parts = query_lower.split(keyword, 1)
-                    if len(parts) > 1:
-                        table_part = parts[1].strip().split()[0].strip(";").strip("(")
-                        table_name = table_part
-                        break
+            table_name = get_parsed_sql(query_str).table_guess
         except Exception:
             table_name = None
         
@@ -734,7 +689,7 @@ async def execute_update(
         
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 await session.commit()
                 
                 if result.returns_rows:
@@ -747,6 +702,8 @@ async def execute_update(
                 
                 return {"rows_affected": result.rowcount}
                 
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_update async (TextClause): {str(e)}")
@@ -763,28 +720,20 @@ async def execute_update(
             if question_marks > 0:
                 # Convertir tupla a dict con nombres param0, param1, etc.
                 if isinstance(params, tuple):
-                    param_names = [f"param{i}" for i in range(len(params))]
-                    query_text = query
-                    for i, name in enumerate(param_names):
-                        query_text = query_text.replace("?", f":{name}", 1)
-                    params_dict = dict(zip(param_names, params))
-                    query = text(query_text).bindparams(**params_dict)
+                    query = bind_qmark_params(query, params)
                 elif isinstance(params, dict):
                     # Si ya es dict, convertir ? a :param_name
-                    query_text = query
-                    for key in params.keys():
-                        query_text = query_text.replace("?", f":{key}", 1)
-                    query = text(query_text).bindparams(**params)
+                    query = bind_qmark_params(query, params)
                 else:
-                    query = text(query)
+                    query = get_parsed_sql(query).template
             else:
-                query = text(query)
+                query = get_parsed_sql(query).template
         else:
-            query = text(query)
+            query = get_parsed_sql(query).template
         
         async with _get_connection_context(connection_type, client_id) as session:
             try:
-                result = await session.execute(query)
+                result = await execute_with_deadline(session, query)
                 await session.commit()
                 
                 if result.returns_rows:
@@ -797,6 +746,8 @@ async def execute_update(
                 
                 return {"rows_affected": result.rowcount}
                 
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 await session.rollback()
                 logger.error(f"Error en execute_update async (string): {str(e)}")
@@ -874,10 +825,12 @@ async def execute_procedure(
         try:
             # Ejecutar stored procedure usando text() con formato SQL Server
             query = text(f"EXEC {procedure_name}")
-            result = await session.execute(query)
+            result = await execute_with_deadline(session, query)
             rows = result.fetchall()
             columns = result.keys()
             return [dict(zip(columns, row)) for row in rows]
+        except RequestTimeoutError:
+            raise
         except Exception as e:
             await session.rollback()
             logger.error(f"Error en execute_procedure async: {str(e)}")
@@ -1018,7 +971,7 @@ async def execute_procedure_params(
             query_str = f"EXEC {procedure_name} {params_str}".strip()
             query = text(query_str)
             
-            result = await session.execute(query, param_bindings)
+            result = await execute_with_deadline(session, query, param_bindings)
             
             # Manejar múltiples result sets si existen
             results = []
@@ -1038,6 +991,8 @@ async def execute_procedure_params(
                     break
             
             return results if results else []
+        except RequestTimeoutError:
+            raise
         except Exception as e:
             await session.rollback()
             logger.error(f"Error en execute_procedure_params async: {str(e)}")
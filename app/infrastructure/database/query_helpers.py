@@ -18,6 +18,8 @@ from app.infrastructure.database.sql_constants import (
     GET_USER_COMPLETE_OPTIMIZED_XML
 )
 from app.core.tenant.context import try_get_current_client_id
+from app.core.security.statement_shape import get_statement_shape
+from app.infrastructure.database.sql_text_cache import get_parsed_sql
 from app.core.exceptions import ValidationError
 from app.core.config import settings
 
@@ -94,8 +96,11 @@ def apply_tenant_filter(
     
     # Aplicar filtro según tipo de query
     if isinstance(query, Select):
-        # Obtener tabla de la query
-        from_clause = query.froms[0] if query.froms else None
+        # Obtener tabla de la query (Table cacheada por forma; otros FROM se resuelven)
+        from_clause = get_statement_shape(query).table
+        if from_clause is None:
+            froms = query.get_final_froms()
+            from_clause = froms[0] if froms else None
         if from_clause is None:
             return query
         
@@ -138,14 +143,9 @@ def get_table_name_from_query(query: ClauseElement) -> Optional[str]:
         Nombre de la tabla o None si no se puede determinar
     """
     try:
-        if isinstance(query, Select):
-            if query.froms:
-                table = query.froms[0]
-                return getattr(table, 'name', None) or str(table)
-        elif isinstance(query, (Update, Delete)):
-            if hasattr(query, 'table'):
-                table = query.table
-                return getattr(table, 'name', None) or str(table)
+        if isinstance(query, (Select, Update, Delete)):
+            # Cacheado por forma de sentencia (ver statement_shape)
+            return get_statement_shape(query).table_name
     except Exception as e:
         logger.debug(f"[TABLE_NAME] Error extrayendo nombre de tabla: {e}")
     
@@ -231,16 +231,17 @@ def apply_tenant_filter_to_text_clause(
     except Exception:
         query_str = str(query)
     
-    query_lower = query_str.lower()
+    # Análisis del texto cacheado (tabla, INSERT, filtro estático, SQL reescrito)
+    parsed = get_parsed_sql(query_str)
     
     # INSERT no lleva WHERE; el cliente_id ya va en VALUES. No aplicar filtro automático.
-    if query_lower.strip().startswith("insert"):
+    if parsed.is_insert:
         logger.debug("[TENANT_FILTER] INSERT detectado, omitiendo filtro (valores explícitos)")
         return query
     
     # Extraer nombre de tabla si no se proporciona
     if table_name is None:
-        table_name = _extract_table_name_from_sql(query_str, query_lower)
+        table_name = parsed.table_name
     
     # Si es tabla global, no aplicar filtro
     if table_name and table_name.lower() in GLOBAL_TABLES:
@@ -248,34 +249,26 @@ def apply_tenant_filter_to_text_clause(
         return query
     
     # Verificar si ya tiene filtro de tenant
-    if _has_tenant_filter(query_str, tenant_column, client_id):
+    if parsed.has_tenant_filter(tenant_column, client_id):
         logger.debug(f"[TENANT_FILTER] TextClause ya tiene filtro de tenant")
         return query
     
     # Agregar filtro de tenant
     try:
-        modified_query_str = _add_tenant_filter_to_sql(
-            query_str, 
-            tenant_column, 
-            client_id
-        )
-        
-        # Obtener parámetros existentes y agregar cliente_id (bindparams puede ser dict-like o método)
-        existing_params = {}
-        bp = getattr(query, "bindparams", None)
-        if bp is not None and not callable(bp) and hasattr(bp, "keys"):
-            try:
-                for key in bp.keys():
-                    val = bp[key]
-                    existing_params[key] = getattr(val, "value", val)
-            except Exception:
-                pass
-        
-        # Agregar cliente_id a los parámetros
-        existing_params[tenant_column] = client_id
+        template = parsed.filtered_template(tenant_column)
+        if template is None:
+            logger.warning(
+                f"[TENANT_FILTER] No se pudo aplicar filtro automático a TextClause. "
+                f"Query: {query_str[:200]}..."
+            )
+            return query
         
-        # Crear nuevo TextClause con filtro agregado
-        new_query = text(modified_query_str).bindparams(**existing_params)
+        # Conservar los parámetros ya ligados al TextClause original y agregar cliente_id
+        existing_binds = [
+            bind for key, bind in getattr(query, "_bindparams", {}).items()
+            if key != tenant_column
+        ]
+        new_query = template.bindparams(*existing_binds, **{tenant_column: client_id})
         
         logger.debug(
             f"[TENANT_FILTER] Filtro de tenant agregado automáticamente a TextClause. "
@@ -0,0 +1,153 @@
+# app/infrastructure/database/read_routing.py
+"""
+Routing de lecturas a réplicas (DatabaseConnection.READ).
+
+Origen de las réplicas:
+- Por tenant: filas activas de cliente_conexion con es_solo_lectura=1 y
+  es_conexion_principal=0 (routing.py las carga en la metadata como "read_replicas").
+- Tenants en BD compartida sin réplica propia: DB_READ_REPLICA_SERVER
+  (misma BD y credenciales que la primaria).
+
+Se usa la primaria cuando:
+- El tenant no tiene réplica o ENABLE_READ_REPLICAS=false
+- La réplica falló hace menos de DB_READ_REPLICA_RETRY_SECONDS
+- El request ya hizo commit en la primaria (read-your-writes)
+- No hay TenantContext (sin request no hay forma de saber si hubo escrituras)
+
+Read-your-writes: cada commit de una sesión que no es de réplica marca el
+TenantContext del request (wrote_primary). El TenantContext es un objeto mutable
+compartido por las tareas hijas del request, así que la marca también se ve desde
+asyncio.gather/create_task.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tenant.context import try_get_tenant_context
+
+logger = logging.getLogger(__name__)
+
+# Clave en Session.info para sesiones abiertas contra una réplica
+READ_REPLICA_SESSION_KEY = "read_replica"
+
+_unavailable_until: Dict[str, float] = {}
+_unavailable_lock = threading.Lock()
+
+
+# ============================================
+# READ-YOUR-WRITES
+# ============================================
+
+def mark_primary_write() -> None:
+    """Marca el request actual como 'escribió en la primaria'."""
+    ctx = try_get_tenant_context()
+    if ctx is not None and not ctx.wrote_primary:
+        ctx.wrote_primary = True
+
+
+def has_primary_write() -> bool:
+    """True si el request actual ya hizo commit en la primaria."""
+    ctx = try_get_tenant_context()
+    return ctx is not None and ctx.wrote_primary
+
+
+def _on_session_commit(session: Session) -> None:
+    if not session.info.get(READ_REPLICA_SESSION_KEY):
+        mark_primary_write()
+
+
+# Listener a nivel de clase: cubre las AsyncSession (su sync_session es una Session)
+# sin registrar nada por sesión.
+event.listen(Session, "after_commit", _on_session_commit)
+
+
+# ============================================
+# SELECCIÓN DE RÉPLICA
+# ============================================
+
+def get_read_replica_candidates(metadata: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Réplicas configuradas para el tenant según su metadata de conexión.
+
+    Cada réplica es un dict con servidor, puerto, nombre_bd, usuario y password.
+    """
+    metadata = metadata or {}
+    replicas = metadata.get("read_replicas") or []
+    if replicas:
+        return list(replicas)
+
+    if metadata.get("database_type", "single") != "multi" and settings.DB_READ_REPLICA_SERVER:
+        return [{
+            "servidor": settings.DB_READ_REPLICA_SERVER,
+            "puerto": settings.DB_READ_REPLICA_PORT,
+            "nombre_bd": settings.DB_DATABASE,
+            "usuario": settings.DB_USER,
+            "password": settings.DB_PASSWORD,
+            "shared": True,
+        }]
+    return []
+
+
+def replica_engine_key(client_id: Optional[Union[int, UUID]], replica: Dict[str, Any]) -> str:
+    """
+    Clave del engine de réplica. La réplica de la BD compartida tiene un único pool
+    para todos los tenants shared; las réplicas dedicadas, uno por tenant y servidor.
+    """
+    endpoint = f"{replica.get('servidor')}:{replica.get('puerto') or 1433}"
+    if replica.get("shared"):
+        return f"read_shared_{endpoint}"
+    return f"read_tenant_{client_id}_{endpoint}"
+
+
+def is_replica_available(engine_key: str) -> bool:
+    until = _unavailable_until.get(engine_key)
+    if until is None:
+        return True
+    if time.monotonic() >= until:
+        with _unavailable_lock:
+            _unavailable_until.pop(engine_key, None)
+        return True
+    return False
+
+
+def mark_replica_unavailable(engine_key: str, reason: Any = None) -> None:
+    """Saca la réplica de rotación durante DB_READ_REPLICA_RETRY_SECONDS."""
+    with _unavailable_lock:
+        _unavailable_until[engine_key] = time.monotonic() + settings.DB_READ_REPLICA_RETRY_SECONDS
+    logger.warning(
+        f"[READ_REPLICA] Réplica {engine_key} no disponible ({reason}). "
+        f"Lecturas a la primaria durante {settings.DB_READ_REPLICA_RETRY_SECONDS}s"
+    )
+
+
+def select_read_replica(
+    client_id: Optional[Union[int, UUID]],
+    metadata: Optional[Dict[str, Any]],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    (engine_key, réplica) a usar para una lectura READ, o None para ir a la primaria.
+    """
+    if not settings.ENABLE_READ_REPLICAS:
+        return None
+    ctx = try_get_tenant_context()
+    if ctx is None or ctx.wrote_primary:
+        return None
+
+    for replica in get_read_replica_candidates(metadata):
+        engine_key = replica_engine_key(client_id, replica)
+        if is_replica_available(engine_key):
+            return engine_key, replica
+    return None
+
+
+def reset_replica_state() -> None:
+    """Vuelve a poner todas las réplicas en rotación (tests / cambio de configuración)."""
+    with _unavailable_lock:
+        _unavailable_until.clear()
@@ -0,0 +1,217 @@
+# app/infrastructure/database/sql_text_cache.py
+"""
+Cache de SQL textual parseado (TextClause y strings).
+
+Las rutas TextClause/string de queries_async pasan el mismo SQL miles de veces por
+el mismo análisis: lower() + split para adivinar la tabla, regex para detectar el
+filtro de tenant, finditer/find para reescribirlo, conversión de '?' a :paramN y
+text() (que vuelve a escanear el SQL buscando parámetros).
+
+ParsedSql guarda todo lo que solo depende del texto; por llamada queda el binding
+de parámetros sobre un TextClause plantilla (bindparams() es generativo y no
+modifica la plantilla). Lo que depende de client_id (filtro con valor literal) se
+evalúa en cada llamada.
+
+Acotado por SQL_TEXT_CACHE_SIZE (LRU; 0 = sin cache).
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import TextClause, text
+
+from app.core.config import settings
+
+# Patrones estáticos de filtro de tenant (ver query_helpers._has_tenant_filter)
+_STATIC_FILTER_PATTERNS = (
+    "{col}\\s*=\\s*:{col}",
+    "{col}\\s*=\\s*:client_id",
+)
+# Patrones con el valor literal de client_id: dependen de cada llamada
+_VALUE_FILTER_PATTERNS = (
+    "{col}\\s*=\\s*{value}",
+    "{col}\\s*=\\s*'{value}'",
+    "{col}\\s*=\\s*\"{value}\"",
+)
+
+_NOT_COMPUTED = object()
+
+
+def guess_table_name(query_lower: str) -> Optional[str]:
+    """
+    Heurística de execute_query: primera palabra tras el primer keyword encontrado
+    (en orden from, update, delete from, insert into).
+    """
+    for keyword in ["from", "update", "delete from", "insert into"]:
+        if keyword in query_lower:
+            parts = query_lower.split(keyword, 1)
+            if len(parts) > 1:
+                return parts[1].strip().split()[0].strip(";").strip("(")
+    return None
+
+
+def qmark_to_named(sql: str, names: Tuple[str, ...]) -> str:
+    """
+    Reemplaza los primeros len(names) '?' por :name, en orden.
+
+    Equivale a aplicar str.replace("?", f":{name}", 1) por cada nombre, en una sola
+    pasada (lineal en el largo del SQL).
+    """
+    parts = sql.split("?")
+    count = min(len(names), len(parts) - 1)
+    if count == 0:
+        return sql
+    pieces = []
+    for i in range(count):
+        pieces.append(parts[i])
+        pieces.append(f":{names[i]}")
+    return "".join(pieces) + "?".join(parts[count:])
+
+
+class ParsedSql:
+    """Análisis del SQL textual que no depende de los valores de la llamada."""
+
+    __slots__ = (
+        "sql", "lower", "is_insert", "table_guess", "_table_name",
+        "_static_filter", "_filtered", "_named", "_template", "_lock",
+    )
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.lower = sql.lower()
+        self.is_insert = self.lower.strip().startswith("insert")
+        self.table_guess = guess_table_name(self.lower)
+        self._table_name: Any = _NOT_COMPUTED
+        self._static_filter: Dict[str, bool] = {}
+        self._filtered: Dict[str, Optional[TextClause]] = {}
+        self._named: Dict[Tuple[str, ...], TextClause] = {}
+        self._template: Optional[TextClause] = None
+        self._lock = threading.Lock()
+
+    @property
+    def table_name(self) -> Optional[str]:
+        """Tabla principal según query_helpers._extract_table_name_from_sql."""
+        if self._table_name is _NOT_COMPUTED:
+            from app.infrastructure.database.query_helpers import _extract_table_name_from_sql
+            self._table_name = _extract_table_name_from_sql(self.sql, self.lower)
+        return self._table_name
+
+    @property
+    def template(self) -> TextClause:
+        """text(sql) sin parámetros ligados."""
+        if self._template is None:
+            self._template = text(self.sql)
+        return self._template
+
+    def has_tenant_filter(self, tenant_column: str, client_id: Union[int, UUID]) -> bool:
+        """Mismo criterio que query_helpers._has_tenant_filter."""
+        static = self._static_filter.get(tenant_column)
+        if static is None:
+            static = any(
+                re.search(p.format(col=tenant_column), self.sql, re.IGNORECASE)
+                for p in _STATIC_FILTER_PATTERNS
+            )
+            self._static_filter[tenant_column] = static
+        if static:
+            return True
+        value = str(client_id)
+        if value.lower() not in self.lower:
+            return False
+        return any(
+            re.search(p.format(col=tenant_column, value=value), self.sql, re.IGNORECASE)
+            for p in _VALUE_FILTER_PATTERNS
+        )
+
+    def filtered_template(self, tenant_column: str) -> Optional[TextClause]:
+        """
+        text() del SQL con "AND/WHERE {tenant_column} = :{tenant_column}" agregado,
+        o None si no se pudo ubicar dónde insertarlo.
+        """
+        if tenant_column not in self._filtered:
+            from app.infrastructure.database.query_helpers import _add_tenant_filter_to_sql
+            modified = _add_tenant_filter_to_sql(self.sql, tenant_column, None)
+            with self._lock:
+                self._filtered[tenant_column] = text(modified) if modified != self.sql else None
+        return self._filtered[tenant_column]
+
+    def named_template(self, names: Tuple[str, ...]) -> TextClause:
+        """text() del SQL con los '?' convertidos a :name (ver qmark_to_named)."""
+        template = self._named.get(names)
+        if template is None:
+            template = text(qmark_to_named(self.sql, names))
+            with self._lock:
+                self._named[names] = template
+        return template
+
+
+class SqlTextCache:
+    """LRU acotado SQL → ParsedSql (thread-safe)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, ParsedSql]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sql: str) -> ParsedSql:
+        if self.max_size <= 0:
+            return ParsedSql(sql)
+        with self._lock:
+            parsed = self._entries.get(sql)
+            if parsed is not None:
+                self._entries.move_to_end(sql)
+                self.hits += 1
+                return parsed
+        parsed = ParsedSql(sql)
+        with self._lock:
+            self.misses += 1
+            self._entries[sql] = parsed
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_sql_text_cache = SqlTextCache(settings.SQL_TEXT_CACHE_SIZE)
+
+
+def get_parsed_sql(sql: str) -> ParsedSql:
+    """ParsedSql cacheado para el texto SQL."""
+    return _sql_text_cache.get(sql)
+
+
+def get_sql_text_cache() -> SqlTextCache:
+    return _sql_text_cache
+
+
+def bind_qmark_params(
+    sql: str,
+    params: Union[Tuple[Any, ...], list, Dict[str, Any]],
+) -> TextClause:
+    """
+    TextClause con los '?' convertidos a parámetros nombrados y ligados.
+
+    - tupla/lista → param0, param1, ...
+    - dict → las claves en orden, una por '?'
+    """
+    parsed = get_parsed_sql(sql)
+    if isinstance(params, dict):
+        return parsed.named_template(tuple(params.keys())).bindparams(**params)
+    names = tuple(f"param{i}" for i in range(len(params)))
+    return parsed.named_template(names).bindparams(**dict(zip(names, params)))
@@ -0,0 +1,118 @@
+# app/infrastructure/database/statement_timeout.py
+"""
+Ejecución de sentencias acotada por el deadline del request.
+
+Dos niveles de corte:
+
+1. Timeout del driver: pyodbc aplica `Connection.timeout` (segundos, SQL_ATTR_QUERY_TIMEOUT)
+   a cada cursor nuevo; al vencer, el driver cancela la sentencia en SQL Server
+   (SQLSTATE HYT00) y la conexión queda utilizable. Es el corte principal.
+2. Cancelación asyncio: si el driver no corta (u otro driver sin timeout),
+   asyncio.wait_for cancela la espera tras REQUEST_DEADLINE_GRACE_SECONDS extra y la
+   conexión se invalida (no vuelve al pool con una sentencia a medias). El cierre
+   espera a que el hilo del driver la libere, por eso el timeout del driver va primero.
+
+Al terminar, el timeout del driver vuelve a 0 (sin límite): la conexión regresa
+al pool igual que salió.
+"""
+
+import asyncio
+import math
+from typing import Any, Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import RequestTimeoutError
+from app.core.metrics.request_deadline import record_deadline_timeout, remaining_seconds
+
+_QUERY_TIMEOUT_SQLSTATE = "HYT00"
+_DRIVER_ATTRS = ("dbapi_connection", "_connection", "_conn")
+
+
+def _timeout_writable(obj: Any) -> bool:
+    """
+    True si `obj.timeout` admite asignación: data descriptor con setter (el getset de
+    pyodbc) o atributo entero de instancia/clase. Un property de solo lectura no cuenta:
+    aioodbc.Connection.timeout delega en la conexión pyodbc pero no tiene setter.
+    """
+    descriptor = getattr(type(obj), "timeout", None)
+    if isinstance(descriptor, property):
+        return descriptor.fset is not None
+    if descriptor is not None and hasattr(type(descriptor), "__set__"):
+        return True
+    return isinstance(getattr(obj, "timeout", None), int)
+
+
+def _driver_connection(raw_connection: Any) -> Optional[Any]:
+    """Conexión del driver con `timeout` asignable (pyodbc) bajo los adaptadores async; None si no hay."""
+    current = raw_connection
+    for _ in range(len(_DRIVER_ATTRS) + 1):
+        if _timeout_writable(current):
+            return current
+        current = next(
+            (getattr(current, attr) for attr in _DRIVER_ATTRS if getattr(current, attr, None) is not None),
+            None,
+        )
+        if current is None:
+            return None
+    return None
+
+
+def _is_driver_timeout(error: DBAPIError) -> bool:
+    args = getattr(error.orig, "args", ()) or ()
+    return bool(args) and str(args[0]) == _QUERY_TIMEOUT_SQLSTATE
+
+
+def _deadline_error() -> RequestTimeoutError:
+    return RequestTimeoutError(
+        detail="La operación excedió el tiempo máximo permitido para la solicitud."
+    )
+
+
+async def execute_with_deadline(session: AsyncSession, statement: Any, params: Any = None) -> Any:
+    """
+    session.execute() acotado por el tiempo restante del request.
+
+    Sin deadline activo (o con REQUEST_DEADLINE_ENABLED=false) equivale a session.execute().
+
+    Raises:
+        RequestTimeoutError: Si el deadline venció antes o durante la sentencia.
+    """
+    remaining = remaining_seconds() if settings.REQUEST_DEADLINE_ENABLED else None
+    if remaining is None:
+        return await session.execute(statement, params)
+    if remaining <= 0:
+        record_deadline_timeout("expired_before")
+        raise _deadline_error()
+
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    driver = _driver_connection(raw)
+    if driver is not None:
+        try:
+            driver.timeout = max(1, math.ceil(remaining))
+        except (AttributeError, TypeError):
+            # Driver que no acepta el timeout: queda solo el corte por asyncio
+            driver = None
+
+    try:
+        return await asyncio.wait_for(
+            session.execute(statement, params),
+            remaining + settings.REQUEST_DEADLINE_GRACE_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        # La sentencia puede seguir viva en el servidor: la conexión no vuelve al pool
+        driver = None
+        await session.invalidate()
+        record_deadline_timeout("cancelled")
+        raise _deadline_error()
+    except DBAPIError as e:
+        if not _is_driver_timeout(e):
+            raise
+        record_deadline_timeout("driver")
+        raise _deadline_error() from e
+    finally:
+        if driver is not None:
+            driver.timeout = 0
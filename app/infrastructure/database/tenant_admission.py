@@ -0,0 +1,255 @@
+# app/infrastructure/database/tenant_admission.py
+"""
+Control de admisión por tenant para el acceso a BD.
+
+Un tenant corriendo reportes pesados o movimientos masivos puede ocupar todas
+las conexiones y dejar sin servicio al resto. Cada sesión tenant de
+get_db_connection (DEFAULT/READ; ADMIN no pasa por aquí) ocupa un slot:
+
+- Límite por tenant: TENANT_DB_MAX_CONCURRENCY × peso del plan
+  (TENANT_PLAN_CONCURRENCY_WEIGHTS, ej. "trial:0.5,basico:1,enterprise:4").
+- Límite global: TENANT_DB_GLOBAL_MAX_CONCURRENCY sesiones de todos los tenants.
+- Sin slot libre el request espera en la cola de su tenant hasta
+  TENANT_DB_QUEUE_TIMEOUT_SECONDS; con TENANT_DB_MAX_QUEUE esperando ya, se rechaza
+  de inmediato. Ambos casos → 503 (ServiceError, TENANT_DB_CONCURRENCY_LIMIT).
+- Reparto justo: los slots liberados se asignan en round-robin entre los tenants
+  con cola, no por orden de llegada global (un tenant con 200 requests en cola no
+  hace esperar a otro con 1).
+
+Reentrante solo en la misma tarea: las sesiones anidadas del mismo tenant no
+piden otro slot (un request no se bloquea a sí mismo). Las tareas hijas
+(gather/create_task) heredan el ContextVar pero no el slot: cada una pide el
+suyo, así el fan-out de un request no supera el límite del tenant.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, FrozenSet, Optional, Tuple, Union
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.exceptions import ServiceError
+from app.core.tenant.context import try_get_tenant_context
+
+logger = logging.getLogger(__name__)
+
+# (tenant, tarea que tomó el slot): las tareas hijas copian el contexto, la tarea no coincide
+_held_slots: ContextVar[FrozenSet[Tuple[str, Optional[asyncio.Task]]]] = ContextVar(
+    "tenant_db_held_slots", default=frozenset()
+)
+
+
+@lru_cache(maxsize=8)
+def parse_plan_weights(raw: str) -> Dict[str, float]:
+    """'trial:0.5,basico:1' → {'trial': 0.5, 'basico': 1.0}; entradas inválidas se ignoran."""
+    weights: Dict[str, float] = {}
+    for item in raw.split(","):
+        plan, _, weight = item.partition(":")
+        try:
+            weights[plan.strip().lower()] = float(weight)
+        except ValueError:
+            if item.strip():
+                logger.warning(f"[TENANT_ADMISSION] Peso de plan inválido ignorado: '{item}'")
+    return weights
+
+
+def tenant_concurrency_limit(plan_suscripcion: Optional[str] = None) -> int:
+    """Sesiones simultáneas permitidas para un tenant según su plan (peso 1 si es desconocido)."""
+    weights = parse_plan_weights(settings.TENANT_PLAN_CONCURRENCY_WEIGHTS)
+    weight = weights.get((plan_suscripcion or "").strip().lower(), 1.0)
+    return max(1, round(settings.TENANT_DB_MAX_CONCURRENCY * weight))
+
+
+class _TenantQueue:
+    """Slots en uso, cola de espera y contadores de un tenant."""
+
+    __slots__ = (
+        "active", "limit", "waiters", "admitted", "rejected", "timeouts",
+        "max_queue_depth", "wait_total_ms", "wait_max_ms", "waited",
+    )
+
+    def __init__(self, limit: int):
+        self.active = 0
+        self.limit = limit
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.max_queue_depth = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.waited = 0
+
+    def queued(self) -> int:
+        return sum(1 for waiter in self.waiters if not waiter.done())
+
+
+class TenantAdmissionController:
+    """
+    Semáforo por tenant + semáforo global con reparto round-robin.
+
+    Todo ocurre en el event loop (sin locks): acquire/release/_dispatch no
+    ceden el control entre leer y modificar el estado.
+    """
+
+    def __init__(self):
+        self._tenants: Dict[str, _TenantQueue] = {}
+        self._ready: Deque[str] = deque()  # Tenants con cola, en orden de turno
+        self._global_active = 0
+
+    def _state(self, key: str, limit: int) -> _TenantQueue:
+        state = self._tenants.get(key)
+        if state is None:
+            state = self._tenants[key] = _TenantQueue(limit)
+        else:
+            state.limit = limit
+        return state
+
+    async def acquire(self, key: str, limit: int, timeout: float) -> None:
+        state = self._state(key, limit)
+        if state.queued() >= settings.TENANT_DB_MAX_QUEUE:
+            state.rejected += 1
+            logger.warning(
+                f"[TENANT_ADMISSION] Cola llena para tenant {key} "
+                f"({state.active}/{state.limit} en uso, {state.queued()} en espera)"
+            )
+            raise self._limit_error()
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        if key not in self._ready:
+            self._ready.append(key)
+        self._dispatch()
+        if waiter.done():
+            state.admitted += 1
+            return
+
+        state.max_queue_depth = max(state.max_queue_depth, state.queued())
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            state.timeouts += 1
+            logger.warning(
+                f"[TENANT_ADMISSION] Timeout ({timeout}s) esperando slot de BD para tenant {key} "
+                f"({state.active}/{state.limit} en uso, {state.queued()} en espera)"
+            )
+            raise self._limit_error()
+        except asyncio.CancelledError:
+            # Slot concedido justo cuando el llamador fue cancelado: devolverlo
+            if waiter.done() and not waiter.cancelled():
+                self.release(key)
+            raise
+        wait_ms = (time.perf_counter() - start) * 1000
+        state.admitted += 1
+        state.waited += 1
+        state.wait_total_ms += wait_ms
+        state.wait_max_ms = max(state.wait_max_ms, wait_ms)
+
+    def release(self, key: str) -> None:
+        state = self._tenants[key]
+        state.active -= 1
+        self._global_active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Concede slots libres a los tenants con cola, uno por turno."""
+        global_limit = settings.TENANT_DB_GLOBAL_MAX_CONCURRENCY
+        blocked = 0
+        while self._ready and blocked < len(self._ready):
+            if global_limit > 0 and self._global_active >= global_limit:
+                return
+            key = self._ready.popleft()
+            state = self._tenants[key]
+            while state.waiters and state.waiters[0].done():
+                state.waiters.popleft()  # Cancelados por timeout
+            if not state.waiters:
+                continue
+            if state.active >= state.limit:
+                self._ready.append(key)
+                blocked += 1
+                continue
+            state.active += 1
+            self._global_active += 1
+            state.waiters.popleft().set_result(None)
+            blocked = 0
+            if state.waiters:
+                self._ready.append(key)
+
+    @staticmethod
+    def _limit_error() -> ServiceError:
+        return ServiceError(
+            status_code=503,
+            detail="Demasiadas operaciones concurrentes de base de datos para esta organización. Reintente en unos segundos.",
+            internal_code="TENANT_DB_CONCURRENCY_LIMIT",
+        )
+
+    def report(self) -> Dict[str, Any]:
+        tenants = []
+        for key, state in self._tenants.items():
+            tenants.append({
+                "tenant": key,
+                "active": state.active,
+                "limit": state.limit,
+                "queued": state.queued(),
+                "max_queue_depth": state.max_queue_depth,
+                "admitted": state.admitted,
+                "rejected": state.rejected,
+                "timeouts": state.timeouts,
+                "wait_avg_ms": round(state.wait_total_ms / state.waited, 3) if state.waited else 0.0,
+                "wait_max_ms": round(state.wait_max_ms, 3),
+            })
+        tenants.sort(key=lambda t: (t["queued"], t["rejected"] + t["timeouts"]), reverse=True)
+        return {
+            "enabled": settings.TENANT_ADMISSION_ENABLED,
+            "global_active": self._global_active,
+            "global_limit": settings.TENANT_DB_GLOBAL_MAX_CONCURRENCY,
+            "tenants": tenants,
+        }
+
+    def reset(self) -> None:
+        self._tenants.clear()
+        self._ready.clear()
+        self._global_active = 0
+
+
+_controller = TenantAdmissionController()
+
+
+@asynccontextmanager
+async def tenant_db_slot(client_id: Optional[Union[int, UUID]]) -> AsyncIterator[None]:
+    """
+    Ocupa un slot de BD del tenant durante el bloque (no-op sin tenant, si esta
+    misma tarea ya tiene uno tomado o con TENANT_ADMISSION_ENABLED=false).
+    """
+    key = str(client_id) if client_id is not None else None
+    held = _held_slots.get()
+    holder = (key, asyncio.current_task())
+    if not settings.TENANT_ADMISSION_ENABLED or key is None or holder in held:
+        yield
+        return
+
+    ctx = try_get_tenant_context()
+    plan = getattr(ctx, "plan_suscripcion", None) if ctx is not None and str(ctx.client_id) == key else None
+    await _controller.acquire(key, tenant_concurrency_limit(plan), settings.TENANT_DB_QUEUE_TIMEOUT_SECONDS)
+    token = _held_slots.set(held | {holder})
+    try:
+        yield
+    finally:
+        _held_slots.reset(token)
+        _controller.release(key)
+
+
+def get_tenant_admission_report() -> Dict[str, Any]:
+    """Slots en uso, profundidad de cola y rechazos por tenant."""
+    return _controller.report()
+
+
+def reset_tenant_admission() -> None:
+    """Limpia estado y contadores (tests)."""
+    _controller.reset()
@@ -26,6 +26,9 @@ logger = logging.getLogger(__name__)
 _redis_client: Optional[aioredis.Redis] = None
 _redis_enabled: bool = False
 
+# Intentos de SETEX+PUBLISH (una transacción MULTI) al revocar un token
+_BLACKLIST_WRITE_ATTEMPTS = 3
+
 
 async def _get_redis_client() -> Optional[aioredis.Redis]:
     """
@@ -176,6 +179,10 @@ class RedisService:
         if expire_seconds <= 0:
             logger.warning(f"[REDIS_BLACKLIST] TTL inválido para jti {jti}: {expire_seconds}")
             return False
+
+        # Filtro local de este worker: la revocación rige aquí aunque Redis falle
+        from app.infrastructure.redis.revocation_filter import REVOCATION_CHANNEL, get_revocation_filter
+        get_revocation_filter().add(jti, expire_seconds)
         
         client = await _get_redis_client()
         if not client:
@@ -186,24 +193,32 @@ class RedisService:
             )
             return False
         
-        try:
-            key = f"{RedisService.BLACKLIST_PREFIX}{jti}"
-            # Guardar con TTL (expira automáticamente)
-            await client.setex(key, expire_seconds, "revoked")
-            
-            logger.info(
-                f"[REDIS_BLACKLIST] Token revocado: jti={jti}, "
-                f"TTL={expire_seconds}s (expira en {expire_seconds // 60} min)"
-            )
-            return True
-            
-        except Exception as e:
-            logger.error(
-                f"[REDIS_BLACKLIST] Error agregando token a blacklist (jti={jti}): {e}. "
-                "Continuando sin blacklist (fail-soft)",
-                exc_info=True
-            )
-            return False
+        key = f"{RedisService.BLACKLIST_PREFIX}{jti}"
+        last_error: Optional[Exception] = None
+        for _ in range(_BLACKLIST_WRITE_ATTEMPTS):
+            try:
+                # SETEX y PUBLISH en la misma transacción: o se guardan ambos o ninguno.
+                # Una clave sin aviso dejaría a los demás workers con un negativo local
+                # "seguro" para este jti hasta el próximo rebuild del filtro.
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.setex(key, expire_seconds, "revoked")
+                    pipe.publish(REVOCATION_CHANNEL, f"{jti}|{expire_seconds}")
+                    await pipe.execute()
+
+                logger.info(
+                    f"[REDIS_BLACKLIST] Token revocado: jti={jti}, "
+                    f"TTL={expire_seconds}s (expira en {expire_seconds // 60} min)"
+                )
+                return True
+            except Exception as e:
+                last_error = e
+
+        logger.error(
+            f"[REDIS_BLACKLIST] Error agregando token a blacklist (jti={jti}) tras "
+            f"{_BLACKLIST_WRITE_ATTEMPTS} intentos: {last_error}. Continuando sin blacklist (fail-soft)",
+            exc_info=last_error
+        )
+        return False
     
     @staticmethod
     async def is_token_blacklisted(jti: str) -> bool:
@@ -350,6 +365,31 @@ class RedisService:
             logger.warning("[REDIS] Error eliminando key=%s: %s", key, e)
             return False
 
+    @staticmethod
+    async def incr(key: str) -> Optional[int]:
+        """Incrementa un contador; None si Redis no está disponible (fail-soft)."""
+        client = await _get_redis_client()
+        if not client:
+            return None
+        try:
+            return int(await client.incr(key))
+        except Exception as e:
+            logger.warning("[REDIS] Error en incr key=%s: %s", key, e)
+            return None
+
+    @staticmethod
+    async def mget_ints(keys: list[str]) -> Optional[list[int]]:
+        """Lee varios contadores (0 si no existen); None si Redis no está disponible (fail-soft)."""
+        client = await _get_redis_client()
+        if not client:
+            return None
+        try:
+            values = await client.mget(keys)
+            return [int(v) if v is not None else 0 for v in values]
+        except Exception as e:
+            logger.warning("[REDIS] Error en mget keys=%s: %s", keys, e)
+            return None
+
     @staticmethod
     def is_redis_available() -> bool:
         """
@@ -0,0 +1,265 @@
+# app/infrastructure/redis/revocation_filter.py
+"""
+Filtro local de revocación de access tokens (por worker).
+
+get_current_user_data verificaba la blacklist con un EXISTS en Redis en cada
+request autenticado. Casi todos los tokens NO están revocados, así que este
+módulo responde localmente los negativos seguros:
+
+- Bloom filter con todos los jti revocados vigentes: si el jti no está, el token
+  seguro no está revocado (sin falsos negativos) → sin ida a Redis.
+- Set de revocaciones recientes (jti → expiración): positivo seguro, también local.
+- Solo un "posible positivo" del Bloom (o un filtro aún no sincronizado) consulta
+  Redis como antes.
+
+Sincronización: una tarea de fondo se suscribe al canal REVOCATION_CHANNEL y
+DESPUÉS carga las claves blacklist:token:* con SCAN (lo publicado durante la carga
+queda en el buffer del pub/sub, no se pierde). set_token_blacklist publica cada
+revocación en el canal. Si la suscripción se cae, el filtro deja de estar listo
+(todo va a Redis) hasta resincronizar. Cada REVOCATION_FILTER_REBUILD_SECONDS se
+reconstruye el Bloom para descartar jti ya expirados.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "blacklist:revocations"
+_RETRY_SECONDS = 5.0
+
+
+class BloomFilter:
+    """Bloom filter sobre bytearray con doble hashing (blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationFilter:
+    """Bloom + revocaciones recientes, alimentados por Redis pub/sub."""
+
+    def __init__(self, capacity: int, error_rate: float, recent_max: int):
+        self.error_rate = error_rate
+        self.recent_max = recent_max
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._recent: Dict[str, float] = {}
+        self.ready = False
+        self.last_sync: Optional[float] = None
+        self.stats: Dict[str, int] = {
+            "local_negative": 0,
+            "local_positive": 0,
+            "redis_checks": 0,
+            "false_positives": 0,
+            "messages": 0,
+            "syncs": 0,
+        }
+
+    def add(self, jti: str, ttl_seconds: Optional[int] = None) -> None:
+        """Registra una revocación (local o recibida del canal)."""
+        from app.core.security.jwt_cache import purge_revoked_jti
+
+        ttl = ttl_seconds if ttl_seconds and ttl_seconds > 0 else settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        purge_revoked_jti(jti)
+        self._bloom.add(jti)
+        self._recent.pop(jti, None)
+        self._recent[jti] = time.time() + ttl
+        if len(self._recent) > self.recent_max:
+            self._prune_recent()
+
+    def _prune_recent(self) -> None:
+        now = time.time()
+        for jti in [j for j, expires_at in self._recent.items() if expires_at <= now]:
+            del self._recent[jti]
+        # Siguen en el Bloom: un jti expulsado del set solo cuesta una ida a Redis
+        while len(self._recent) > self.recent_max:
+            del self._recent[next(iter(self._recent))]
+
+    def check_local(self, jti: str) -> Optional[bool]:
+        """True/False si se resuelve localmente; None si hay que consultar Redis."""
+        expires_at = self._recent.get(jti)
+        if expires_at is not None and expires_at > time.time():
+            self.stats["local_positive"] += 1
+            return True
+        if self.ready and jti not in self._bloom:
+            self.stats["local_negative"] += 1
+            return False
+        return None
+
+    async def is_revoked(self, jti: str) -> bool:
+        local = self.check_local(jti)
+        if local is not None:
+            return local
+        from app.infrastructure.redis.client import RedisService
+
+        self.stats["redis_checks"] += 1
+        revoked = await RedisService.is_token_blacklisted(jti)
+        if revoked:
+            self.add(jti)
+        elif self.ready:
+            self.stats["false_positives"] += 1
+        return revoked
+
+    def on_message(self, data: Any) -> None:
+        """Mensaje del canal: "<jti>" o "<jti>|<ttl>"."""
+        if isinstance(data, bytes):
+            data = data.decode()
+        jti, _, ttl = str(data).partition("|")
+        if not jti:
+            return
+        self.stats["messages"] += 1
+        self.add(jti, int(ttl) if ttl.isdigit() else None)
+
+    async def rebuild(self, client: Any) -> int:
+        """Reconstruye el Bloom desde las claves blacklist vigentes en Redis."""
+        from app.infrastructure.redis.client import RedisService
+
+        jtis = []
+        async for key in client.scan_iter(match=f"{RedisService.BLACKLIST_PREFIX}*", count=1000):
+            jtis.append(str(key)[len(RedisService.BLACKLIST_PREFIX):])
+        bloom = BloomFilter(max(settings.REVOCATION_FILTER_CAPACITY, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        # Lo revocado localmente mientras corría el SCAN
+        for jti in self._recent:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._prune_recent()
+        self.ready = True
+        self.last_sync = time.time()
+        self.stats["syncs"] += 1
+        return len(jtis)
+
+    def report(self) -> Dict[str, Any]:
+        checks = self.stats["local_negative"] + self.stats["local_positive"] + self.stats["redis_checks"]
+        local = self.stats["local_negative"] + self.stats["local_positive"]
+        return {
+            "ready": self.ready,
+            "last_sync": self.last_sync,
+            "bloom_items": self._bloom.count,
+            "bloom_capacity": self._bloom.capacity,
+            "bloom_bytes": len(self._bloom._bits),
+            "recent": len(self._recent),
+            **self.stats,
+            "local_rate": round(local / checks, 3) if checks else None,
+        }
+
+
+_filter = RevocationFilter(
+    settings.REVOCATION_FILTER_CAPACITY,
+    settings.REVOCATION_FILTER_ERROR_RATE,
+    settings.REVOCATION_FILTER_RECENT_MAX,
+)
+_sync_task: Optional[asyncio.Task] = None
+
+
+def get_revocation_filter() -> RevocationFilter:
+    return _filter
+
+
+async def is_token_revoked(jti: str) -> bool:
+    """Reemplazo de RedisService.is_token_blacklisted en el camino crítico."""
+    if not settings.REVOCATION_FILTER_ENABLED:
+        from app.infrastructure.redis.client import RedisService
+
+        return await RedisService.is_token_blacklisted(jti)
+    return await _filter.is_revoked(jti)
+
+
+async def _run_sync() -> None:
+    from app.infrastructure.redis.client import _get_redis_client
+
+    while True:
+        pubsub = None
+        try:
+            client = await _get_redis_client()
+            if client is None:
+                await asyncio.sleep(_RETRY_SECONDS * 6)
+                continue
+            pubsub = client.pubsub()
+            await pubsub.subscribe(REVOCATION_CHANNEL)
+            loaded = await _filter.rebuild(client)
+            logger.info(f"[REVOCATION_FILTER] Sincronizado: {loaded} jti revocados vigentes")
+            next_rebuild = time.monotonic() + settings.REVOCATION_FILTER_REBUILD_SECONDS
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    _filter.on_message(message.get("data"))
+                if time.monotonic() >= next_rebuild:
+                    await _filter.rebuild(client)
+                    next_rebuild = time.monotonic() + settings.REVOCATION_FILTER_REBUILD_SECONDS
+        except asyncio.CancelledError:
+            _filter.ready = False
+            raise
+        except Exception as e:
+            # Sin suscripción no hay negativos seguros: todo vuelve a Redis
+            _filter.ready = False
+            logger.warning(f"[REVOCATION_FILTER] Suscripción caída, verificando en Redis: {e}")
+            await asyncio.sleep(_RETRY_SECONDS)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def start_revocation_filter() -> asyncio.Task:
+    """Lanza la sincronización del filtro en background."""
+    global _sync_task
+    if _sync_task is None or _sync_task.done():
+        _sync_task = asyncio.create_task(_run_sync(), name="revocation-filter")
+    return _sync_task
+
+
+async def stop_revocation_filter() -> None:
+    """Cancela la sincronización al apagar."""
+    global _sync_task
+    task, _sync_task = _sync_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def get_revocation_filter_report() -> Dict[str, Any]:
+    """Checks resueltos localmente vs. en Redis y estado de la sincronización."""
+    return {"enabled": settings.REVOCATION_FILTER_ENABLED, **_filter.report()}
+
+
+def reset_revocation_filter() -> None:
+    """Vacía el filtro y las métricas (tests)."""
+    global _filter
+    _filter = RevocationFilter(
+        settings.REVOCATION_FILTER_CAPACITY,
+        settings.REVOCATION_FILTER_ERROR_RATE,
+        settings.REVOCATION_FILTER_RECENT_MAX,
+    )
@@ -27,6 +27,7 @@ from fastapi.security import HTTPBearer, OAuth2PasswordBearer
 
 # ✅ FASE 1: Rate Limiting (condicional)
 from app.core.security.rate_limiting import get_limiter
+from app.core.openapi_static import install_static_openapi
 
 logger = logging.getLogger(__name__)
 
@@ -91,11 +92,36 @@ def create_application() -> FastAPI:
         TenantMiddleware
     )
 
+    # Presupuesto de queries por request (envuelve al TenantMiddleware para contar sus queries)
+    if settings.QUERY_BUDGET_ENABLED:
+        from app.core.metrics.query_budget import QueryBudgetMiddleware, install_query_counter
+
+        install_query_counter()
+        app.add_middleware(QueryBudgetMiddleware)
+
     # Diagnóstico temporal: POST /auth/impersonate/* (solo logs)
     from app.core.auth.impersonate_auth_diag import ImpersonateAuthDiagMiddleware
 
     app.add_middleware(ImpersonateAuthDiagMiddleware)
 
+    # Deadline por request: por fuera de Tenant (su resolución también consume presupuesto)
+    if settings.REQUEST_DEADLINE_ENABLED:
+        from app.core.metrics.request_deadline import RequestDeadlineMiddleware
+
+        app.add_middleware(RequestDeadlineMiddleware)
+
+    # Load shedding: por fuera de Tenant/QueryBudget para rechazar antes de tocar la BD
+    if settings.LOAD_SHEDDING_ENABLED:
+        from app.core.metrics.load_shedding import LoadSheddingMiddleware
+
+        app.add_middleware(LoadSheddingMiddleware)
+
+    # Compresión de respuestas (ASGI puro: no bufferiza streams)
+    if settings.COMPRESSION_ENABLED:
+        from app.core.compression import CompressionMiddleware
+
+        app.add_middleware(CompressionMiddleware)
+
     # ✅ CORRECCIÓN: Construir origins dinámicamente para subdominios
     allowed_origins = [
         # Desarrollo local
@@ -237,6 +263,10 @@ def create_application() -> FastAPI:
     # Rutas API v1
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
+    # OpenAPI precalculado en el build: los workers no generan el schema
+    if settings.OPENAPI_STATIC_ENABLED:
+        install_static_openapi(app)
+
     return app
 
 # Instancia de la aplicación
@@ -256,10 +286,66 @@ async def rbac_lifespan(app: FastAPI):
     except Exception:
         pass
 
+    # Modo ENABLED_MODULES=catalog: routers ERP según cliente_modulo (antes del sync RBAC,
+    # que recorre las rutas registradas)
+    from app.api.v1.module_routers import is_catalog_mode
+    if is_catalog_mode():
+        from app.api.v1.module_routers import register_catalog_module_routers
+        await register_catalog_module_routers(app)
+
+    # Pools pyodbc: se crean aquí y no al importar connection_pool
+    if settings.ENABLE_CONNECTION_POOLING:
+        from app.infrastructure.database.connection_pool import init_pools
+        init_pools()
+
     await run_rbac_startup(app)
 
+    if settings.LOOP_WATCHDOG_ENABLED:
+        from app.core.metrics.loop_watchdog import start_loop_watchdog
+        start_loop_watchdog()
+
+    if settings.TENANT_WARMUP_ENABLED:
+        from app.core.tenant.warmup import start_tenant_warmup
+        start_tenant_warmup()
+
+    if settings.REVOCATION_FILTER_ENABLED and settings.ENABLE_REDIS_CACHE:
+        from app.infrastructure.redis.revocation_filter import start_revocation_filter
+        start_revocation_filter()
+
+    if settings.BUSINESS_ACTIVITY_WRITE_BEHIND_ENABLED:
+        from app.modules.auth.application.services.business_activity_service import (
+            start_business_activity_flusher,
+        )
+        start_business_activity_flusher()
+
+    if settings.AUDIT_PIPELINE_ENABLED:
+        from app.modules.superadmin.application.services.audit_pipeline import start_audit_pipeline
+        start_audit_pipeline()
+
     yield
 
+    if settings.AUDIT_PIPELINE_ENABLED:
+        from app.modules.superadmin.application.services.audit_pipeline import stop_audit_pipeline
+        await stop_audit_pipeline()
+
+    if settings.BUSINESS_ACTIVITY_WRITE_BEHIND_ENABLED:
+        from app.modules.auth.application.services.business_activity_service import (
+            stop_business_activity_flusher,
+        )
+        await stop_business_activity_flusher()
+
+    if settings.REVOCATION_FILTER_ENABLED and settings.ENABLE_REDIS_CACHE:
+        from app.infrastructure.redis.revocation_filter import stop_revocation_filter
+        await stop_revocation_filter()
+
+    if settings.TENANT_WARMUP_ENABLED:
+        from app.core.tenant.warmup import stop_tenant_warmup
+        await stop_tenant_warmup()
+
+    if settings.LOOP_WATCHDOG_ENABLED:
+        from app.core.metrics.loop_watchdog import stop_loop_watchdog
+        await stop_loop_watchdog()
+
 
 # Registrar lifespan RBAC sin modificar otros startup/shutdown ya declarados
 app.router.lifespan_context = rbac_lifespan
@@ -11,6 +11,7 @@ from sqlalchemy import and_, func, or_, select
 from app.core.application.base_service import BaseService
 from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.infrastructure.database.connection_async import DatabaseConnection
 from app.infrastructure.database.queries.auth.refresh_token_queries_core import (
     get_active_sessions_by_user_core,
 )
@@ -496,10 +497,14 @@ class ActiveSessionsReadService(BaseService):
                 .select_from(_admin_base_from_v1())
                 .where(where_clause)
             )
-            count_rows = await execute_query(count_query, client_id=cliente_id)
+            count_rows = await execute_query(
+                count_query, client_id=cliente_id, connection_type=DatabaseConnection.READ
+            )
             total = extract_count(count_rows)
 
-        rows = await execute_query(list_query, client_id=cliente_id)
+        rows = await execute_query(
+            list_query, client_id=cliente_id, connection_type=DatabaseConnection.READ
+        )
         items = [map_row_to_admin_session(row) for row in rows]
 
         if not pagination.is_paginated:
@@ -571,10 +576,14 @@ class ActiveSessionsReadService(BaseService):
                 .select_from(_admin_base_from_v2())
                 .where(where_clause)
             )
-            count_rows = await execute_query(count_query, client_id=cliente_id)
+            count_rows = await execute_query(
+                count_query, client_id=cliente_id, connection_type=DatabaseConnection.READ
+            )
             total = extract_count(count_rows)
 
-        rows = await execute_query(list_query, client_id=cliente_id)
+        rows = await execute_query(
+            list_query, client_id=cliente_id, connection_type=DatabaseConnection.READ
+        )
         items = [
             map_row_to_admin_session(
                 {
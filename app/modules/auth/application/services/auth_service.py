@@ -453,12 +453,7 @@ class AuthService:
                 usuario_id,
                 cliente_id,
             )
-            return {
-                "empresas_disponibles": [],
-                "empresa_activa": None,
-                "es_admin_sin_empresa": False,
-                "requiere_seleccion": False,
-            }
+            return AuthService._empresa_context_sin_seleccion()
 
         from app.core.tenant.context import try_get_tenant_context
 
@@ -545,6 +540,38 @@ class AuthService:
                 exc_info=True,
             )
 
+        return await AuthService._resolver_empresa_activa(
+            usuario_id,
+            cliente_id,
+            empresas_disponibles=empresas_disponibles,
+            empresa_default_id=empresa_default_id,
+            es_admin_sin_empresa=es_admin_sin_empresa,
+        )
+
+    @staticmethod
+    def _empresa_context_sin_seleccion() -> Dict[str, Any]:
+        """Contexto de empresa del superadmin de plataforma: ninguna y sin selección."""
+        return {
+            "empresas_disponibles": [],
+            "empresa_activa": None,
+            "es_admin_sin_empresa": False,
+            "requiere_seleccion": False,
+        }
+
+    @staticmethod
+    async def _resolver_empresa_activa(
+        usuario_id: UUID,
+        cliente_id: UUID,
+        *,
+        empresas_disponibles: List[Dict[str, Any]],
+        empresa_default_id: Optional[UUID],
+        es_admin_sin_empresa: bool,
+    ) -> Dict[str, Any]:
+        """
+        Empresa activa y selección a partir de las empresas por rol y la preferida.
+
+        Compartido por get_empresa_activa_para_login y LoginContext (login en una query).
+        """
         # Admin global (usuario_rol.empresa_id NULL): elegibles desde org_empresa (R-LOGIN-06)
         if es_admin_sin_empresa and not empresas_disponibles:
             try:
@@ -920,7 +947,14 @@ class AuthService:
             # ✅ CORRECCIÓN CRÍTICA: Usar BD apropiada según tipo de usuario
             # ✅ FASE 2: Usar execute_query async con text().bindparams()
             
-            if is_superadmin:
+            login_context = None
+            if not is_superadmin and settings.LOGIN_CONTEXT_SINGLE_QUERY:
+                # Usuario + roles + empresas en una sola query (login_context.py)
+                from app.modules.auth.application.services.login_context import fetch_login_rows
+
+                login_context = await fetch_login_rows(search_cliente_id, username, database_type)
+                user = dict(login_context.user) if login_context else None
+            elif is_superadmin:
                 # Superadmin: SIEMPRE usar BD ADMIN
                 logger.debug(f"[AUTH] Ejecutando en BD ADMIN: cliente_id={search_cliente_id}, username='{username}'")
                 
@@ -1020,11 +1054,18 @@ class AuthService:
 
             # ✅ CALCULAR NIVELES DE ACCESO (NUEVO)
             # ✅ FASE 2: Usar await — incluye detección platform superadmin por username/rol SYSTEM
-            level_info = await AuthService.get_user_access_level_info(
-                user["usuario_id"],
-                user["cliente_id"],
-                username=username,
-            )
+            if login_context is not None:
+                # Superadmin SYSTEM + expiración de tokens en una query a BD ADMIN
+                from app.modules.auth.application.services.login_context import load_admin_context
+
+                await load_admin_context(login_context)
+                level_info = login_context.level_info()
+            else:
+                level_info = await AuthService.get_user_access_level_info(
+                    user["usuario_id"],
+                    user["cliente_id"],
+                    username=username,
+                )
             if is_superadmin or level_info.get("is_super_admin"):
                 level_info = AuthService._platform_superadmin_level_info()
 
@@ -1035,6 +1076,9 @@ class AuthService:
             
             # Eliminar la contraseña del resultado
             user.pop('contrasena', None)
+            if login_context is not None:
+                user.pop('empresa_default_id', None)
+                user['login_context'] = login_context
             
             # ✅ AGREGAR contexto multi-tenant al resultado
             if is_superadmin or level_info.get("is_super_admin"):
@@ -1,13 +1,28 @@
-"""C05 — actualización throttled de last_business_activity_at (IAM Session V2)."""
+"""
+C05 — actualización throttled de last_business_activity_at (IAM Session V2).
+
+Desde get_current_user_data se usa record_touch (write-behind): la sesión queda en
+un conjunto en memoria por tenant, throttled por worker, y una tarea de fondo lo
+vuelca cada BUSINESS_ACTIVITY_FLUSH_SECONDS con un UPDATE set-based por tenant
+(touch_business_activity_batch_core). El UPDATE escribe GETDATE() como touch()
+y el throttle en SQL, así que solo se guardan los ids (la hora del volcado
+difiere del request en a lo sumo el intervalo de flush). Al apagar se vuelca lo pendiente.
+Así ningún request autenticado escribe en la BD de forma síncrona.
+touch() mantiene la actualización inmediata para quien la necesite.
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Set, Tuple
 from uuid import UUID
 
+from app.core.config import settings
 from app.infrastructure.database.queries.auth.session import (
     get_active_session_by_id_core,
+    touch_business_activity_batch_core,
     touch_business_activity_core,
 )
 from app.modules.auth.application.session.session_v2_feature import is_session_v2_enabled
@@ -15,6 +30,23 @@ from app.modules.auth.application.session.session_v2_feature import is_session_v
 logger = logging.getLogger(__name__)
 
 BUSINESS_ACTIVITY_THROTTLE_MINUTES = 5
+_FLUSH_CHUNK = 1000  # sesiones por UPDATE (límite de parámetros de SQL Server)
+
+# cliente_id → sesiones con touch pendiente
+_pending: Dict[UUID, Set[UUID]] = {}
+# (cliente_id, session_id) → monotonic del último touch encolado (throttle por worker)
+_last_recorded: Dict[Tuple[UUID, UUID], float] = {}
+_flush_task: Optional[asyncio.Task] = None
+_flush_lock: Optional[asyncio.Lock] = None
+_background: Set[asyncio.Task] = set()
+_stats: Dict[str, int] = {
+    "recorded": 0,
+    "throttled": 0,
+    "flushes": 0,
+    "statements": 0,
+    "rows_updated": 0,
+    "failed": 0,
+}
 
 
 class BusinessActivityService:
@@ -70,5 +102,153 @@ class BusinessActivityService:
                 exc,
             )
 
+    @staticmethod
+    def record_touch(session_id: UUID, cliente_id: UUID) -> None:
+        """
+        Encola el touch (write-behind); sin I/O. Throttled por worker: una sesión
+        se encola como mucho una vez por BUSINESS_ACTIVITY_THROTTLE_MINUTES.
+        """
+        if not is_session_v2_enabled(cliente_id):
+            return
+
+        now = time.monotonic()
+        key = (cliente_id, session_id)
+        last = _last_recorded.get(key)
+        if last is not None and now - last < BUSINESS_ACTIVITY_THROTTLE_MINUTES * 60:
+            _stats["throttled"] += 1
+            return
+        _last_recorded[key] = now
+        _pending.setdefault(cliente_id, set()).add(session_id)
+        _stats["recorded"] += 1
+        _ensure_flusher()
+        if pending_count() >= settings.BUSINESS_ACTIVITY_MAX_PENDING:
+            _schedule(flush_business_activity())
+
+
+def pending_count() -> int:
+    return sum(len(sessions) for sessions in _pending.values())
+
+
+def _schedule(coro: Any) -> None:
+    try:
+        task = asyncio.get_running_loop().create_task(coro)
+    except RuntimeError:
+        coro.close()
+        return
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def flush_business_activity() -> int:
+    """Vuelca los touches pendientes: un UPDATE por tenant (por lotes de 1000)."""
+    global _flush_lock
+    if _flush_lock is None:
+        _flush_lock = asyncio.Lock()
+    async with _flush_lock:
+        batch = dict(_pending)
+        _pending.clear()
+        if not batch:
+            return 0
+
+        rows = 0
+        for cliente_id, sessions in batch.items():
+            session_ids = list(sessions)
+            for start in range(0, len(session_ids), _FLUSH_CHUNK):
+                chunk = session_ids[start:start + _FLUSH_CHUNK]
+                try:
+                    rows += await touch_business_activity_batch_core(
+                        cliente_id,
+                        chunk,
+                        throttle_minutes=BUSINESS_ACTIVITY_THROTTLE_MINUTES,
+                    )
+                    _stats["statements"] += 1
+                except Exception as exc:
+                    # Telemetría: se descarta el lote y se permite re-encolar esas sesiones
+                    _stats["failed"] += len(chunk)
+                    for session_id in chunk:
+                        _last_recorded.pop((cliente_id, session_id), None)
+                    logger.warning(
+                        "[BUSINESS-ACTIVITY] flush fail-soft cliente_id=%s sesiones=%s: %s",
+                        cliente_id,
+                        len(chunk),
+                        exc,
+                    )
+        _stats["flushes"] += 1
+        _stats["rows_updated"] += rows
+        _prune_recorded()
+        return rows
+
+
+def _prune_recorded() -> None:
+    cutoff = time.monotonic() - BUSINESS_ACTIVITY_THROTTLE_MINUTES * 60
+    for key in [k for k, ts in _last_recorded.items() if ts < cutoff]:
+        del _last_recorded[key]
+
+
+async def _run_flusher() -> None:
+    while True:
+        await asyncio.sleep(settings.BUSINESS_ACTIVITY_FLUSH_SECONDS)
+        try:
+            await flush_business_activity()
+        except Exception as exc:
+            logger.warning("[BUSINESS-ACTIVITY] flush periódico fallido: %s", exc)
+
+
+def _ensure_flusher() -> None:
+    """El flusher arranca con el primer touch encolado (y con el lifespan)."""
+    global _flush_task
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if _flush_task is None or _flush_task.done() or _flush_task.get_loop() is not loop:
+        _flush_task = loop.create_task(_run_flusher(), name="business-activity-flush")
+
+
+def start_business_activity_flusher() -> None:
+    """Lanza el volcado periódico de touches en background."""
+    _ensure_flusher()
+
+
+async def stop_business_activity_flusher() -> None:
+    """Detiene el volcado periódico y vuelca lo pendiente (shutdown)."""
+    global _flush_task
+    task, _flush_task = _flush_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await flush_business_activity()
+
+
+def get_business_activity_report() -> Dict[str, Any]:
+    """Touches encolados, throttled, volcados y sentencias ejecutadas."""
+    return {
+        "write_behind": settings.BUSINESS_ACTIVITY_WRITE_BEHIND_ENABLED,
+        "flush_seconds": settings.BUSINESS_ACTIVITY_FLUSH_SECONDS,
+        "pending": pending_count(),
+        "tracked_sessions": len(_last_recorded),
+        **_stats,
+    }
+
+
+def reset_business_activity() -> None:
+    """Vacía el buffer y las métricas (tests)."""
+    global _flush_lock
+    _flush_lock = None
+    _pending.clear()
+    _last_recorded.clear()
+    for key in _stats:
+        _stats[key] = 0
+
 
-__all__ = ["BUSINESS_ACTIVITY_THROTTLE_MINUTES", "BusinessActivityService"]
+__all__ = [
+    "BUSINESS_ACTIVITY_THROTTLE_MINUTES",
+    "BusinessActivityService",
+    "flush_business_activity",
+    "get_business_activity_report",
+    "start_business_activity_flusher",
+    "stop_business_activity_flusher",
+]
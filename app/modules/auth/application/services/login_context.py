@@ -0,0 +1,257 @@
+# app/modules/auth/application/services/login_context.py
+"""
+Contexto de login en una ida a BD por base (tenant + ADMIN).
+
+El login encadenaba ~13 queries secuenciales: usuario, niveles (dos veces, cada
+una con su detección de superadmin en ADMIN), empresas por rol, admin sin empresa,
+empresa preferida, nombres de roles, es_admin_cliente (otra detección de
+superadmin) y expiración de tokens. Ahora:
+
+1. GET_LOGIN_CONTEXT (BD del tenant): usuario + una fila por usuario_rol activo
+   con su rol y su empresa.
+2. GET_LOGIN_ADMIN_CONTEXT (BD ADMIN): rol SUPER_ADMIN en el cliente SYSTEM y
+   expiración de tokens del tenant (cliente_auth_config).
+
+LoginContext deriva en memoria niveles, nombres de roles, es_admin_cliente y
+empresas elegibles con los mismos criterios que get_user_access_level_info,
+UsuarioService.get_user_role_names, usuario_tiene_es_admin_cliente y
+get_empresa_activa_para_login. Solo quedan como queries aparte los casos raros:
+listar org_empresa para un admin sin empresa en usuario_rol y limpiar una
+empresa preferida inválida.
+
+No aplica al username reservado de superadmin (su usuario vive en BD ADMIN):
+ese login sigue el camino de siempre. LOGIN_CONTEXT_SINGLE_QUERY=false vuelve
+al camino anterior para todos.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.infrastructure.database.connection_async import DatabaseConnection
+from app.infrastructure.database.queries.auth.auth_queries import (
+    GET_LOGIN_ADMIN_CONTEXT,
+    GET_LOGIN_CONTEXT,
+    GET_LOGIN_CONTEXT_DEDICATED,
+)
+from app.infrastructure.database.queries_async import execute_query
+
+logger = logging.getLogger(__name__)
+
+
+def _truthy(value: Any) -> bool:
+    """BIT de SQL Server (bool/int/None) a bool."""
+    return bool(value) and value != 0
+
+
+@dataclass
+class LoginContext:
+    """
+    Usuario, sus roles activos (con empresa) y la política del tenant, ya cargados.
+
+    cliente_id es el tenant destino del login (en BD dedicada, el del contexto).
+    """
+
+    user: Dict[str, Any]
+    roles: List[Dict[str, Any]]
+    cliente_id: UUID
+    database_type: str = "single"
+    is_platform_superadmin: bool = False
+    token_expiration: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def usuario_id(self) -> UUID:
+        return self.user["usuario_id"]
+
+    def _roles_for(self, empresa_id: Optional[UUID], *, same_cliente: bool) -> List[Dict[str, Any]]:
+        """Roles activos (rol y usuario_rol) de la empresa activa o globales."""
+        selected = []
+        for row in self.roles:
+            if not _truthy(row.get("rol_es_activo")):
+                continue
+            if same_cliente and row.get("ur_cliente_id") != self.cliente_id:
+                continue
+            if empresa_id is not None and row.get("ur_empresa_id") not in (None, empresa_id):
+                continue
+            selected.append(row)
+        return selected
+
+    def level_info(self, empresa_id: Optional[UUID] = None) -> Dict[str, Any]:
+        """Mismo cálculo que AuthService.get_user_access_level_info."""
+        from app.modules.auth.application.services.auth_service import AuthService
+
+        if self.is_platform_superadmin:
+            return AuthService._platform_superadmin_level_info()
+
+        roles = self._roles_for(empresa_id, same_cliente=False)
+        if self.database_type != "multi":
+            # Roles del tenant o de sistema (r.cliente_id NULL)
+            roles = [r for r in roles if r.get("rol_cliente_id") in (None, self.cliente_id)]
+        levels = [r["nivel_acceso"] for r in roles if r.get("nivel_acceso") is not None]
+        access_level = max(levels) if levels else 1
+        is_super_admin = any(
+            r.get("codigo_rol") == "SUPER_ADMIN" and r.get("nivel_acceso") == 5 for r in roles
+        )
+        if is_super_admin:
+            user_type = "platform_admin"
+        elif access_level >= 4:
+            user_type = "tenant_admin"
+        else:
+            user_type = "user"
+        return {"access_level": access_level, "is_super_admin": is_super_admin, "user_type": user_type}
+
+    def role_names(self, empresa_id: Optional[UUID] = None) -> List[str]:
+        """Mismo criterio que UsuarioService.get_user_role_names (DISTINCT r.nombre)."""
+        names: List[str] = []
+        for row in self._roles_for(empresa_id, same_cliente=True):
+            nombre = row.get("rol_nombre")
+            if nombre is not None and nombre not in names:
+                names.append(nombre)
+        return names
+
+    def es_admin_cliente(self, empresa_id: Optional[UUID] = None) -> bool:
+        """Mismo criterio que AuthService.usuario_tiene_es_admin_cliente."""
+        if self.is_platform_superadmin:
+            return False
+        return any(
+            _truthy(row.get("es_admin_cliente"))
+            for row in self._roles_for(empresa_id, same_cliente=True)
+        )
+
+    async def empresa_context(
+        self,
+        *,
+        es_superadmin: bool = False,
+        user_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Mismo resultado que AuthService.get_empresa_activa_para_login."""
+        from app.modules.auth.application.services.auth_service import AuthService
+
+        if es_superadmin or user_type == "platform_admin":
+            return AuthService._empresa_context_sin_seleccion()
+
+        empresas_disponibles: List[Dict[str, Any]] = []
+        seen: set = set()
+        es_admin_sin_empresa = False
+        # usuario_rol del cliente; sin filtrar rol.es_activo (igual que las queries originales)
+        rows = [r for r in self.roles if r.get("ur_cliente_id") == self.cliente_id]
+        for row in sorted(
+            (r for r in rows if r.get("ur_empresa_id") is not None and _truthy(r.get("empresa_es_activo"))),
+            key=lambda r: str(r.get("razon_social") or "").casefold(),  # collation CI de SQL Server
+        ):
+            item = AuthService._empresa_disponible_from_row(
+                {**row, "empresa_id": row["ur_empresa_id"]}
+            )
+            if item and item["empresa_id"] not in seen:
+                seen.add(item["empresa_id"])
+                empresas_disponibles.append(item)
+        es_admin_sin_empresa = any(r.get("ur_empresa_id") is None for r in rows)
+
+        return await AuthService._resolver_empresa_activa(
+            self.usuario_id,
+            self.cliente_id,
+            empresas_disponibles=empresas_disponibles,
+            empresa_default_id=AuthService._coerce_uuid(self.user.get("empresa_default_id")),
+            es_admin_sin_empresa=es_admin_sin_empresa,
+        )
+
+
+def _normalize_role_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    from app.modules.auth.application.services.auth_service import AuthService
+
+    return {
+        "ur_cliente_id": AuthService._coerce_uuid(row.get("ur_cliente_id")),
+        "ur_empresa_id": AuthService._coerce_uuid(row.get("ur_empresa_id")),
+        "rol_nombre": row.get("rol_nombre"),
+        "codigo_rol": row.get("codigo_rol"),
+        "nivel_acceso": row.get("nivel_acceso"),
+        "es_admin_cliente": row.get("es_admin_cliente"),
+        "rol_es_activo": row.get("rol_es_activo"),
+        "rol_cliente_id": AuthService._coerce_uuid(row.get("rol_cliente_id")),
+        "razon_social": row.get("razon_social"),
+        "nombre_comercial": row.get("nombre_comercial"),
+        "empresa_es_activo": row.get("empresa_es_activo"),
+    }
+
+
+_USER_FIELDS = (
+    "usuario_id", "cliente_id", "nombre_usuario", "correo", "contrasena", "nombre", "apellido",
+    "es_activo", "requiere_cambio_contrasena", "proveedor_autenticacion", "empresa_default_id",
+)
+
+
+async def fetch_login_rows(
+    cliente_id: UUID,
+    username: str,
+    database_type: str,
+) -> Optional[LoginContext]:
+    """
+    Query 1 (BD del tenant): usuario + roles. None si el usuario no existe.
+
+    El usuario_id/cliente_id se normalizan a UUID; en BD dedicada un cliente_id
+    NULL/nulo se reemplaza por el del contexto (igual que authenticate_user).
+    """
+    from app.modules.auth.application.services.auth_service import AuthService
+
+    if database_type == "multi":
+        query = text(GET_LOGIN_CONTEXT_DEDICATED).bindparams(nombre_usuario=username)
+    else:
+        query = text(GET_LOGIN_CONTEXT).bindparams(cliente_id=cliente_id, nombre_usuario=username)
+    rows = await execute_query(query, connection_type=DatabaseConnection.DEFAULT, client_id=cliente_id)
+    if not rows:
+        return None
+
+    usuario_id = AuthService._coerce_uuid(rows[0].get("usuario_id"))
+    user = {name: rows[0].get(name) for name in _USER_FIELDS}
+    user["usuario_id"] = usuario_id
+    user_cliente_id = AuthService._coerce_uuid(user.get("cliente_id"))
+    user["cliente_id"] = user_cliente_id or cliente_id
+    # Sin usuario_rol activos el LEFT JOIN deja una fila con usuario_rol_id NULL
+    roles = [_normalize_role_row(row) for row in rows if row.get("usuario_rol_id") is not None]
+    return LoginContext(user=user, roles=roles, cliente_id=cliente_id, database_type=database_type)
+
+
+async def load_admin_context(context: LoginContext) -> None:
+    """
+    Query 2 (BD ADMIN): superadmin de plataforma + expiración de tokens.
+
+    Fail-soft como las funciones originales: si falla, no es superadmin y se usan
+    las expiraciones de settings.
+    """
+    from app.modules.auth.application.services.auth_service import AuthService
+
+    context.token_expiration = {
+        "access_token_minutes": settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+        "refresh_token_days": settings.REFRESH_TOKEN_EXPIRE_DAYS,
+    }
+    system_cliente_id = AuthService._coerce_uuid(settings.SUPERADMIN_CLIENTE_ID)
+    try:
+        rows = await execute_query(
+            text(GET_LOGIN_ADMIN_CONTEXT).bindparams(
+                usuario_id=context.usuario_id,
+                system_cliente_id=system_cliente_id,
+                cliente_id=context.cliente_id,
+            ),
+            connection_type=DatabaseConnection.ADMIN,
+            client_id=None,
+        )
+    except Exception as e:
+        logger.warning(
+            "[LOGIN_CONTEXT] No se pudo leer contexto ADMIN para usuario %s: %s. "
+            "Usando settings globales.",
+            context.usuario_id,
+            e,
+        )
+        return
+    if not rows:
+        return
+    row = rows[0]
+    context.is_platform_superadmin = bool(system_cliente_id) and int(row.get("super_admin_count") or 0) > 0
+    if row.get("access_token_minutes") is not None:
+        context.token_expiration["access_token_minutes"] = int(row["access_token_minutes"])
+    if row.get("refresh_token_days") is not None:
+        context.token_expiration["refresh_token_days"] = int(row["refresh_token_days"])
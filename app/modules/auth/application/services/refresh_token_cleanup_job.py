@@ -4,9 +4,16 @@ Funciona tanto para Single-DB como Multi-DB.
 
 ✅ FASE 4: Job centralizado para cleanup de tokens por tenant.
 """
+import asyncio
+import json
 import logging
+import os
+import time
+from pathlib import Path
 from uuid import UUID
-from typing import Dict, List, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.infrastructure.database.queries.auth.refresh_token_queries_core import delete_expired_tokens_core
 from app.infrastructure.database.connection_async import get_db_connection, DatabaseConnection
 from app.infrastructure.database.tables import ClienteTable
 from sqlalchemy import select
@@ -21,32 +28,52 @@ class RefreshTokenCleanupJob:
     """Job para limpiar tokens expirados por tenant."""
     
     @staticmethod
-    async def cleanup_all_tenants() -> Dict[str, Any]:
+    async def cleanup_all_tenants(
+        *,
+        resume: bool = True,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
         Limpia tokens expirados en todos los tenants activos.
         
         ✅ FASE 4: Itera todos los tenants activos, establece contexto para cada uno,
-        y ejecuta cleanup_expired_tokens() que requiere contexto de tenant.
+        y ejecuta la purga que requiere contexto de tenant.
         
         Funciona tanto para Single-DB como Multi-DB:
         - Single-DB: Todos los tenants en bd_sistema, cleanup por cliente_id
         - Multi-DB: Cada tenant en su BD dedicada, cleanup en su BD específica
         
+        Hasta TOKEN_CLEANUP_CONCURRENCY tenants en paralelo (cada tarea con su propio
+        contexto de tenant); dentro de cada tenant, DELETE en lotes de
+        TOKEN_CLEANUP_BATCH_SIZE con pausa entre lotes. Cada tenant terminado se
+        registra en el checkpoint: con resume=True una corrida cortada (o con
+        errores) retoma solo los tenants pendientes. El avance en vivo se consulta
+        con get_cleanup_progress().
+        
         Returns:
             Dict con estadísticas de cleanup:
             {
                 'tenants_processed': int,
                 'tokens_deleted': int,
                 'tenants_detail': List[Dict],  # Detalle por tenant
-                'errors': List[str]  # Errores por tenant
+                'errors': List[str],  # Errores por tenant
+                'tenants_total': int,
+                'tenants_skipped': int,  # Ya completados en la corrida reanudada
+                'resumed': bool,
+                'duration_ms': float
             }
         """
         stats = {
             'tenants_processed': 0,
             'tokens_deleted': 0,
             'tenants_detail': [],
-            'errors': []
+            'errors': [],
+            'tenants_total': 0,
+            'tenants_skipped': 0,
+            'resumed': False,
+            'duration_ms': 0.0,
         }
+        start = time.perf_counter()
         
         logger.info("[CLEANUP_JOB] Iniciando cleanup de tokens expirados para todos los tenants")
         
@@ -59,104 +86,82 @@ class RefreshTokenCleanupJob:
                 ClienteTable.c.tipo_instalacion
             ).where(
                 ClienteTable.c.es_activo == True
-            )
+            ).order_by(ClienteTable.c.cliente_id)
             
             async with get_db_connection(
                 connection_type=DatabaseConnection.ADMIN,
                 client_id=None
             ) as session:
                 result = await session.execute(query)
-                tenants = result.fetchall()
+                tenants = [dict(row._mapping) for row in result.fetchall()]
             
-            logger.info(f"[CLEANUP_JOB] Encontrados {len(tenants)} tenants activos para procesar")
+            checkpoint = _load_checkpoint() if resume else None
+            if checkpoint is None:
+                checkpoint = {'started_at': time.time(), 'completed': []}
+            else:
+                stats['resumed'] = True
+            completed = set(checkpoint['completed'])
+            pending = [t for t in tenants if str(t['cliente_id']) not in completed]
+            stats['tenants_total'] = len(tenants)
+            stats['tenants_skipped'] = len(tenants) - len(pending)
             
-            # Procesar cada tenant
-            for tenant in tenants:
-                cliente_id = tenant['cliente_id']
-                codigo_cliente = tenant.get('codigo_cliente', 'N/A')
-                subdominio = tenant.get('subdominio', 'N/A')
-                tipo_instalacion = tenant.get('tipo_instalacion', 'shared')
-                
-                tenant_stats = {
-                    'cliente_id': str(cliente_id),
-                    'codigo_cliente': codigo_cliente,
-                    'tokens_deleted': 0,
-                    'success': False,
-                    'error': None
-                }
-                
-                try:
-                    # ✅ FASE 4: Obtener metadata de conexión para este tenant
-                    connection_metadata = await get_connection_metadata_async(cliente_id)
-                    database_type = connection_metadata.get('database_type', 'single')
-                    nombre_bd = connection_metadata.get('nombre_bd', 'bd_sistema')
-                    
-                    logger.debug(
-                        f"[CLEANUP_JOB] Procesando tenant {codigo_cliente} ({cliente_id}): "
-                        f"{database_type.upper()}-DB ({nombre_bd})"
-                    )
-                    
-                    # ✅ FASE 4: Establecer contexto del tenant con metadata completa
-                    tenant_context = TenantContext(
-                        client_id=cliente_id,
-                        codigo_cliente=codigo_cliente,
-                        subdominio=subdominio,
-                        database_type=database_type,
-                        nombre_bd=nombre_bd,
-                        tipo_instalacion=tipo_instalacion,
-                        connection_metadata=connection_metadata
-                    )
-                    
-                    # Establecer contexto (retorna tokens para reset)
-                    tokens = set_tenant_context(tenant_context)
-                    
+            logger.info(
+                f"[CLEANUP_JOB] Encontrados {len(tenants)} tenants activos para procesar"
+                + (f" (reanudando: {stats['tenants_skipped']} ya completados)" if stats['resumed'] else "")
+            )
+            
+            _progress.update({
+                'running': True,
+                'started_at': checkpoint['started_at'],
+                'tenants_total': len(tenants),
+                'tenants_done': stats['tenants_skipped'],
+                'tenants_failed': 0,
+                'tokens_deleted': 0,
+                'batches': 0,
+                'in_progress': [],
+            })
+            semaphore = asyncio.Semaphore(
+                max(1, concurrency or settings.TOKEN_CLEANUP_CONCURRENCY)
+            )
+            
+            async def _process(tenant: Dict[str, Any]) -> None:
+                async with semaphore:
+                    _progress['in_progress'].append(str(tenant['cliente_id']))
                     try:
-                        deleted_count = await RefreshTokenCleanupJob._purge_tenant_tokens(
-                            cliente_id
-                        )
-                        
-                        # Actualizar estadísticas
-                        stats['tenants_processed'] += 1
-                        stats['tokens_deleted'] += deleted_count
-                        tenant_stats['tokens_deleted'] = deleted_count
-                        tenant_stats['success'] = True
-                        
-                        logger.info(
-                            f"[CLEANUP_JOB] ✅ Tenant {codigo_cliente} ({cliente_id}): "
-                            f"{deleted_count} tokens eliminados"
-                        )
-                        
-                    except Exception as cleanup_error:
-                        # Error durante cleanup (no crítico, continuar con siguiente tenant)
-                        error_msg = (
-                            f"Error en cleanup para tenant {codigo_cliente} ({cliente_id}): "
-                            f"{str(cleanup_error)}"
-                        )
-                        logger.error(f"[CLEANUP_JOB] ❌ {error_msg}", exc_info=True)
-                        stats['errors'].append(error_msg)
-                        tenant_stats['error'] = str(cleanup_error)
-                        
+                        tenant_stats = await RefreshTokenCleanupJob._cleanup_tenant(tenant)
                     finally:
-                        # ✅ FASE 4: Limpiar contexto siempre
-                        reset_tenant_context(tokens)
-                        
-                except Exception as tenant_error:
-                    # Error al obtener metadata o establecer contexto
-                    error_msg = (
-                        f"Error procesando tenant {codigo_cliente} ({cliente_id}): "
-                        f"{str(tenant_error)}"
-                    )
-                    logger.error(f"[CLEANUP_JOB] ❌ {error_msg}", exc_info=True)
-                    stats['errors'].append(error_msg)
-                    tenant_stats['error'] = str(tenant_error)
-                
-                # Agregar detalle del tenant a estadísticas
+                        _progress['in_progress'].remove(str(tenant['cliente_id']))
                 stats['tenants_detail'].append(tenant_stats)
+                if tenant_stats['success']:
+                    stats['tenants_processed'] += 1
+                    stats['tokens_deleted'] += tenant_stats['tokens_deleted']
+                    _progress['tokens_deleted'] += tenant_stats['tokens_deleted']
+                    completed.add(tenant_stats['cliente_id'])
+                    checkpoint['completed'] = sorted(completed)
+                    _save_checkpoint(checkpoint)
+                else:
+                    stats['errors'].append(
+                        f"Error en cleanup para tenant {tenant_stats['codigo_cliente']} "
+                        f"({tenant_stats['cliente_id']}): {tenant_stats['error']}"
+                    )
+                    _progress['tenants_failed'] += 1
+                _progress['tenants_done'] += 1
+                logger.info(
+                    f"[CLEANUP_JOB] Progreso {_progress['tenants_done']}/{len(tenants)} tenants, "
+                    f"{_progress['tokens_deleted']} tokens eliminados"
+                )
+            
+            await asyncio.gather(*(_process(tenant) for tenant in pending))
             
+            # Con errores se conserva el checkpoint: la próxima corrida reintenta solo los fallidos
+            if not stats['errors']:
+                _clear_checkpoint()
+            
+            stats['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
             logger.info(
                 f"[CLEANUP_JOB] ✅ Completado: {stats['tenants_processed']} tenants procesados, "
                 f"{stats['tokens_deleted']} tokens eliminados, "
-                f"{len(stats['errors'])} errores"
+                f"{len(stats['errors'])} errores en {stats['duration_ms']}ms"
             )
             
             return stats
@@ -165,6 +170,70 @@ class RefreshTokenCleanupJob:
             logger.exception(f"[CLEANUP_JOB] ❌ Error crítico en cleanup job: {str(e)}")
             stats['errors'].append(f"Error crítico: {str(e)}")
             return stats
+        finally:
+            _progress['running'] = False
+    
+    @staticmethod
+    async def _cleanup_tenant(tenant: Dict[str, Any]) -> Dict[str, Any]:
+        """Purga en lotes un tenant con su contexto; nunca lanza (error en el detalle)."""
+        cliente_id = tenant['cliente_id']
+        codigo_cliente = tenant.get('codigo_cliente') or 'N/A'
+        tenant_stats = {
+            'cliente_id': str(cliente_id),
+            'codigo_cliente': codigo_cliente,
+            'tokens_deleted': 0,
+            'success': False,
+            'error': None
+        }
+        
+        try:
+            # ✅ FASE 4: Obtener metadata de conexión para este tenant
+            connection_metadata = await get_connection_metadata_async(cliente_id)
+            database_type = connection_metadata.get('database_type', 'single')
+            nombre_bd = connection_metadata.get('nombre_bd', 'bd_sistema')
+            
+            logger.debug(
+                f"[CLEANUP_JOB] Procesando tenant {codigo_cliente} ({cliente_id}): "
+                f"{database_type.upper()}-DB ({nombre_bd})"
+            )
+            
+            # ✅ FASE 4: Establecer contexto del tenant (ContextVar: aislado por tarea)
+            tokens = set_tenant_context(TenantContext(
+                client_id=cliente_id,
+                codigo_cliente=codigo_cliente,
+                subdominio=tenant.get('subdominio') or 'N/A',
+                database_type=database_type,
+                nombre_bd=nombre_bd,
+                tipo_instalacion=tenant.get('tipo_instalacion') or 'shared',
+                connection_metadata=connection_metadata
+            ))
+            try:
+                deleted_count = await RefreshTokenCleanupJob._purge_tenant_tokens(
+                    cliente_id,
+                    batch_size=settings.TOKEN_CLEANUP_BATCH_SIZE,
+                    pause_seconds=settings.TOKEN_CLEANUP_BATCH_PAUSE_SECONDS,
+                )
+            finally:
+                # ✅ FASE 4: Limpiar contexto siempre
+                reset_tenant_context(tokens)
+            
+            tenant_stats['tokens_deleted'] = deleted_count
+            tenant_stats['success'] = True
+            logger.info(
+                f"[CLEANUP_JOB] ✅ Tenant {codigo_cliente} ({cliente_id}): "
+                f"{deleted_count} tokens eliminados"
+            )
+        
+        except Exception as tenant_error:
+            # Error no crítico: se registra y el job sigue con los demás tenants
+            logger.error(
+                f"[CLEANUP_JOB] ❌ Error en cleanup para tenant {codigo_cliente} ({cliente_id}): "
+                f"{str(tenant_error)}",
+                exc_info=True
+            )
+            tenant_stats['error'] = str(tenant_error)
+        
+        return tenant_stats
     
     @staticmethod
     async def cleanup_single_tenant(cliente_id: UUID) -> Dict[str, Any]:
@@ -220,6 +289,7 @@ class RefreshTokenCleanupJob:
                 
                 if not tenant_info:
                     raise ValueError(f"Tenant {cliente_id} no encontrado o inactivo")
+                tenant_info = dict(tenant_info._mapping)
                 
                 codigo_cliente = tenant_info['codigo_cliente']
                 subdominio = tenant_info.get('subdominio', 'N/A')
@@ -240,7 +310,9 @@ class RefreshTokenCleanupJob:
             
             try:
                 deleted_count = await RefreshTokenCleanupJob._purge_tenant_tokens(
-                    cliente_id
+                    cliente_id,
+                    batch_size=settings.TOKEN_CLEANUP_BATCH_SIZE,
+                    pause_seconds=settings.TOKEN_CLEANUP_BATCH_PAUSE_SECONDS,
                 )
                 result['tokens_deleted'] = deleted_count
                 result['success'] = True
@@ -261,8 +333,18 @@ class RefreshTokenCleanupJob:
         return result
 
     @staticmethod
-    async def _purge_tenant_tokens(cliente_id: UUID) -> int:
-        """Purga tokens según motor V1/V2 del tenant."""
+    async def _purge_tenant_tokens(
+        cliente_id: UUID,
+        *,
+        batch_size: Optional[int] = None,
+        pause_seconds: float = 0.0,
+    ) -> int:
+        """
+        Purga tokens según motor V1/V2 del tenant.
+
+        Con batch_size, cada DELETE borra como máximo ese número de filas y se
+        repite (con pausa) hasta vaciar; sin él, un DELETE por tabla.
+        """
         from app.modules.auth.application.session.session_v2_feature import (
             is_session_v2_enabled,
         )
@@ -273,11 +355,94 @@ class RefreshTokenCleanupJob:
                 purge_expired_tokens_core,
             )
 
-            tokens_deleted = await purge_expired_tokens_core(cliente_id)
-            sessions_deleted = await purge_closed_sessions_core(cliente_id)
+            tokens_deleted = await _delete_in_batches(
+                purge_expired_tokens_core, cliente_id, batch_size, pause_seconds
+            )
+            sessions_deleted = await _delete_in_batches(
+                purge_closed_sessions_core, cliente_id, batch_size, pause_seconds
+            )
             return tokens_deleted + sessions_deleted
 
+        if batch_size:
+            return await _delete_in_batches(
+                delete_expired_tokens_core, cliente_id, batch_size, pause_seconds
+            )
         return await RefreshTokenService.cleanup_expired_tokens()
 
 
-__all__ = ["RefreshTokenCleanupJob"]
+async def _delete_in_batches(
+    purge: Callable[..., Awaitable[int]],
+    cliente_id: UUID,
+    batch_size: Optional[int],
+    pause_seconds: float,
+) -> int:
+    """Repite purge(cliente_id, limit=batch_size) hasta que borre menos de un lote."""
+    if not batch_size:
+        return await purge(cliente_id)
+    total = 0
+    while True:
+        deleted = await purge(cliente_id, limit=batch_size)
+        total += deleted
+        _progress['batches'] += 1
+        if deleted < batch_size:
+            return total
+        await asyncio.sleep(pause_seconds)
+
+
+def _load_checkpoint() -> Optional[Dict[str, Any]]:
+    """Checkpoint de la corrida anterior si quedó incompleta y no venció."""
+    path = Path(settings.TOKEN_CLEANUP_CHECKPOINT_PATH)
+    try:
+        checkpoint = json.loads(path.read_text(encoding="utf-8"))
+        started_at = float(checkpoint['started_at'])
+        completed = list(checkpoint['completed'])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[CLEANUP_JOB] Checkpoint ilegible en {path}, se ignora: {e}")
+        return None
+    if time.time() - started_at > settings.TOKEN_CLEANUP_CHECKPOINT_MAX_AGE_HOURS * 3600:
+        logger.info(f"[CLEANUP_JOB] Checkpoint vencido en {path}, se inicia una corrida nueva")
+        return None
+    return {'started_at': started_at, 'completed': completed}
+
+
+def _save_checkpoint(checkpoint: Dict[str, Any]) -> None:
+    """Escritura atómica (tmp + rename); un fallo solo impide reanudar."""
+    path = Path(settings.TOKEN_CLEANUP_CHECKPOINT_PATH)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(checkpoint), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"[CLEANUP_JOB] No se pudo guardar el checkpoint {path}: {e}")
+
+
+def _clear_checkpoint() -> None:
+    try:
+        Path(settings.TOKEN_CLEANUP_CHECKPOINT_PATH).unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"[CLEANUP_JOB] No se pudo borrar el checkpoint: {e}")
+
+
+_progress: Dict[str, Any] = {
+    'running': False,
+    'started_at': None,
+    'tenants_total': 0,
+    'tenants_done': 0,
+    'tenants_failed': 0,
+    'tokens_deleted': 0,
+    'batches': 0,
+    'in_progress': [],
+}
+
+
+def get_cleanup_progress() -> Dict[str, Any]:
+    """Avance de la corrida actual (o de la última): tenants, tokens y lotes."""
+    return {**_progress, 'in_progress': list(_progress['in_progress'])}
+
+
+__all__ = ["RefreshTokenCleanupJob", "get_cleanup_progress"]
@@ -36,6 +36,7 @@ from app.modules.auth.presentation.schemas import (
     ImpersonationEndResponse,
 )
 from app.core.authorization.rbac import require_super_admin
+from app.core.authorization.route_priority import PRIORITY_CRITICA, declare_priority
 from app.core.auth.impersonation import is_impersonation_payload
 from app.core.security.jwt import normalize_bearer_jwt_token
 from app.modules.auth.application.services.impersonation_service import (
@@ -56,6 +57,7 @@ from app.core.auth import (
     RefreshTokenBody,
 )
 from app.api.deps import get_current_active_user, get_current_user_data, RoleChecker
+from app.api.deps_etag import conditional_get
 from app.modules.users.presentation.schemas import UsuarioReadWithRoles
 from app.core.authorization.rbac import has_permission
 from app.core.security.jwt import create_access_token, create_refresh_token
@@ -171,6 +173,7 @@ def _session_token_http_response(
 @router.post(
     "/login/",
     response_model=Union[Token, LoginEmpresaSelectionResponse],
+    dependencies=[Depends(declare_priority(PRIORITY_CRITICA))],
     summary="Autenticar usuario y obtener token",
     description="""
     Verifica credenciales (nombre de usuario/email y contraseña) **dentro del contexto de un cliente**.
@@ -283,13 +286,23 @@ async def login(
             target_cliente_id = cliente_id
             logger.debug(f"[LOGIN] target_cliente_id no encontrado en user_base_data, usando cliente_id del contexto: {cliente_id}")
 
+        # Contexto precargado por authenticate_user (usuario + roles + empresas en una query):
+        # lo que sigue se deriva en memoria en vez de una query por paso
+        login_context = user_base_data.pop("login_context", None)
+
         # 5b. Resolución de empresa activa (multi-empresa); superadmin nunca selecciona empresa
-        empresa_ctx = await AuthService.get_empresa_activa_para_login(
-            user_id,
-            target_cliente_id,
-            es_superadmin=es_superadmin,
-            user_type=user_base_data.get("user_type"),
-        )
+        if login_context is not None:
+            empresa_ctx = await login_context.empresa_context(
+                es_superadmin=es_superadmin,
+                user_type=user_base_data.get("user_type"),
+            )
+        else:
+            empresa_ctx = await AuthService.get_empresa_activa_para_login(
+                user_id,
+                target_cliente_id,
+                es_superadmin=es_superadmin,
+                user_type=user_base_data.get("user_type"),
+            )
         empresa_activa = empresa_ctx.get("empresa_activa")
         requiere_seleccion = empresa_ctx.get("requiere_seleccion", False)
         es_admin_sin_empresa = empresa_ctx.get("es_admin_sin_empresa", False)
@@ -305,28 +318,36 @@ async def login(
         if es_superadmin:
             user_role_names = ["Super Administrador"]  # Rol implícito
             logger.info(f"[LOGIN] Superadmin accediendo a cliente_id={target_cliente_id}")
+        elif login_context is not None:
+            user_role_names = login_context.role_names(empresa_activa)
         else:
             user_role_names = await UsuarioService.get_user_role_names(
                 cliente_id, user_id, empresa_id=empresa_activa
             )
 
         # 6. Tokens con contexto correcto
-        level_info = await get_user_access_level_info(
-            user_id,
-            target_cliente_id,
-            empresa_id=empresa_activa,
-            username=form_data.username,
-        )
+        if login_context is not None:
+            level_info = login_context.level_info(empresa_activa)
+        else:
+            level_info = await get_user_access_level_info(
+                user_id,
+                target_cliente_id,
+                empresa_id=empresa_activa,
+                username=form_data.username,
+            )
         if es_superadmin or level_info.get("is_super_admin"):
             level_info = AuthService._platform_superadmin_level_info()
             es_superadmin = True
 
-        es_admin_cliente = await AuthService.usuario_tiene_es_admin_cliente(
-            user_id,
-            target_cliente_id,
-            empresa_activa,
-            username=form_data.username,
-        )
+        if login_context is not None:
+            es_admin_cliente = login_context.es_admin_cliente(empresa_activa)
+        else:
+            es_admin_cliente = await AuthService.usuario_tiene_es_admin_cliente(
+                user_id,
+                target_cliente_id,
+                empresa_activa,
+                username=form_data.username,
+            )
         user_type_login = level_info.get("user_type", "user")
 
         requires_password_change = AuthService.resolve_requires_password_change(
@@ -362,7 +383,10 @@ async def login(
         if es_superadmin:
             token_data["es_superadmin"] = True
 
-        token_expiration = await AuthService.get_token_expiration_for_cliente(target_cliente_id)
+        if login_context is not None:
+            token_expiration = login_context.token_expiration
+        else:
+            token_expiration = await AuthService.get_token_expiration_for_cliente(target_cliente_id)
         access_expire_minutes = token_expiration["access_token_minutes"]
         refresh_expire_days = token_expiration["refresh_token_days"]
         refresh_cookie_max_age = refresh_expire_days * 24 * 60 * 60
@@ -850,7 +874,8 @@ async def finalizar_impersonacion(
 @router.get(
     "/me/",
     response_model=MeResponse,
-    summary="Obtener usuario actual"
+    summary="Obtener usuario actual",
+    dependencies=[Depends(declare_priority(PRIORITY_CRITICA))],
 )
 async def get_me(
     request: Request,
@@ -1139,6 +1164,7 @@ async def get_me(
     
     **Formato:** `{"permissions": ["billing.read", "crm.access", ...]}`
     """,
+    dependencies=[Depends(conditional_get())],
 )
 async def get_permissions_me(
     current_user=Depends(require_erp_session),
@@ -1242,6 +1268,7 @@ async def get_permissions_me(
     Flujo: Tenant → Modules → Permissions → Menu.
     Misma estructura que GET /modulos-menus/me/; no reemplaza ese endpoint.
     """,
+    dependencies=[Depends(conditional_get()), Depends(declare_priority(PRIORITY_CRITICA))],
 )
 async def get_menu(
     current_user=Depends(require_erp_session),
@@ -1336,7 +1363,11 @@ async def get_current_user_for_refresh_endpoint(
     )
 
 
-@router.post("/refresh/", response_model=Token)
+@router.post(
+    "/refresh/",
+    response_model=Token,
+    dependencies=[Depends(declare_priority(PRIORITY_CRITICA))],
+)
 async def refresh_access_token(
     request: Request,
     response: Response,
@@ -4,6 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app.api.deps import get_current_active_user
 from app.core.authorization.rbac import require_permission
+from app.core.authorization.route_priority import PRIORITY_BAJA
 from app.modules.users.presentation.schemas import UsuarioReadWithRoles
 from app.modules.bi.application.services import (
     list_reporte,
@@ -31,7 +32,7 @@ async def get_reportes(
     es_publico: Optional[bool] = Query(None),
     buscar: Optional[str] = Query(None),
     current_user: UsuarioReadWithRoles = Depends(get_current_active_user),
-    _: UsuarioReadWithRoles = Depends(require_permission("bi.reporte.leer")),
+    _: UsuarioReadWithRoles = Depends(require_permission("bi.reporte.leer", prioridad=PRIORITY_BAJA)),
 ):
     return await list_reporte(
         current_user.cliente_id,
@@ -7,6 +7,7 @@ from datetime import date
 from app.api.deps import get_current_active_user
 from app.modules.inv.presentation.inv_deps import get_inv_session_client_id
 from app.core.authorization.rbac import require_permission
+from app.core.authorization.route_priority import PRIORITY_BAJA
 from app.modules.users.presentation.schemas import UsuarioReadWithRoles
 from app.modules.inv.presentation.schemas import KardexLineaRead
 from app.modules.inv.application.services import kardex_service
@@ -25,7 +26,9 @@ async def obtener_kardex(
     fecha_desde: Optional[date] = Query(None, description="Fecha desde"),
     fecha_hasta: Optional[date] = Query(None, description="Fecha hasta"),
     current_user: UsuarioReadWithRoles = Depends(get_current_active_user),
-    _: UsuarioReadWithRoles = Depends(require_permission(f"{MODULE_CODE}.{RESOURCE_CODE}.leer")),
+    _: UsuarioReadWithRoles = Depends(
+        require_permission(f"{MODULE_CODE}.{RESOURCE_CODE}.leer", prioridad=PRIORITY_BAJA)
+    ),
     client_id: UUID = Depends(get_inv_session_client_id),
 ):
     """Kardex de la empresa activa en sesión (sin mezclar otras empresas del tenant)."""
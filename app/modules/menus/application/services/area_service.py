@@ -24,6 +24,7 @@ from app.core.exceptions import ValidationError, NotFoundError, ConflictError, D
 
 # 🏗️ BASE SERVICE - Nueva clase base para manejo consistente de errores
 from app.core.application.base_service import BaseService
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_TENANT
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +98,7 @@ class AreaService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def crear_area(cliente_id: UUID, area_data: AreaCreate) -> AreaRead:
         """
@@ -248,6 +250,7 @@ class AreaService(BaseService):
         )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def actualizar_area(area_id: UUID, area_data: AreaUpdate) -> AreaRead:
         """
@@ -330,6 +333,7 @@ class AreaService(BaseService):
         return AreaRead(**resultado_update)
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def cambiar_estado_area(area_id: UUID, activar: bool) -> AreaRead:
         """
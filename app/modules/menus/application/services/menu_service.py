@@ -29,6 +29,9 @@ from app.modules.menus.presentation.schemas import (
 
 # 🔧 UTILIDADES
 from app.modules.menus.application.services.menu_helper import build_menu_tree
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_GLOBAL
+from app.core.authorization.menu_cache import get_or_build_menu
+from app.core.tenant.context import try_get_current_client_id
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +76,7 @@ class MenuService(BaseService):
 
         logger.info(f"Obteniendo menú filtrado para usuario_id: {usuario_id}")
         
-        try:
+        async def build() -> MenuResponse:
             # 🗄️ EJECUTAR STORED PROCEDURE
             # ✅ FASE 2: Usar await
             resultado_sp = await execute_procedure_params(procedure_name, params_dict)
@@ -88,6 +91,21 @@ class MenuService(BaseService):
 
             return MenuResponse(menu=menu_tree)
 
+        try:
+            # ⚡ CACHE: mismo conjunto de roles en el tenant → mismo árbol (sin SP ni build_menu_tree)
+            from app.modules.modulos.application.services.modulo_menu_service import ModuloMenuService
+
+            cliente_id = try_get_current_client_id()
+            return await get_or_build_menu(
+                "legacy",
+                cliente_id=cliente_id,
+                usuario_id=usuario_id,
+                empresa_id=None,
+                response_model=MenuResponse,
+                build=build,
+                load_role_ids=lambda: ModuloMenuService.obtener_rol_ids_usuario(usuario_id, cliente_id),
+            )
+
         except DatabaseError as db_err:
             logger.error(f"Error de BD al obtener menú para usuario {usuario_id}: {db_err.detail}")
             raise ServiceError(
@@ -221,6 +239,7 @@ class MenuService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def crear_menu(cliente_id: UUID, menu_data: MenuCreate) -> MenuReadSingle:
         """
@@ -363,6 +382,7 @@ class MenuService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def actualizar_menu(menu_id: UUID, menu_data: MenuUpdate, cliente_id: Optional[UUID] = None) -> MenuReadSingle:
         """
@@ -519,6 +539,7 @@ class MenuService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def desactivar_menu(menu_id: UUID) -> Dict[str, Any]:
         """
@@ -584,6 +605,7 @@ class MenuService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def reactivar_menu(menu_id: UUID) -> Dict[str, Any]:
         """
@@ -33,7 +33,9 @@ from app.core.exceptions import CustomException # Reemplaza ServiceError
 
 # Importar Dependencias de Autorización
 from app.api.deps import get_current_active_user, RoleChecker
+from app.api.deps_etag import conditional_get
 from app.core.authorization.rbac import require_permission
+from app.core.authorization.route_priority import PRIORITY_CRITICA
 
 # Logging
 from app.core.logging_config import get_logger
@@ -74,7 +76,10 @@ def _can_manage_system_menu(current_user: UsuarioReadWithRoles) -> bool:
     - 401: No autenticado.
     - 500: Error interno del servidor.
     """,
-    dependencies=[Depends(require_permission("modulos.menu.leer"))],
+    dependencies=[
+        Depends(conditional_get()),
+        Depends(require_permission("modulos.menu.leer", prioridad=PRIORITY_CRITICA)),
+    ],
 )
 async def get_menu(
     current_user: UsuarioReadWithRoles = Depends(get_current_active_user)
@@ -125,7 +130,7 @@ async def get_menu(
     - 403: Acceso denegado (no Admin).
     - 500: Error interno del servidor.
     """,
-    dependencies=[Depends(require_admin), Depends(require_permission("modulos.menu.leer"))],
+    dependencies=[Depends(conditional_get()), Depends(require_admin), Depends(require_permission("modulos.menu.leer"))],
 )
 async def get_all_menus_admin_structured_endpoint(
     current_user: UsuarioReadWithRoles = Depends(get_current_active_user)
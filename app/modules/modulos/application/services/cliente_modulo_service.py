@@ -37,6 +37,7 @@ from app.modules.modulos.presentation.schemas import (
 )
 from app.modules.modulos.application.helpers.rol_plantilla_applier import aplicar_plantillas_roles
 from app.infrastructure.database.connection_async import DatabaseConnection
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_GLOBAL
 
 logger = logging.getLogger(__name__)
 
@@ -250,6 +251,7 @@ class ClienteModuloService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def activar_modulo_cliente(modulo_data: ClienteModuloCreate) -> ClienteModuloRead:
         """
@@ -460,6 +462,7 @@ class ClienteModuloService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def desactivar_modulo_cliente(cliente_id: UUID, modulo_id: UUID) -> bool:
         """
@@ -514,6 +517,7 @@ class ClienteModuloService(BaseService):
         return True
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def actualizar_configuracion(
         cliente_id: UUID,
@@ -559,6 +563,7 @@ class ClienteModuloService(BaseService):
         return await ClienteModuloService.obtener_modulo_activo_por_id(modulo_activo.cliente_modulo_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def actualizar_limites(
         cliente_id: UUID,
@@ -617,6 +622,7 @@ class ClienteModuloService(BaseService):
         return await ClienteModuloService.obtener_modulo_activo_por_id(modulo_activo.cliente_modulo_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def extender_vencimiento(cliente_id: UUID, modulo_id: UUID, dias: int) -> ClienteModuloRead:
         """
@@ -33,6 +33,8 @@ from app.modules.modulos.presentation.schemas import (
 )
 from app.modules.modulos.application.helpers.menu_transformer import transformar_sp_menu_usuario
 from app.infrastructure.database.connection_async import DatabaseConnection
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_GLOBAL, SCOPE_TENANT
+from app.core.authorization.menu_cache import get_or_build_menu
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +118,7 @@ class ModuloMenuService(BaseService):
         return menu_dict
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def crear_menu(menu_data: ModuloMenuCreate) -> ModuloMenuRead:
         """
@@ -547,6 +550,7 @@ class ModuloMenuService(BaseService):
         return [ModuloMenuRead(**ModuloMenuService._normalizar_menu_dict(menu)) for menu in resultados]
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def actualizar_menu(menu_id: UUID, menu_data: ModuloMenuUpdate) -> ModuloMenuRead:
         """
@@ -641,6 +645,7 @@ class ModuloMenuService(BaseService):
         return menu_actualizado
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def eliminar_menu(menu_id: UUID) -> bool:
         """
@@ -695,6 +700,7 @@ class ModuloMenuService(BaseService):
         return True
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def activar_menu(menu_id: UUID) -> ModuloMenuRead:
         """Activa un menú."""
@@ -727,6 +733,7 @@ class ModuloMenuService(BaseService):
         return ModuloMenuRead(**menu_dict)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def desactivar_menu(menu_id: UUID) -> ModuloMenuRead:
         """Desactiva un menú."""
@@ -759,6 +766,7 @@ class ModuloMenuService(BaseService):
         return ModuloMenuRead(**menu_dict)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def reordenar_menus(seccion_id: UUID, ordenes: Dict[UUID, int]) -> List[ModuloMenuRead]:
         """
@@ -803,6 +811,7 @@ class ModuloMenuService(BaseService):
         )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def duplicar_menu(menu_id: UUID, cliente_id: UUID, nuevo_nombre: Optional[str] = None) -> ModuloMenuRead:
         """
@@ -905,6 +914,91 @@ class ModuloMenuService(BaseService):
         empresa_id: Optional[UUID] = None,
         effective_permission_codes: Optional[List[str]] = None,
         permisos_rol_id: Optional[UUID] = None,
+    ) -> MenuUsuarioResponse:
+        """
+        Menú del usuario desde el cache de menús compilados (ver
+        app/core/authorization/menu_cache.py); en fallo lo construye con
+        _construir_menu_usuario. Usuarios con el mismo conjunto de roles en el
+        mismo tenant y empresa comparten la entrada.
+        """
+        from app.core.tenant.empresa_context import resolve_empresa_id
+
+        resolved_empresa_id = resolve_empresa_id(empresa_id)
+        if is_super_admin:
+            scope = "super_admin"
+        elif permisos_rol_id is not None:
+            scope = f"rol:{permisos_rol_id}"
+        else:
+            scope = None
+
+        async def build() -> MenuUsuarioResponse:
+            return await ModuloMenuService._construir_menu_usuario(
+                usuario_id=usuario_id,
+                cliente_id=cliente_id,
+                is_super_admin=is_super_admin,
+                as_tenant_admin=as_tenant_admin,
+                empresa_id=resolved_empresa_id,
+                effective_permission_codes=effective_permission_codes,
+                permisos_rol_id=permisos_rol_id,
+            )
+
+        return await get_or_build_menu(
+            "modulos",
+            cliente_id=cliente_id,
+            usuario_id=usuario_id,
+            empresa_id=resolved_empresa_id,
+            response_model=MenuUsuarioResponse,
+            build=build,
+            load_role_ids=lambda: ModuloMenuService.obtener_rol_ids_usuario(
+                usuario_id, cliente_id, resolved_empresa_id
+            ),
+            scope=scope,
+        )
+
+    @staticmethod
+    async def obtener_rol_ids_usuario(
+        usuario_id: UUID,
+        cliente_id: UUID,
+        empresa_id: Optional[UUID] = None,
+    ) -> List[UUID]:
+        """
+        Roles vigentes del usuario en el tenant (mismo criterio que la QUERY 2 del
+        menú: activos, no expirados y, con empresa, del scope de esa empresa).
+        """
+        from app.core.tenant.empresa_context import sql_empresa_filter_usuario_rol_qmark
+
+        empresa_sql = sql_empresa_filter_usuario_rol_qmark("ur") if empresa_id else ""
+        query_raw = f"""
+        SELECT ur.rol_id
+        FROM usuario_rol ur
+        WHERE ur.usuario_id = ?
+          AND ur.cliente_id = ?
+          AND ur.es_activo = 1
+          AND (ur.fecha_expiracion IS NULL OR ur.fecha_expiracion > GETDATE())
+          {empresa_sql}
+        """
+        params_raw = (str(usuario_id), str(cliente_id))
+        if empresa_id:
+            params_raw += (str(empresa_id),)
+        rows = await execute_query(
+            query_raw,
+            params=params_raw,
+            connection_type=DatabaseConnection.DEFAULT,
+            client_id=cliente_id,
+        )
+        return [row["rol_id"] for row in rows or [] if row.get("rol_id")]
+
+    @staticmethod
+    @BaseService.handle_service_errors
+    async def _construir_menu_usuario(
+        usuario_id: UUID,
+        cliente_id: UUID,
+        is_super_admin: bool = False,
+        as_tenant_admin: bool = False,
+        *,
+        empresa_id: Optional[UUID] = None,
+        effective_permission_codes: Optional[List[str]] = None,
+        permisos_rol_id: Optional[UUID] = None,
     ) -> MenuUsuarioResponse:
         """
         Obtiene el menú completo del usuario combinando datos de BD central y BD del cliente.
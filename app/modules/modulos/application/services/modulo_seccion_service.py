@@ -30,6 +30,7 @@ from app.modules.modulos.presentation.schemas import (
     ModuloSeccionCreate, ModuloSeccionUpdate, ModuloSeccionRead
 )
 from app.infrastructure.database.connection_async import DatabaseConnection
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_GLOBAL
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,7 @@ class ModuloSeccionService(BaseService):
     """
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def crear_seccion(seccion_data: ModuloSeccionCreate) -> ModuloSeccionRead:
         """
@@ -160,6 +162,7 @@ class ModuloSeccionService(BaseService):
         return ModuloSeccionRead(**resultado[0])
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def actualizar_seccion(seccion_id: UUID, seccion_data: ModuloSeccionUpdate) -> ModuloSeccionRead:
         """
@@ -216,6 +219,7 @@ class ModuloSeccionService(BaseService):
         return ModuloSeccionRead(**resultado)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def eliminar_seccion(seccion_id: UUID) -> bool:
         """
@@ -262,6 +266,7 @@ class ModuloSeccionService(BaseService):
         return True
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def activar_seccion(seccion_id: UUID) -> ModuloSeccionRead:
         """Activa una sección."""
@@ -293,6 +298,7 @@ class ModuloSeccionService(BaseService):
         return ModuloSeccionRead(**resultado)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def desactivar_seccion(seccion_id: UUID) -> ModuloSeccionRead:
         """Desactiva una sección."""
@@ -324,6 +330,7 @@ class ModuloSeccionService(BaseService):
         return ModuloSeccionRead(**resultado)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def reordenar_secciones(modulo_id: UUID, ordenes: Dict[UUID, int]) -> List[ModuloSeccionRead]:
         """
@@ -33,6 +33,7 @@ from app.core.exceptions import (
 from app.core.application.base_service import BaseService
 from app.modules.modulos.presentation.schemas import ModuloCreate, ModuloUpdate, ModuloRead
 from app.infrastructure.database.connection_async import DatabaseConnection
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_GLOBAL
 
 logger = logging.getLogger(__name__)
 
@@ -269,6 +270,7 @@ class ModuloService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def crear_modulo(modulo_data: ModuloCreate) -> ModuloRead:
         """
@@ -320,6 +322,7 @@ class ModuloService(BaseService):
         return ModuloRead(**resultado)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def actualizar_modulo(modulo_id: UUID, modulo_data: ModuloUpdate) -> ModuloRead:
         """
@@ -385,6 +388,7 @@ class ModuloService(BaseService):
         return ModuloRead(**resultado)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def eliminar_modulo(modulo_id: UUID) -> bool:
         """
@@ -452,6 +456,7 @@ class ModuloService(BaseService):
         return True
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def activar_modulo(modulo_id: UUID) -> ModuloRead:
         """Activa un módulo del catálogo."""
@@ -483,6 +488,7 @@ class ModuloService(BaseService):
         return ModuloRead(**resultado)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def desactivar_modulo(modulo_id: UUID) -> ModuloRead:
         """Desactiva un módulo del catálogo."""
@@ -15,6 +15,7 @@ from app.core.exceptions import CustomException
 from app.api.deps import get_current_active_user
 from app.core.authorization.lbac import require_super_admin
 from app.core.authorization.rbac import require_permission
+from app.core.authorization.route_priority import PRIORITY_CRITICA
 from app.core.tenant.company_scope import resolve_empresa_id_for_rbac
 from app.modules.users.presentation.schemas import UsuarioReadWithRoles
 
@@ -65,7 +66,7 @@ async def listar_menus_modulo(
     - 200: Menú del usuario obtenido exitosamente
     - 500: Error interno del servidor
     """,
-    dependencies=[Depends(require_permission("modulos.menu.leer"))],
+    dependencies=[Depends(require_permission("modulos.menu.leer", prioridad=PRIORITY_CRITICA))],
 )
 async def obtener_mi_menu(
     current_user: UsuarioReadWithRoles = Depends(get_current_active_user)
@@ -23,13 +23,15 @@ from app.modules.modulos.presentation.schemas import (
 from app.modules.modulos.application.services.modulo_service import ModuloService
 from app.core.exceptions import CustomException
 from app.api.deps import get_current_active_user
+from app.api.deps_etag import conditional_get
 from app.core.authorization.lbac import require_super_admin
 from app.core.authorization.rbac import require_permission
 from app.modules.users.presentation.schemas import UsuarioReadWithRoles
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# GET condicional: el catálogo solo cambia con escrituras de módulos/cliente_modulo (versión global)
+router = APIRouter(dependencies=[Depends(conditional_get(tenant_scoped=False))])
 
 
 @router.get(
@@ -17,6 +17,7 @@ from app.core.application.base_service import BaseService
 
 # 👥 SERVICIOS RELACIONADOS
 from app.modules.rbac.application.services.rol_service import RolService
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_TENANT
 # ✅ REFACTORIZACIÓN: Importación lazy para evitar circular imports
 # from app.modules.modulos.application.services.modulo_menu_service import ModuloMenuService
 
@@ -175,6 +176,7 @@ class PermisoService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def asignar_o_actualizar_permiso(
         cliente_id: UUID,
@@ -501,6 +503,7 @@ class PermisoService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def revocar_permiso(cliente_id: UUID, rol_id: UUID, menu_id: UUID) -> Dict:
         """
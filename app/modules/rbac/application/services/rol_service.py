@@ -31,6 +31,7 @@ from app.core.exceptions import (
 
 # 🏗️ BASE SERVICE - Clase base para manejo consistente de errores
 from app.core.application.base_service import BaseService
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_TENANT
 
 logger = logging.getLogger(__name__)
 
@@ -319,6 +320,7 @@ class RolService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def crear_rol(cliente_id: UUID, rol_data: Dict) -> Dict:
         """
@@ -693,6 +695,7 @@ class RolService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def actualizar_rol(rol_id: UUID, rol_data: Dict) -> Dict:
         """
@@ -802,6 +805,7 @@ class RolService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def desactivar_rol(rol_id: UUID) -> Dict:
         """
@@ -898,6 +902,7 @@ class RolService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def reactivar_rol(rol_id: UUID) -> Dict:
         """
@@ -1136,6 +1141,7 @@ class RolService(BaseService):
             )
 
     @staticmethod
+    @bumps_versions(SCOPE_TENANT)
     @BaseService.handle_service_errors
     async def actualizar_permisos_rol(rol_id: UUID, permisos_payload: PermisoUpdatePayload) -> None:
         """
@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.modules.rbac.presentation.schemas import PermisoCatalogoRead
 from app.modules.rbac.application.services.permisos_negocio_service import listar_catalogo_permisos
 from app.api.deps import get_current_active_user
+from app.api.deps_etag import conditional_get
 from app.core.authorization.rbac import require_permission
 from app.core.logging_config import get_logger
 from app.core.exceptions import CustomException
@@ -28,13 +29,13 @@ router = APIRouter()
     **URL:** GET /api/v1/permisos-catalogo o GET /api/v1/permisos-catalogo/
     **Autorización:** `admin.rol.leer`.
     """,
-    dependencies=[Depends(require_permission("admin.rol.leer"))],
+    dependencies=[Depends(conditional_get()), Depends(require_permission("admin.rol.leer"))],
 )
 @router.get(
     "/",
     response_model=List[PermisoCatalogoRead],
     include_in_schema=False,
-    dependencies=[Depends(require_permission("admin.rol.leer"))],
+    dependencies=[Depends(conditional_get()), Depends(require_permission("admin.rol.leer"))],
 )
 async def get_permisos_catalogo(
     current_user=Depends(get_current_active_user),
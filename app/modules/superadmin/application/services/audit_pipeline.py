@@ -0,0 +1,369 @@
+"""
+Pipeline asíncrono de auditoría (auth_audit_log).
+
+AuditService.registrar_auth_event ya no inserta en línea con el request (login,
+refresh, accesos cross-tenant...): encola la fila en una cola acotada y un
+consumidor en background la inserta en lotes, un INSERT multi-fila por BD
+destino (tenant dedicado o ADMIN) y cliente.
+
+- Durabilidad: los eventos de AUDIT_SYNC_EVENTS (impersonación, reuso de
+  tokens...) y todo si AUDIT_PIPELINE_ENABLED=false se siguen escribiendo de
+  forma síncrona, como antes.
+- Spill a disco: si la BD falla el lote se escribe como JSONL en AUDIT_SPILL_DIR
+  (un archivo inmutable por lote, rename atómico) y se reintenta cada
+  AUDIT_SPILL_REPLAY_SECONDS. Cualquier worker puede reclamar un archivo
+  renombrándolo, así no se inserta dos veces.
+- Cola llena: los eventos se juntan en un buffer y se vuelcan a disco por lote
+  (AUDIT_BATCH_SIZE o cada AUDIT_FLUSH_SECONDS), no un archivo + fsync por evento.
+- Al apagar se drena la cola con AUDIT_SHUTDOWN_TIMEOUT_SECONDS; si vence, el
+  lote en curso y lo que queda sin insertar se vuelcan a disco antes de cancelar.
+
+fecha_evento lo fija AuditService al registrar el evento, con el mismo reloj en la
+ruta síncrona y en la encolada; el lote o el replay no alteran la hora del evento.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.infrastructure.database.connection_async import DatabaseConnection
+from app.infrastructure.database.queries_async import execute_insert
+from app.infrastructure.database.tables import AuthAuditLogTable
+
+logger = logging.getLogger(__name__)
+
+_ROWS_PER_INSERT = 100  # 13 columnas × 100 < 2100 parámetros de SQL Server
+_UUID_FIELDS = ("cliente_id", "usuario_id")
+_STALE_CLAIM_SECONDS = 600
+
+_queue: Optional[asyncio.Queue] = None
+_queue_loop: Optional[asyncio.AbstractEventLoop] = None
+_consumer_task: Optional[asyncio.Task] = None
+_last_replay = 0.0
+_overflow: List[Dict[str, Any]] = []
+_overflow_task: Optional[asyncio.Task] = None
+_stats: Dict[str, int] = {
+    "enqueued": 0,
+    "inserted": 0,
+    "batches": 0,
+    "statements": 0,
+    "spilled": 0,
+    "replayed": 0,
+    "queue_full": 0,
+}
+
+
+def is_synchronous_event(evento: str) -> bool:
+    """El evento se escribe en línea (pipeline desactivado o evento durable)."""
+    if not settings.AUDIT_PIPELINE_ENABLED:
+        return True
+    return evento in {e.strip() for e in settings.AUDIT_SYNC_EVENTS.split(",") if e.strip()}
+
+
+def _get_queue() -> asyncio.Queue:
+    """Cola del loop actual; arranca el consumidor si no corre."""
+    global _queue, _queue_loop, _consumer_task
+    loop = asyncio.get_running_loop()
+    if _queue is None or _queue_loop is not loop:
+        _queue, _queue_loop, _consumer_task = asyncio.Queue(maxsize=settings.AUDIT_QUEUE_MAX_SIZE), loop, None
+    if _consumer_task is None or _consumer_task.done():
+        _consumer_task = loop.create_task(_consume(_queue), name="audit-pipeline")
+    return _queue
+
+
+async def enqueue_audit_event(row: Dict[str, Any], connection_type: DatabaseConnection) -> None:
+    """Encola una fila de auth_audit_log; con la cola llena va directo a disco."""
+    event = {**row, "fecha_evento": row.get("fecha_evento") or datetime.now(), "_conn": connection_type.name}
+    queue = _get_queue()
+    try:
+        queue.put_nowait(event)
+        _stats["enqueued"] += 1
+    except asyncio.QueueFull:
+        _stats["queue_full"] += 1
+        await _buffer_overflow(event)
+
+
+async def _buffer_overflow(event: Dict[str, Any]) -> None:
+    """Cola llena: junta el evento y vuelca a disco por lote (tamaño o tiempo)."""
+    global _overflow_task
+    _overflow.append(event)
+    if len(_overflow) >= settings.AUDIT_BATCH_SIZE:
+        await _spill(_take_overflow())
+    elif _overflow_task is None or _overflow_task.done():
+        _overflow_task = asyncio.get_running_loop().create_task(_flush_overflow_later(), name="audit-overflow")
+
+
+def _take_overflow() -> List[Dict[str, Any]]:
+    events = list(_overflow)
+    _overflow.clear()
+    return events
+
+
+async def _flush_overflow_later() -> None:
+    try:
+        await asyncio.sleep(settings.AUDIT_FLUSH_SECONDS)
+    except asyncio.CancelledError:
+        _spill_now(_take_overflow())
+        raise
+    events = _take_overflow()
+    if events:
+        await _spill(events)
+
+
+async def _consume(queue: asyncio.Queue) -> None:
+    """Consume lotes hasta recibir el centinela None (shutdown)."""
+    while True:
+        first = await queue.get()
+        if first is None:
+            return
+        batch = [first]
+        stop = _drain_into(queue, batch)
+        if not stop and len(batch) < settings.AUDIT_BATCH_SIZE:
+            # Breve espera para juntar más eventos (logins en ráfaga)
+            try:
+                await asyncio.sleep(settings.AUDIT_FLUSH_SECONDS)
+            except asyncio.CancelledError:
+                _spill_now(batch)
+                raise
+            stop = _drain_into(queue, batch)
+        try:
+            await write_batch(batch)
+            if not stop:
+                await _maybe_replay_spill()
+        except Exception as exc:
+            logger.error(f"[AUDIT_PIPELINE] Error en el consumidor: {exc}", exc_info=True)
+        if stop:
+            return
+
+
+def _drain_into(queue: asyncio.Queue, batch: List[Dict[str, Any]]) -> bool:
+    """Agrega lo disponible sin esperar; True si apareció el centinela."""
+    while len(batch) < settings.AUDIT_BATCH_SIZE:
+        try:
+            event = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return False
+        if event is None:
+            return True
+        batch.append(event)
+    return False
+
+
+async def write_batch(events: List[Dict[str, Any]]) -> int:
+    """
+    Inserta eventos agrupados por BD destino; lo que falle se vuelca a disco.
+
+    Si se cancela (shutdown con timeout), los chunks aún no insertados se vuelcan
+    a disco antes de propagar la cancelación.
+    """
+    groups: Dict[Tuple[str, Any], List[Dict[str, Any]]] = {}
+    for event in events:
+        groups.setdefault((event["_conn"], event["cliente_id"]), []).append(event)
+    chunks = [
+        (conn_name, cliente_id, group[start:start + _ROWS_PER_INSERT])
+        for (conn_name, cliente_id), group in groups.items()
+        for start in range(0, len(group), _ROWS_PER_INSERT)
+    ]
+
+    inserted = 0
+    done = 0
+    try:
+        for conn_name, cliente_id, chunk in chunks:
+            rows = [{k: v for k, v in event.items() if not k.startswith("_")} for event in chunk]
+            try:
+                await execute_insert(
+                    insert(AuthAuditLogTable).values(rows),
+                    connection_type=DatabaseConnection[conn_name],
+                    client_id=cliente_id,
+                )
+                inserted += len(chunk)
+                _stats["statements"] += 1
+            except Exception as exc:
+                logger.warning(
+                    f"[AUDIT_PIPELINE] Insert fallido ({len(chunk)} eventos, cliente {cliente_id}), "
+                    f"volcando a disco: {exc}"
+                )
+                await _spill(chunk)
+            done += 1
+    except asyncio.CancelledError:
+        _spill_now([event for _, _, chunk in chunks[done:] for event in chunk])
+        _stats["inserted"] += inserted
+        raise
+    _stats["inserted"] += inserted
+    _stats["batches"] += 1
+    return inserted
+
+
+def _serialize(event: Dict[str, Any]) -> str:
+    return json.dumps(
+        {k: (str(v) if isinstance(v, UUID) else v.isoformat() if isinstance(v, datetime) else v)
+         for k, v in event.items()},
+        ensure_ascii=False,
+    )
+
+
+def _deserialize(line: str) -> Dict[str, Any]:
+    event = json.loads(line)
+    for field in _UUID_FIELDS:
+        if event.get(field):
+            event[field] = UUID(event[field])
+    event["fecha_evento"] = datetime.fromisoformat(event["fecha_evento"])
+    return event
+
+
+def _write_spill_file(lines: List[str]) -> None:
+    directory = Path(settings.AUDIT_SPILL_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"audit-{os.getpid()}-{time.time_ns()}-{uuid4().hex[:8]}.jsonl"
+    tmp = directory / f".{name}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, directory / name)  # visible solo completo
+
+
+async def _spill(events: List[Dict[str, Any]]) -> None:
+    try:
+        await asyncio.to_thread(_write_spill_file, [_serialize(e) for e in events])
+        _stats["spilled"] += len(events)
+    except Exception as exc:
+        logger.error(f"[AUDIT_PIPELINE] No se pudo volcar {len(events)} eventos a disco: {exc}")
+
+
+def _spill_now(events: List[Dict[str, Any]]) -> None:
+    """Spill sin ceder el loop: para la ruta de cancelación (no puede volver a cancelarse)."""
+    if not events:
+        return
+    try:
+        _write_spill_file([_serialize(e) for e in events])
+        _stats["spilled"] += len(events)
+        logger.warning(f"[AUDIT_PIPELINE] Cancelado al apagar: {len(events)} eventos volcados a disco")
+    except Exception as exc:
+        logger.error(f"[AUDIT_PIPELINE] No se pudo volcar {len(events)} eventos a disco: {exc}")
+
+
+def _claim_spill_files() -> List[Path]:
+    directory = Path(settings.AUDIT_SPILL_DIR)
+    if not directory.is_dir():
+        return []
+    claimed = []
+    now = time.time()
+    for path in sorted(directory.iterdir()):
+        # Reclamos de un worker que murió a mitad del replay
+        stale = ".replay-" in path.name and now - path.stat().st_mtime > _STALE_CLAIM_SECONDS
+        if not (path.name.endswith(".jsonl") or stale):
+            continue
+        target = path.with_name(f"{path.name.split('.replay-')[0]}.replay-{os.getpid()}")
+        try:
+            os.rename(path, target)
+            os.utime(target)  # el reclamo recién hecho no cuenta como abandonado
+        except OSError:
+            continue  # otro worker lo reclamó
+        claimed.append(target)
+    return claimed
+
+
+def _read_spill_file(path: Path) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as fh:
+        return [_deserialize(line) for line in fh if line.strip()]
+
+
+async def replay_spill() -> int:
+    """Reinserta los eventos volcados a disco (los que vuelvan a fallar se re-vuelcan)."""
+    replayed = 0
+    for path in await asyncio.to_thread(_claim_spill_files):
+        try:
+            events = await asyncio.to_thread(_read_spill_file, path)
+        except Exception as exc:
+            logger.error(f"[AUDIT_PIPELINE] Archivo de spill ilegible {path.name}: {exc}")
+            continue
+        try:
+            replayed += await write_batch(events)
+        except asyncio.CancelledError:
+            path.unlink()  # write_batch ya volcó lo no insertado a un archivo nuevo
+            raise
+        await asyncio.to_thread(path.unlink)
+    _stats["replayed"] += replayed
+    if replayed:
+        logger.info(f"[AUDIT_PIPELINE] {replayed} eventos recuperados desde disco")
+    return replayed
+
+
+async def _maybe_replay_spill() -> None:
+    global _last_replay
+    if time.monotonic() - _last_replay < settings.AUDIT_SPILL_REPLAY_SECONDS:
+        return
+    _last_replay = time.monotonic()
+    await replay_spill()
+
+
+def start_audit_pipeline() -> None:
+    """Arranca el consumidor (también arranca solo con el primer evento)."""
+    _get_queue()
+
+
+async def stop_audit_pipeline() -> None:
+    """
+    Detiene el consumidor tras su lote en curso y drena la cola (shutdown).
+
+    Espera y drenaje acotados por AUDIT_SHUTDOWN_TIMEOUT_SECONDS: al vencer, lo no
+    insertado queda en disco (write_batch vuelca al ser cancelado).
+    """
+    global _consumer_task, _overflow_task
+    task, _consumer_task = _consumer_task, None
+    overflow_task, _overflow_task = _overflow_task, None
+    if overflow_task is not None and not overflow_task.done():
+        overflow_task.cancel()  # vuelca el buffer de cola llena al cancelarse
+        try:
+            await overflow_task
+        except asyncio.CancelledError:
+            pass
+    _spill_now(_take_overflow())
+    timeout = settings.AUDIT_SHUTDOWN_TIMEOUT_SECONDS
+    if task is not None and not task.done() and _queue is not None:
+        await _queue.put(None)
+        try:
+            await asyncio.wait_for(task, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("[AUDIT_PIPELINE] Consumidor sin terminar al apagar; lote en curso volcado a disco")
+    if _queue is not None:
+        pending = [e for e in (_queue.get_nowait() for _ in range(_queue.qsize())) if e is not None]
+        if pending:
+            try:
+                await asyncio.wait_for(write_batch(pending), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("[AUDIT_PIPELINE] Drenaje final vencido; pendientes volcados a disco")
+
+
+def get_audit_pipeline_report() -> Dict[str, Any]:
+    """Eventos encolados, insertados por lote y volcados a disco."""
+    directory = Path(settings.AUDIT_SPILL_DIR)
+    spill_files = len(list(directory.glob("*.jsonl"))) if directory.is_dir() else 0
+    return {
+        "enabled": settings.AUDIT_PIPELINE_ENABLED,
+        "queue_size": _queue.qsize() if _queue is not None else 0,
+        "queue_max": settings.AUDIT_QUEUE_MAX_SIZE,
+        "overflow_buffered": len(_overflow),
+        "spill_files": spill_files,
+        **_stats,
+    }
+
+
+def reset_audit_pipeline() -> None:
+    """Descarta cola y métricas (tests)."""
+    global _queue, _queue_loop, _consumer_task, _last_replay, _overflow_task
+    _queue, _queue_loop, _consumer_task, _last_replay, _overflow_task = None, None, None, 0.0, None
+    _overflow.clear()
+    for key in _stats:
+        _stats[key] = 0
@@ -13,6 +13,10 @@ from app.infrastructure.database.sql_constants import (
 from app.infrastructure.database.connection_async import DatabaseConnection
 from app.core.exceptions import DatabaseError
 from app.core.application.base_service import BaseService
+from app.modules.superadmin.application.services.audit_pipeline import (
+    enqueue_audit_event,
+    is_synchronous_event,
+)
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
@@ -118,6 +122,9 @@ class AuditService(BaseService):
 
             # ✅ FASE 4B: Usar parámetros nombrados directamente (ya están en la constante)
             query = INSERT_AUTH_AUDIT_LOG
+            # Mismo reloj para la ruta síncrona y la encolada (no el GETDATE() del servidor):
+            # el orden de los eventos no depende de la ruta ni del momento del INSERT en lote
+            fecha_evento = datetime.now()
 
             # ✅ FASE 2: Usar await con text().bindparams()
             # ✅ CORRECCIÓN: auth_audit_log existe tanto en BD central como en BD dedicada
@@ -148,6 +155,30 @@ class AuditService(BaseService):
                     f"[AUDIT] Sin contexto de tenant, usando BD ADMIN por defecto"
                 )
             
+            # Pipeline asíncrono: la fila se inserta en lote fuera del request
+            # (los eventos de AUDIT_SYNC_EVENTS siguen siendo síncronos)
+            if not is_synchronous_event(evento):
+                await enqueue_audit_event(
+                    {
+                        "cliente_id": cliente_id_uuid,
+                        "usuario_id": usuario_id_uuid,
+                        "evento": evento,
+                        "nombre_usuario_intento": nombre_usuario_intento,
+                        "descripcion": descripcion,
+                        "exito": bool(exito),
+                        "codigo_error": codigo_error,
+                        "ip_address": ip_address,
+                        "user_agent": user_agent,
+                        "device_info": device_info,
+                        "geolocation": geolocation,
+                        "metadata_json": metadata_json,
+                        "fecha_evento": fecha_evento,
+                    },
+                    connection_type,
+                )
+                logger.debug("[AUDIT] auth_audit_log encolado: evento=%s, cliente_id=%s", evento, cliente_id)
+                return {"rows_affected": 0, "queued": True}
+
             result = await execute_insert(
                 text(query).bindparams(
                     cliente_id=cliente_id_uuid,
@@ -162,6 +193,7 @@ class AuditService(BaseService):
                     device_info=device_info,
                     geolocation=geolocation,
                     metadata_json=metadata_json,
+                    fecha_evento=fecha_evento,
                 ),
                 connection_type=connection_type,  # BD del tenant para dedicated, BD ADMIN para shared
                 client_id=cliente_id_uuid
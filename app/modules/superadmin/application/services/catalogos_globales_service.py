@@ -15,6 +15,7 @@ from app.infrastructure.database.tables_erp import (
     CatProvinciaTable,
     CatDistritoTable,
 )
+from app.infrastructure.cache.versions import bumps_versions, SCOPE_GLOBAL
 
 
 class CatalogosGlobalesService(BaseService):
@@ -229,6 +230,7 @@ class CatalogosGlobalesService(BaseService):
         return rows[0]
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def create_moneda(*, client_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         moneda_id = uuid4()
@@ -247,6 +249,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_moneda(client_id=client_id, moneda_id=moneda_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def update_moneda(*, client_id: UUID, moneda_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         await CatalogosGlobalesService.get_moneda(client_id=client_id, moneda_id=moneda_id)
@@ -258,6 +261,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_moneda(client_id=client_id, moneda_id=moneda_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def deactivate_moneda(*, client_id: UUID, moneda_id: UUID) -> None:
         await CatalogosGlobalesService.get_moneda(client_id=client_id, moneda_id=moneda_id)
@@ -313,6 +317,7 @@ class CatalogosGlobalesService(BaseService):
         return rows[0]
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def create_pais(*, client_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         pais_id = uuid4()
@@ -332,6 +337,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_pais(client_id=client_id, pais_id=pais_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def update_pais(*, client_id: UUID, pais_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         await CatalogosGlobalesService.get_pais(client_id=client_id, pais_id=pais_id)
@@ -350,6 +356,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_pais(client_id=client_id, pais_id=pais_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def deactivate_pais(*, client_id: UUID, pais_id: UUID) -> None:
         await CatalogosGlobalesService.get_pais(client_id=client_id, pais_id=pais_id)
@@ -407,6 +414,7 @@ class CatalogosGlobalesService(BaseService):
         return rows[0]
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def create_departamento(*, client_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         departamento_id = uuid4()
@@ -424,6 +432,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_departamento(client_id=client_id, departamento_id=departamento_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def update_departamento(*, client_id: UUID, departamento_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         await CatalogosGlobalesService.get_departamento(client_id=client_id, departamento_id=departamento_id)
@@ -439,6 +448,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_departamento(client_id=client_id, departamento_id=departamento_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def delete_departamento(*, client_id: UUID, departamento_id: UUID) -> None:
         await CatalogosGlobalesService.get_departamento(client_id=client_id, departamento_id=departamento_id)
@@ -500,6 +510,7 @@ class CatalogosGlobalesService(BaseService):
         return rows[0]
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def create_provincia(*, client_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         provincia_id = uuid4()
@@ -517,6 +528,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_provincia(client_id=client_id, provincia_id=provincia_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def update_provincia(*, client_id: UUID, provincia_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         await CatalogosGlobalesService.get_provincia(client_id=client_id, provincia_id=provincia_id)
@@ -528,6 +540,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_provincia(client_id=client_id, provincia_id=provincia_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def delete_provincia(*, client_id: UUID, provincia_id: UUID) -> None:
         await CatalogosGlobalesService.get_provincia(client_id=client_id, provincia_id=provincia_id)
@@ -597,6 +610,7 @@ class CatalogosGlobalesService(BaseService):
         return rows[0]
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def create_distrito(*, client_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         distrito_id = uuid4()
@@ -617,6 +631,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_distrito(client_id=client_id, distrito_id=distrito_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def update_distrito(*, client_id: UUID, distrito_id: UUID, data: Dict[str, Any]) -> Dict[str, Any]:
         await CatalogosGlobalesService.get_distrito(client_id=client_id, distrito_id=distrito_id)
@@ -632,6 +647,7 @@ class CatalogosGlobalesService(BaseService):
         return await CatalogosGlobalesService.get_distrito(client_id=client_id, distrito_id=distrito_id)
 
     @staticmethod
+    @bumps_versions(SCOPE_GLOBAL)
     @BaseService.handle_service_errors
     async def delete_distrito(*, client_id: UUID, distrito_id: UUID) -> None:
         await CatalogosGlobalesService.get_distrito(client_id=client_id, distrito_id=distrito_id)
@@ -26,6 +26,7 @@ import logging
 # Importaciones de base de datos
 # ✅ FASE 2: Migrar a queries_async
 from app.infrastructure.database.queries_async import execute_query
+from app.infrastructure.database.connection_async import DatabaseConnection
 from sqlalchemy import text
 
 # Schemas
@@ -983,7 +984,10 @@ class SuperadminAuditoriaService(BaseService):
         """
         # Si se filtra por cliente_id, usar la conexión de ese cliente
         # ✅ FASE 2: Usar await
-        auth_stats_raw = await execute_query(auth_stats_query, tuple(params_auth), client_id=cliente_id)
+        auth_stats_raw = await execute_query(
+            auth_stats_query, tuple(params_auth), client_id=cliente_id,
+            connection_type=DatabaseConnection.READ
+        )
 
         # Procesar estadísticas de autenticación
         total_eventos = 0
@@ -1027,7 +1031,10 @@ class SuperadminAuditoriaService(BaseService):
         """
         # Si se filtra por cliente_id, usar la conexión de ese cliente
         # ✅ FASE 2: Usar await
-        sync_stats_raw = await execute_query(sync_stats_query, tuple(params_sync), client_id=cliente_id)
+        sync_stats_raw = await execute_query(
+            sync_stats_query, tuple(params_sync), client_id=cliente_id,
+            connection_type=DatabaseConnection.READ
+        )
 
         # Procesar estadísticas de sincronización
         total_sincronizaciones = 0
@@ -1056,7 +1063,10 @@ class SuperadminAuditoriaService(BaseService):
         """
         # Si se filtra por cliente_id, usar la conexión de ese cliente
         # ✅ FASE 2: Usar await
-        top_ips_raw = await execute_query(top_ips_query, tuple(params_auth), client_id=cliente_id)
+        top_ips_raw = await execute_query(
+            top_ips_query, tuple(params_auth), client_id=cliente_id,
+            connection_type=DatabaseConnection.READ
+        )
         top_ips = [
             IPStats(
                 ip_address=row['ip_address'],
@@ -1079,7 +1089,10 @@ class SuperadminAuditoriaService(BaseService):
         """
         # Si se filtra por cliente_id, usar la conexión de ese cliente
         # ✅ FASE 2: Usar await
-        top_usuarios_raw = await execute_query(top_usuarios_query, tuple(params_auth), client_id=cliente_id)
+        top_usuarios_raw = await execute_query(
+            top_usuarios_query, tuple(params_auth), client_id=cliente_id,
+            connection_type=DatabaseConnection.READ
+        )
         top_usuarios = [
             UsuarioStats(
                 usuario_id=row['usuario_id'],
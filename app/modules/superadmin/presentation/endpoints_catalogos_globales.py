@@ -5,6 +5,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
 
 from app.api.deps import get_current_active_user
+from app.api.deps_etag import conditional_get
 from app.core.authorization.lbac import require_super_admin
 from app.core.exceptions import CustomException
 from app.modules.superadmin.application.services.catalogos_globales_service import (
@@ -34,7 +35,8 @@ from app.modules.superadmin.presentation.schemas_catalogos_globales import (
 )
 
 
-router = APIRouter()
+# GET condicional: los catálogos globales solo cambian por sus propias escrituras (versión global)
+router = APIRouter(dependencies=[Depends(conditional_get(tenant_scoped=False))])
 
 
 def _resolve_target_client_id(current_user, cliente_id: Optional[UUID]) -> UUID:
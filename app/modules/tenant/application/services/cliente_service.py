@@ -34,6 +34,7 @@ from app.modules.tenant.application.services.cliente_onboarding_service import (
     MENSAJE_CREACION_EXITOSA,
 )
 from app.infrastructure.database.connection_async import DatabaseConnection
+from app.core.tenant.cache import invalidate_subdomain_cache
 
 logger = logging.getLogger(__name__)
 
@@ -417,6 +418,7 @@ class ClienteService(BaseService):
             )
         
         logger.info(f"Cliente ID {cliente_id} actualizado exitosamente.")
+        invalidate_subdomain_cache()
         return ClienteRead(**resultado)
     
     @staticmethod
@@ -463,6 +465,7 @@ class ClienteService(BaseService):
             )
         
         logger.info(f"Cliente ID {cliente_id} eliminado exitosamente (marcado como inactivo).")
+        invalidate_subdomain_cache()
         return True
     
     @staticmethod
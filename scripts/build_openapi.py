@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Genera el documento OpenAPI precalculado que sirve app.core.openapi_static.
+
+Importa app.main (con el ENABLED_MODULES del entorno), genera el schema una sola
+vez y escribe en OPENAPI_STATIC_DIR el documento completo, los parciales por
+módulo, sus variantes .gz/.br (brotli opcional) y manifest.json con los ETag.
+Pensado para el build de la imagen: los workers no vuelven a generar el schema.
+
+USO:
+    python scripts/build_openapi.py                  # OPENAPI_STATIC_DIR del entorno
+    python scripts/build_openapi.py --out build/openapi
+    python scripts/build_openapi.py --no-split       # solo el documento completo
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", help="Directorio de salida (default: OPENAPI_STATIC_DIR)")
+    parser.add_argument("--no-split", action="store_true", help="No generar documentos por módulo")
+    args = parser.parse_args()
+
+    # El build genera el schema dinámico: no instalar un build previo sobre la app
+    os.environ["OPENAPI_STATIC_ENABLED"] = "false"
+    from app.core.config import settings
+    from app.core.openapi_static import build_openapi_documents
+    from app.main import app
+
+    out_dir = Path(args.out or settings.OPENAPI_STATIC_DIR)
+    if not out_dir.is_absolute():
+        out_dir = ROOT / out_dir
+    manifest = build_openapi_documents(app, out_dir, split_modules=not args.no_split)
+
+    full = manifest["documents"][""]
+    gz_size = (out_dir / f"{full['file']}.gz").stat().st_size
+    print(
+        f"OpenAPI escrito en {out_dir}: {full['size'] / 1024:.0f} KB "
+        f"(gzip {gz_size / 1024:.0f} KB, codificaciones {full['encodings']}), "
+        f"{len(manifest['documents']) - 1} módulos, ETag {full['etag']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Perfil de tiempo de import y memoria al arrancar la app (import app.main).
+
+Corre `python -X importtime -c "import app.main"` en un proceso aparte (con el
+ENABLED_MODULES indicado) y agrupa el tiempo propio de cada import por paquete:
+app.modules.<mod>, resto de app y librerías de terceros. También reporta el pico
+de memoria (RSS) del proceso.
+
+USO:
+    python scripts/profile_imports.py                      # ENABLED_MODULES actual
+    python scripts/profile_imports.py --modules INV,PUR    # despliegue reducido
+    python scripts/profile_imports.py --compare INV,PUR    # todos vs. reducido
+    python scripts/profile_imports.py --top 30 --json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+_CHILD_CODE = (
+    "import resource, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(f'PROFILE {elapsed:.3f} {rss} {len(sys.modules)} {len(app.main.app.routes)}')\n"
+)
+
+
+def _group(name: str) -> str:
+    parts = name.split(".")
+    if name.startswith("app.modules.") and len(parts) > 2:
+        return ".".join(parts[:3])
+    if parts[0] == "app":
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def profile(enabled_modules: Optional[str]) -> Dict:
+    """Importa app.main en un subproceso y devuelve tiempos por grupo, RSS y conteos."""
+    env = dict(os.environ)
+    if enabled_modules is not None:
+        env["ENABLED_MODULES"] = enabled_modules
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_CODE],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    summary = next((line for line in proc.stdout.splitlines() if line.startswith("PROFILE ")), None)
+    if proc.returncode != 0 or summary is None:
+        raise SystemExit(f"Falló import app.main:\n{proc.stderr[-2000:]}")
+
+    groups: Counter = Counter()
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            groups[_group(match.group(4))] += int(match.group(1))
+
+    _, seconds, rss_kb, modules, routes = summary.split()
+    return {
+        "enabled_modules": env.get("ENABLED_MODULES", "all"),
+        "import_seconds": float(seconds),
+        "max_rss_mb": round(int(rss_kb) / 1024, 1),
+        "python_modules": int(modules),
+        "routes": int(routes),
+        "groups_ms": {name: round(us / 1000, 1) for name, us in groups.most_common()},
+    }
+
+
+def _print_report(report: Dict, top: int) -> None:
+    print(f"\nENABLED_MODULES={report['enabled_modules']}")
+    print(
+        f"  import app.main: {report['import_seconds']:.2f}s | RSS máx: {report['max_rss_mb']} MB | "
+        f"módulos Python: {report['python_modules']} | rutas: {report['routes']}"
+    )
+    for name, ms in list(report["groups_ms"].items())[:top]:
+        print(f"  {ms:>9.1f} ms  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", help="ENABLED_MODULES para el perfil (default: el del entorno)")
+    parser.add_argument("--compare", help="Compara ENABLED_MODULES=all contra esta lista")
+    parser.add_argument("--top", type=int, default=20, help="Grupos a mostrar (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args()
+
+    reports = [profile("all"), profile(args.compare)] if args.compare else [profile(args.modules)]
+    if args.json:
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+        return
+    for report in reports:
+        _print_report(report, args.top)
+    if len(reports) == 2:
+        full, slim = reports
+        print(
+            f"\nReducido vs. todos: import {slim['import_seconds'] / full['import_seconds']:.0%}, "
+            f"RSS {slim['max_rss_mb'] / full['max_rss_mb']:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,35 @@ def sample_tenant_context():
     )
 
 
+@pytest.fixture(autouse=True)
+def _reset_menu_cache():
+    """Los tests de menú reutilizan usuario/tenant: sin aciertos de cache entre tests."""
+    from app.core.authorization.menu_cache import reset_menu_cache
+
+    reset_menu_cache()
+    yield
+    reset_menu_cache()
+
+
+@pytest.fixture(autouse=True)
+def _reset_rate_limiter():
+    """Cuotas por usuario independientes entre tests (mismo usuario/tenant en muchos tests)."""
+    from app.core.security.tenant_rate_limiter import reset_rate_limiter
+
+    reset_rate_limiter()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _restore_redis_client():
+    """Un test que intenta conectar a Redis no deja un singleton muerto para los siguientes."""
+    from app.infrastructure.redis import client
+
+    saved = (client._redis_client, client._redis_enabled)
+    yield
+    client._redis_client, client._redis_enabled = saved
+
+
 @pytest.fixture
 def mock_tenant_context(sample_tenant_context):
     """Fixture que establece contexto de tenant para tests."""
@@ -45,6 +74,29 @@ def mock_tenant_context(sample_tenant_context):
     reset_tenant_context(tokens)
 
 
+@pytest.fixture
+def query_budget():
+    """
+    Presupuesto de queries para un bloque de código.
+
+    Uso:
+        def test_listado(query_budget):
+            with query_budget(max_statements=3, max_duplicates=0) as stats:
+                ...
+    Falla el test (QueryBudgetExceeded) si el bloque ejecuta más sentencias de las declaradas.
+    """
+    from contextlib import contextmanager
+    from app.core.metrics.query_budget import track_queries, assert_query_budget
+
+    @contextmanager
+    def _budget(max_statements: int, max_duplicates=None):
+        with track_queries() as stats:
+            yield stats
+        assert_query_budget(stats, max_statements=max_statements, max_duplicates=max_duplicates)
+
+    return _budget
+
+
 @pytest.fixture
 def mock_settings():
     """Fixture para mockear settings."""
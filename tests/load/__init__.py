@@ -0,0 +1,4 @@
+# tests/load/__init__.py
+"""
+Harness de carga offline (BD stand-in en SQLite + driver asyncio).
+"""
@@ -0,0 +1,268 @@
+"""
+Driver de carga asyncio.
+
+Ejecuta una mezcla ponderada de escenarios con concurrencia controlada (N workers)
+contra la app in-process (httpx.ASGITransport) o contra una URL, y reporta por
+escenario RPS, errores y latencias p50/p95/p99.
+
+Escenarios:
+- login:     POST /auth/login/ (bcrypt + emisión de tokens)
+- auth_me:   GET  /auth/me/
+- menu:      GET  /modulos-menus/me/
+- stock:     GET  /inv/stock
+- procesar:  POST /inv/movimientos/{id}/procesar (consume movimientos del seed;
+             cuando se agotan el worker ejecuta stock en su lugar)
+
+El tenant se resuelve por el header Host ({subdominio}.{BASE_DOMAIN}), igual que
+en producción con TenantMiddleware.
+"""
+
+import asyncio
+import math
+import random
+import statistics
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from tests.load.seed import DEFAULT_PASSWORD, TenantSeed
+
+API = settings.API_V1_STR
+
+DEFAULT_WEIGHTS: Dict[str, int] = {
+    "login": 1,
+    "auth_me": 4,
+    "menu": 3,
+    "stock": 4,
+    "procesar": 2,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+@dataclass
+class ScenarioStats:
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    status_codes: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def record(self, latency_ms: float, status_code: Optional[int]) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.status_codes[str(status_code) if status_code is not None else "exception"] += 1
+        if status_code is None or status_code >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed_s: float) -> Dict[str, Any]:
+        values = sorted(self.latencies_ms)
+        return {
+            "requests": len(values),
+            "errors": self.errors,
+            "rps": round(len(values) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(values[-1], 2) if values else 0.0,
+            "mean_ms": round(statistics.fmean(values), 2) if values else 0.0,
+            "status_codes": dict(self.status_codes),
+        }
+
+
+@dataclass
+class _Session:
+    tenant: TenantSeed
+    username: str
+    host: str
+    access_token: Optional[str] = None
+
+
+class LoadDriver:
+    """
+    Genera carga sobre la app. `app` (ASGI) tiene prioridad sobre `base_url`.
+
+    Se detiene al completar `total_requests` o al cumplirse `duration_s`
+    (lo que ocurra primero; al menos uno de los dos es obligatorio).
+    """
+
+    def __init__(
+        self,
+        tenants: List[TenantSeed],
+        app: Any = None,
+        base_url: Optional[str] = None,
+        concurrency: int = 10,
+        total_requests: Optional[int] = None,
+        duration_s: Optional[float] = None,
+        weights: Optional[Dict[str, int]] = None,
+        seed: int = 42,
+        timeout_s: float = 30.0,
+    ):
+        if app is None and base_url is None:
+            raise ValueError("Se requiere app (ASGI) o base_url")
+        if total_requests is None and duration_s is None:
+            raise ValueError("Se requiere total_requests o duration_s")
+        self.tenants = tenants
+        self.app = app
+        self.base_url = base_url or "http://loadtest"
+        self.concurrency = max(1, concurrency)
+        self.total_requests = total_requests
+        self.duration_s = duration_s
+        self.weights = {k: v for k, v in (weights or DEFAULT_WEIGHTS).items() if v > 0}
+        unknown = set(self.weights) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Escenarios desconocidos: {sorted(unknown)}")
+        self.timeout_s = timeout_s
+        self._random = random.Random(seed)
+        self._sessions = [
+            _Session(tenant=t, username=u, host=f"{t.subdominio}.{settings.BASE_DOMAIN}")
+            for t in tenants
+            for u in t.usernames
+        ]
+        self._movimientos: Dict[str, Deque] = {
+            t.subdominio: deque(t.movimiento_ids) for t in tenants
+        }
+        self.stats: Dict[str, ScenarioStats] = {name: ScenarioStats(name) for name in self.weights}
+        self._issued = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        transport = httpx.ASGITransport(app=self.app) if self.app is not None else None
+        return httpx.AsyncClient(
+            transport=transport,
+            base_url=self.base_url,
+            timeout=self.timeout_s,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+
+    # ------------------------------------------------------------------
+    # Escenarios
+    # ------------------------------------------------------------------
+
+    async def _login(self, client: httpx.AsyncClient, session: _Session) -> httpx.Response:
+        response = await client.post(
+            f"{API}/auth/login/",
+            data={"username": session.username, "password": DEFAULT_PASSWORD},
+            headers={"Host": session.host},
+        )
+        if response.status_code == 200:
+            session.access_token = response.json().get("access_token")
+        return response
+
+    def _auth_headers(self, session: _Session) -> Dict[str, str]:
+        return {"Host": session.host, "Authorization": f"Bearer {session.access_token}"}
+
+    def _pick(self) -> Tuple[str, _Session]:
+        names = list(self.weights)
+        name = self._random.choices(names, weights=[self.weights[n] for n in names])[0]
+        session = self._random.choice(self._sessions)
+        if name == "procesar" and not self._movimientos[session.tenant.subdominio]:
+            name = "stock" if "stock" in self.stats else "auth_me"
+            self.stats.setdefault(name, ScenarioStats(name))
+        return name, session
+
+    async def _run_scenario(self, client: httpx.AsyncClient, name: str, session: _Session) -> httpx.Response:
+        if name == "login":
+            return await self._login(client, session)
+        headers = self._auth_headers(session)
+        if name == "auth_me":
+            return await client.get(f"{API}/auth/me/", headers=headers)
+        if name == "menu":
+            return await client.get(f"{API}/modulos-menus/me/", headers=headers)
+        if name == "stock":
+            return await client.get(f"{API}/inv/stock", headers=headers)
+        movimiento_id = self._movimientos[session.tenant.subdominio].popleft()
+        return await client.post(f"{API}/inv/movimientos/{movimiento_id}/procesar", headers=headers)
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+
+    def _claim(self, deadline: Optional[float]) -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if self.total_requests is not None and self._issued >= self.total_requests:
+            return False
+        self._issued += 1
+        return True
+
+    async def _worker(self, client: httpx.AsyncClient, deadline: Optional[float]) -> None:
+        while self._claim(deadline):
+            name, session = self._pick()
+            start = time.perf_counter()
+            status_code: Optional[int] = None
+            try:
+                response = await self._run_scenario(client, name, session)
+                status_code = response.status_code
+            except Exception:
+                status_code = None
+            self.stats[name].record((time.perf_counter() - start) * 1000, status_code)
+
+    async def warm_up(self, client: httpx.AsyncClient) -> None:
+        """Login inicial de cada usuario (no se mide): los escenarios usan sus tokens."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _one(session: _Session) -> None:
+            async with semaphore:
+                response = await self._login(client, session)
+                if response.status_code != 200:
+                    raise RuntimeError(
+                        f"Login de calentamiento falló para {session.username}@{session.host}: "
+                        f"{response.status_code} {response.text[:200]}"
+                    )
+
+        await asyncio.gather(*(_one(s) for s in self._sessions))
+
+    async def run(self) -> Dict[str, Any]:
+        async with self._client() as client:
+            await self.warm_up(client)
+            start = time.perf_counter()
+            deadline = start + self.duration_s if self.duration_s is not None else None
+            await asyncio.gather(*(self._worker(client, deadline) for _ in range(self.concurrency)))
+            elapsed = time.perf_counter() - start
+        return self.report(elapsed)
+
+    def report(self, elapsed_s: float) -> Dict[str, Any]:
+        scenarios = {
+            name: stats.summary(elapsed_s) for name, stats in self.stats.items() if stats.latencies_ms
+        }
+        total = ScenarioStats("total")
+        for stats in self.stats.values():
+            total.latencies_ms.extend(stats.latencies_ms)
+            total.status_codes.update(stats.status_codes)
+            total.errors += stats.errors
+        return {
+            "config": {
+                "concurrency": self.concurrency,
+                "total_requests": self.total_requests,
+                "duration_s": self.duration_s,
+                "tenants": len(self.tenants),
+                "users": len(self._sessions),
+                "weights": self.weights,
+                "target": "asgi" if self.app is not None else self.base_url,
+            },
+            "elapsed_s": round(elapsed_s, 3),
+            "scenarios": scenarios,
+            "total": total.summary(elapsed_s),
+        }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Tabla de texto con el resumen por escenario."""
+    header = f"{'escenario':<10} {'reqs':>6} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    lines = [header, "-" * len(header)]
+    rows = list(report["scenarios"].items()) + [("TOTAL", report["total"])]
+    for name, s in rows:
+        lines.append(
+            f"{name:<10} {s['requests']:>6} {s['errors']:>5} {s['rps']:>8.1f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}"
+        )
+    lines.append(f"duración: {report['elapsed_s']}s  concurrencia: {report['config']['concurrency']}  (ms)")
+    return "\n".join(lines)
@@ -0,0 +1,112 @@
+"""
+CLI del harness de carga offline.
+
+Crea la BD stand-in (SQLite), siembra el dataset multi-tenant, arranca la app
+in-process (con su lifespan) y ejecuta el driver de carga.
+
+USO:
+    python -m tests.load.run_load --concurrency 20 --requests 2000
+    python -m tests.load.run_load --duration 30 --tenants 5 --output reports/load/latest.json
+    python -m tests.load.run_load --weights login=0,stock=5,menu=1
+
+Sin Redis ni rate limiting (se fuerzan por defecto antes de importar la app).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional
+
+# Antes de importar app.*: la configuración se lee al importar app.core.config
+os.environ.setdefault("ENABLE_REDIS_CACHE", "false")
+os.environ.setdefault("ENABLE_RATE_LIMITING", "false")
+
+
+def _parse_weights(value: str) -> Dict[str, int]:
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = int(weight)
+    return weights
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Prueba de carga offline contra la BD stand-in.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Workers concurrentes")
+    parser.add_argument("--requests", type=int, default=None, help="Total de requests (default 500)")
+    parser.add_argument("--duration", type=float, default=None, help="Duración máxima en segundos")
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--users", type=int, default=5, help="Usuarios por tenant")
+    parser.add_argument("--productos", type=int, default=200, help="Productos por tenant")
+    parser.add_argument("--movimientos", type=int, default=200, help="Movimientos por tenant")
+    parser.add_argument("--weights", type=_parse_weights, default=None,
+                        help="Mezcla de escenarios, p.ej. login=1,auth_me=4,menu=3,stock=4,procesar=2")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=None, help="Archivo SQLite (default: temporal, se elimina)")
+    parser.add_argument("--output", default=None, help="Guardar el reporte JSON en esta ruta")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+    if args.requests is None and args.duration is None:
+        args.requests = 500
+    return args
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from tests.load.driver import LoadDriver
+    from tests.load.seed import SeedConfig, seed_dataset
+    from tests.load.standin_db import StandinDatabase
+
+    standin = StandinDatabase(path=args.db)
+    try:
+        await standin.create_schema()
+        tenants = await seed_dataset(standin, SeedConfig(
+            tenants=args.tenants,
+            users_per_tenant=args.users,
+            productos_per_tenant=args.productos,
+            movimientos_per_tenant=args.movimientos,
+        ))
+        standin.install()
+
+        from app.main import app
+
+        async with app.router.lifespan_context(app):
+            driver = LoadDriver(
+                tenants,
+                app=app,
+                concurrency=args.concurrency,
+                total_requests=args.requests,
+                duration_s=args.duration,
+                weights=args.weights,
+                seed=args.seed,
+            )
+            report = await driver.run()
+        report["standin"] = {"statements_translated": standin.statements_translated}
+        return report
+    finally:
+        await standin.dispose(remove_file=args.db is None)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+    # La app configura sus propios handlers al importarse: fijar el nivel raíz después
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    from tests.load.driver import format_report
+
+    report = asyncio.run(run(args))
+    print(format_report(report))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Reporte guardado en {args.output}")
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Dataset sintético multi-tenant para la BD stand-in.
+
+Genera por tenant: cliente, empresa, roles con permisos (RBAC), usuarios con
+contraseña bcrypt, módulo INV con menús, catálogo de productos, almacenes, stock
+y movimientos pendientes de procesar (uno por request del escenario "procesar").
+
+Las columnas NOT NULL sin default que el dataset no especifica se rellenan
+según su tipo (fill_row), así el seed no se rompe cuando las tablas crecen.
+"""
+
+import datetime
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from sqlalchemy import Table
+
+from app.core.config import settings
+
+DEFAULT_PASSWORD = "LoadTest#2024"
+
+# Permisos que ejercitan los escenarios del driver
+SCENARIO_PERMISSIONS = [
+    ("modulos.menu.leer", "menu", "leer"),
+    ("inv.stock.leer", "stock", "leer"),
+    ("inv.movimiento.leer", "movimiento", "leer"),
+    ("inv.movimiento.procesar", "movimiento", "procesar"),
+]
+
+
+@dataclass
+class SeedConfig:
+    tenants: int = 3
+    users_per_tenant: int = 5
+    productos_per_tenant: int = 200
+    almacenes_per_tenant: int = 2
+    movimientos_per_tenant: int = 200
+    menus_per_tenant: int = 30
+
+
+@dataclass
+class TenantSeed:
+    cliente_id: uuid.UUID
+    subdominio: str
+    empresa_id: uuid.UUID
+    usernames: List[str]
+    movimiento_ids: List[uuid.UUID] = field(default_factory=list)
+
+
+def _filler(column) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = str
+    if python_type is uuid.UUID:
+        return uuid.uuid4()
+    if python_type is bool:
+        return False
+    if python_type is int:
+        return 0
+    if python_type in (float, Decimal):
+        return Decimal("0")
+    if python_type is datetime.datetime:
+        return datetime.datetime.now()
+    if python_type is datetime.date:
+        return datetime.date.today()
+    length = getattr(column.type, "length", None) or 10
+    return "x"[:length]
+
+
+def fill_row(table: Table, **values: Any) -> Dict[str, Any]:
+    """Completa las columnas NOT NULL sin default que no vienen en `values`."""
+    row = dict(values)
+    for column in table.columns:
+        if column.name in row:
+            continue
+        if column.nullable or column.default is not None or column.server_default is not None:
+            continue
+        row[column.name] = _filler(column)
+    return row
+
+
+def _hash_password(password: str) -> str:
+    from app.core.security.password import get_password_hash
+
+    return get_password_hash(password)
+
+
+async def seed_dataset(standin, config: SeedConfig = SeedConfig()) -> List[TenantSeed]:
+    """Inserta el dataset en el stand-in y retorna los datos que necesita el driver."""
+    tables = standin.metadata.tables
+    rows: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add(table_name: str, **values: Any) -> Dict[str, Any]:
+        row = fill_row(tables[table_name], **values)
+        rows.setdefault(table_name, []).append(row)
+        return row
+
+    password_hash = _hash_password(DEFAULT_PASSWORD)
+    now = datetime.datetime.now()
+
+    # Cliente SYSTEM (superadmin) para que el middleware resuelva el host base
+    add(
+        "cliente", cliente_id=uuid.UUID(settings.SUPERADMIN_CLIENTE_ID), codigo_cliente="SYSTEM",
+        subdominio=settings.SUPERADMIN_SUBDOMINIO, razon_social="Plataforma",
+        contacto_email="platform@example.com", es_activo=True,
+    )
+
+    # Catálogo global de permisos y módulo INV
+    moneda_id = uuid.uuid4()
+    add("cat_moneda", moneda_id=moneda_id, codigo="PEN", nombre="Sol", simbolo="S/", es_activo=True)
+    modulo_id = uuid.uuid4()
+    add("modulo", modulo_id=modulo_id, codigo="INV", nombre="Inventarios", es_activo=True, orden=1)
+    seccion_id = uuid.uuid4()
+    add("modulo_seccion", seccion_id=seccion_id, modulo_id=modulo_id, codigo="INV_OPE",
+        nombre="Operaciones", orden=1, es_activo=True)
+    permiso_ids = {}
+    for codigo, recurso, accion in SCENARIO_PERMISSIONS:
+        permiso_ids[codigo] = uuid.uuid4()
+        add("permiso", permiso_id=permiso_ids[codigo], codigo=codigo, nombre=codigo,
+            recurso=recurso, accion=accion, modulo_id=modulo_id, es_activo=True)
+
+    seeds: List[TenantSeed] = []
+    for t in range(config.tenants):
+        cliente_id = uuid.uuid4()
+        subdominio = f"tenant{t + 1}"
+        add(
+            "cliente", cliente_id=cliente_id, codigo_cliente=f"T{t + 1:03d}", subdominio=subdominio,
+            razon_social=f"Tenant {t + 1} SAC", contacto_email=f"admin@{subdominio}.example.com",
+            es_activo=True, tipo_instalacion="shared", modo_autenticacion="local",
+        )
+        add("cliente_modulo", cliente_modulo_id=uuid.uuid4(), cliente_id=cliente_id,
+            modulo_id=modulo_id, esta_activo=True, fecha_activacion=now)
+        empresa_id = uuid.uuid4()
+        add("org_empresa", empresa_id=empresa_id, cliente_id=cliente_id, codigo_empresa="EMP01",
+            razon_social=f"Empresa {t + 1}", ruc=f"20{t + 1:09d}", es_activo=True)
+
+        rol_id = uuid.uuid4()
+        add("rol", rol_id=rol_id, cliente_id=cliente_id, nombre="Almacenero",
+            codigo_rol="ALMACENERO", es_activo=True)
+        for permiso_id in permiso_ids.values():
+            add("rol_permiso", rol_permiso_id=uuid.uuid4(), cliente_id=cliente_id,
+                rol_id=rol_id, permiso_id=permiso_id)
+
+        usernames = []
+        for u in range(config.users_per_tenant):
+            usuario_id = uuid.uuid4()
+            username = f"user{u + 1}"
+            usernames.append(username)
+            add("usuario", usuario_id=usuario_id, cliente_id=cliente_id, nombre_usuario=username,
+                correo=f"{username}@{subdominio}.example.com", contrasena=password_hash,
+                nombre="Usuario", apellido=f"{u + 1}", es_activo=True, es_eliminado=False,
+                proveedor_autenticacion="local")
+            add("usuario_rol", usuario_rol_id=uuid.uuid4(), usuario_id=usuario_id, rol_id=rol_id,
+                cliente_id=cliente_id, empresa_id=empresa_id, es_activo=True)
+
+        for m in range(config.menus_per_tenant):
+            menu_id = uuid.uuid4()
+            add("modulo_menu", menu_id=menu_id, modulo_id=modulo_id, seccion_id=seccion_id,
+                cliente_id=None, nombre=f"Opción {m + 1}", ruta=f"/inv/opcion-{m + 1}",
+                orden=m, es_activo=True, es_visible=True)
+            add("rol_menu_permiso", permiso_id=uuid.uuid4(), cliente_id=cliente_id, rol_id=rol_id,
+                menu_id=menu_id, puede_ver=True, puede_crear=True, puede_editar=True,
+                puede_eliminar=False)
+
+        unidad_id = uuid.uuid4()
+        add("inv_unidad_medida", unidad_medida_id=unidad_id, cliente_id=cliente_id,
+            empresa_id=empresa_id, codigo="UND", nombre="Unidad", es_activo=True)
+        almacen_ids = []
+        for a in range(config.almacenes_per_tenant):
+            almacen_id = uuid.uuid4()
+            almacen_ids.append(almacen_id)
+            add("inv_almacen", almacen_id=almacen_id, cliente_id=cliente_id, empresa_id=empresa_id,
+                codigo=f"ALM{a + 1}", nombre=f"Almacén {a + 1}", tipo_almacen="general", es_activo=True)
+        tipo_ingreso_id = uuid.uuid4()
+        add("inv_tipo_movimiento", tipo_movimiento_id=tipo_ingreso_id, cliente_id=cliente_id,
+            empresa_id=empresa_id, codigo="ING", nombre="Ingreso", clase_movimiento="entrada",
+            afecta_costo=True, es_activo=True)
+
+        producto_ids = []
+        for p in range(config.productos_per_tenant):
+            producto_id = uuid.uuid4()
+            producto_ids.append(producto_id)
+            add("inv_producto", producto_id=producto_id, cliente_id=cliente_id, empresa_id=empresa_id,
+                codigo_sku=f"SKU-{p:05d}", nombre=f"Producto {p}", tipo_producto="bien",
+                unidad_medida_base_id=unidad_id, moneda_costo=moneda_id, moneda_venta=moneda_id,
+                costo_promedio=Decimal("10.50"), precio_base_venta=Decimal("15.00"),
+                maneja_inventario=True, es_activo=True)
+            for almacen_id in almacen_ids:
+                add("inv_stock", stock_id=uuid.uuid4(), cliente_id=cliente_id, empresa_id=empresa_id,
+                    producto_id=producto_id, almacen_id=almacen_id, moneda_id=moneda_id,
+                    cantidad_actual=Decimal("100"), cantidad_reservada=Decimal("0"),
+                    costo_promedio=Decimal("10.50"))
+
+        seed = TenantSeed(cliente_id=cliente_id, subdominio=subdominio, empresa_id=empresa_id,
+                          usernames=usernames)
+        for m in range(config.movimientos_per_tenant):
+            movimiento_id = uuid.uuid4()
+            seed.movimiento_ids.append(movimiento_id)
+            add("inv_movimiento", movimiento_id=movimiento_id, cliente_id=cliente_id,
+                empresa_id=empresa_id, numero_movimiento=f"MOV-{m:06d}",
+                tipo_movimiento_id=tipo_ingreso_id, fecha_movimiento=now,
+                fecha_contable=now.date(), almacen_destino_id=almacen_ids[0], moneda_id=moneda_id,
+                estado="borrador", total_items=1)
+            producto_id = producto_ids[m % len(producto_ids)]
+            add("inv_movimiento_detalle", movimiento_detalle_id=uuid.uuid4(), cliente_id=cliente_id,
+                empresa_id=empresa_id, movimiento_id=movimiento_id, producto_id=producto_id,
+                cantidad=Decimal("1"), unidad_medida_id=unidad_id, cantidad_base=Decimal("1"),
+                costo_unitario=Decimal("10.50"), moneda_id=moneda_id)
+        seeds.append(seed)
+
+    for table_name, table_rows in rows.items():
+        await standin.insert_rows(table_name, table_rows)
+    return seeds
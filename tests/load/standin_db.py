@@ -0,0 +1,315 @@
+"""
+BD stand-in para pruebas de carga offline.
+
+Reemplaza SQL Server por un archivo SQLite (aiosqlite) con el esquema construido
+desde las tablas Core (tables.py, tables_modulos.py y tables_erp). Se enchufa en
+el único punto por el que pasan execute_query, UnitOfWork y get_db_connection:
+`connection_async._get_async_engine`.
+
+Adaptaciones a SQLite:
+- UNIQUEIDENTIFIER se guarda como CHAR(36) COLLATE NOCASE con guiones; acepta UUID
+  o str como parámetro (igual que SQL Server), también en bindparams de text().
+- Funciones T-SQL registradas en cada conexión: GETDATE, SYSDATETIME, GETUTCDATE,
+  NEWID, LEN; ISNULL(a, b) se reescribe a IFNULL(a, b).
+- Reescritura de SQL textual: TOP n → LIMIT n, OFFSET/FETCH → LIMIT/OFFSET,
+  OUTPUT INSERTED.* → RETURNING, N'...' → '...', WITH (NOLOCK) y dbo. → (nada).
+- Los nombres de índice son globales en SQLite: los duplicados se prefijan con la tabla.
+
+USO:
+    standin = StandinDatabase()
+    await standin.create_schema()
+    standin.install()
+    ...
+    standin.uninstall()
+    await standin.dispose()
+"""
+
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, DefaultClause, MetaData, String, Table, UniqueConstraint, event, func, text,
+)
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import sqltypes
+
+logger = logging.getLogger(__name__)
+
+
+@compiles(UNIQUEIDENTIFIER, "sqlite")
+def _compile_uniqueidentifier_sqlite(type_, compiler, **kw):
+    # SQL Server compara uniqueidentifier sin distinguir mayúsculas
+    return "CHAR(36) COLLATE NOCASE"
+
+
+class _StandinUuid(sqltypes.Uuid):
+    """
+    UNIQUEIDENTIFIER en SQLite: acepta UUID o str (como pyodbc/SQL Server) y
+    guarda el formato canónico con guiones, el mismo que usa el SQL textual.
+    """
+
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is None:
+                return None
+            return str(value if isinstance(value, uuid.UUID) else uuid.UUID(str(value)))
+        return process
+
+    def result_processor(self, dialect, coltype):
+        as_uuid = self.as_uuid
+
+        def process(value):
+            if value is None:
+                return None
+            parsed = value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+            return parsed if as_uuid else str(parsed)
+        return process
+
+
+# Parámetros no soportados por sqlite3 en SQL textual (los Core los procesa el tipo)
+sqlite3.register_adapter(uuid.UUID, str)
+sqlite3.register_adapter(Decimal, float)
+
+
+# ============================================================================
+# ESQUEMA
+# ============================================================================
+
+def _iter_core_tables() -> Iterable[Table]:
+    from app.infrastructure.database import tables, tables_modulos
+    from app.infrastructure.database import tables_erp
+
+    seen = set()
+    for module in (tables, tables_modulos, tables_erp):
+        for value in vars(module).values():
+            if isinstance(value, Table) and value.name not in seen:
+                seen.add(value.name)
+                yield value
+    # Tablas ERP no re-exportadas en el __init__ (comparten metadata_erp)
+    from app.infrastructure.database.tables_erp.tables_org import metadata_erp
+    for table in metadata_erp.tables.values():
+        if table.name not in seen:
+            seen.add(table.name)
+            yield table
+
+
+def _add_rbac_catalog_tables(target: MetaData) -> None:
+    """
+    permiso y rol_permiso solo existen como DDL (bootstrap_v2/01_schema/V030)
+    y se consultan con SQL textual: se definen aquí con las mismas columnas.
+    """
+    Table(
+        "permiso", target,
+        Column("permiso_id", UNIQUEIDENTIFIER, primary_key=True),
+        Column("codigo", String(100), nullable=False, unique=True),
+        Column("nombre", String(150), nullable=False),
+        Column("descripcion", String(500)),
+        Column("modulo_id", UNIQUEIDENTIFIER),
+        Column("recurso", String(80), nullable=False),
+        Column("accion", String(30), nullable=False),
+        Column("es_activo", Boolean, nullable=False, server_default="1"),
+        Column("fecha_creacion", DateTime, nullable=False, server_default=func.getdate()),
+        Column("fecha_actualizacion", DateTime),
+    )
+    Table(
+        "rol_permiso", target,
+        Column("rol_permiso_id", UNIQUEIDENTIFIER, primary_key=True),
+        Column("cliente_id", UNIQUEIDENTIFIER, nullable=False),
+        Column("rol_id", UNIQUEIDENTIFIER, nullable=False),
+        Column("permiso_id", UNIQUEIDENTIFIER, nullable=False),
+        Column("fecha_creacion", DateTime, nullable=False, server_default=func.getdate()),
+        UniqueConstraint("cliente_id", "rol_id", "permiso_id", name="UQ_rol_permiso"),
+    )
+
+
+# Columnas presentes en el DDL (bootstrap_v2/01_schema/V020) que las tablas Core
+# no declaran pero el SQL textual sí consulta
+_DDL_ONLY_COLUMNS = {
+    "usuario": [("empresa_default_id", UNIQUEIDENTIFIER, None)],
+    "rol": [("empresa_id", UNIQUEIDENTIFIER, None), ("es_admin_cliente", Boolean, "0")],
+    "usuario_rol": [("es_empresa_default", Boolean, "0")],
+    "rol_menu_permiso": [("empresa_id", UNIQUEIDENTIFIER, None), ("fecha_actualizacion", DateTime, None)],
+    "auth_audit_log": [("empresa_id", UNIQUEIDENTIFIER, None)],
+}
+
+
+def _add_ddl_only_columns(target: MetaData) -> None:
+    for table_name, columns in _DDL_ONLY_COLUMNS.items():
+        table = target.tables[table_name]
+        for name, type_, server_default in columns:
+            if name not in table.c:
+                table.append_column(Column(name, type_, server_default=server_default))
+
+
+def build_standin_metadata() -> MetaData:
+    """
+    Copia todas las tablas Core a una MetaData única (resuelve FKs entre
+    metadata y metadata_erp) y renombra índices duplicados.
+    """
+    target = MetaData()
+    for table in _iter_core_tables():
+        table.to_metadata(target)
+    _add_rbac_catalog_tables(target)
+    _add_ddl_only_columns(target)
+
+    # En SQL Server las PK UNIQUEIDENTIFIER tienen DEFAULT NEWID() en el DDL
+    for table in target.tables.values():
+        for column in table.primary_key.columns:
+            if isinstance(column.type, UNIQUEIDENTIFIER) and column.server_default is None:
+                column.server_default = DefaultClause(text("(newid())"))
+
+    index_names = set()
+    for table in target.tables.values():
+        for index in table.indexes:
+            if index.name in index_names:
+                index.name = f"{table.name}__{index.name}"
+            index_names.add(index.name)
+    return target
+
+
+# ============================================================================
+# TRADUCCIÓN T-SQL → SQLite
+# ============================================================================
+
+_TOP_RE = re.compile(r"^(\s*SELECT\s+(?:DISTINCT\s+)?)TOP\s*\(?\s*(\d+|\?|:\w+)\s*\)?\s+", re.IGNORECASE)
+_OFFSET_FETCH_RE = re.compile(
+    r"OFFSET\s+(\S+)\s+ROWS?\s+FETCH\s+(?:NEXT|FIRST)\s+(\S+)\s+ROWS?\s+ONLY", re.IGNORECASE
+)
+_OUTPUT_RE = re.compile(
+    r"\s+OUTPUT\s+((?:(?:INSERTED|DELETED)\.(?:\*|\[?\w+\]?)(?:\s+AS\s+\w+)?\s*,?\s*)+)",
+    re.IGNORECASE,
+)
+# ISNULL es un operador postfijo en SQLite: la función equivalente es IFNULL
+_ISNULL_FUNC_RE = re.compile(r"\bISNULL\s*\(", re.IGNORECASE)
+_NVARCHAR_LITERAL_RE = re.compile(r"\bN'")
+_DBO_SCHEMA_RE = re.compile(r"(?:\bdbo|\[dbo\])\.", re.IGNORECASE)
+_NOLOCK_RE = re.compile(r"\s+WITH\s*\(\s*NOLOCK\s*\)", re.IGNORECASE)
+_TRAILING_SEMICOLON_RE = re.compile(r";\s*$")
+
+
+def translate_tsql(statement: str) -> str:
+    """Reescribe las construcciones T-SQL más comunes a su equivalente SQLite."""
+    sql = statement
+    if "N'" in sql:
+        sql = _NVARCHAR_LITERAL_RE.sub("'", sql)
+    sql = _NOLOCK_RE.sub("", sql)
+    sql = _ISNULL_FUNC_RE.sub("IFNULL(", sql)
+    if "dbo" in sql.lower():
+        sql = _DBO_SCHEMA_RE.sub("", sql)
+
+    suffix = ""
+    top = _TOP_RE.match(sql)
+    if top:
+        sql = top.group(1) + sql[top.end():]
+        suffix = f" LIMIT {top.group(2)}"
+
+    sql = _OFFSET_FETCH_RE.sub(lambda m: f"LIMIT {m.group(2)} OFFSET {m.group(1)}", sql)
+
+    output = _OUTPUT_RE.search(sql)
+    if output:
+        columns = re.sub(r"(?i)\b(?:INSERTED|DELETED)\.", "", output.group(1)).strip().rstrip(",")
+        sql = sql[: output.start()] + " " + sql[output.end():]
+        suffix += f" RETURNING {columns}"
+
+    if suffix:
+        sql = _TRAILING_SEMICOLON_RE.sub("", sql.rstrip()) + suffix
+    return sql
+
+
+def _register_tsql_functions(dbapi_connection) -> None:
+    now = lambda: datetime.datetime.now().isoformat(" ")  # noqa: E731
+    dbapi_connection.create_function("getdate", 0, now)
+    dbapi_connection.create_function("sysdatetime", 0, now)
+    dbapi_connection.create_function("getutcdate", 0, lambda: datetime.datetime.utcnow().isoformat(" "))
+    dbapi_connection.create_function("newid", 0, lambda: str(uuid.uuid4()))
+    dbapi_connection.create_function("len", 1, lambda value: None if value is None else len(str(value).rstrip()))
+
+
+# ============================================================================
+# STAND-IN
+# ============================================================================
+
+class StandinDatabase:
+    """BD SQLite que sustituye a SQL Server para ADMIN y todos los tenants."""
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="standin_", suffix=".db")
+            os.close(fd)
+        self.path = path
+        self.metadata = build_standin_metadata()
+        self.engine: AsyncEngine = create_async_engine(
+            f"sqlite+aiosqlite:///{path}",
+            connect_args={"timeout": 30},
+        )
+        dialect = self.engine.sync_engine.dialect
+        dialect.colspecs = {**dialect.colspecs, sqltypes.Uuid: _StandinUuid, UNIQUEIDENTIFIER: _StandinUuid}
+        event.listen(self.engine.sync_engine, "connect", self._on_connect)
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._translate, retval=True)
+        self.statements_translated = 0
+        self._original_get_async_engine = None
+
+    @staticmethod
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        _register_tsql_functions(dbapi_connection)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+    def _translate(self, conn, cursor, statement, parameters, context, executemany):
+        translated = translate_tsql(statement)
+        if translated != statement:
+            self.statements_translated += 1
+        return translated, parameters
+
+    async def create_schema(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.run_sync(self.metadata.drop_all)
+            await conn.run_sync(self.metadata.create_all)
+        logger.info("[STANDIN_DB] Esquema creado (%d tablas) en %s", len(self.metadata.tables), self.path)
+
+    async def insert_rows(self, table_name: str, rows: list) -> None:
+        if not rows:
+            return
+        table = self.metadata.tables[table_name]
+        async with self.engine.begin() as conn:
+            await conn.execute(table.insert(), rows)
+
+    def install(self) -> "StandinDatabase":
+        """Enruta todas las conexiones (ADMIN y tenants) al stand-in."""
+        from app.infrastructure.database import connection_async
+
+        if self._original_get_async_engine is None:
+            self._original_get_async_engine = connection_async._get_async_engine
+            connection_async._get_async_engine = lambda *args, **kwargs: self.engine
+        return self
+
+    def uninstall(self) -> None:
+        from app.infrastructure.database import connection_async
+
+        if self._original_get_async_engine is not None:
+            connection_async._get_async_engine = self._original_get_async_engine
+            self._original_get_async_engine = None
+
+    async def dispose(self, remove_file: bool = True) -> None:
+        self.uninstall()
+        await self.engine.dispose()
+        if remove_file:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except FileNotFoundError:
+                    pass
+
+    def table_columns(self, table_name: str) -> Dict[str, Any]:
+        return {c.name: c for c in self.metadata.tables[table_name].columns}
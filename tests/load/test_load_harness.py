@@ -0,0 +1,71 @@
+"""
+Tests del harness de carga offline (stand-in SQLite + driver).
+"""
+
+import pytest
+
+from tests.load.driver import LoadDriver, percentile
+from tests.load.standin_db import translate_tsql
+
+
+class TestTranslateTsql:
+
+    def test_top_a_limit(self):
+        sql = translate_tsql("SELECT TOP 1 usuario_id FROM usuario WHERE es_activo = 1")
+        assert sql == "SELECT usuario_id FROM usuario WHERE es_activo = 1 LIMIT 1"
+
+    def test_offset_fetch_a_limit_offset(self):
+        sql = translate_tsql("SELECT * FROM inv_stock ORDER BY stock_id OFFSET 20 ROWS FETCH NEXT 10 ROWS ONLY")
+        assert sql.endswith("ORDER BY stock_id LIMIT 10 OFFSET 20")
+
+    def test_output_inserted_a_returning(self):
+        sql = translate_tsql(
+            "INSERT INTO rol (nombre) OUTPUT INSERTED.rol_id, INSERTED.nombre VALUES (:nombre)"
+        )
+        assert sql == "INSERT INTO rol (nombre) VALUES (:nombre) RETURNING rol_id, nombre"
+
+    def test_isnull_dbo_nolock_y_literales_n(self):
+        sql = translate_tsql(
+            "SELECT ISNULL(r.nombre, N'x') FROM dbo.rol r WITH (NOLOCK) WHERE r.codigo = N'ADM'"
+        )
+        assert sql == "SELECT IFNULL(r.nombre, 'x') FROM rol r WHERE r.codigo = 'ADM'"
+
+
+def test_percentile_rango_mas_cercano():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_carga_in_process_sin_errores():
+    pytest.importorskip("aiosqlite")
+    from tests.load.seed import SeedConfig, seed_dataset
+    from tests.load.standin_db import StandinDatabase
+
+    standin = StandinDatabase()
+    try:
+        await standin.create_schema()
+        tenants = await seed_dataset(standin, SeedConfig(
+            tenants=1, users_per_tenant=2, productos_per_tenant=10,
+            almacenes_per_tenant=1, movimientos_per_tenant=10, menus_per_tenant=5,
+        ))
+        standin.install()
+        from app.main import app
+
+        # login se ejercita en el calentamiento (rate limit por IP en la app)
+        driver = LoadDriver(
+            tenants, app=app, concurrency=4, total_requests=40,
+            weights={"auth_me": 1, "menu": 1, "stock": 1, "procesar": 1},
+        )
+        report = await driver.run()
+    finally:
+        await standin.dispose()
+
+    assert report["total"]["requests"] == 40
+    assert report["total"]["errors"] == 0, report["scenarios"]
+    assert set(report["scenarios"]) == {"auth_me", "menu", "stock", "procesar"}
+    total = report["total"]
+    assert total["p50_ms"] <= total["p95_ms"] <= total["p99_ms"] <= total["max_ms"]
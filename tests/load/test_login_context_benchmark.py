@@ -0,0 +1,87 @@
+"""
+Benchmark del login contra la BD stand-in: contexto en una query por base
+(LOGIN_CONTEXT_SINGLE_QUERY) vs. una query por paso. Mismo user_data en ambos
+modos y menos sentencias; las latencias se imprimen (bcrypt domina el total).
+"""
+
+import statistics
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.metrics.query_budget import track_queries
+from app.core.tenant.context import TenantContext, reset_tenant_context, set_tenant_context
+
+LOGINS_PER_MODE = 8
+
+
+def _request() -> Request:
+    return Request({
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "path": "/api/v1/auth/login/",
+        "headers": [(b"user-agent", b"pytest"), (b"x-client-type", b"mobile")],
+        "client": ("127.0.0.1", 12345),
+    })
+
+
+async def _run_logins(login_fn, username: str, password: str):
+    latencies, statements, user_data = [], [], None
+    for _ in range(LOGINS_PER_MODE):
+        form_data = MagicMock(username=username, password=password)
+        with track_queries() as stats:
+            started = time.perf_counter()
+            result = await login_fn(request=_request(), response=Response(), form_data=form_data)
+            latencies.append((time.perf_counter() - started) * 1000)
+        statements.append(stats.statement_count)
+        user_data = result["user_data"] if isinstance(result, dict) else result.user_data
+    return latencies, statements, user_data.model_dump()
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_login_context_single_query_vs_per_step(monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from app.modules.auth.presentation import endpoints as auth_endpoints
+    from tests.load.seed import DEFAULT_PASSWORD, SeedConfig, seed_dataset
+    from tests.load.standin_db import StandinDatabase
+
+    login_fn = auth_endpoints.login
+    while hasattr(login_fn, "__wrapped__"):
+        login_fn = login_fn.__wrapped__
+
+    standin = StandinDatabase()
+    try:
+        await standin.create_schema()
+        tenants = await seed_dataset(standin, SeedConfig(
+            tenants=1, users_per_tenant=1, productos_per_tenant=1,
+            almacenes_per_tenant=1, movimientos_per_tenant=0, menus_per_tenant=1,
+        ))
+        standin.install()
+        tenant = tenants[0]
+        tokens = set_tenant_context(TenantContext(client_id=tenant.cliente_id, subdominio=tenant.subdominio))
+        try:
+            results = {}
+            for mode in (False, True):
+                monkeypatch.setattr(settings, "LOGIN_CONTEXT_SINGLE_QUERY", mode)
+                results[mode] = await _run_logins(login_fn, tenant.usernames[0], DEFAULT_PASSWORD)
+        finally:
+            reset_tenant_context(tokens)
+    finally:
+        await standin.dispose()
+
+    (per_step_ms, per_step_sql, per_step_user) = results[False]
+    (single_ms, single_sql, single_user) = results[True]
+    print(
+        f"\n[login] por paso: {statistics.median(per_step_sql)} sentencias, "
+        f"mediana {statistics.median(per_step_ms):.1f} ms, máx {max(per_step_ms):.1f} ms"
+        f"\n[login] una query: {statistics.median(single_sql)} sentencias, "
+        f"mediana {statistics.median(single_ms):.1f} ms, máx {max(single_ms):.1f} ms"
+    )
+    assert single_user == per_step_user
+    assert statistics.median(single_sql) <= statistics.median(per_step_sql) - 6
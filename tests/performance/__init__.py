@@ -0,0 +1,4 @@
+# tests/performance/__init__.py
+"""
+Tests de performance y microbenchmarks de hot paths.
+"""
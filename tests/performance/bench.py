@@ -0,0 +1,149 @@
+"""
+Mini-harness de microbenchmarks (estilo pytest-benchmark, sin dependencias extra).
+
+- run_benchmark: calibra iteraciones por ronda y mide varias rondas con perf_counter.
+- compare_results: compara medianas contra un baseline JSON con tolerancia.
+- load_results / save_results: persistencia JSON.
+
+Los tiempos se expresan en microsegundos por llamada. Los baselines dependen de la
+máquina: regenerarlos en el runner de CI con BENCH_SAVE_BASELINE=true.
+"""
+
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+import warnings
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+_MAX_ITERATIONS = 1_000_000
+
+
+@dataclass
+class BenchResult:
+    """Resultado de un benchmark (tiempos en µs por llamada)."""
+
+    name: str
+    rounds: int
+    iterations: int
+    min_us: float
+    median_us: float
+    mean_us: float
+    stddev_us: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def run_benchmark(
+    name: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    rounds: int = 7,
+    round_time: float = 0.02,
+    **kwargs: Any,
+) -> BenchResult:
+    """
+    Mide `fn(*args, **kwargs)`.
+
+    Calibra el número de iteraciones para que cada ronda dure ~round_time segundos
+    y toma `rounds` rondas. El logging y los warnings se silencian durante la
+    medición para no medir los handlers de pytest (caplog / recwarn).
+    """
+    logging.disable(logging.CRITICAL)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            fn(*args, **kwargs)  # warm-up (imports perezosos, caches de compilación)
+
+            iterations = 1
+            while True:
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    fn(*args, **kwargs)
+                elapsed = time.perf_counter() - start
+                if elapsed >= round_time or iterations >= _MAX_ITERATIONS:
+                    break
+                # Escalar hacia round_time (como máximo x10 por paso)
+                scale = min(10.0, round_time / max(elapsed, 1e-9))
+                iterations = min(_MAX_ITERATIONS, max(iterations + 1, int(iterations * scale)))
+
+            samples: List[float] = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    fn(*args, **kwargs)
+                samples.append((time.perf_counter() - start) / iterations * 1e6)
+        finally:
+            logging.disable(logging.NOTSET)
+
+    return BenchResult(
+        name=name,
+        rounds=rounds,
+        iterations=iterations,
+        min_us=round(min(samples), 3),
+        median_us=round(statistics.median(samples), 3),
+        mean_us=round(statistics.fmean(samples), 3),
+        stddev_us=round(statistics.pstdev(samples), 3),
+    )
+
+
+def compare_results(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[Dict[str, Any]]:
+    """
+    Retorna los benchmarks cuya mediana supera `baseline * tolerance`.
+
+    Benchmarks sin entrada en el baseline se ignoran (nuevos).
+    """
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base or not base.get("median_us"):
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        if ratio > tolerance:
+            regressions.append({
+                "name": name,
+                "baseline_us": base["median_us"],
+                "current_us": result["median_us"],
+                "ratio": round(ratio, 2),
+            })
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Carga el mapa nombre → resultado de un JSON de benchmarks ({} si no existe)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("benchmarks", {})
+
+
+def save_results(
+    path: str,
+    results: Dict[str, Dict[str, Any]],
+    regressions: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """Guarda resultados (y regresiones detectadas) con metadatos de la máquina."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": dict(sorted(results.items())),
+    }
+    if regressions is not None:
+        payload["regressions"] = regressions
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+        f.write("\n")
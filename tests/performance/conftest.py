@@ -0,0 +1,71 @@
+"""
+Fixtures de microbenchmarks.
+
+Fixture `bench`: mide una función y la registra para el reporte de la sesión.
+Al final de la sesión se escribe el JSON de resultados y se compara contra el
+baseline guardado.
+
+Variables de entorno:
+- BENCH_OUTPUT: ruta del JSON de resultados (default: reports/benchmarks/latest.json)
+- BENCH_BASELINE: ruta del baseline (default: tests/performance/benchmark_baseline.json)
+- BENCH_TOLERANCE: factor permitido sobre la mediana del baseline (default: 1.5)
+- BENCH_STRICT=true: falla el test si excede la tolerancia (por defecto solo avisa)
+- BENCH_SAVE_BASELINE=true: sobrescribe el baseline con los resultados actuales
+"""
+
+import os
+import warnings
+
+import pytest
+
+from tests.performance.bench import compare_results, load_results, run_benchmark, save_results
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BENCH_OUTPUT = os.getenv("BENCH_OUTPUT", os.path.join(_ROOT, "reports", "benchmarks", "latest.json"))
+BENCH_BASELINE = os.getenv(
+    "BENCH_BASELINE", os.path.join(_ROOT, "tests", "performance", "benchmark_baseline.json")
+)
+BENCH_TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "1.5"))
+BENCH_STRICT = os.getenv("BENCH_STRICT", "false").lower() == "true"
+BENCH_SAVE_BASELINE = os.getenv("BENCH_SAVE_BASELINE", "false").lower() == "true"
+
+_session_results = {}
+
+
+@pytest.fixture
+def bench():
+    """
+    Mide `fn(*args, **kwargs)` y compara su mediana con el baseline.
+
+    Uso:
+        def test_algo(bench):
+            result = bench("nombre_estable", fn, arg1, kw=1)
+    """
+    baseline = load_results(BENCH_BASELINE)
+
+    def _bench(name, fn, *args, **kwargs):
+        result = run_benchmark(name, fn, *args, **kwargs).to_dict()
+        _session_results[name] = result
+        regressions = compare_results({name: result}, baseline, BENCH_TOLERANCE)
+        if regressions:
+            reg = regressions[0]
+            msg = (
+                f"Regresión en {name}: {reg['current_us']}µs vs baseline "
+                f"{reg['baseline_us']}µs (x{reg['ratio']}, tolerancia x{BENCH_TOLERANCE})"
+            )
+            if BENCH_STRICT:
+                pytest.fail(msg)
+            warnings.warn(msg)
+        return result
+
+    return _bench
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _session_results:
+        return
+    baseline = load_results(BENCH_BASELINE)
+    regressions = compare_results(_session_results, baseline, BENCH_TOLERANCE)
+    save_results(BENCH_OUTPUT, _session_results, regressions)
+    if BENCH_SAVE_BASELINE:
+        save_results(BENCH_BASELINE, {**baseline, **_session_results})
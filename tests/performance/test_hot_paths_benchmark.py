@@ -0,0 +1,248 @@
+"""
+Microbenchmarks de hot paths CPU-bound (sin BD ni red).
+
+Cubre las funciones que corren en cada request:
+- apply_tenant_filter / apply_tenant_filter_to_text_clause
+- Conversión de "?" a parámetros nombrados (rutas string de queries_async)
+- Pipeline Core de execute_query con y sin cache de forma de sentencia
+- QueryAuditor.validate_tenant_filter
+- has_permission
+- build_menu_tree
+- TenantMiddleware._extract_subdomain
+- JWT encode/decode (y decode con cache de tokens verificados)
+- Construcción Pydantic de modelos Read grandes del ERP
+
+Resultados: reports/benchmarks/latest.json, comparados contra
+tests/performance/benchmark_baseline.json (ver tests/performance/conftest.py).
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from jose import jwt
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.core.security.query_auditor import QueryAuditor
+from app.infrastructure.database.query_helpers import (
+    apply_tenant_filter,
+    apply_tenant_filter_to_text_clause,
+)
+from app.infrastructure.database.tables import RolTable, UsuarioTable
+
+pytestmark = pytest.mark.benchmark
+
+CLIENT_ID = uuid4()
+
+
+class TestTenantFilterBenchmark:
+
+    def test_apply_tenant_filter_select(self, bench):
+        query = select(UsuarioTable.c.usuario_id, UsuarioTable.c.nombre_usuario).where(
+            UsuarioTable.c.es_activo == True  # noqa: E712
+        )
+        result = bench("apply_tenant_filter.select", apply_tenant_filter, query, client_id=CLIENT_ID)
+        assert result["median_us"] > 0
+
+    def test_apply_tenant_filter_to_text_clause(self, bench):
+        query = text(
+            "SELECT u.usuario_id, u.nombre_usuario FROM usuario u "
+            "WHERE u.es_activo = 1 AND u.es_eliminado = 0 ORDER BY u.nombre_usuario"
+        )
+        bench("apply_tenant_filter.text_clause", apply_tenant_filter_to_text_clause, query, client_id=CLIENT_ID)
+
+    def test_query_auditor_validate_select(self, bench):
+        query = select(RolTable).where(RolTable.c.cliente_id == CLIENT_ID)
+        bench("query_auditor.validate.select", QueryAuditor.validate_tenant_filter, query, client_id=CLIENT_ID)
+
+    def test_core_pipeline_fresh_statement(self, bench, monkeypatch):
+        # Lo que execute_query hace por sentencia Core: nueva en cada request, misma forma
+        from app.core.security import statement_shape
+        from app.infrastructure.database.query_helpers import get_table_name_from_query
+        from app.infrastructure.database.tables_erp import InvStockTable
+
+        producto_id = uuid4()
+
+        def _pipeline():
+            query = select(InvStockTable).where(InvStockTable.c.producto_id == producto_id)
+            table_name = get_table_name_from_query(query)
+            QueryAuditor.validate_tenant_filter(query, table_name=table_name, client_id=CLIENT_ID)
+            return apply_tenant_filter(query, client_id=CLIENT_ID, table_name=table_name)
+
+        shape_cache = statement_shape.StatementShapeCache(max_size=128)
+        monkeypatch.setattr(statement_shape, "_shape_cache", shape_cache)
+        bench("tenant_pipeline.core.shape_cached", _pipeline)
+        monkeypatch.setattr(
+            statement_shape, "_shape_cache", statement_shape.StatementShapeCache(max_size=0)
+        )
+        bench("tenant_pipeline.core.uncached", _pipeline)
+        # Conteos, no tiempos (estables en CI compartido): la forma se analiza una sola vez
+        assert shape_cache.misses == 1
+        assert shape_cache.hits > 0
+
+    def test_qmark_binding(self, bench, monkeypatch):
+        # Ruta string de execute_update: '?' → :paramN sobre el mismo SQL en cada request
+        from app.infrastructure.database import sql_text_cache
+
+        sql = (
+            "UPDATE inv_producto SET nombre = ?, descripcion = ?, precio_venta = ?, "
+            "stock_minimo = ?, es_activo = ? WHERE producto_id = ? AND cliente_id = ?"
+        )
+        params = ("Producto", "Desc", Decimal("10.50"), 5, True, uuid4(), CLIENT_ID)
+
+        text_cache = sql_text_cache.SqlTextCache(max_size=128)
+        monkeypatch.setattr(sql_text_cache, "_sql_text_cache", text_cache)
+        bench("qmark_binding.cached", sql_text_cache.bind_qmark_params, sql, params)
+        monkeypatch.setattr(sql_text_cache, "_sql_text_cache", sql_text_cache.SqlTextCache(max_size=0))
+        bench("qmark_binding.uncached", sql_text_cache.bind_qmark_params, sql, params)
+        # El SQL se parsea una sola vez; el resto de rondas son aciertos
+        assert text_cache.misses == 1
+        assert text_cache.hits > 0
+
+    def test_query_auditor_validate_string(self, bench):
+        query = "SELECT * FROM usuario WHERE cliente_id = ? AND es_activo = 1"
+        bench("query_auditor.validate.string", QueryAuditor.validate_tenant_filter, query, client_id=CLIENT_ID)
+
+
+class TestAuthorizationBenchmark:
+
+    def test_has_permission(self, bench):
+        from app.core.authorization.rbac import has_permission
+
+        user = SimpleNamespace(
+            nombre_usuario="bench",
+            is_super_admin=False,
+            roles=[SimpleNamespace(nombre="Vendedor", es_activo=True)],
+            permisos=[f"modulo{i}.accion{j}" for i in range(40) for j in range(5)],
+        )
+        result = bench("rbac.has_permission.miss", has_permission, user, "inv.producto.eliminar")
+        assert result["median_us"] > 0
+
+    def test_build_menu_tree(self, bench):
+        from app.modules.menus.application.services.menu_helper import build_menu_tree
+
+        area_id = uuid4()
+        rows = []
+        for i in range(20):
+            parent_id = uuid4()
+            rows.append({
+                "menu_id": parent_id, "nombre": f"Modulo {i}", "icono": "box", "ruta": None,
+                "orden": i, "Level": 0, "es_activo": True, "area_id": area_id,
+                "area_nombre": "ERP", "cliente_id": None, "padre_menu_id": None,
+            })
+            for j in range(10):
+                rows.append({
+                    "menu_id": uuid4(), "nombre": f"Opción {i}.{j}", "icono": None,
+                    "ruta": f"/m{i}/o{j}", "orden": 10 - j, "Level": 1, "es_activo": True,
+                    "area_id": area_id, "area_nombre": "ERP", "cliente_id": None,
+                    "padre_menu_id": parent_id,
+                })
+        tree = build_menu_tree(rows)
+        assert len(tree) == 20
+        bench("menu.build_menu_tree.220", build_menu_tree, rows)
+
+
+class TestTenantMiddlewareBenchmark:
+
+    def test_extract_subdomain(self, bench):
+        from app.core.tenant.middleware import TenantMiddleware
+
+        middleware = TenantMiddleware(app=None)
+        host = f"acme.{middleware.base_domain}:8000"
+        assert middleware._extract_subdomain(host) == "acme"
+        bench("tenant_middleware.extract_subdomain", middleware._extract_subdomain, host)
+
+
+class TestJWTBenchmark:
+
+    def _claims(self):
+        return {
+            "sub": "usuario.bench",
+            "cliente_id": str(CLIENT_ID),
+            "level_info": {"access_level": 2, "is_super_admin": False, "user_type": "user"},
+        }
+
+    def test_create_access_token(self, bench):
+        from app.core.security.jwt import create_access_token
+
+        bench("jwt.create_access_token", create_access_token, self._claims(), empresa_id=uuid4())
+
+    def test_decode_access_token(self, bench):
+        from app.core.security.jwt import create_access_token
+
+        token, _ = create_access_token(self._claims())
+        bench(
+            "jwt.decode_access_token",
+            jwt.decode,
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+        )
+
+    def test_decode_access_token_cached(self, bench):
+        from app.core.security import jwt_cache
+        from app.core.security.jwt import create_access_token
+        from app.core.security.jwt_cache import decode_access_token, reset_jwt_cache
+
+        # Token de tamaño realista: roles, permisos y contexto de empresa/sesión
+        claims = {
+            **self._claims(),
+            "roles": ["ADMIN_EMPRESA", "VENTAS", "ALMACEN"],
+            "permisos": [f"modulo_{i}.leer" for i in range(40)],
+            "sid": str(uuid4()),
+        }
+        token, _ = create_access_token(claims, empresa_id=uuid4())
+        reset_jwt_cache()
+        with patch.object(jwt_cache.jwt, "decode", wraps=jwt.decode) as decode:
+            decode_access_token(token)
+            bench("jwt.decode_access_token.cached", decode_access_token, token)
+        bench(
+            "jwt.decode_access_token.large",
+            jwt.decode,
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+        )
+        reset_jwt_cache()
+        # Un solo jwt.decode real: todas las rondas del benchmark salen del cache
+        assert decode.call_count == 1
+
+
+class TestPydanticReadModelsBenchmark:
+
+    def test_producto_read_page(self, bench):
+        from app.modules.inv.presentation.schemas import ProductoRead
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "producto_id": uuid4(), "cliente_id": CLIENT_ID, "empresa_id": uuid4(),
+                "codigo_sku": f"SKU-{i:05d}", "nombre": f"Producto {i}", "tipo_producto": "bien",
+                "unidad_medida_base_id": uuid4(), "moneda_costo": uuid4(), "moneda_venta": uuid4(),
+                "costo_promedio": Decimal("12.3456"), "precio_base_venta": Decimal("19.90"),
+                "stock_minimo": Decimal("5"), "maneja_inventario": True, "afecto_igv": True,
+                "porcentaje_igv": Decimal("18.00"), "es_activo": True, "fecha_creacion": now,
+                "descripcion": "Descripción larga " * 4,
+            }
+            for i in range(100)
+        ]
+
+        def _build_page():
+            return [ProductoRead.model_validate(row) for row in rows]
+
+        assert len(_build_page()) == 100
+        bench("pydantic.producto_read.page_100", _build_page, rounds=5)
+
+
+def test_compare_results_detects_regression():
+    from tests.performance.bench import compare_results
+
+    baseline = {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}}
+    current = {"a": {"median_us": 16.0}, "b": {"median_us": 14.0}, "nuevo": {"median_us": 1.0}}
+    regressions = compare_results(current, baseline, tolerance=1.5)
+    assert [r["name"] for r in regressions] == ["a"]
+    assert regressions[0]["ratio"] == 1.6
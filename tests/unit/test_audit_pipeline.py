@@ -0,0 +1,158 @@
+"""
+Tests del pipeline asíncrono de auditoría: un INSERT por tenant al volcar la
+cola, eventos durables en línea, spill a disco ante fallos y replay.
+"""
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.database.connection_async import DatabaseConnection
+from app.modules.superadmin.application.services.audit_pipeline import (
+    enqueue_audit_event,
+    get_audit_pipeline_report,
+    replay_spill,
+    reset_audit_pipeline,
+    stop_audit_pipeline,
+    write_batch,
+)
+from app.modules.superadmin.application.services.audit_service import AuditService
+
+_PIPELINE = "app.modules.superadmin.application.services.audit_pipeline"
+_SERVICE = "app.modules.superadmin.application.services.audit_service"
+TENANT_A = uuid4()
+TENANT_B = uuid4()
+
+
+def _row(cliente_id, evento="login_success"):
+    return {
+        "cliente_id": cliente_id,
+        "usuario_id": uuid4(),
+        "evento": evento,
+        "nombre_usuario_intento": None,
+        "descripcion": "test",
+        "exito": True,
+        "codigo_error": None,
+        "ip_address": "127.0.0.1",
+        "user_agent": None,
+        "device_info": None,
+        "geolocation": None,
+        "metadata_json": None,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _pipeline(tmp_path, monkeypatch):
+    reset_audit_pipeline()
+    monkeypatch.setattr(settings, "AUDIT_PIPELINE_ENABLED", True)
+    monkeypatch.setattr(settings, "AUDIT_SPILL_DIR", str(tmp_path / "spill"))
+    monkeypatch.setattr(settings, "AUDIT_FLUSH_SECONDS", 0.01)
+    yield
+    reset_audit_pipeline()
+
+
+@pytest.mark.asyncio
+async def test_queue_is_written_with_one_insert_per_tenant():
+    with patch(f"{_PIPELINE}.execute_insert", new_callable=AsyncMock) as insert:
+        for _ in range(3):
+            await enqueue_audit_event(_row(TENANT_A), DatabaseConnection.DEFAULT)
+        await enqueue_audit_event(_row(TENANT_B), DatabaseConnection.ADMIN)
+        await stop_audit_pipeline()
+
+    assert insert.await_count == 2
+    client_ids = {call.kwargs["client_id"] for call in insert.await_args_list}
+    assert client_ids == {TENANT_A, TENANT_B}
+    report = get_audit_pipeline_report()
+    assert report["enqueued"] == 4
+    assert report["inserted"] == 4
+    assert report["statements"] == 2
+
+
+@pytest.mark.asyncio
+async def test_durable_events_are_written_synchronously():
+    with patch(f"{_SERVICE}.enqueue_audit_event", new_callable=AsyncMock) as enqueue, patch(
+        f"{_SERVICE}.execute_insert",
+        new=AsyncMock(return_value={"rows_affected": 1}),
+    ) as sync_insert:
+        result = await AuditService.registrar_auth_event(
+            cliente_id=TENANT_A, usuario_id=uuid4(), evento="impersonation_started", exito=True
+        )
+        queued = await AuditService.registrar_auth_event(
+            cliente_id=TENANT_A, usuario_id=uuid4(), evento="login_success", exito=True
+        )
+
+    sync_insert.assert_awaited_once()
+    assert result == {"rows_affected": 1}
+    enqueue.assert_awaited_once()
+    assert queued["queued"] is True
+    # Ambas rutas fijan fecha_evento con el mismo reloj (no el GETDATE() del INSERT)
+    sync_fecha = sync_insert.await_args.args[0].compile().params["fecha_evento"]
+    queued_fecha = enqueue.await_args.args[0]["fecha_evento"]
+    assert isinstance(sync_fecha, datetime) and isinstance(queued_fecha, datetime)
+    assert sync_fecha <= queued_fecha
+
+
+@pytest.mark.asyncio
+async def test_failed_insert_spills_to_disk_and_replays():
+    fecha = datetime(2026, 1, 1, 8, 30)
+    events = [{**_row(TENANT_A), "fecha_evento": fecha, "_conn": "DEFAULT"} for _ in range(2)]
+
+    with patch(f"{_PIPELINE}.execute_insert", new=AsyncMock(side_effect=RuntimeError("bd caída"))):
+        assert await write_batch(events) == 0
+    assert get_audit_pipeline_report()["spill_files"] == 1
+
+    with patch(f"{_PIPELINE}.execute_insert", new_callable=AsyncMock) as insert:
+        assert await replay_spill() == 2
+
+    assert insert.await_args.kwargs["client_id"] == TENANT_A
+    params = insert.await_args.args[0].compile().params
+    assert fecha in params.values()  # la hora del evento no cambia en el replay
+    report = get_audit_pipeline_report()
+    assert report["spill_files"] == 0
+    assert report["spilled"] == 2
+    assert report["replayed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shutdown_timeout_spills_in_flight_batch(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_SHUTDOWN_TIMEOUT_SECONDS", 0.2)
+
+    async def _slow_insert(*_args, **_kwargs):
+        await asyncio.sleep(5)  # BD esperando conexión del pool
+
+    with patch(f"{_PIPELINE}.execute_insert", new=_slow_insert):
+        for _ in range(3):
+            await enqueue_audit_event(_row(TENANT_A), DatabaseConnection.DEFAULT)
+        await asyncio.sleep(0.05)  # el consumidor ya está dentro de write_batch
+        await asyncio.wait_for(stop_audit_pipeline(), timeout=2)
+
+    report = get_audit_pipeline_report()
+    assert report["inserted"] == 0
+    assert report["spilled"] == 3
+    assert report["spill_files"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_spills_in_batches(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_QUEUE_MAX_SIZE", 1)
+    monkeypatch.setattr(settings, "AUDIT_BATCH_SIZE", 3)
+
+    with patch(f"{_PIPELINE}.execute_insert", new_callable=AsyncMock), patch(
+        f"{_PIPELINE}._maybe_replay_spill", new_callable=AsyncMock
+    ):
+        # Sin ceder el loop: el consumidor no alcanza a vaciar la cola
+        for _ in range(6):
+            await enqueue_audit_event(_row(TENANT_A), DatabaseConnection.DEFAULT)
+        assert get_audit_pipeline_report()["spill_files"] == 1  # lote de 3 al llenarse el buffer
+        await asyncio.sleep(0.05)  # el resto (2) se vuelca por tiempo
+        await stop_audit_pipeline()
+
+    report = get_audit_pipeline_report()
+    assert report["queue_full"] >= 4
+    assert report["spilled"] == report["queue_full"]
+    assert report["enqueued"] + report["queue_full"] == 6
+    assert report["spill_files"] == 2  # un archivo por lote, no uno por evento
+    assert report["overflow_buffered"] == 0
@@ -0,0 +1,84 @@
+"""
+Tests del touch de actividad write-behind (C05): encolado sin I/O, throttle por
+worker, un UPDATE por tenant al volcar y re-encolado tras un volcado fallido.
+"""
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.modules.auth.application.services.business_activity_service import (
+    BusinessActivityService,
+    flush_business_activity,
+    get_business_activity_report,
+    reset_business_activity,
+    stop_business_activity_flusher,
+)
+
+_BAS = "app.modules.auth.application.services.business_activity_service"
+TENANT_A = uuid4()
+TENANT_B = uuid4()
+
+
+@pytest.fixture(autouse=True)
+def _buffer():
+    reset_business_activity()
+    with patch(f"{_BAS}.is_session_v2_enabled", return_value=True):
+        yield
+    reset_business_activity()
+
+
+@pytest.mark.asyncio
+async def test_record_touch_does_no_io_and_throttles_per_session():
+    session_id = uuid4()
+    with patch(f"{_BAS}.touch_business_activity_batch_core", new_callable=AsyncMock) as batch, patch(
+        f"{_BAS}.touch_business_activity_core", new_callable=AsyncMock
+    ) as single:
+        for _ in range(5):
+            BusinessActivityService.record_touch(session_id, TENANT_A)
+
+        batch.assert_not_awaited()
+        single.assert_not_awaited()
+        await stop_business_activity_flusher()
+
+    report = get_business_activity_report()
+    assert report["recorded"] == 1
+    assert report["throttled"] == 4
+    assert report["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_issues_one_update_per_tenant():
+    sessions_a = [uuid4() for _ in range(3)]
+    session_b = uuid4()
+    for session_id in sessions_a:
+        BusinessActivityService.record_touch(session_id, TENANT_A)
+    BusinessActivityService.record_touch(session_b, TENANT_B)
+
+    with patch(f"{_BAS}.touch_business_activity_batch_core", new=AsyncMock(return_value=2)) as batch:
+        rows = await flush_business_activity()
+        await stop_business_activity_flusher()
+
+    assert rows == 4
+    assert batch.await_count == 2
+    calls = {call.args[0]: call.args[1] for call in batch.await_args_list}
+    assert sorted(calls[TENANT_A]) == sorted(sessions_a)
+    assert calls[TENANT_B] == [session_b]
+    assert get_business_activity_report()["statements"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_allows_session_to_be_recorded_again():
+    session_id = uuid4()
+    BusinessActivityService.record_touch(session_id, TENANT_A)
+
+    with patch(
+        f"{_BAS}.touch_business_activity_batch_core", new=AsyncMock(side_effect=RuntimeError("bd caída"))
+    ):
+        assert await flush_business_activity() == 0
+
+    BusinessActivityService.record_touch(session_id, TENANT_A)
+    report = get_business_activity_report()
+    assert report["failed"] == 1
+    assert report["pending"] == 1
+    await stop_business_activity_flusher()
@@ -0,0 +1,121 @@
+"""
+Tests del middleware de compresión: negociación por Accept-Encoding, umbral de
+tamaño, tipos no comprimibles, streams y cache de cuerpos comprimidos.
+"""
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import (
+    CompressedBodyCache,
+    CompressionMiddleware,
+    get_compression_report,
+    negotiate_encoding,
+    reset_compression_metrics,
+)
+
+LARGE = {"items": [{"codigo": f"ITEM-{i}", "nombre": "Producto de prueba"} for i in range(200)]}
+
+
+@pytest.fixture
+def client():
+    reset_compression_metrics()
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/grande")
+    async def grande():
+        return JSONResponse(LARGE, headers={"ETag": '"v1"'})
+
+    @app.get("/chico")
+    async def chico():
+        return {"ok": True}
+
+    @app.get("/binario")
+    async def binario():
+        return Response(b"x" * 5000, media_type="application/pdf")
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(50):
+                yield f"fila-{i},valor\n".encode()
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    yield TestClient(app)
+    reset_compression_metrics()
+
+
+def test_negotiate_encoding_respects_q_values():
+    assert negotiate_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br, gzip", ("br", "gzip")) == "br"
+    assert negotiate_encoding("gzip;q=0", ("gzip",)) is None
+    assert negotiate_encoding("*", ("gzip",)) == "gzip"
+    assert negotiate_encoding(None, ("gzip",)) is None
+
+
+def test_large_json_is_gzipped_with_weak_etag(client):
+    response = client.get("/grande", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.json() == LARGE
+
+
+def test_small_binary_and_unaccepted_responses_are_untouched(client):
+    assert "content-encoding" not in client.get("/chico", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/binario", headers={"Accept-Encoding": "gzip"}).headers
+    plain = client.get("/grande", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == '"v1"'
+
+
+def test_stream_is_compressed_incrementally(client):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert zlib.decompress(raw, 16 + zlib.MAX_WBITS).decode().startswith("fila-0,valor\n")
+
+
+def test_repeated_bodies_are_served_from_cache(client):
+    first = client.get("/grande", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/grande", headers={"Accept-Encoding": "gzip"})
+
+    assert first.content == second.content
+    report = get_compression_report()
+    assert report["cache"]["hits"] == 1
+    assert report["cache"]["misses"] == 1
+    assert report["compressed"]["gzip"] == 2
+    assert report["bytes_out"] < report["bytes_in"]
+
+
+def test_body_cache_evicts_by_total_bytes():
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.put((b"a", "gzip"), b"123456")
+    cache.put((b"b", "gzip"), b"123456")
+
+    assert cache.get((b"a", "gzip")) is None
+    assert cache.get((b"b", "gzip")) == b"123456"
+    assert cache.size_bytes == 6
+
+
+def test_precompressed_responses_pass_through(client):
+    body = gzip.compress(b"{}" * 1000)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @app.get("/ya")
+    async def ya():
+        return Response(body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    response = TestClient(app).get("/ya", headers={"Accept-Encoding": "gzip"})
+    assert response.content == b"{}" * 1000
+    assert get_compression_report()["compressed"] == {}
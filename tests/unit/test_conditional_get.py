@@ -0,0 +1,150 @@
+"""
+Tests del GET condicional: ETag por contadores de versión, 304 sin ejecutar el
+endpoint y bump por escrituras (tenant, contexto y global).
+"""
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user_data
+from app.api.deps_etag import conditional_get, etag_matches
+from app.core.config import settings
+from app.core.tenant.context import TenantContext, reset_tenant_context, set_tenant_context
+from app.infrastructure.cache.versions import (
+    SCOPE_GLOBAL,
+    SCOPE_TENANT,
+    bump_versions,
+    bumps_versions,
+    get_etag_report,
+    get_versions,
+    reset_versions,
+    version_keys,
+)
+
+TENANT_A = str(uuid4())
+TENANT_B = str(uuid4())
+
+
+@pytest.fixture
+def app_and_calls(monkeypatch):
+    # Ventana de staleness amplia: el ETag no cambia por tiempo durante el test
+    monkeypatch.setattr(settings, "CONDITIONAL_GET_MAX_STALENESS_SECONDS", 10**9)
+    reset_versions()
+    app = FastAPI()
+    calls = {"menu": 0}
+    payload = {"sub": "ana", "cliente_id": TENANT_A, "empresa_id": None}
+    app.dependency_overrides[get_current_user_data] = lambda: payload
+
+    @app.get("/menu", dependencies=[Depends(conditional_get())])
+    async def menu():
+        calls["menu"] += 1
+        return {"items": [1, 2, 3]}
+
+    yield app, calls, payload
+    reset_versions()
+
+
+def _revalidate(client, etag):
+    return client.get("/menu", headers={"If-None-Match": etag})
+
+
+def test_etag_matches_uses_weak_comparison():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_matching_etag_returns_304_without_running_endpoint(app_and_calls):
+    app, calls, _ = app_and_calls
+    client = TestClient(app)
+
+    first = client.get("/menu")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    second = _revalidate(client, etag)
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert calls["menu"] == 1
+    assert get_etag_report()["not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tenant_bump_invalidates_only_that_tenant(app_and_calls):
+    app, calls, _ = app_and_calls
+    client = TestClient(app)
+    etag = client.get("/menu").headers["etag"]
+
+    await bump_versions(TENANT_B)
+    assert _revalidate(client, etag).status_code == 304
+
+    await bump_versions(TENANT_A)
+    refreshed = _revalidate(client, etag)
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_global_and_superadmin_bumps_invalidate_everyone(app_and_calls, monkeypatch):
+    app, _, _ = app_and_calls
+    client = TestClient(app)
+    etag = client.get("/menu").headers["etag"]
+
+    await bump_versions()
+    etag_after_global = _revalidate(client, etag).headers["etag"]
+    assert etag_after_global != etag
+
+    monkeypatch.setattr(settings, "SUPERADMIN_CLIENTE_ID", TENANT_B)
+    await bump_versions(TENANT_B)
+    assert _revalidate(client, etag_after_global).status_code == 200
+
+
+def test_etag_depends_on_identity(app_and_calls):
+    app, _, payload = app_and_calls
+    client = TestClient(app)
+    etag = client.get("/menu").headers["etag"]
+
+    payload["sub"] = "beto"
+    assert _revalidate(client, etag).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_bumps_versions_decorator_resolves_tenant():
+    reset_versions()
+
+    class Servicio:
+        @staticmethod
+        @bumps_versions(SCOPE_TENANT)
+        async def crear(cliente_id, data):
+            return data
+
+        @staticmethod
+        @bumps_versions(SCOPE_TENANT)
+        async def actualizar(rol_id):
+            return rol_id
+
+        @staticmethod
+        @bumps_versions(SCOPE_GLOBAL)
+        async def crear_modulo(data):
+            return data
+
+    before = await get_versions(version_keys(TENANT_A))
+    assert await Servicio.crear(TENANT_A, {"x": 1}) == {"x": 1}
+    after_arg = await get_versions(version_keys(TENANT_A))
+    assert after_arg[-1] == before[-1] + 1  # tenant
+    assert after_arg[-2] == before[-2]      # global intacto
+
+    token = set_tenant_context(TenantContext(client_id=UUID(TENANT_A)))
+    try:
+        await Servicio.actualizar(uuid4())
+    finally:
+        reset_tenant_context(token)
+    assert (await get_versions(version_keys(TENANT_A)))[-1] == before[-1] + 2
+
+    await Servicio.crear_modulo({})
+    assert (await get_versions(version_keys(TENANT_A)))[-2] == before[-2] + 1
+    reset_versions()
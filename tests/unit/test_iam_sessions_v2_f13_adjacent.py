@@ -342,12 +342,16 @@ async def test_f13_deps_touch_business_activity_from_sid():
         "is_impersonation": False,
     }
     with patch(
+        "app.modules.auth.application.services.business_activity_service.BusinessActivityService.record_touch",
+    ) as mock_record, patch(
         "app.modules.auth.application.services.business_activity_service.BusinessActivityService.touch",
         new_callable=AsyncMock,
     ) as mock_touch:
         await _touch_business_activity_from_payload(payload)
 
-    mock_touch.assert_awaited_once_with(SESSION_ID, CLIENTE_ID)
+    # Write-behind: se encola sin UPDATE síncrono en el request
+    mock_record.assert_called_once_with(SESSION_ID, CLIENTE_ID)
+    mock_touch.assert_not_awaited()
 
 
 @pytest.mark.unit
@@ -356,6 +360,8 @@ async def test_f13_deps_skips_impersonation_and_missing_sid():
     from app.api.deps import _touch_business_activity_from_payload
 
     with patch(
+        "app.modules.auth.application.services.business_activity_service.BusinessActivityService.record_touch",
+    ) as mock_record, patch(
         "app.modules.auth.application.services.business_activity_service.BusinessActivityService.touch",
         new_callable=AsyncMock,
     ) as mock_touch:
@@ -364,6 +370,7 @@ async def test_f13_deps_skips_impersonation_and_missing_sid():
         )
         await _touch_business_activity_from_payload({"cliente_id": str(CLIENTE_ID)})
 
+    mock_record.assert_not_called()
     mock_touch.assert_not_awaited()
 
 
@@ -0,0 +1,88 @@
+"""
+Tests del cache de access tokens verificados: aciertos sin jwt.decode, tokens
+alterados/expirados rechazados, purga por revocación y LRU acotado.
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core.config import settings
+from app.core.security import jwt_cache
+from app.core.security.jwt import create_access_token
+from app.core.security.jwt_cache import (
+    VerifiedTokenCache,
+    decode_access_token,
+    get_jwt_cache_report,
+    reset_jwt_cache,
+)
+from app.infrastructure.redis.revocation_filter import get_revocation_filter, reset_revocation_filter
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_DECODE_CACHE_ENABLED", True)
+    reset_jwt_cache()
+    yield
+    reset_jwt_cache()
+    reset_revocation_filter()
+
+
+def _token(sub="ana"):
+    return create_access_token({"sub": sub, "cliente_id": "c1"})  # (token, jti)
+
+
+def test_repeated_token_is_decoded_once():
+    token, _ = _token()
+    with patch.object(jwt_cache.jwt, "decode", wraps=jwt.decode) as decode:
+        first = decode_access_token(token)
+        first["sub"] = "modificado"  # copia: no altera el cache
+        second = decode_access_token(token)
+
+    assert decode.call_count == 1
+    assert second["sub"] == "ana"
+    assert get_jwt_cache_report()["hits"] == 1
+
+
+def test_tampered_token_is_not_served_from_cache():
+    token, _ = _token()
+    decode_access_token(token)
+    header, body, signature = token.split(".")
+    tampered = ".".join([header, body, signature[:-2] + ("AA" if signature[-2:] != "AA" else "BB")])
+
+    with pytest.raises(JWTError):
+        decode_access_token(tampered)
+
+
+def test_entry_expires_at_token_exp():
+    cache = VerifiedTokenCache(max_size=10)
+    cache.put(b"vigente", {"sub": "a", "exp": time.time() + 60})
+    cache.put(b"vencido", {"sub": "b", "exp": time.time() - 1})
+
+    assert cache.get(b"vigente") is not None
+    assert cache.get(b"vencido") is None
+    assert cache.stats["expired"] == 1
+
+
+def test_revocation_purges_cached_token():
+    token, jti = _token()
+    decode_access_token(token)
+    assert get_jwt_cache_report()["size"] == 1
+
+    get_revocation_filter().add(jti, 600)
+
+    report = get_jwt_cache_report()
+    assert report["size"] == 0
+    assert report["purged"] == 1
+
+
+def test_cache_is_bounded():
+    cache = VerifiedTokenCache(max_size=3)
+    for i in range(5):
+        cache.put(f"t{i}".encode(), {"jti": f"j{i}", "exp": time.time() + 60})
+
+    assert cache.get(b"t0") is None
+    assert cache.get(b"t4") is not None
+    assert cache.stats["evictions"] == 2
+    assert not cache.purge_jti("j0")  # el índice por jti también se poda
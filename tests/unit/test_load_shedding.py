@@ -0,0 +1,150 @@
+"""
+Tests del load shedding adaptativo (prioridades de ruta + middleware).
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.authorization.rbac import require_permission
+from app.core.authorization.route_priority import declare_priority, declared_priority, infer_priority
+from app.core.config import settings
+from app.core.metrics import load_shedding
+from app.core.metrics.load_shedding import LoadShedder, LoadSheddingMiddleware
+
+
+class TestInferPriority:
+
+    @pytest.mark.parametrize("path,method,expected", [
+        ("/api/v1/auth/refresh/", "POST", "critica"),
+        ("/api/v1/inv/productos/", "POST", "alta"),
+        ("/api/v1/inv/productos/{producto_id}", "DELETE", "alta"),
+        ("/api/v1/inv/productos/{producto_id}", "GET", "normal"),
+        ("/api/v1/inv/productos/", "GET", "baja"),
+        ("/api/v1/inv/productos/{producto_id}/export", "GET", "baja"),
+        ("/api/v1/bi/reportes/{reporte_id}/ejecutar", "POST", "baja"),
+    ])
+    def test_inferida(self, path, method, expected):
+        assert infer_priority(path, method) == expected
+
+
+class TestDeclaredPriority:
+
+    @staticmethod
+    def _declared(router, path, method):
+        route = next(r for r in router.routes if r.path == path and method in r.methods)
+        return declared_priority(route.dependant)
+
+    def test_rutas_criticas_y_de_baja_prioridad_la_declaran(self):
+        from app.modules.auth.presentation.endpoints import router as auth_router
+        from app.modules.bi.presentation.endpoints_reporte import router as reporte_router
+        from app.modules.inv.presentation.endpoints_kardex import router as kardex_router
+        from app.modules.menus.presentation.endpoints import router as menus_router
+        from app.modules.modulos.presentation.endpoints_menus import router as modulos_menus_router
+
+        assert self._declared(auth_router, "/login/", "POST") == "critica"
+        assert self._declared(auth_router, "/refresh/", "POST") == "critica"
+        assert self._declared(auth_router, "/me/", "GET") == "critica"
+        assert self._declared(auth_router, "/menu", "GET") == "critica"
+        assert self._declared(menus_router, "/getmenu/", "GET") == "critica"
+        assert self._declared(modulos_menus_router, "/me/", "GET") == "critica"
+        assert self._declared(kardex_router, "", "GET") == "baja"
+        assert self._declared(reporte_router, "", "GET") == "baja"
+
+    def test_prioridad_invalida(self):
+        with pytest.raises(ValueError):
+            declare_priority("urgente")
+
+
+def _build_app(shedder):
+    app = FastAPI()
+    app.add_middleware(LoadSheddingMiddleware, shedder=shedder)
+
+    def fake_user():
+        return object()
+
+    @app.get("/api/v1/inv/productos/")
+    async def listar():
+        return {"ok": True}
+
+    @app.get("/api/v1/inv/productos/{producto_id}")
+    async def detalle(producto_id: str):
+        return {"ok": True}
+
+    @app.post("/api/v1/inv/productos/")
+    async def crear():
+        return {"ok": True}
+
+    @app.post("/api/v1/auth/refresh/")
+    async def refresh():
+        return {"ok": True}
+
+    permiso = require_permission("inv.stock.recalcular", prioridad="baja")
+    app.dependency_overrides[permiso] = fake_user
+
+    @app.post("/api/v1/inv/stock/recalcular", dependencies=[Depends(permiso)])
+    async def recalcular():
+        return {"ok": True}
+
+    return app
+
+
+@pytest.fixture
+def pool_wait(monkeypatch):
+    """Fija la espera reciente de pool (ms) que ve el shedder."""
+    state = {"ms": 0.0}
+    monkeypatch.setattr(settings, "SHED_POOL_WAIT_MS", 100.0)
+    monkeypatch.setattr(settings, "SHED_RETRY_AFTER_SECONDS", 5)
+    monkeypatch.setattr(load_shedding, "get_max_recent_pool_wait_ms", lambda: state["ms"])
+    monkeypatch.setattr(load_shedding, "get_current_loop_lag_ms", lambda: 0.0)
+    monkeypatch.setattr(load_shedding, "_PRESSURE_TTL_SECONDS", 0.0)
+    return state
+
+
+def _statuses(client):
+    return {
+        "listado": client.get("/api/v1/inv/productos/").status_code,
+        "detalle": client.get("/api/v1/inv/productos/abc").status_code,
+        "crear": client.post("/api/v1/inv/productos/").status_code,
+        "refresh": client.post("/api/v1/auth/refresh/").status_code,
+        "declarada_baja": client.post("/api/v1/inv/stock/recalcular").status_code,
+    }
+
+
+def test_sin_presion_pasa_todo(pool_wait):
+    client = TestClient(_build_app(LoadShedder()))
+    assert set(_statuses(client).values()) == {200}
+
+
+def test_presion_elevada_rechaza_prioridad_baja(pool_wait):
+    shedder = LoadShedder()
+    client = TestClient(_build_app(shedder))
+    pool_wait["ms"] = 150.0
+
+    assert _statuses(client) == {
+        "listado": 503, "detalle": 200, "crear": 200, "refresh": 200, "declarada_baja": 503,
+    }
+    response = client.get("/api/v1/inv/productos/")
+    assert response.headers["Retry-After"] == "5"
+    assert response.json()["error_code"] == "LOAD_SHED"
+    assert shedder.report()["shed_by_priority"]["baja"] == 3
+
+
+def test_presion_critica_solo_deja_escrituras_y_auth(pool_wait):
+    client = TestClient(_build_app(LoadShedder()))
+    pool_wait["ms"] = 250.0
+
+    assert _statuses(client) == {
+        "listado": 503, "detalle": 503, "crear": 200, "refresh": 200, "declarada_baja": 503,
+    }
+    assert client.get("/api/v1/inv/productos/abc").headers["Retry-After"] == "10"
+
+
+def test_requests_en_curso_como_senal(monkeypatch):
+    monkeypatch.setattr(settings, "SHED_MAX_IN_FLIGHT", 4)
+    monkeypatch.setattr(load_shedding, "get_max_recent_pool_wait_ms", lambda: 0.0)
+    monkeypatch.setattr(load_shedding, "get_current_loop_lag_ms", lambda: 0.0)
+    shedder = LoadShedder()
+    shedder.in_flight = 5
+    assert shedder.pressure_level() == 1
+    assert shedder.report()["signals"]["in_flight"] == 1.25
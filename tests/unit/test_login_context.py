@@ -0,0 +1,97 @@
+"""
+Tests de LoginContext: niveles, roles, es_admin_cliente y empresas derivados en
+memoria de las filas de GET_LOGIN_CONTEXT con los criterios de las queries previas.
+"""
+from uuid import uuid4
+
+import pytest
+
+from app.modules.auth.application.services.login_context import LoginContext
+
+CLIENTE = uuid4()
+EMP_A = uuid4()
+EMP_B = uuid4()
+
+
+def _role(nombre, nivel, *, empresa=None, cliente=CLIENTE, rol_cliente=CLIENTE, admin=False,
+          activo=True, razon_social=None, codigo=None):
+    return {
+        "ur_cliente_id": cliente,
+        "ur_empresa_id": empresa,
+        "rol_nombre": nombre,
+        "codigo_rol": codigo,
+        "nivel_acceso": nivel,
+        "es_admin_cliente": admin,
+        "rol_es_activo": activo,
+        "rol_cliente_id": rol_cliente,
+        "razon_social": razon_social,
+        "nombre_comercial": None,
+        "empresa_es_activo": True if empresa else None,
+    }
+
+
+def _context(roles, **kwargs):
+    user = {"usuario_id": uuid4(), "cliente_id": CLIENTE, "empresa_default_id": kwargs.pop("default", None)}
+    return LoginContext(user=user, roles=roles, cliente_id=CLIENTE, **kwargs)
+
+
+def test_level_info_uses_max_active_level_of_the_empresa():
+    ctx = _context([
+        _role("Vendedor", 2, empresa=EMP_A),
+        _role("Gerente", 4, empresa=EMP_B),
+        _role("Inactivo", 5, activo=False),
+        _role("Ajeno", 5, rol_cliente=uuid4()),  # rol de otro tenant: fuera en BD compartida
+    ])
+
+    assert ctx.level_info() == {"access_level": 4, "is_super_admin": False, "user_type": "tenant_admin"}
+    assert ctx.level_info(EMP_A)["access_level"] == 2
+    assert ctx.level_info(EMP_A)["user_type"] == "user"
+
+
+def test_role_names_and_admin_flag_follow_empresa_filter():
+    ctx = _context([
+        _role("Admin", 4, admin=True, empresa=EMP_B),
+        _role("Vendedor", 2, empresa=EMP_A),
+        _role("Vendedor", 2),  # global: cuenta para cualquier empresa
+    ])
+
+    assert ctx.role_names() == ["Admin", "Vendedor"]
+    assert ctx.role_names(EMP_A) == ["Vendedor"]
+    assert ctx.es_admin_cliente() is True
+    assert ctx.es_admin_cliente(EMP_A) is False
+
+
+def test_platform_superadmin_overrides_tenant_roles():
+    ctx = _context([_role("Admin", 4, admin=True)], is_platform_superadmin=True)
+
+    assert ctx.level_info()["user_type"] == "platform_admin"
+    assert ctx.es_admin_cliente() is False
+
+
+@pytest.mark.asyncio
+async def test_empresa_context_sorts_dedupes_and_requires_selection():
+    ctx = _context([
+        _role("Vendedor", 2, empresa=EMP_B, razon_social="beta SAC"),
+        _role("Cajero", 1, empresa=EMP_A, razon_social="Alfa SAC"),
+        _role("Supervisor", 3, empresa=EMP_B, razon_social="beta SAC"),
+    ])
+
+    result = await ctx.empresa_context()
+
+    assert [e["empresa_id"] for e in result["empresas_disponibles"]] == [EMP_A, EMP_B]
+    assert result["requiere_seleccion"] is True
+    assert result["empresa_activa"] is None
+    assert result["es_admin_sin_empresa"] is False
+
+
+@pytest.mark.asyncio
+async def test_empresa_context_uses_valid_default():
+    ctx = _context([
+        _role("Vendedor", 2, empresa=EMP_A, razon_social="Alfa"),
+        _role("Vendedor", 2, empresa=EMP_B, razon_social="Beta"),
+    ], default=EMP_B)
+
+    result = await ctx.empresa_context()
+
+    assert result["empresa_activa"] == EMP_B
+    assert result["requiere_seleccion"] is False
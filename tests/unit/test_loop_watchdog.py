@@ -0,0 +1,73 @@
+"""
+Tests del watchdog de bloqueos del event loop.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.metrics.loop_watchdog import LoopWatchdog, _call_site
+
+
+def _bloqueo_sincrono(segundos: float) -> None:
+    time.sleep(segundos)
+
+
+@pytest.mark.asyncio
+async def test_detecta_bloqueo_y_captura_sitio():
+    watchdog = LoopWatchdog(threshold_ms=50, interval_ms=10)
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.05)
+        _bloqueo_sincrono(0.2)
+        await asyncio.sleep(0.05)
+    finally:
+        await watchdog.stop()
+
+    report = watchdog.report()
+    assert report["blocks_detected"] >= 1
+    assert report["max_lag_ms"] >= 100
+    offender = report["offenders"][0]
+    assert "test_loop_watchdog.py" in offender["call_site"]
+    assert offender["call_site"].endswith("_bloqueo_sincrono")
+    assert any("_bloqueo_sincrono" in line for line in offender["stack"])
+
+
+@pytest.mark.asyncio
+async def test_sin_bloqueos_no_reporta():
+    watchdog = LoopWatchdog(threshold_ms=100, interval_ms=10)
+    watchdog.start()
+    try:
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+    finally:
+        await watchdog.stop()
+
+    report = watchdog.report()
+    assert report["blocks_detected"] == 0
+    assert report["offenders"] == []
+
+
+@pytest.mark.asyncio
+async def test_agrega_por_sitio_de_llamada():
+    watchdog = LoopWatchdog(threshold_ms=40, interval_ms=10)
+    watchdog.start()
+    try:
+        for _ in range(2):
+            await asyncio.sleep(0.03)
+            _bloqueo_sincrono(0.12)
+        await asyncio.sleep(0.03)
+    finally:
+        await watchdog.stop()
+
+    offenders = watchdog.report()["offenders"]
+    sitio = [o for o in offenders if o["call_site"].endswith("_bloqueo_sincrono")]
+    assert sitio and sitio[0]["count"] == 2
+
+    watchdog.reset()
+    assert watchdog.report()["offenders"] == []
+
+
+def test_call_site_sin_frames():
+    assert _call_site([]) == "desconocido"
@@ -0,0 +1,151 @@
+"""
+Tests del cache de menús compilados: entrada compartida por conjunto de roles,
+invalidación por contadores de versión y copia independiente por respuesta.
+"""
+from typing import Any, List
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.authorization.menu_cache import get_menu_cache_report, get_or_build_menu
+from app.infrastructure.cache.versions import bump_versions, reset_versions
+from app.modules.modulos.application.services.modulo_menu_service import ModuloMenuService
+from app.modules.modulos.presentation.schemas import MenuUsuarioResponse, ModuloMenuResponse
+
+CLIENT_ID = uuid4()
+ROL_A = uuid4()
+ROL_B = uuid4()
+
+
+def _menu(codigo: str = "INV") -> MenuUsuarioResponse:
+    modulo = ModuloMenuResponse(
+        modulo_id=uuid4(), codigo=codigo, nombre=codigo, color="#4CAF50", categoria="operaciones", orden=1
+    )
+    return MenuUsuarioResponse(modulos=[modulo])
+
+
+class _Builder:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self) -> MenuUsuarioResponse:
+        self.calls += 1
+        return _menu(f"M{self.calls}")
+
+
+async def _get(build, usuario_id, roles: List[Any], **kwargs):
+    async def load_roles():
+        return roles
+
+    return await get_or_build_menu(
+        "test",
+        cliente_id=CLIENT_ID,
+        usuario_id=usuario_id,
+        empresa_id=None,
+        response_model=MenuUsuarioResponse,
+        build=build,
+        load_role_ids=load_roles,
+        **kwargs,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _versions():
+    reset_versions()
+    yield
+    reset_versions()
+
+
+@pytest.mark.asyncio
+async def test_users_with_same_role_set_share_the_compiled_menu():
+    build = _Builder()
+
+    first = await _get(build, uuid4(), [ROL_A, ROL_B])
+    second = await _get(build, uuid4(), [ROL_B, ROL_A])
+    other = await _get(build, uuid4(), [ROL_A])
+
+    assert build.calls == 2
+    assert second.model_dump() == first.model_dump()
+    assert other.modulos[0].codigo == "M2"
+    report = get_menu_cache_report()
+    assert report["hits"] == 1
+    assert report["misses"] == 2
+    assert report["role_misses"] == 3
+
+
+@pytest.mark.asyncio
+async def test_version_bump_rebuilds_menu_and_role_set():
+    build = _Builder()
+    usuario_id = uuid4()
+
+    await _get(build, usuario_id, [ROL_A])
+    await _get(build, usuario_id, [ROL_A])
+    assert get_menu_cache_report()["role_hits"] == 1
+
+    await bump_versions(uuid4())  # otro tenant: sin efecto
+    await _get(build, usuario_id, [ROL_A])
+    assert build.calls == 1
+
+    await bump_versions(CLIENT_ID)
+    refreshed = await _get(build, usuario_id, [ROL_A])
+    assert build.calls == 2
+    assert refreshed.modulos[0].codigo == "M2"
+    assert get_menu_cache_report()["role_misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_hits_return_independent_models():
+    build = _Builder()
+    usuario_id = uuid4()
+    await _get(build, usuario_id, [ROL_A])
+
+    hit = await _get(build, usuario_id, [ROL_A])
+    hit.modulos[0].codigo = "MUTADO"
+
+    assert (await _get(build, usuario_id, [ROL_A])).modulos[0].codigo == "M1"
+
+
+@pytest.mark.asyncio
+async def test_fixed_scope_skips_role_lookup():
+    build = _Builder()
+    load_roles = AsyncMock(return_value=[ROL_A])
+
+    for _ in range(2):
+        await get_or_build_menu(
+            "test",
+            cliente_id=CLIENT_ID,
+            usuario_id=uuid4(),
+            empresa_id=None,
+            response_model=MenuUsuarioResponse,
+            build=build,
+            load_role_ids=load_roles,
+            scope="super_admin",
+        )
+
+    assert build.calls == 1
+    load_roles.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_obtener_menu_usuario_skips_menu_queries_on_hit():
+    executed: List[str] = []
+
+    async def fake_execute_query(query, *args, **kwargs):
+        q = query if isinstance(query, str) else str(query)
+        executed.append(q)
+        if "SELECT ur.rol_id" in q:
+            return [{"rol_id": ROL_A}]
+        return []
+
+    with patch(
+        "app.modules.modulos.application.services.modulo_menu_service.execute_query",
+        new=AsyncMock(side_effect=fake_execute_query),
+    ):
+        for _ in range(2):
+            await ModuloMenuService.obtener_menu_usuario(usuario_id=uuid4(), cliente_id=CLIENT_ID)
+
+    role_lookups = [q for q in executed if "SELECT ur.rol_id" in q]
+    assert len(role_lookups) == 2
+    # Solo el primer usuario ejecuta la query de menús centrales
+    assert len(executed) - len(role_lookups) == 1
@@ -0,0 +1,82 @@
+"""
+Tests del registro diferido de routers ERP (ENABLED_MODULES).
+"""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from app.api.v1 import module_routers
+from app.api.v1.module_routers import (
+    MODULE_ROUTERS,
+    get_module_router_profile,
+    include_module_routers,
+    register_catalog_module_routers,
+    resolve_enabled_modules,
+)
+from app.core.config import settings
+
+
+class TestResolveEnabledModules:
+
+    @pytest.mark.parametrize("raw", ["all", "ALL", "", "  "])
+    def test_todos(self, raw):
+        assert resolve_enabled_modules(raw) is None
+
+    def test_lista_explicita(self):
+        assert resolve_enabled_modules(" inv, pur ,INV_BILL") == frozenset({"INV", "PUR", "INV_BILL"})
+
+    def test_codigo_desconocido_se_ignora_con_warning(self, caplog):
+        assert resolve_enabled_modules("INV,XYZ") == frozenset({"INV", "XYZ"})
+        assert "XYZ" in caplog.text
+
+
+def _prefixes(router):
+    return {route.path.split("/")[1] for route in router.routes}
+
+
+def test_solo_registra_los_modulos_habilitados():
+    router = APIRouter()
+    registered = include_module_routers(router, frozenset({"INV", "PUR"}))
+    assert registered == ["INV", "PUR"]
+    assert _prefixes(router) == {"inv", "pur"}
+
+    # Una segunda llamada no duplica rutas
+    routes = len(router.routes)
+    assert include_module_routers(router, frozenset({"INV"})) == []
+    assert len(router.routes) == routes
+
+
+def test_perfil_de_import():
+    include_module_routers(APIRouter(), frozenset({"ORG"}))
+    profile = get_module_router_profile()
+    org = next(entry for entry in profile["registered"] if entry["codigo"] == "ORG")
+    assert org["routes"] > 0
+    assert org["import_ms"] >= 0
+
+
+def test_catalogo_declara_todos_los_paquetes():
+    assert len({m.codigo for m in MODULE_ROUTERS}) == len(MODULE_ROUTERS)
+    assert len({m.prefix for m in MODULE_ROUTERS}) == len(MODULE_ROUTERS)
+
+
+@pytest.mark.asyncio
+async def test_modo_catalogo_registra_modulos_contratados(monkeypatch):
+    async def fake_catalog():
+        return frozenset({"SLS"})
+
+    monkeypatch.setattr(module_routers, "load_catalog_modules", fake_catalog)
+    app = FastAPI()
+    assert await register_catalog_module_routers(app) == ["SLS"]
+    paths = [route.path for route in app.routes if route.path.startswith(settings.API_V1_STR)]
+    assert paths and all(path.startswith(f"{settings.API_V1_STR}/sls") for path in paths)
+
+
+@pytest.mark.asyncio
+async def test_modo_catalogo_sin_bd_registra_todos(monkeypatch):
+    async def failing_catalog():
+        raise RuntimeError("sin conexión")
+
+    monkeypatch.setattr(module_routers, "load_catalog_modules", failing_catalog)
+    app = FastAPI()
+    registered = await register_catalog_module_routers(app)
+    assert registered == [m.codigo for m in MODULE_ROUTERS]
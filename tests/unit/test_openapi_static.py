@@ -0,0 +1,145 @@
+"""
+Tests del OpenAPI precalculado: build (completo, por módulo, comprimido) y
+servicio estático con Accept-Encoding, ETag/304 y fallback cuando el build
+está desactualizado.
+"""
+import gzip
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.openapi_static import (
+    build_openapi_documents,
+    install_static_openapi,
+    split_openapi_by_module,
+)
+
+
+class Item(BaseModel):
+    nombre: str
+
+
+class Pedido(BaseModel):
+    items: list[Item]
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI(title="test", version="1.0.0")
+
+    @app.post("/api/v1/inv/items", response_model=Item)
+    async def crear_item(item: Item):
+        return item
+
+    @app.post("/api/v1/sls/pedidos", response_model=Pedido)
+    async def crear_pedido(pedido: Pedido):
+        return pedido
+
+    return app
+
+
+def test_split_by_module_keeps_only_referenced_schemas():
+    documents = split_openapi_by_module(_make_app().openapi())
+
+    assert set(documents) == {"inv", "sls"}
+    assert list(documents["inv"]["paths"]) == ["/api/v1/inv/items"]
+    assert "Pedido" not in documents["inv"]["components"]["schemas"]
+    # Cierre transitivo: Pedido referencia Item
+    assert {"Pedido", "Item"} <= set(documents["sls"]["components"]["schemas"])
+
+
+def test_build_writes_compressed_documents_and_manifest(tmp_path):
+    manifest = build_openapi_documents(_make_app(), tmp_path)
+
+    full = manifest["documents"][""]
+    body = (tmp_path / "openapi.json").read_bytes()
+    assert gzip.decompress((tmp_path / "openapi.json.gz").read_bytes()) == body
+    assert json.loads(body)["info"]["title"] == "test"
+    assert "gzip" in full["encodings"]
+    assert json.loads((tmp_path / "manifest.json").read_text())["documents"]["inv"]["file"] == "openapi.inv.json"
+
+
+def test_serves_precompressed_document_with_etag(tmp_path):
+    build_openapi_documents(_make_app(), tmp_path)
+    app = _make_app()
+    assert install_static_openapi(app, tmp_path) is True
+    client = TestClient(app)
+
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json()["paths"].keys() == app.openapi()["paths"].keys()
+
+    identity = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    # El ETag de cualquier variante valida el documento
+    for etag in (response.headers["etag"], identity.headers["etag"]):
+        revalidated = client.get("/openapi.json", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+
+
+def test_serves_module_documents(tmp_path):
+    build_openapi_documents(_make_app(), tmp_path)
+    app = _make_app()
+    install_static_openapi(app, tmp_path)
+    client = TestClient(app)
+
+    assert list(client.get("/openapi/inv.json").json()["paths"]) == ["/api/v1/inv/items"]
+    missing = client.get("/openapi/xyz.json")
+    assert missing.status_code == 404
+    assert missing.json()["error_code"] == "OPENAPI_NOT_FOUND"
+
+
+def test_stale_build_falls_back_to_runtime_generation(tmp_path):
+    build_openapi_documents(_make_app(), tmp_path)
+    app = _make_app()
+
+    @app.get("/api/v1/inv/nuevo")
+    async def nuevo():
+        return {}
+
+    install_static_openapi(app, tmp_path)
+    response = TestClient(app).get("/openapi.json")
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert "/api/v1/inv/nuevo" in response.json()["paths"]
+
+
+def test_without_build_keeps_dynamic_route(tmp_path):
+    app = _make_app()
+
+    assert install_static_openapi(app, tmp_path) is False
+    assert TestClient(app).get("/openapi.json").status_code == 200
+
+
+def test_fingerprint_tracks_schema_and_description_changes():
+    from pydantic import Field, create_model
+
+    from app.core.openapi_static import compute_openapi_fingerprint
+
+    class ItemDescrito(BaseModel):
+        nombre: str = Field(description="Nombre del ítem")
+
+    def _app(model, summary="Crear ítem"):
+        app = FastAPI(title="test", version="1.0.0")
+
+        @app.post("/api/v1/inv/items", response_model=model, summary=summary)
+        async def crear_item(item: model):
+            return item
+
+        return app
+
+    base = compute_openapi_fingerprint(_app(Item))
+    assert compute_openapi_fingerprint(_app(Item)) == base
+    assert compute_openapi_fingerprint(_app(ItemDescrito)) != base
+    assert compute_openapi_fingerprint(_app(Item, summary="Alta de ítem")) != base
+    # Campo nuevo en un modelo anidado (Pedido → Item), mismos nombres de modelo
+    item_v2 = create_model("Item", nombre=(str, ...), sku=(str, ...))
+    pedido_v1 = create_model("Pedido", items=(list[Item], ...))
+    pedido_v2 = create_model("Pedido", items=(list[item_v2], ...))
+    assert compute_openapi_fingerprint(_app(pedido_v1)) != compute_openapi_fingerprint(_app(pedido_v2))
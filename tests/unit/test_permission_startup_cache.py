@@ -0,0 +1,143 @@
+"""
+Tests del cache de startup RBAC por huella de rutas.
+"""
+
+import json
+
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.core.authorization import permission_registry, permission_startup, permission_sync_service
+from app.core.authorization.permission_startup import run_rbac_startup
+from app.core.authorization.permission_startup_cache import compute_routes_fingerprint
+from app.core.authorization.rbac import require_permission
+from app.core.config import settings
+
+
+def _build_app(extra_route: bool = False) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/inv/productos/", dependencies=[Depends(require_permission("inv.producto.leer"))])
+    async def listar():
+        return []
+
+    # Sin permiso declarado: permiso inferido (org.area.crear)
+    @app.post("/api/v1/org/areas")
+    async def crear_area():
+        return {}
+
+    if extra_route:
+        @app.delete("/api/v1/org/areas/{area_id}")
+        async def eliminar_area(area_id: str):
+            return {}
+
+    return app
+
+
+def _enforced(app: FastAPI):
+    out = {}
+    for route in app.routes:
+        codigos = [getattr(d.dependency, "__permission_codigo__", None) for d in getattr(route, "dependencies", [])]
+        codigos = [c for c in codigos if c]
+        if codigos:
+            out[(route.path, tuple(sorted(route.methods)))] = codigos
+    return out
+
+
+@pytest.fixture
+def startup_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RBAC_STARTUP_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "RBAC_STARTUP_CACHE_PATH", str(tmp_path / "rbac.json"))
+    calls = {"sync": 0}
+
+    async def fake_sync():
+        calls["sync"] += 1
+        return True
+
+    async def fake_execute_query(*args, **kwargs):
+        return [{"total": 0}]
+
+    monkeypatch.setattr(permission_startup, "sync_permissions", fake_sync)
+    monkeypatch.setattr(permission_startup, "execute_query", fake_execute_query)
+    permission_registry.clear()
+    yield calls, tmp_path / "rbac.json"
+    permission_registry.clear()
+
+
+@pytest.mark.asyncio
+async def test_segundo_arranque_carga_desde_cache(startup_env):
+    calls, cache_file = startup_env
+
+    first = _build_app()
+    await run_rbac_startup(first)
+    assert calls["sync"] == 1
+    assert cache_file.exists()
+    registry_first = {p["codigo"] for p in permission_registry.get_all()}
+    assert {"inv.producto.leer", "org.area.crear"} <= registry_first
+
+    permission_registry.clear()
+    second = _build_app()
+    await run_rbac_startup(second)
+
+    assert calls["sync"] == 1  # Sin sync con BD
+    assert {p["codigo"] for p in permission_registry.get_all()} == registry_first
+    assert _enforced(second) == _enforced(first)
+
+
+@pytest.mark.asyncio
+async def test_cambio_de_rutas_invalida_el_cache(startup_env):
+    calls, _ = startup_env
+    await run_rbac_startup(_build_app())
+    await run_rbac_startup(_build_app(extra_route=True))
+    assert calls["sync"] == 2
+    assert permission_registry.get_by_codigo("org.area.eliminar") is not None
+
+
+@pytest.mark.asyncio
+async def test_sync_fallido_no_escribe_cache(startup_env, monkeypatch):
+    calls, cache_file = startup_env
+
+    async def failing_sync():
+        return False
+
+    monkeypatch.setattr(permission_startup, "sync_permissions", failing_sync)
+    await run_rbac_startup(_build_app())
+    assert not cache_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_sync_deshabilitado_no_escribe_cache(startup_env, monkeypatch):
+    calls, cache_file = startup_env
+    fake_sync = permission_startup.sync_permissions
+    monkeypatch.setattr(permission_startup, "sync_permissions", permission_sync_service.sync)
+    monkeypatch.setattr(settings, "RBAC_PERMISSION_SYNC_ENABLED", False)
+    await run_rbac_startup(_build_app())
+    assert not cache_file.exists()
+
+    # Al reactivar el sync, el arranque siguiente sincroniza con la BD
+    monkeypatch.setattr(permission_startup, "sync_permissions", fake_sync)
+    monkeypatch.setattr(settings, "RBAC_PERMISSION_SYNC_ENABLED", True)
+    permission_registry.clear()
+    await run_rbac_startup(_build_app())
+    assert calls["sync"] == 1
+    assert cache_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_cache_corrupto_se_reconstruye(startup_env):
+    calls, cache_file = startup_env
+    cache_file.write_text("{no es json")
+    await run_rbac_startup(_build_app())
+    assert calls["sync"] == 1
+    assert json.loads(cache_file.read_text())["fingerprint"] == compute_routes_fingerprint(_build_app())
+
+
+def test_huella_estable_e_independiente_del_orden():
+    assert compute_routes_fingerprint(_build_app()) == compute_routes_fingerprint(_build_app())
+    assert compute_routes_fingerprint(_build_app()) != compute_routes_fingerprint(_build_app(extra_route=True))
+
+
+def test_huella_distingue_la_base_de_datos(monkeypatch):
+    huella = compute_routes_fingerprint(_build_app())
+    monkeypatch.setattr(settings, "DB_ADMIN_DATABASE", "otra_bd_admin")
+    assert compute_routes_fingerprint(_build_app()) != huella
@@ -0,0 +1,96 @@
+"""
+Tests de la telemetría de pools de conexión (app.core.metrics.pool_metrics).
+"""
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.metrics import pool_metrics
+
+
+@pytest.fixture
+def engine(tmp_path):
+    eng = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    yield eng
+    pool_metrics.forget_engine("test:pool")
+    eng.dispose()
+
+
+def test_checkout_registra_espera_y_ocupacion(engine):
+    metrics = pool_metrics.instrument_engine("test:pool", engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert metrics.occupancy()["checked_out"] == 1
+    with engine.connect():
+        pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checked_out"] == 0
+    assert snapshot["idle"] == 1
+    assert sum(snapshot["wait_histogram"].values()) == 2
+    report = pool_metrics.get_pool_metrics_report()
+    assert any(e["engine"] == "test:pool" for e in report["engines"])
+
+
+def test_timeout_del_pool(engine):
+    metrics = pool_metrics.instrument_engine("test:pool", engine)
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    assert metrics.timeouts == 1
+    assert metrics.snapshot()["wait_p99_ms"] >= 90
+    # La espera reciente (señal de load shedding) refleja el timeout
+    assert pool_metrics.get_max_recent_pool_wait_ms() >= 90 * 0.2 * 0.9
+
+
+def test_alerta_por_p95(engine, monkeypatch):
+    monkeypatch.setattr(settings, "POOL_WAIT_P95_ALERT_MS", -1.0)
+    monkeypatch.setattr(settings, "POOL_ALERT_INTERVAL_SECONDS", 0.0)
+    metrics = pool_metrics.instrument_engine("test:pool", engine)
+    with engine.connect():
+        pass
+    assert len(metrics.alerts) == 1
+    assert metrics.alerts[0]["threshold_ms"] == -1.0
+
+
+def test_fallo_de_pre_ping(engine):
+    metrics = pool_metrics.instrument_engine("test:pool", engine)
+    with engine.connect() as conn:
+        conn.connection._connection_record.invalidate(exc.InvalidatePoolError("pre-ping"))
+    with engine.connect() as conn:
+        conn.invalidate()
+    assert metrics.pre_ping_failures == 1
+    assert metrics.invalidations == 2
+
+
+def test_dispose_conserva_la_instrumentacion(engine):
+    metrics = pool_metrics.instrument_engine("test:pool", engine)
+    old_pool = engine.pool
+    engine.dispose()
+    assert engine.pool is not old_pool
+
+    with engine.connect() as conn:
+        assert metrics.occupancy()["checked_out"] == 1
+        conn.invalidate()
+    assert metrics.checkouts == 1
+    assert metrics.invalidations == 1
+
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert metrics.checkouts == 2  # sin doble envoltura tras varios dispose
+
+
+def test_desactivado(engine, monkeypatch):
+    monkeypatch.setattr(settings, "POOL_METRICS_ENABLED", False)
+    assert pool_metrics.instrument_engine("test:pool", engine) is None
+    assert pool_metrics.get_pool_metrics("test:pool") is None
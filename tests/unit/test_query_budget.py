@@ -0,0 +1,142 @@
+"""
+Tests del detector N+1 / presupuesto de queries por request.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.metrics import query_budget as qb
+from app.core.metrics.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    assert_query_budget,
+    fingerprint_sql,
+    get_query_budget_violations,
+    reset_query_budget_violations,
+    track_queries,
+)
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, nombre TEXT)"))
+        for i in range(5):
+            conn.execute(text("INSERT INTO item (id, nombre) VALUES (:i, :n)"), {"i": i, "n": f"x{i}"})
+    yield engine
+    engine.dispose()
+
+
+def _n_plus_one(engine, n: int) -> None:
+    with engine.connect() as conn:
+        ids = [r[0] for r in conn.execute(text("SELECT id FROM item")).fetchall()][:n]
+        for item_id in ids:
+            conn.execute(text("SELECT nombre FROM item WHERE id = :id"), {"id": item_id})
+
+
+def test_fingerprint_ignores_literals_and_params():
+    a = fingerprint_sql("SELECT * FROM usuario WHERE usuario_id = 15 AND nombre = 'ana'")
+    b = fingerprint_sql("select *  from usuario\nwhere usuario_id = 99 and nombre = 'luis'")
+    c = fingerprint_sql("SELECT * FROM usuario WHERE usuario_id = :p1 AND nombre = @nombre")
+    assert a == b == c
+
+
+def test_fingerprint_collapses_in_lists():
+    assert fingerprint_sql("SELECT 1 FROM rol WHERE rol_id IN (?, ?, ?)") == fingerprint_sql(
+        "SELECT 1 FROM rol WHERE rol_id IN (?)"
+    )
+
+
+def test_track_queries_counts_statements_and_duplicates(sqlite_engine):
+    with track_queries() as stats:
+        _n_plus_one(sqlite_engine, 4)
+
+    assert stats.statement_count == 5
+    assert stats.duplicate_count == 3
+    assert stats.max_repetitions == 4
+    assert stats.total_db_time >= 0
+
+
+def test_no_tracking_outside_context(sqlite_engine):
+    with track_queries() as stats:
+        pass
+    _n_plus_one(sqlite_engine, 2)
+    assert stats.statement_count == 0
+    assert qb.get_current_query_stats() is None
+
+
+def test_assert_query_budget_reports_repeated_fingerprint(sqlite_engine):
+    with track_queries() as stats:
+        _n_plus_one(sqlite_engine, 3)
+
+    with pytest.raises(QueryBudgetExceeded) as exc_info:
+        assert_query_budget(stats, max_statements=2)
+    assert "3x" in str(exc_info.value)
+
+    with pytest.raises(QueryBudgetExceeded):
+        assert_query_budget(stats, max_statements=10, max_duplicates=0)
+
+    assert_query_budget(stats, max_statements=4, max_duplicates=2)
+
+
+def test_query_budget_fixture_fails_when_exceeded(sqlite_engine, query_budget):
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(max_statements=1):
+            _n_plus_one(sqlite_engine, 2)
+
+    with query_budget(max_statements=3) as stats:
+        _n_plus_one(sqlite_engine, 2)
+    assert stats.statement_count == 3
+
+
+def test_middleware_server_timing_and_violation_log(sqlite_engine, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MAX_STATEMENTS", 3)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_DUPLICATE_THRESHOLD", 100)
+    reset_query_budget_violations()
+
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/items/{n}")
+    def listar(n: int):
+        _n_plus_one(sqlite_engine, n)
+        return {"ok": True}
+
+    client = TestClient(app)
+
+    response = client.get("/items/1")
+    assert response.status_code == 200
+    assert 'queries=2' in response.headers["Server-Timing"]
+    assert get_query_budget_violations() == []
+
+    response = client.get("/items/5")
+    assert 'queries=6 duplicadas=4' in response.headers["Server-Timing"]
+    violations = get_query_budget_violations()
+    assert violations[0]["endpoint"] == "GET /items/{n}"
+    assert violations[0]["max_statements"] == 6
+    reset_query_budget_violations()
+
+
+def test_middleware_omits_server_timing_in_production(sqlite_engine, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    response = TestClient(app).get("/ping")
+    assert "Server-Timing" not in response.headers
@@ -0,0 +1,119 @@
+"""
+Tests del routing de lecturas a réplicas (DatabaseConnection.READ).
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tenant.context import TenantContext, reset_tenant_context, set_tenant_context
+from app.infrastructure.database import connection_async, read_routing
+from app.infrastructure.database.connection_async import DatabaseConnection, get_db_connection
+
+REPLICA = {"servidor": "replica1", "puerto": 1433, "nombre_bd": "bd_cliente", "usuario": "u", "password": "p"}
+
+
+@pytest.fixture
+def tenant_ctx():
+    ctx = TenantContext(client_id=uuid4())
+    tokens = set_tenant_context(ctx)
+    read_routing.reset_replica_state()
+    yield ctx
+    reset_tenant_context(tokens)
+    read_routing.reset_replica_state()
+
+
+class TestSeleccionDeReplica:
+
+    def test_sin_contexto_va_a_primaria(self):
+        assert read_routing.select_read_replica(uuid4(), {"read_replicas": [REPLICA]}) is None
+
+    def test_replica_del_tenant(self, tenant_ctx):
+        key, replica = read_routing.select_read_replica(tenant_ctx.client_id, {"read_replicas": [REPLICA]})
+        assert replica is REPLICA
+        assert key == f"read_tenant_{tenant_ctx.client_id}_replica1:1433"
+
+    def test_read_your_writes(self, tenant_ctx):
+        read_routing.mark_primary_write()
+        assert tenant_ctx.wrote_primary
+        assert read_routing.select_read_replica(tenant_ctx.client_id, {"read_replicas": [REPLICA]}) is None
+
+    def test_replica_caida_pasa_a_la_siguiente(self, tenant_ctx):
+        otra = dict(REPLICA, servidor="replica2")
+        metadata = {"read_replicas": [REPLICA, otra]}
+        first_key, _ = read_routing.select_read_replica(tenant_ctx.client_id, metadata)
+        read_routing.mark_replica_unavailable(first_key, "test")
+        _, replica = read_routing.select_read_replica(tenant_ctx.client_id, metadata)
+        assert replica is otra
+
+    def test_replica_compartida_desde_settings(self, tenant_ctx, monkeypatch):
+        monkeypatch.setattr(settings, "DB_READ_REPLICA_SERVER", "shared-replica")
+        key, replica = read_routing.select_read_replica(tenant_ctx.client_id, {"database_type": "single"})
+        assert key == "read_shared_shared-replica:1433"
+        assert replica["nombre_bd"] == settings.DB_DATABASE
+        # Tenant dedicado sin réplica propia: no usa la réplica compartida
+        assert read_routing.select_read_replica(tenant_ctx.client_id, {"database_type": "multi"}) is None
+
+    def test_desactivado(self, tenant_ctx, monkeypatch):
+        monkeypatch.setattr(settings, "ENABLE_READ_REPLICAS", False)
+        assert read_routing.select_read_replica(tenant_ctx.client_id, {"read_replicas": [REPLICA]}) is None
+
+
+class TestMarcaDeEscritura:
+
+    def test_commit_en_primaria_marca_el_request(self, tenant_ctx):
+        with Session(create_engine("sqlite://")) as session:
+            session.execute(text("SELECT 1"))
+            session.commit()
+        assert tenant_ctx.wrote_primary
+
+    def test_commit_en_replica_no_marca(self, tenant_ctx):
+        with Session(create_engine("sqlite://")) as session:
+            session.info[read_routing.READ_REPLICA_SESSION_KEY] = True
+            session.execute(text("SELECT 1"))
+            session.commit()
+        assert not tenant_ctx.wrote_primary
+
+
+class TestGetDbConnectionRead:
+
+    @pytest.fixture
+    def engines(self, monkeypatch):
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        primary = create_async_engine("sqlite+aiosqlite://")
+        replica = create_async_engine("sqlite+aiosqlite://")
+        broken = create_async_engine("sqlite+aiosqlite:////nonexistent-dir/replica.db")
+        monkeypatch.setattr(connection_async, "_get_async_engine", lambda *args, **kwargs: primary)
+        return {"primary": primary, "replica": replica, "broken": broken}
+
+    @pytest.mark.asyncio
+    async def test_lectura_va_a_la_replica(self, tenant_ctx, engines, monkeypatch):
+        monkeypatch.setattr(connection_async, "_get_read_engine", lambda key, replica: engines["replica"])
+        metadata = {"read_replicas": [REPLICA]}
+        async with get_db_connection(DatabaseConnection.READ, tenant_ctx.client_id, metadata) as session:
+            assert session.bind is engines["replica"]
+            assert session.info[read_routing.READ_REPLICA_SESSION_KEY]
+
+    @pytest.mark.asyncio
+    async def test_replica_inaccesible_cae_a_primaria(self, tenant_ctx, engines, monkeypatch):
+        monkeypatch.setattr(connection_async, "_get_read_engine", lambda key, replica: engines["broken"])
+        metadata = {"read_replicas": [REPLICA]}
+        async with get_db_connection(DatabaseConnection.READ, tenant_ctx.client_id, metadata) as session:
+            assert session.bind is engines["primary"]
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+        # Fuera de rotación: la siguiente lectura ni lo intenta
+        assert read_routing.select_read_replica(tenant_ctx.client_id, metadata) is None
+
+    @pytest.mark.asyncio
+    async def test_despues_de_escribir_lee_de_la_primaria(self, tenant_ctx, engines, monkeypatch):
+        monkeypatch.setattr(connection_async, "_get_read_engine", lambda key, replica: engines["replica"])
+        async with get_db_connection(DatabaseConnection.DEFAULT, tenant_ctx.client_id, {"database_type": "single"}) as session:
+            await session.execute(text("SELECT 1"))
+            await session.commit()
+        async with get_db_connection(DatabaseConnection.READ, tenant_ctx.client_id, {"read_replicas": [REPLICA]}) as session:
+            assert session.bind is engines["primary"]
@@ -0,0 +1,112 @@
+"""
+Tests de la limpieza de tokens en todos los tenants: DELETE en lotes, concurrencia
+acotada y reanudación desde el checkpoint.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.modules.auth.application.services import refresh_token_cleanup_job as job_module
+from app.modules.auth.application.services.refresh_token_cleanup_job import (
+    RefreshTokenCleanupJob,
+    _delete_in_batches,
+    get_cleanup_progress,
+)
+
+TENANTS = [{"cliente_id": uuid4(), "codigo_cliente": f"T{i}"} for i in range(6)]
+
+
+@pytest.fixture(autouse=True)
+def _checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "token_cleanup_checkpoint.json"
+    monkeypatch.setattr(settings, "TOKEN_CLEANUP_CHECKPOINT_PATH", str(path))
+    return path
+
+
+def _fake_admin_connection():
+    result = MagicMock()
+    result.fetchall.return_value = [SimpleNamespace(_mapping=tenant) for tenant in TENANTS]
+
+    @asynccontextmanager
+    async def _connection(**_kwargs):
+        yield SimpleNamespace(execute=AsyncMock(return_value=result))
+
+    return _connection
+
+
+def _tenant_stats(tenant, *, deleted=1, error=None):
+    return {
+        "cliente_id": str(tenant["cliente_id"]),
+        "codigo_cliente": tenant["codigo_cliente"],
+        "tokens_deleted": 0 if error else deleted,
+        "success": error is None,
+        "error": error,
+    }
+
+
+@pytest.mark.asyncio
+async def test_delete_in_batches_repeats_until_short_batch():
+    purge = AsyncMock(side_effect=[1000, 1000, 3])
+    cliente_id = uuid4()
+
+    deleted = await _delete_in_batches(purge, cliente_id, 1000, 0)
+
+    assert deleted == 2003
+    assert purge.await_count == 3
+    purge.assert_awaited_with(cliente_id, limit=1000)
+
+
+@pytest.mark.asyncio
+async def test_tenants_run_with_bounded_concurrency():
+    running, peak = 0, 0
+
+    async def _cleanup(tenant):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return _tenant_stats(tenant, deleted=5)
+
+    with (
+        patch.object(job_module, "get_db_connection", _fake_admin_connection()),
+        patch.object(RefreshTokenCleanupJob, "_cleanup_tenant", side_effect=_cleanup),
+    ):
+        stats = await RefreshTokenCleanupJob.cleanup_all_tenants(concurrency=2)
+
+    assert peak == 2
+    assert stats["tenants_processed"] == 6
+    assert stats["tokens_deleted"] == 30
+    progress = get_cleanup_progress()
+    assert progress["running"] is False
+    assert progress["tenants_done"] == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_run_resumes_only_pending_tenants(_checkpoint):
+    failing = TENANTS[3]
+
+    async def _first_run(tenant):
+        if tenant["cliente_id"] == failing["cliente_id"]:
+            return _tenant_stats(tenant, error="timeout")
+        return _tenant_stats(tenant)
+
+    cleanup = AsyncMock(side_effect=lambda tenant: _tenant_stats(tenant))
+    with patch.object(job_module, "get_db_connection", _fake_admin_connection()):
+        with patch.object(RefreshTokenCleanupJob, "_cleanup_tenant", side_effect=_first_run):
+            first = await RefreshTokenCleanupJob.cleanup_all_tenants()
+        assert len(first["errors"]) == 1
+        assert _checkpoint.exists()
+
+        with patch.object(RefreshTokenCleanupJob, "_cleanup_tenant", new=cleanup):
+            second = await RefreshTokenCleanupJob.cleanup_all_tenants()
+
+    assert second["resumed"] is True
+    assert second["tenants_skipped"] == 5
+    cleanup.assert_awaited_once_with(failing)
+    assert not _checkpoint.exists()
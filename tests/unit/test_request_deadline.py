@@ -0,0 +1,254 @@
+"""
+Tests del deadline por request y su propagación a las sentencias SQL.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.exceptions import RequestTimeoutError
+from app.core.metrics.request_deadline import (
+    RequestDeadlineMiddleware,
+    get_deadline_report,
+    parse_timeout_header,
+    record_deadline_timeout,
+    remaining_seconds,
+    request_deadline,
+    reset_deadline_metrics,
+)
+from app.infrastructure.database import statement_timeout
+from app.infrastructure.database.statement_timeout import execute_with_deadline
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    reset_deadline_metrics()
+    yield
+    reset_deadline_metrics()
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'deadline.db'}", pool_size=2, max_overflow=0)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register_sleep(dbapi_connection, _record):
+        # La función corre en el hilo del driver: simula una sentencia lenta
+        dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or ms)
+
+    return engine
+
+
+class TestParseHeader:
+
+    @pytest.mark.parametrize("value,expected", [
+        ("5", 5.0),
+        ("0.5", 0.5),
+        ("0", None),
+        ("-3", None),
+        ("abc", None),
+        ("nan", None),
+        (None, None),
+    ])
+    def test_valores(self, value, expected):
+        assert parse_timeout_header(value) == expected
+
+    def test_se_acota_al_maximo(self, monkeypatch):
+        monkeypatch.setattr(settings, "REQUEST_MAX_TIMEOUT_SECONDS", 30.0)
+        assert parse_timeout_header("600") == 30.0
+
+
+class TestRequestDeadlineContext:
+
+    def test_sin_deadline(self):
+        assert remaining_seconds() is None
+
+    def test_anidado_no_alarga_el_deadline(self):
+        with request_deadline(1.0) as outer:
+            with request_deadline(60.0) as inner:
+                assert inner is outer
+                assert remaining_seconds() <= 1.0
+        assert remaining_seconds() is None
+
+
+def _build_app(seen):
+    app = FastAPI()
+    app.add_middleware(RequestDeadlineMiddleware)
+
+    @app.get("/api/v1/inv/productos/")
+    async def listar():
+        seen.append(remaining_seconds())
+        return {"ok": True}
+
+    @app.post("/api/v1/auth/login/")
+    async def login():
+        seen.append(remaining_seconds())
+        return {"ok": True}
+
+    @app.get("/api/v1/inv/productos/{producto_id}")
+    async def detalle(producto_id: str):
+        record_deadline_timeout("driver")
+        return {"ok": True}
+
+    return app
+
+
+class TestMiddleware:
+
+    def test_header_del_cliente(self):
+        seen = []
+        client = TestClient(_build_app(seen))
+        client.get("/api/v1/inv/productos/", headers={settings.REQUEST_TIMEOUT_HEADER: "3"})
+        assert 2.0 < seen[0] <= 3.0
+
+    def test_default_por_prioridad(self, monkeypatch):
+        monkeypatch.setattr(settings, "REQUEST_TIMEOUT_BY_PRIORITY", "critica:7,baja:40")
+        seen = []
+        client = TestClient(_build_app(seen))
+        client.get("/api/v1/inv/productos/")
+        client.post("/api/v1/auth/login/")
+        assert 39.0 < seen[0] <= 40.0
+        assert 6.0 < seen[1] <= 7.0
+
+    def test_prioridad_sin_default_no_fija_deadline(self, monkeypatch):
+        monkeypatch.setattr(settings, "REQUEST_TIMEOUT_BY_PRIORITY", "critica:7")
+        seen = []
+        TestClient(_build_app(seen)).get("/api/v1/inv/productos/")
+        assert seen == [None]
+
+    def test_cortes_se_etiquetan_con_la_plantilla_de_ruta(self):
+        client = TestClient(_build_app([]))
+        for producto_id in ("a1", "b2", "c3"):
+            client.get(f"/api/v1/inv/productos/{producto_id}", headers={settings.REQUEST_TIMEOUT_HEADER: "5"})
+
+        routes = get_deadline_report()["routes"]
+        assert [(r["route"], r["count"]) for r in routes] == [("GET /api/v1/inv/productos/{producto_id}", 3)]
+
+
+class TestExecuteWithDeadline:
+
+    @pytest.mark.asyncio
+    async def test_sin_deadline_ejecuta_normal(self, sqlite_engine):
+        async with AsyncSession(sqlite_engine) as session:
+            result = await execute_with_deadline(session, text("SELECT 1"))
+            assert result.scalar() == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_vencido_no_ejecuta(self, sqlite_engine):
+        async with AsyncSession(sqlite_engine) as session:
+            with request_deadline(0.01, label="GET /lento"):
+                await asyncio.sleep(0.02)
+                with pytest.raises(RequestTimeoutError) as exc:
+                    await execute_with_deadline(session, text("SELECT 1"))
+        assert exc.value.status_code == 504
+        route = get_deadline_report()["routes"][0]
+        assert route["route"] == "GET /lento"
+        assert route["expired_before"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelacion_invalida_la_conexion(self, sqlite_engine, monkeypatch):
+        monkeypatch.setattr(settings, "REQUEST_DEADLINE_GRACE_SECONDS", 0.0)
+        invalidated = []
+        event.listen(sqlite_engine.sync_engine.pool, "invalidate", lambda *args: invalidated.append(args))
+        async with AsyncSession(sqlite_engine) as session:
+            with request_deadline(0.1, label="GET /lento"):
+                with pytest.raises(RequestTimeoutError):
+                    await execute_with_deadline(session, text("SELECT sleep_ms(500)"))
+        assert get_deadline_report()["routes"][0]["cancelled"] == 1
+        assert invalidated
+        assert sqlite_engine.pool.checkedout() == 0
+
+        # El pool sigue sirviendo conexiones limpias
+        async with AsyncSession(sqlite_engine) as session:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_del_driver_se_traduce_y_resetea(self, sqlite_engine, monkeypatch):
+        class FakeDriver:
+            timeout = 0
+
+        driver = FakeDriver()
+        applied = []
+        monkeypatch.setattr(statement_timeout, "_driver_connection", lambda raw: driver)
+
+        async def fake_execute(statement, params=None):
+            applied.append(driver.timeout)
+            raise DBAPIError("SELECT 1", None, Exception("HYT00", "Query timeout expired"))
+
+        async with AsyncSession(sqlite_engine) as session:
+            monkeypatch.setattr(session, "execute", fake_execute)
+            with request_deadline(4.5):
+                with pytest.raises(RequestTimeoutError):
+                    await execute_with_deadline(session, text("SELECT 1"))
+
+        assert applied == [5]
+        assert driver.timeout == 0
+        assert get_deadline_report()["routes"][0]["driver"] == 1
+
+    @pytest.mark.asyncio
+    async def test_otros_errores_del_driver_no_se_traducen(self, sqlite_engine):
+        async with AsyncSession(sqlite_engine) as session:
+            with request_deadline(5.0):
+                with pytest.raises(DBAPIError):
+                    await execute_with_deadline(session, text("SELECT * FROM tabla_inexistente"))
+        assert get_deadline_report()["total_timeouts"] == 0
+
+
+class TestDriverConnection:
+
+    def test_encuentra_conexion_pyodbc_bajo_adaptadores(self):
+        class Pyodbc:
+            timeout = 0
+
+        class Aioodbc:
+            def __init__(self):
+                self._conn = Pyodbc()
+
+        class Adapter:
+            def __init__(self):
+                self._connection = Aioodbc()
+
+        class Fairy:
+            def __init__(self):
+                self.dbapi_connection = Adapter()
+
+        found = statement_timeout._driver_connection(Fairy())
+        assert isinstance(found, Pyodbc)
+
+    @pytest.mark.asyncio
+    async def test_salta_el_timeout_de_solo_lectura_de_aioodbc(self):
+        aioodbc = pytest.importorskip("aioodbc")
+        from sqlalchemy.connectors.aioodbc import AsyncAdapt_aioodbc_connection
+
+        class PyodbcConnection:
+            timeout = 0
+
+        pyodbc_conn = PyodbcConnection()
+        aioodbc_conn = aioodbc.Connection(dsn="")
+        aioodbc_conn._conn = pyodbc_conn
+        adapter = AsyncAdapt_aioodbc_connection(None, aioodbc_conn)
+
+        class Fairy:
+            dbapi_connection = adapter
+
+        try:
+            found = statement_timeout._driver_connection(Fairy())
+            assert found is pyodbc_conn
+            found.timeout = 7
+            assert aioodbc_conn.timeout == 7
+        finally:
+            aioodbc_conn._conn = None
+
+    def test_driver_sin_timeout(self):
+        class Plain:
+            pass
+
+        assert statement_timeout._driver_connection(Plain()) is None
@@ -0,0 +1,149 @@
+"""
+Tests del filtro local de revocación: Bloom sin falsos negativos, negativos
+resueltos sin Redis una vez sincronizado y revocaciones recibidas por el canal.
+"""
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.infrastructure.redis.client import RedisService
+from app.infrastructure.redis.revocation_filter import (
+    BloomFilter,
+    get_revocation_filter,
+    get_revocation_filter_report,
+    is_token_revoked,
+    reset_revocation_filter,
+)
+
+REDIS_CHECK = "app.infrastructure.redis.client.RedisService.is_token_blacklisted"
+
+
+class _FakeRedis:
+    def __init__(self, jtis):
+        self.keys = [f"{RedisService.BLACKLIST_PREFIX}{jti}" for jti in jtis]
+
+    async def scan_iter(self, match=None, count=None):
+        for key in self.keys:
+            yield key
+
+
+class _FakeTransaction:
+    """MULTI/EXEC: los comandos se aplican juntos en execute() o ninguno."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.commands.append(("setex", key))
+
+    def publish(self, channel, message):
+        self.commands.append(("publish", message))
+
+    async def execute(self):
+        if self.redis.publish_failures > 0:
+            self.redis.publish_failures -= 1
+            raise ConnectionError("publish: conexión cerrada")
+        for command, arg in self.commands:
+            (self.redis.stored if command == "setex" else self.redis.published).append(arg)
+
+
+class _FakeRedisWriter:
+    def __init__(self, publish_failures):
+        self.publish_failures = publish_failures
+        self.stored = []
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        assert transaction
+        return _FakeTransaction(self)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_filter():
+    reset_revocation_filter()
+    yield
+    reset_revocation_filter()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [str(uuid4()) for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(str(uuid4()) in bloom for _ in range(2000))
+    assert false_positives < 100
+
+
+@pytest.mark.asyncio
+async def test_unsynced_filter_falls_back_to_redis():
+    with patch(REDIS_CHECK, new=AsyncMock(return_value=False)) as redis_check:
+        assert await is_token_revoked("jti-1") is False
+
+    redis_check.assert_awaited_once_with("jti-1")
+
+
+@pytest.mark.asyncio
+async def test_synced_filter_answers_negatives_locally():
+    revoked = str(uuid4())
+    await get_revocation_filter().rebuild(_FakeRedis([revoked]))
+
+    with patch(REDIS_CHECK, new=AsyncMock(return_value=True)) as redis_check:
+        for _ in range(20):
+            assert await is_token_revoked(str(uuid4())) is False
+        assert redis_check.await_count <= 1  # a lo sumo un falso positivo
+
+        assert await is_token_revoked(revoked) is True
+        # Confirmado por Redis: el siguiente check es local
+        calls = redis_check.await_count
+        assert await is_token_revoked(revoked) is True
+        assert redis_check.await_count == calls
+
+    report = get_revocation_filter_report()
+    assert report["ready"] is True
+    assert report["local_negative"] >= 19
+
+
+@pytest.mark.asyncio
+async def test_channel_and_local_revocations_are_positive_without_redis():
+    await get_revocation_filter().rebuild(_FakeRedis([]))
+    get_revocation_filter().on_message("jti-canal|600")
+    # Sin Redis (ENABLE_REDIS_CACHE=false) la revocación igual rige en este worker
+    await RedisService.set_token_blacklist("jti-local", 600)
+
+    with patch(REDIS_CHECK, new=AsyncMock(return_value=False)) as redis_check:
+        assert await is_token_revoked("jti-canal") is True
+        assert await is_token_revoked("jti-local") is True
+
+    redis_check.assert_not_awaited()
+    assert get_revocation_filter_report()["messages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_blacklist_write_retries_setex_and_publish_together():
+    redis = _FakeRedisWriter(publish_failures=1)
+    with patch("app.infrastructure.redis.client._get_redis_client", new=AsyncMock(return_value=redis)):
+        assert await RedisService.set_token_blacklist("jti-retry", 600) is True
+
+    assert redis.stored == [f"{RedisService.BLACKLIST_PREFIX}jti-retry"]
+    assert redis.published == ["jti-retry|600"]
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_does_not_leave_unannounced_key():
+    redis = _FakeRedisWriter(publish_failures=10)
+    with patch("app.infrastructure.redis.client._get_redis_client", new=AsyncMock(return_value=redis)):
+        assert await RedisService.set_token_blacklist("jti-caido", 600) is False
+
+    # Ni clave ni aviso: el filtro de los demás workers y Redis responden lo mismo
+    assert redis.stored == [] and redis.published == []
+    assert get_revocation_filter().check_local("jti-caido") is True
@@ -0,0 +1,110 @@
+"""
+Tests del cache de SQL textual (filtro de tenant en TextClause y '?' → :paramN).
+"""
+
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from app.infrastructure.database.query_helpers import apply_tenant_filter_to_text_clause
+from app.infrastructure.database.sql_text_cache import (
+    SqlTextCache,
+    bind_qmark_params,
+    get_parsed_sql,
+    get_sql_text_cache,
+    guess_table_name,
+    qmark_to_named,
+)
+
+
+def _replace_loop(sql, names):
+    # Implementación anterior (una pasada completa por parámetro)
+    for name in names:
+        sql = sql.replace("?", f":{name}", 1)
+    return sql
+
+
+class TestQmarkToNamed:
+
+    def test_equivale_al_replace_secuencial(self):
+        sql = "UPDATE rol SET nombre = ?, descripcion = ? WHERE rol_id = ? AND cliente_id = ?"
+        for names in [("a",), ("a", "b"), ("a", "b", "c", "d"), ("a", "b", "c", "d", "e")]:
+            assert qmark_to_named(sql, names) == _replace_loop(sql, names)
+
+    def test_sin_signos(self):
+        assert qmark_to_named("SELECT 1", ("a",)) == "SELECT 1"
+
+    def test_bind_tupla_y_dict(self):
+        sql = "SELECT * FROM usuario WHERE usuario_id = ? AND es_activo = ?"
+        by_pos = bind_qmark_params(sql, (5, 1))
+        by_name = bind_qmark_params(sql, {"uid": 5, "activo": 1})
+        assert by_pos.text.endswith("usuario_id = :param0 AND es_activo = :param1")
+        assert by_pos.compile().params == {"param0": 5, "param1": 1}
+        assert by_name.compile().params == {"uid": 5, "activo": 1}
+
+    def test_plantilla_no_retiene_valores_entre_llamadas(self):
+        sql = "SELECT * FROM rol WHERE rol_id = ?"
+        first = bind_qmark_params(sql, (1,))
+        second = bind_qmark_params(sql, (2,))
+        assert first.compile().params == {"param0": 1}
+        assert second.compile().params == {"param0": 2}
+        assert get_parsed_sql(sql).named_template(("param0",)).compile().params == {"param0": None}
+
+
+class TestSqlTextCache:
+
+    def test_lru_acotado_y_hits(self):
+        cache = SqlTextCache(max_size=1)
+        first = cache.get("SELECT * FROM rol")
+        assert cache.get("SELECT * FROM rol") is first
+        cache.get("SELECT * FROM usuario")
+        assert cache.stats() == {"size": 1, "max_size": 1, "hits": 1, "misses": 2}
+
+    def test_tamano_cero_desactiva(self):
+        cache = SqlTextCache(max_size=0)
+        assert cache.get("SELECT 1") is not cache.get("SELECT 1")
+
+    def test_tabla_heuristica(self):
+        assert guess_table_name("select * from usuario where x = 1") == "usuario"
+        assert get_parsed_sql("DELETE FROM rol WHERE rol_id = :id").table_name == "rol"
+
+
+class TestTenantFilterTextClause:
+
+    def setup_method(self):
+        get_sql_text_cache().clear()
+
+    def test_client_id_de_cada_llamada(self):
+        sql = "SELECT * FROM refresh_tokens WHERE token_hash = :token_hash"
+        tenant_a, tenant_b = uuid4(), uuid4()
+        query_a = apply_tenant_filter_to_text_clause(text(sql), client_id=tenant_a)
+        query_b = apply_tenant_filter_to_text_clause(text(sql), client_id=tenant_b)
+
+        assert query_a.text == query_b.text
+        assert query_a.text.endswith("token_hash = :token_hash AND cliente_id = :cliente_id")
+        assert query_a.compile().params["cliente_id"] == tenant_a
+        assert query_b.compile().params["cliente_id"] == tenant_b
+        assert get_sql_text_cache().stats()["hits"] >= 1
+
+    def test_conserva_parametros_ligados(self):
+        query = text("SELECT * FROM usuario WHERE nombre_usuario = :nombre").bindparams(nombre="ana")
+        client_id = uuid4()
+        filtered = apply_tenant_filter_to_text_clause(query, client_id=client_id)
+        assert filtered.compile().params == {"nombre": "ana", "cliente_id": client_id}
+
+    def test_filtro_literal_depende_del_client_id(self):
+        client_id = uuid4()
+        sql = f"SELECT * FROM usuario WHERE cliente_id = '{client_id}'"
+        query = text(sql)
+        assert apply_tenant_filter_to_text_clause(query, client_id=client_id) is query
+        # Mismo texto (cacheado), otro tenant: hay que agregar el filtro
+        other = apply_tenant_filter_to_text_clause(query, client_id=uuid4())
+        assert other is not query
+        assert "AND cliente_id = :cliente_id" in other.text
+
+    def test_tabla_global_e_insert_sin_cambios(self):
+        client_id = uuid4()
+        global_query = text("SELECT * FROM cliente WHERE codigo_cliente = :codigo")
+        insert_query = text("INSERT INTO rol (nombre) VALUES (:nombre)")
+        assert apply_tenant_filter_to_text_clause(global_query, client_id=client_id) is global_query
+        assert apply_tenant_filter_to_text_clause(insert_query, client_id=client_id) is insert_query
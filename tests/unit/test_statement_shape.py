@@ -0,0 +1,116 @@
+"""
+Tests del cache de forma de sentencias (filtro y auditoría de tenant).
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.exceptions import SecurityError
+from app.core.security.query_auditor import QueryAuditor
+from app.core.security.statement_shape import (
+    StatementShapeCache,
+    analyze_statement,
+    get_statement_shape_cache,
+)
+from app.infrastructure.database.query_helpers import apply_tenant_filter, get_table_name_from_query
+from app.infrastructure.database.tables import RolTable, UsuarioTable
+
+
+def _usuarios_activos(nombre: str):
+    return select(UsuarioTable.c.usuario_id).where(UsuarioTable.c.nombre_usuario == nombre)
+
+
+class TestStatementShapeCache:
+
+    def test_misma_forma_distintos_valores_reutiliza_analisis(self):
+        cache = StatementShapeCache(max_size=10)
+        first = cache.get(_usuarios_activos("ana"))
+        second = cache.get(_usuarios_activos("luis"))
+        assert second is first
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+        assert first.table is UsuarioTable
+        assert first.table_name == "usuario"
+        assert "nombre_usuario = :nombre_usuario_1" in first.where_sql
+
+    def test_formas_distintas_no_colisionan(self):
+        cache = StatementShapeCache(max_size=10)
+        con_tenant = cache.get(select(RolTable).where(RolTable.c.cliente_id == uuid4()))
+        sin_tenant = cache.get(select(RolTable).where(RolTable.c.nombre == "x"))
+        assert con_tenant is not sin_tenant
+        assert "cliente_id" in con_tenant.where_sql
+        assert "cliente_id" not in sin_tenant.where_sql
+
+    def test_lru_acotado(self):
+        cache = StatementShapeCache(max_size=1)
+        cache.get(select(RolTable))
+        cache.get(select(UsuarioTable))
+        assert cache.stats()["size"] == 1
+
+    def test_alias_no_se_cachea_como_table(self):
+        alias = UsuarioTable.alias("u")
+        shape = analyze_statement(select(alias.c.usuario_id))
+        assert shape.table is None
+        assert shape.from_name == "u"
+
+
+class TestTenantFilterConCache:
+
+    def setup_method(self):
+        get_statement_shape_cache().clear()
+
+    def test_filtro_usa_client_id_de_cada_llamada(self):
+        tenant_a, tenant_b = uuid4(), uuid4()
+        query_a = apply_tenant_filter(_usuarios_activos("ana"), client_id=tenant_a)
+        query_b = apply_tenant_filter(_usuarios_activos("ana"), client_id=tenant_b)
+
+        assert get_statement_shape_cache().stats()["hits"] >= 1
+        params_a = query_a.compile().params
+        params_b = query_b.compile().params
+        assert tenant_a in params_a.values() and tenant_b not in params_a.values()
+        assert tenant_b in params_b.values() and tenant_a not in params_b.values()
+        assert str(query_a) == str(query_b)
+
+    def test_resultado_igual_con_y_sin_cache(self, monkeypatch):
+        client_id = uuid4()
+        cached = apply_tenant_filter(_usuarios_activos("ana"), client_id=client_id)
+        cached = apply_tenant_filter(_usuarios_activos("ana"), client_id=client_id)
+
+        from app.core.security import statement_shape
+        monkeypatch.setattr(statement_shape, "_shape_cache", StatementShapeCache(max_size=0))
+        uncached = apply_tenant_filter(_usuarios_activos("ana"), client_id=client_id)
+
+        assert str(cached) == str(uncached)
+        assert "usuario.cliente_id = :cliente_id_1" in str(cached)
+
+    def test_tabla_de_update(self):
+        query = update(RolTable).where(RolTable.c.rol_id == uuid4()).values(nombre="x")
+        assert get_table_name_from_query(query) == "rol"
+
+
+class TestQueryAuditorConCache:
+
+    def setup_method(self):
+        get_statement_shape_cache().clear()
+
+    def test_produccion_bloquea_tambien_en_cache_hit(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        monkeypatch.setattr(settings, "ENABLE_QUERY_TENANT_VALIDATION", True)
+        for _ in range(2):
+            with pytest.raises(SecurityError):
+                QueryAuditor.validate_tenant_filter(
+                    select(UsuarioTable).where(UsuarioTable.c.nombre_usuario == "ana"),
+                    client_id=uuid4(),
+                )
+        assert get_statement_shape_cache().stats()["hits"] >= 1
+
+    def test_query_con_filtro_pasa(self):
+        client_id = uuid4()
+        for _ in range(2):
+            assert QueryAuditor.validate_tenant_filter(
+                select(RolTable).where(RolTable.c.cliente_id == client_id),
+                client_id=client_id,
+            )
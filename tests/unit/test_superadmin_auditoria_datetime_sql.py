@@ -5,6 +5,7 @@ from uuid import UUID
 
 import pytest
 
+from app.infrastructure.database.connection_async import DatabaseConnection
 from app.modules.superadmin.application.datetime_sql import (
     normalize_datetime_for_sql_server,
     sql_int_or_zero,
@@ -40,9 +41,11 @@ async def test_obtener_estadisticas_passes_naive_datetimes_to_execute_query():
     fecha_desde = datetime(2026, 6, 2, 0, 0, 0, tzinfo=timezone.utc)
     fecha_hasta = datetime(2026, 6, 3, 23, 59, 59, tzinfo=timezone.utc)
     captured_params: list[tuple] = []
+    captured_connection_types = []
 
-    async def fake_execute_query(query, params, client_id=None):
+    async def fake_execute_query(query, params, client_id=None, connection_type=None):
         captured_params.append(params)
+        captured_connection_types.append(connection_type)
         if "GROUP BY evento" in query:
             return []
         if "GROUP BY tipo_sincronizacion" in query:
@@ -64,6 +67,8 @@ async def test_obtener_estadisticas_passes_naive_datetimes_to_execute_query():
 
     assert result["autenticacion"]["total_eventos"] == 0
     assert captured_params, "expected execute_query calls"
+    # Estadísticas: lecturas pesadas que pueden ir a réplica
+    assert set(captured_connection_types) == {DatabaseConnection.READ}
     for params in captured_params:
         for param in params:
             if isinstance(param, datetime):
@@ -80,7 +85,7 @@ async def test_obtener_estadisticas_null_aggregates_coerced_to_zero():
         "eventos_por_tipo": None,
     }
 
-    async def fake_execute_query(query, params, client_id=None):
+    async def fake_execute_query(query, params, client_id=None, connection_type=None):
         if "GROUP BY evento" in query:
             return [auth_row]
         return []
@@ -0,0 +1,180 @@
+"""
+Tests del control de admisión por tenant a la BD (tenant_admission).
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ServiceError
+from app.core.tenant.context import TenantContext, reset_tenant_context, set_tenant_context
+from app.infrastructure.database import tenant_admission
+from app.infrastructure.database.tenant_admission import (
+    get_tenant_admission_report,
+    tenant_concurrency_limit,
+    tenant_db_slot,
+)
+
+
+@pytest.fixture(autouse=True)
+def admission(monkeypatch):
+    monkeypatch.setattr(settings, "TENANT_ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "TENANT_DB_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "TENANT_DB_GLOBAL_MAX_CONCURRENCY", 0)
+    monkeypatch.setattr(settings, "TENANT_DB_QUEUE_TIMEOUT_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "TENANT_DB_MAX_QUEUE", 100)
+    tenant_admission.reset_tenant_admission()
+    yield
+    tenant_admission.reset_tenant_admission()
+
+
+def _tenant_report(client_id):
+    return next(t for t in get_tenant_admission_report()["tenants"] if t["tenant"] == str(client_id))
+
+
+def test_limite_por_plan(monkeypatch):
+    monkeypatch.setattr(settings, "TENANT_DB_MAX_CONCURRENCY", 8)
+    monkeypatch.setattr(settings, "TENANT_PLAN_CONCURRENCY_WEIGHTS", "trial:0.5, enterprise:4, roto")
+    assert tenant_concurrency_limit("trial") == 4
+    assert tenant_concurrency_limit("Enterprise") == 32
+    assert tenant_concurrency_limit("desconocido") == 8
+    assert tenant_concurrency_limit(None) == 8
+
+
+@pytest.mark.asyncio
+async def test_espera_en_cola_hasta_que_se_libera_un_slot():
+    client_id = uuid4()
+    release = asyncio.Event()
+    active = 0
+    max_active = 0
+
+    async def worker():
+        nonlocal active, max_active
+        async with tenant_db_slot(client_id):
+            active += 1
+            max_active = max(max_active, active)
+            await release.wait()
+            active -= 1
+
+    tasks = [asyncio.create_task(worker()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    report = _tenant_report(client_id)
+    assert (report["active"], report["queued"]) == (2, 1)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert max_active == 2
+    assert _tenant_report(client_id)["admitted"] == 3
+
+
+@pytest.mark.asyncio
+async def test_timeout_y_cola_llena_rechazan_con_503(monkeypatch):
+    monkeypatch.setattr(settings, "TENANT_DB_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "TENANT_DB_QUEUE_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "TENANT_DB_MAX_QUEUE", 1)
+    client_id = uuid4()
+    hold = asyncio.Event()
+
+    async def holder():
+        async with tenant_db_slot(client_id):
+            await hold.wait()
+
+    async def waiter():
+        async with tenant_db_slot(client_id):
+            pass
+
+    holder_task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(waiter())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceError) as exc_info:
+        async with tenant_db_slot(client_id):
+            pass
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.internal_code == "TENANT_DB_CONCURRENCY_LIMIT"
+
+    with pytest.raises(ServiceError):
+        await queued
+    hold.set()
+    await holder_task
+
+    report = _tenant_report(client_id)
+    assert (report["rejected"], report["timeouts"], report["active"]) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_reparto_round_robin_entre_tenants(monkeypatch):
+    monkeypatch.setattr(settings, "TENANT_DB_MAX_CONCURRENCY", 10)
+    monkeypatch.setattr(settings, "TENANT_DB_GLOBAL_MAX_CONCURRENCY", 1)
+    ruidoso, tranquilo = uuid4(), uuid4()
+    order = []
+    gate = asyncio.Event()
+
+    async def work(client_id, label):
+        async with tenant_db_slot(client_id):
+            order.append(label)
+            await gate.wait()
+
+    first = asyncio.create_task(work(ruidoso, "R0"))
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(work(ruidoso, f"R{i}")) for i in range(1, 4)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(work(tranquilo, "T")))
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(first, *tasks)
+    # El tenant tranquilo no espera detrás de toda la cola del ruidoso
+    assert order.index("T") <= 2
+
+
+@pytest.mark.asyncio
+async def test_sesiones_anidadas_no_piden_otro_slot(monkeypatch):
+    monkeypatch.setattr(settings, "TENANT_DB_MAX_CONCURRENCY", 1)
+    client_id = uuid4()
+    async with tenant_db_slot(client_id):
+        async with tenant_db_slot(client_id):
+            assert _tenant_report(client_id)["active"] == 1
+    assert _tenant_report(client_id)["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tareas_hijas_piden_su_propio_slot():
+    client_id = uuid4()
+    max_active = 0
+
+    async def child():
+        nonlocal max_active
+        async with tenant_db_slot(client_id):
+            max_active = max(max_active, _tenant_report(client_id)["active"])
+            await asyncio.sleep(0.01)
+
+    async with tenant_db_slot(client_id):
+        await asyncio.gather(*(child() for _ in range(4)))
+
+    assert max_active == 2  # padre + una hija: el límite del tenant se respeta
+    assert _tenant_report(client_id)["admitted"] == 5
+    assert _tenant_report(client_id)["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_plan_del_contexto(monkeypatch):
+    monkeypatch.setattr(settings, "TENANT_PLAN_CONCURRENCY_WEIGHTS", "enterprise:4")
+    ctx = TenantContext(client_id=uuid4(), plan_suscripcion="enterprise")
+    tokens = set_tenant_context(ctx)
+    try:
+        async with tenant_db_slot(ctx.client_id):
+            assert _tenant_report(ctx.client_id)["limit"] == 8
+    finally:
+        reset_tenant_context(tokens)
+
+
+@pytest.mark.asyncio
+async def test_desactivado_o_sin_tenant(monkeypatch):
+    async with tenant_db_slot(None):
+        pass
+    monkeypatch.setattr(settings, "TENANT_ADMISSION_ENABLED", False)
+    async with tenant_db_slot(uuid4()):
+        pass
+    assert get_tenant_admission_report()["tenants"] == []
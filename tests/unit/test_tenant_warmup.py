@@ -0,0 +1,199 @@
+"""
+Tests del pre-calentamiento de tenants al arrancar (app.core.tenant.warmup).
+"""
+
+import asyncio
+import contextlib
+import datetime
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.core.tenant import routing, warmup
+from app.core.tenant.cache import subdomain_cache
+from app.infrastructure.database import connection_async
+
+
+@pytest.fixture
+def tenant_engines(tmp_path, monkeypatch):
+    """Un AsyncEngine SQLite por tenant en lugar de los engines aioodbc."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engines = {}
+
+    def fake_get_async_engine(connection_type=None, client_id=None, connection_metadata=None):
+        if client_id not in engines:
+            engines[client_id] = create_async_engine(
+                f"sqlite+aiosqlite:///{tmp_path / f'{client_id}.db'}", pool_size=5, max_overflow=0
+            )
+        return engines[client_id]
+
+    monkeypatch.setattr(connection_async, "_get_async_engine", fake_get_async_engine)
+    subdomain_cache.clear()
+    yield engines
+    subdomain_cache.clear()
+
+
+def _tenants(n):
+    return [
+        {"cliente_id": uuid.uuid4(), "codigo_cliente": f"T{i}", "subdominio": f"Tenant{i}", "sesiones": n - i}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_calienta_caches_y_pool(tenant_engines, monkeypatch):
+    tenants = _tenants(2)
+    metadata_calls = []
+
+    async def fake_load(limit, lookback_hours):
+        assert limit == 2
+        return tenants
+
+    async def fake_metadata(client_id):
+        metadata_calls.append(client_id)
+        return {"database_type": "single"}
+
+    monkeypatch.setattr(warmup, "load_active_tenants", fake_load)
+    monkeypatch.setattr(routing, "get_connection_metadata_async", fake_metadata)
+    monkeypatch.setattr(settings, "TENANT_WARMUP_MIN_IDLE", 3)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+
+    summary = await warmup.warm_up_tenants(limit=2)
+
+    assert summary["tenants"] == 2 and summary["failed"] == 0
+    assert summary["connections"] == 6
+    assert metadata_calls == [t["cliente_id"] for t in tenants]
+    assert subdomain_cache.get("tenant0")["cliente_id"] == tenants[0]["cliente_id"]
+    # Las conexiones quedan ociosas en el pool, listas para el primer request
+    for engine in tenant_engines.values():
+        assert engine.sync_engine.pool.checkedin() == 3
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrencia_acotada_y_fallos_no_bloquean(tenant_engines, monkeypatch):
+    tenants = _tenants(6)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_load(limit, lookback_hours):
+        return tenants
+
+    async def fake_metadata(client_id):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if client_id == tenants[0]["cliente_id"]:
+            raise RuntimeError("credenciales inválidas")
+        return {}
+
+    monkeypatch.setattr(warmup, "load_active_tenants", fake_load)
+    monkeypatch.setattr(routing, "get_connection_metadata_async", fake_metadata)
+
+    summary = await warmup.warm_up_tenants(concurrency=2)
+
+    assert max_in_flight == 2
+    assert summary["tenants"] == 5 and summary["failed"] == 1
+    for engine in tenant_engines.values():
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_start_no_bloquea_y_stop_cancela(monkeypatch):
+    started = asyncio.Event()
+
+    async def slow_warmup():
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(warmup, "warm_up_tenants", slow_warmup)
+    task = warmup.start_tenant_warmup()
+    await started.wait()
+    assert not task.done()
+    await warmup.stop_tenant_warmup()
+    assert task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_tenant_dedicado_se_cuenta_en_su_bd(monkeypatch):
+    compartido = {"cliente_id": uuid.uuid4(), "codigo_cliente": "S", "subdominio": "s", "sesiones": 2}
+    dedicado = {"cliente_id": uuid.uuid4(), "codigo_cliente": "D", "subdominio": "d"}
+    connections = []
+
+    class FakeSession:
+        async def execute(self, query):
+            return type("Result", (), {"scalar": lambda self: 5})()
+
+    @contextlib.asynccontextmanager
+    async def fake_connection(connection_type, client_id=None, connection_metadata=None):
+        connections.append((connection_type, client_id))
+        yield FakeSession()
+
+    async def fake_shared(limit, since):
+        return [dict(compartido)]
+
+    async def fake_dedicated():
+        return [dict(dedicado)]
+
+    monkeypatch.setattr(warmup, "_load_shared_ranking", fake_shared)
+    monkeypatch.setattr(warmup, "_load_dedicated_tenants", fake_dedicated)
+    monkeypatch.setattr(connection_async, "get_db_connection", fake_connection)
+
+    tenants = await warmup.load_active_tenants(limit=5, lookback_hours=24)
+
+    assert [(t["codigo_cliente"], t["sesiones"]) for t in tenants] == [("D", 5), ("S", 2)]
+    assert connections == [(connection_async.DatabaseConnection.DEFAULT, dedicado["cliente_id"])]
+
+
+@pytest.mark.asyncio
+async def test_tenants_mas_activos_desde_sesiones():
+    pytest.importorskip("aiosqlite")
+    from tests.load.seed import fill_row
+    from tests.load.standin_db import StandinDatabase
+
+    standin = StandinDatabase()
+    try:
+        await standin.create_schema()
+        tables = standin.metadata.tables
+        now = datetime.datetime.now()
+        activo, poco_activo, inactivo, dedicado = uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        await standin.insert_rows("cliente", [
+            fill_row(tables["cliente"], cliente_id=cid, codigo_cliente=codigo, subdominio=codigo.lower(),
+                     razon_social=codigo, contacto_email="x@example.com", es_activo=es_activo,
+                     tipo_instalacion=tipo)
+            for cid, codigo, es_activo, tipo in (
+                (activo, "A", True, "shared"),
+                (poco_activo, "B", True, "shared"),
+                (inactivo, "C", False, "shared"),
+                (dedicado, "D", True, "dedicated"),
+            )
+        ])
+
+        def session_row(cliente_id, last_activity):
+            return fill_row(
+                tables["user_session"], session_id=uuid.uuid4(), usuario_id=uuid.uuid4(), cliente_id=cliente_id,
+                platform="web", is_active=True, created_at=last_activity,
+                last_business_activity_at=last_activity, expires_at=now + datetime.timedelta(days=1),
+            )
+
+        await standin.insert_rows("user_session", [
+            session_row(activo, now), session_row(activo, now), session_row(activo, now),
+            session_row(poco_activo, now),
+            session_row(poco_activo, now - datetime.timedelta(days=3)),
+            session_row(inactivo, now),
+            # BD del tenant dedicado (la stand-in sirve ADMIN y tenants desde el mismo archivo)
+            session_row(dedicado, now), session_row(dedicado, now),
+        ])
+        standin.install()
+
+        tenants = await warmup.load_active_tenants(limit=5, lookback_hours=24)
+    finally:
+        await standin.dispose()
+
+    assert [(t["cliente_id"], t["sesiones"]) for t in tenants] == [(activo, 3), (dedicado, 2), (poco_activo, 1)]
+    assert tenants[0]["subdominio"] == "a"